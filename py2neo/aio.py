@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Asynchronous counterparts of the :class:`.Graph`, :class:`.GraphTransaction`
+and :class:`.Cursor` classes, for use with :mod:`asyncio`.
+
+These run over Bolt only, using a pool of :class:`.AsyncBolt`
+connections, and require Python 3.5 or above. Records are returned
+in exactly the same form as those returned by the blocking API::
+
+    >>> from asyncio import run
+    >>> from py2neo.aio import AsyncGraph
+    >>> async def main():
+    ...     async with AsyncGraph("bolt://localhost:7687") as graph:
+    ...         cursor = await graph.run("UNWIND range(1, 3) AS n RETURN n")
+    ...         async for record in cursor:
+    ...             print(record["n"])
+    >>> run(main())
+    1
+    2
+    3
+
+"""
+
+
+from py2neo.connect import ConnectionProfile, TransactionError
+from py2neo.connect.aio import AsyncConnectionPool
+from py2neo.connect.bolt import Bolt
+from py2neo.data import LazyRecord, Record
+from py2neo.database import CypherSummary, GraphTransactionError
+from py2neo.internal.caching import ThreadLocalEntityCache
+
+
+__all__ = ["AsyncGraph", "AsyncGraphTransaction", "AsyncCursor"]
+
+
+class AsyncGraph(object):
+    """ Asynchronous access to a Neo4j graph database over Bolt.
+
+    Connection details are given in the same way as for :class:`.Graph`
+    and the same settings are supported. A pool of connections is kept
+    for each :class:`.AsyncGraph` object, up to `max_size` connections
+    in size, and each operation waits for a free connection without
+    blocking the event loop. The pool can be shut down by calling
+    :meth:`.close`, or by using the graph as an asynchronous context
+    manager.
+    """
+
+    def __init__(self, uri=None, name=None, **settings):
+        profile = ConnectionProfile(uri, **settings)
+        if profile.protocol != "bolt":
+            raise ValueError("Asynchronous access is only available over Bolt")
+        self.__name__ = name
+        self._pool = AsyncConnectionPool(profile, settings.get("user_agent"),
+                                         settings.get("max_size"), settings.get("max_age"),
+                                         settings.get("acquire_wait_timeout"))
+        self.node_cache = ThreadLocalEntityCache()
+        self.relationship_cache = ThreadLocalEntityCache()
+        self._hydrant = Bolt.default_hydrant(profile, self)
+
+    def __repr__(self):
+        return "<%s uri=%r name=%r>" % (self.__class__.__name__, self.uri, self.name)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def name(self):
+        return self.__name__
+
+    @property
+    def uri(self):
+        """ The URI to which this graph is connected.
+        """
+        return self._pool.profile.uri
+
+    @property
+    def pool(self):
+        """ The :class:`.AsyncConnectionPool` used by this graph.
+        """
+        return self._pool
+
+    def close(self):
+        """ Close all connections held by this graph.
+        """
+        self._pool.close()
+
+    def auto(self, readonly=False):
+        """ Create a new auto-commit :class:`.AsyncGraphTransaction`.
+
+        :param readonly: if :const:`True`, will begin a readonly
+            transaction, otherwise will begin as read-write
+        """
+        return AsyncGraphTransaction(self, autocommit=True, readonly=readonly)
+
+    async def begin(self, readonly=False, after=None, metadata=None, timeout=None):
+        """ Begin a new :class:`.AsyncGraphTransaction`.
+
+        :param readonly: if :const:`True`, will begin a readonly
+            transaction, otherwise will begin as read-write
+        :param after: bookmark(s) after which this transaction should
+            begin
+        :param metadata: user metadata to attach to the transaction
+        :param timeout: transaction timeout, in seconds
+        """
+        tx = AsyncGraphTransaction(self, readonly=readonly)
+        await tx._begin(after, metadata, timeout)
+        return tx
+
+    async def run(self, cypher, parameters=None, fetch_size=None, **kwparameters):
+        """ Run a single read/write query within an auto-commit
+        :class:`.AsyncGraphTransaction`.
+
+        :param cypher: Cypher statement
+        :param parameters: dictionary of parameters
+        :param fetch_size: number of records to pull from the server
+                           in each batch, or -1 to pull all records at
+                           once; defaults to the `fetch_size` setting
+        :param kwparameters: extra keyword parameters
+        :return: :class:`.AsyncCursor` object
+        """
+        return await self.auto().run(cypher, parameters, fetch_size=fetch_size, **kwparameters)
+
+    async def evaluate(self, cypher, parameters=None, **kwparameters):
+        """ Run a single query within an auto-commit
+        :class:`.AsyncGraphTransaction` and return the value from the
+        first column of the first record.
+
+        :param cypher: Cypher statement
+        :param parameters: dictionary of parameters
+        :return: first value from the first record returned or
+                 :py:const:`None`.
+        """
+        return await self.auto().evaluate(cypher, parameters, **kwparameters)
+
+
+class AsyncGraphTransaction(object):
+    """ Asynchronous counterpart of :class:`.GraphTransaction`.
+
+    An explicit transaction should be created with
+    :meth:`.AsyncGraph.begin`, and can then be used as an asynchronous
+    context manager, which commits on success and rolls back on error.
+    """
+
+    _finished = False
+
+    def __init__(self, graph, autocommit=False, readonly=False):
+        self._graph = graph
+        self._autocommit = autocommit
+        self._readonly = readonly
+        self._cx = None
+        self._transaction = None
+
+    async def _begin(self, after=None, metadata=None, timeout=None):
+        pool = self._graph.pool
+        cx = await pool.acquire(self._graph.name, self._readonly)
+        try:
+            self._transaction = await cx.begin(self._graph.name, self._readonly,
+                                               after, metadata, timeout)
+        except Exception:
+            await pool.release(cx)
+            raise
+        self._cx = cx
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    def _assert_unfinished(self):
+        if self._finished:
+            raise GraphTransactionError(self)
+
+    @property
+    def graph(self):
+        return self._graph
+
+    def finished(self):
+        """ Indicates whether or not this transaction has been completed
+        or is still open.
+        """
+        return self._finished
+
+    async def run(self, cypher, parameters=None, fetch_size=None, **kwparameters):
+        """ Send a Cypher statement to the server for execution and
+        return an :class:`.AsyncCursor` for navigating its result.
+
+        :param cypher: Cypher statement
+        :param parameters: dictionary of parameters
+        :param fetch_size: number of records to pull from the server
+                           in each batch, or -1 to pull all records at
+                           once; defaults to the `fetch_size` setting
+        :returns: :class:`.AsyncCursor` object
+        """
+        self._assert_unfinished()
+        hydrant = self._graph._hydrant
+        parameters = dict(parameters or {}, **kwparameters)
+        try:
+            if self._transaction:
+                cx = self._cx
+                parameters = hydrant.dehydrate(parameters, version=cx.protocol_version)
+                result = cx.run_in_tx(self._transaction, cypher, parameters)
+            else:
+                cx = await self._graph.pool.acquire(self._graph.name, self._readonly)
+                parameters = hydrant.dehydrate(parameters, version=cx.protocol_version)
+                result = cx.auto_run(self._graph.name, cypher, parameters, self._readonly)
+            if fetch_size is None:
+                fetch_size = cx.profile.fetch_size
+            if cx.supports_fetch_size():
+                result.fetch_size = fetch_size
+                cx.pull(result, n=fetch_size)
+            else:
+                cx.pull(result)
+            await cx.sync(result)
+            return AsyncCursor(cx, result, hydrant)
+        finally:
+            if not self._transaction:
+                self._finished = True
+
+    async def evaluate(self, cypher, parameters=None, **kwparameters):
+        """ Execute a single Cypher statement and return the value from
+        the first column of the first record.
+
+        :param cypher: Cypher statement
+        :param parameters: dictionary of parameters
+        :returns: single return value or :const:`None`
+        """
+        cursor = await self.run(cypher, parameters, fetch_size=1, **kwparameters)
+        try:
+            return await cursor.evaluate(0)
+        finally:
+            await cursor.close()
+
+    async def commit(self):
+        """ Commit the transaction.
+        """
+        self._assert_unfinished()
+        try:
+            return await self._cx.commit(self._transaction)
+        except TransactionError as error:
+            error.__class__ = GraphTransactionError
+            raise error
+        finally:
+            self._finished = True
+
+    async def rollback(self):
+        """ Roll back the current transaction, undoing all actions
+        previously taken.
+        """
+        self._assert_unfinished()
+        try:
+            return await self._cx.rollback(self._transaction)
+        except TransactionError as error:
+            error.__class__ = GraphTransactionError
+            raise error
+        finally:
+            self._finished = True
+
+
+class AsyncCursor(object):
+    """ Asynchronous counterpart of :class:`.Cursor`, which can be
+    iterated over with ``async for``.
+    """
+
+    def __init__(self, cx, result, hydrant=None):
+        self._cx = cx
+        self._result = result
+        self._hydrant = hydrant
+        self._entities = {}
+        # The header has already been received, so the fields are
+        # read from it directly, instead of through a blocking sync.
+        self._keys = result.first().metadata.get("fields")
+        self._current = None
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if await self.forward():
+            return self._current
+        else:
+            raise StopAsyncIteration()
+
+    def __getitem__(self, key):
+        return self._current[key]
+
+    @property
+    def current(self):
+        """ Returns the current record or :py:const:`None` if no record
+        has yet been selected.
+        """
+        return self._current
+
+    @property
+    def fetch_size(self):
+        """ The number of records pulled from the server in each batch,
+        or -1 if all remaining records are pulled at once.
+        """
+        return self._result.fetch_size
+
+    @fetch_size.setter
+    def fetch_size(self, value):
+        self._result.fetch_size = value
+
+    def keys(self):
+        """ Return the field names for the records in the stream.
+        """
+        return self._keys
+
+    async def close(self):
+        """ Close this cursor, dropping any records not yet read and
+        telling the server to discard those that it has not yet sent.
+        """
+        if not self._closed:
+            result = self._result
+            result.discard(sync=False)
+            if result.has_more():
+                self._cx.discard(result)
+                await self._cx.sync(result)
+            self._closed = True
+
+    async def summary(self):
+        """ Return the result summary.
+        """
+        await self._cx.buffer(self._result)
+        return CypherSummary(**self._result.summary())
+
+    async def forward(self, amount=1):
+        """ Attempt to move the cursor `amount` records forward,
+        returning the number of records actually moved.
+        """
+        if amount == 0:
+            return 0
+        if amount < 0:
+            raise ValueError("Cursor can only move forwards")
+        amount = int(amount)
+        moved = 0
+        cx = self._cx
+        result = self._result
+        hydrant = self._hydrant
+        keys = self._keys
+        v = result.protocol_version
+        lazy = result.lazy_records
+        while moved != amount:
+            values = await cx.fetch(result)
+            if values is None:
+                break
+            if lazy:
+                self._current = LazyRecord(keys, self._loader(keys, values, v))
+            else:
+                if hydrant:
+                    values = hydrant.hydrate(keys, values, entities=self._entities, version=v)
+                self._current = Record(zip(keys, values))
+            moved += 1
+        return moved
+
+    def _loader(self, keys, values, version):
+        hydrant = self._hydrant
+        entities = self._entities
+
+        def load(index):
+            if hydrant:
+                return hydrant.hydrate(keys[index:index + 1], (values[index],),
+                                       entities=entities, version=version)[0]
+            else:
+                return values[index]
+
+        return load
+
+    async def evaluate(self, field=0):
+        """ Return the value of the first field from the next record
+        (or the value of another field if explicitly specified), or
+        :py:const:`None` if there are no more records.
+
+        :param field: field to select value from (optional)
+        :returns: value of the field or :py:const:`None`
+        """
+        if await self.forward():
+            try:
+                return self[field]
+            except IndexError:
+                return None
+        else:
+            return None
+
+    async def data(self):
+        """ Consume and extract the entire result as a list of
+        dictionaries.
+
+        :return: the full query result
+        :rtype: `list` of `dict`
+        """
+        records = []
+        async for record in self:
+            records.append(record.data())
+        return records
@@ -17,8 +17,9 @@
 
 
 from collections import deque
+from copy import copy
 from logging import getLogger
-from threading import Event
+from threading import Condition, Lock, RLock
 from uuid import uuid4
 
 from py2neo.internal.compat import urlsplit, string_types, perf_counter
@@ -29,6 +30,8 @@ from py2neo.meta import (
     NEO4J_VERIFY,
 )
 from py2neo.connect.addressing import Address
+from py2neo.connect.metrics import ConnectorMetrics, PoolMetrics
+from py2neo.connect.routing import RoutingError, RoutingTable, WRITE_FAILURE_CODES
 
 
 DEFAULT_PROTOCOL = "bolt"
@@ -94,6 +97,11 @@ class ConnectionProfile(object):
     user = None
     password = None
     address = None
+    readers = ()
+    lazy_records = False
+    fetch_size = -1
+    http_streaming = False
+    http_graph_format = False
 
     def __init__(self, uri=None, **settings):
         # TODO: recognise IPv6 addresses explicitly
@@ -102,12 +110,12 @@ class ConnectionProfile(object):
             parsed = urlsplit(uri)
             if parsed.scheme is not None:
                 self.scheme = parsed.scheme
-                if self.scheme in ["bolt+s", "bolt+ssc",
+                if self.scheme in ["bolt+s", "bolt+ssc", "neo4j+s", "neo4j+ssc",
                                    "https", "http+s", "http+ssc"]:
                     self.secure = True
-                elif self.scheme in ["bolt", "http"]:
+                elif self.scheme in ["bolt", "neo4j", "http"]:
                     self.secure = False
-                if self.scheme in ["bolt+ssc", "http+ssc"]:
+                if self.scheme in ["bolt+ssc", "neo4j+ssc", "http+ssc"]:
                     self.verify = False
                 else:
                     self.verify = True
@@ -140,6 +148,10 @@ class ConnectionProfile(object):
         self.scheme = self._coalesce(settings.get("scheme"), self.scheme)
         self.user = self._coalesce(settings.get("user"), self.user)
         self.password = self._coalesce(settings.get("password"), self.password)
+        self.lazy_records = self._coalesce(settings.get("lazy_records"), self.lazy_records)
+        self.fetch_size = self._coalesce(settings.get("fetch_size"), self.fetch_size)
+        self.http_streaming = self._coalesce(settings.get("http_streaming"), self.http_streaming)
+        self.http_graph_format = self._coalesce(settings.get("http_graph_format"), self.http_graph_format)
         if "address" in settings:
             address = settings.get("address")
             if isinstance(address, tuple):
@@ -152,6 +164,12 @@ class ConnectionProfile(object):
             self.address = Address.parse("%s:%s" % (settings.get("host"), self.port))
         elif "port" in settings:
             self.address = Address.parse("%s:%s" % (self.host, settings.get("port")))
+        if settings.get("readers") is not None:
+            readers = settings.get("readers")
+            if isinstance(readers, string_types):
+                readers = readers.split(",")
+            self.readers = tuple(Address(reader) if isinstance(reader, tuple)
+                                 else Address.parse(reader.strip()) for reader in readers)
 
     def _apply_correct_scheme_for_security(self):
         if self.secure is None:
@@ -159,10 +177,11 @@ class ConnectionProfile(object):
         if self.verify is None:
             self.verify = DEFAULT_VERIFY
         if self.protocol == "bolt":
+            prefix = "neo4j" if self.routing else "bolt"
             if self.secure:
-                self.scheme = "bolt+s" if self.verify else "bolt+ssc"
+                self.scheme = prefix + ("+s" if self.verify else "+ssc")
             else:
-                self.scheme = "bolt"
+                self.scheme = prefix
         elif self.protocol == "http":
             if self.secure:
                 self.scheme = "https" if self.verify else "http+ssc"
@@ -174,15 +193,32 @@ class ConnectionProfile(object):
             self.user = DEFAULT_USER
         if not self.password:
             self.password = DEFAULT_PASSWORD
-        if not self.address.port:
-            bits = list(self.address)
-            if self.scheme == "http":
-                bits[1] = DEFAULT_HTTP_PORT
-            elif self.scheme in ("https", "http+s", "http+ssc"):
-                bits[1] = DEFAULT_HTTPS_PORT
-            else:
-                bits[1] = DEFAULT_BOLT_PORT
-            self.address = Address(bits)
+        self.address = self._apply_default_port(self.address)
+        self.readers = tuple(map(self._apply_default_port, self.readers))
+
+    def _apply_default_port(self, address):
+        if address.port:
+            return address
+        bits = list(address)
+        if self.scheme == "http":
+            bits[1] = DEFAULT_HTTP_PORT
+        elif self.scheme in ("https", "http+s", "http+ssc"):
+            bits[1] = DEFAULT_HTTPS_PORT
+        else:
+            bits[1] = DEFAULT_BOLT_PORT
+        return Address(bits)
+
+    def with_address(self, address):
+        """ Return a copy of this profile, for a server at a different
+        address, but otherwise with the same details.
+        """
+        profile = copy(self)
+        profile.address = address
+        profile.readers = ()
+        if profile.routing:
+            # Connections to each server are direct, not routed.
+            profile.scheme = "bolt" + profile.scheme[5:]
+        return profile
 
     @property
     def auth(self):
@@ -202,18 +238,27 @@ class ConnectionProfile(object):
 
     @property
     def protocol(self):
-        if self.scheme in ("bolt", "bolt+s", "bolt+ssc"):
+        if self.scheme in ("bolt", "bolt+s", "bolt+ssc", "neo4j", "neo4j+s", "neo4j+ssc"):
             return "bolt"
         elif self.scheme in ("http", "https", "http+s", "http+ssc"):
             return "http"
         else:
             return DEFAULT_PROTOCOL
 
+    @property
+    def routing(self):
+        """ True if the servers to use should be discovered from the
+        routing table of a Neo4j cluster, as for the ``neo4j`` URI
+        schemes.
+        """
+        return self.scheme in ("neo4j", "neo4j+s", "neo4j+ssc")
+
     @property
     def uri(self):
         return "%s://%s@%s:%s" % (self.scheme, self.user, self.host, self.port)
 
-    __hash_keys = ("secure", "verify", "scheme", "user", "password", "address")
+    __hash_keys = ("secure", "verify", "scheme", "user", "password", "address", "readers",
+                   "lazy_records", "fetch_size", "http_streaming", "http_graph_format")
 
     def __hash__(self):
         values = tuple(getattr(self, key) for key in self.__hash_keys)
@@ -264,13 +309,13 @@ class Connection(object):
     # TODO: ping method
 
     @classmethod
-    def open(cls, profile, user_agent=None):
+    def open(cls, profile, user_agent=None, transport=None):
         if profile.protocol == "bolt":
             from py2neo.connect.bolt import Bolt
             return Bolt.open(profile, user_agent=user_agent)
         elif profile.protocol == "http":
             from py2neo.connect.http import HTTP
-            return HTTP.open(profile, user_agent=user_agent)
+            return HTTP.open(profile, user_agent=user_agent, transport=transport)
         else:
             raise ValueError("Unknown scheme %r" % profile.scheme)
 
@@ -314,8 +359,30 @@ class Connection(object):
     def _goodbye(self):
         pass
 
-    def reset(self, force=False):
-        pass
+    @property
+    def state(self):
+        """ The state of this connection, as far as the server is
+        concerned. This is one of:
+
+        - ``"idle"`` -- ready for use, with nothing to clean up
+        - ``"transaction"`` -- holding an open transaction
+        - ``"streaming"`` -- with records still to be received or
+          pulled for a result
+        - ``"failed"`` -- following a failure that the server has not
+          yet been told to clear
+        """
+        return "idle"
+
+    def reset(self, force=False, pipelined=False):
+        """ Reset this connection, if it is not already idle.
+
+        :param force: if true, reset the connection whatever its state
+        :param pipelined: if true, send the reset without waiting for
+            the response, which is instead received along with the
+            response to the next request
+        :return: true if a reset was carried out, false otherwise
+        """
+        return False
 
     def auto_run(self, graph_name, cypher, parameters=None,
                  readonly=False, after=None, metadata=None, timeout=None):
@@ -374,9 +441,21 @@ class Connection(object):
     def supports_multi(self):
         return self.neo4j_version.major_minor >= (4, 0)
 
+    def supports_fetch_size(self):
+        """ Return true if results can be pulled from the server in
+        batches of a given size, false if they can only be pulled in
+        full.
+        """
+        return False
+
 
 class ConnectionPool(object):
     """ A connection pool for a remote Neo4j service.
+
+    A pool can be shared between threads. All bookkeeping is carried
+    out under a single lock, which is never held while network I/O
+    takes place, and threads waiting for a connection are served in
+    the order in which they arrived.
     """
 
     default_init_size = 1
@@ -388,7 +467,8 @@ class ConnectionPool(object):
     default_acquire_wait_timeout = 30
 
     @classmethod
-    def open(cls, profile=None, user_agent=None, init_size=None, max_size=None, max_age=None):
+    def open(cls, profile=None, user_agent=None, init_size=None, max_size=None, max_age=None,
+             acquire_wait_timeout=None, http_keep_alive=None, http_idle_timeout=None):
         """ Create a new connection pool, with an option to seed one
         or more initial connections.
 
@@ -402,22 +482,42 @@ class ConnectionPool(object):
             free
         :param max_age: the maximum permitted age, in seconds, for
             connections to be retained in this pool
+        :param acquire_wait_timeout: the maximum time, in seconds, to
+            wait for a connection to become available when the pool is
+            full
+        :param http_keep_alive: the number of sockets to keep open for
+            reuse by HTTP connections
+        :param http_idle_timeout: the time, in seconds, after which an
+            idle HTTP socket is closed
         """
-        pool = cls(profile, user_agent, max_size, max_age)
+        pool = cls(profile, user_agent, max_size, max_age, acquire_wait_timeout,
+                   http_keep_alive, http_idle_timeout)
         seeds = [pool.acquire() for _ in range(init_size or cls.default_init_size)]
         for seed in seeds:
             pool.release(seed)
         return pool
 
-    def __init__(self, profile, user_agent, max_size, max_age):
+    def __init__(self, profile, user_agent, max_size, max_age, acquire_wait_timeout=None,
+                 http_keep_alive=None, http_idle_timeout=None):
         self._profile = profile
         self._user_agent = user_agent
         self._max_size = max_size or self.default_max_size
         self._max_age = max_age or self.default_max_age
-        self._in_use_list = deque()
-        self._quarantine = deque()
+        self._acquire_wait_timeout = acquire_wait_timeout or self.default_acquire_wait_timeout
+        self._lock = RLock()
+        self._in_use = set()
+        self._quarantine = set()
         self._free_list = deque()
-        self._waiting_list = WaitingList()
+        self._opening = 0
+        self._waiting_list = WaitingList(self._lock)
+        self._metrics = PoolMetrics()
+        if profile.protocol == "http":
+            # HTTP connections are logical only, and share the sockets
+            # of a single transport.
+            from py2neo.connect.http import HTTPTransport
+            self._transport = HTTPTransport(profile, http_keep_alive, http_idle_timeout)
+        else:
+            self._transport = None
 
     def __del__(self):
         try:
@@ -429,7 +529,7 @@ class ConnectionPool(object):
         return "<{} profile={!r} [{}{}{}]>".format(
             self.__class__.__name__,
             self.profile,
-            "|" * len(self._in_use_list),
+            "|" * len(self._in_use),
             "." * len(self._free_list),
             " " * (self.max_size - self.size),
         )
@@ -466,13 +566,13 @@ class ConnectionPool(object):
 
     @max_size.setter
     def max_size(self, value):
-        old_value = self._max_size
-        self._max_size = value
-        if value > old_value:
-            # The maximum size has grown, so new slots have become
-            # available. Notify any waiting acquirers of this extra
-            # capacity.
-            self._waiting_list.notify()
+        with self._lock:
+            old_value = self._max_size
+            self._max_size = value
+            if value > old_value:
+                # The maximum size has grown, so new slots have become
+                # available. Hand these to any waiting acquirers.
+                self._notify_capacity()
 
     @property
     def max_age(self):
@@ -483,22 +583,51 @@ class ConnectionPool(object):
 
     @property
     def acquire_wait_timeout(self):
-        # TODO: make this configurable
-        return self.default_acquire_wait_timeout
+        """ The maximum time, in seconds, to wait for a connection to
+        become available when the pool is full.
+        """
+        return self._acquire_wait_timeout
+
+    @acquire_wait_timeout.setter
+    def acquire_wait_timeout(self, value):
+        self._acquire_wait_timeout = value
 
     @property
     def in_use(self):
         """ The number of connections in this pool that are currently
         in use.
         """
-        return len(self._in_use_list)
+        return len(self._in_use)
 
     @property
     def size(self):
-        """ The total number of connections (both in-use and free)
-        currently owned by this connection pool.
+        """ The total number of connections currently owned by this
+        connection pool. As well as those in use and those free, this
+        includes connections still being opened or being sanitized, so
+        that other threads cannot overfill the pool in the meantime.
         """
-        return len(self._in_use_list) + len(self._free_list)
+        return len(self._in_use) + len(self._free_list) + len(self._quarantine) + self._opening
+
+    @property
+    def metrics(self):
+        """ The :class:`.PoolMetrics` recorded for this pool.
+        """
+        return self._metrics
+
+    @property
+    def resets_sent(self):
+        """ The number of times a connection has been reset on being
+        acquired from, or released into, this pool.
+        """
+        return self._metrics.resets_sent
+
+    @property
+    def resets_avoided(self):
+        """ The number of times a connection has been acquired from, or
+        released into, this pool without needing to be reset, as it was
+        already idle.
+        """
+        return self._metrics.resets_avoided
 
     def _sanitize(self, cx, force_reset=False):
         """ Attempt to clean up a connection, such that it can be
@@ -511,19 +640,68 @@ class ConnectionPool(object):
 
         Should the connection be neither broken, closed nor expired,
         it will be reset (optionally forcibly so) and the connection
-        object will be returned, indicating success.
+        object will be returned, indicating success. A connection that
+        is already idle is not reset, unless forced. Otherwise, the
+        reset is pipelined, so that its response is received along
+        with that of the next request on the connection.
+
+        The connection must be held in quarantine by the caller for
+        the duration of this call, which is made without the lock.
         """
         if cx.broken or cx.closed:
+            self._discard(cx, "break")
             return None
         expired = self.max_age is not None and cx.age > self.max_age
         if expired:
             cx.close()
+            self._discard(cx, "expire")
             return None
-        self._quarantine.append(cx)
-        cx.reset(force=force_reset)
-        self._quarantine.remove(cx)
+        reset = cx.reset(force=force_reset, pipelined=True)
+        with self._lock:
+            if reset:
+                self._metrics.resets_sent += 1
+            else:
+                self._metrics.resets_avoided += 1
         return cx
 
+    def _discard(self, cx, event):
+        """ Record the lifetime of a connection that has left the pool,
+        and the reason it did so.
+        """
+        lifetime = cx.age
+        with self._lock:
+            if event == "break":
+                self._metrics.breakages += 1
+            elif event == "expire":
+                self._metrics.expirations += 1
+            self._metrics.lifetime.observe(lifetime)
+        self._metrics._emit(event, lifetime)
+
+    def record_retry(self, delay):
+        """ Record that a unit of work is to be retried after the
+        given delay, in seconds (see :class:`.RetryPolicy`).
+        """
+        with self._lock:
+            self._metrics.retries += 1
+        self._metrics._emit("retry", delay)
+
+    def record_give_up(self):
+        """ Record that a unit of work failed with a retryable error,
+        but will not be retried again.
+        """
+        with self._lock:
+            self._metrics.retries_exhausted += 1
+        self._metrics._emit("give_up")
+
+    def _notify_capacity(self):
+        """ Reserve a slot for each waiting acquirer for which there is
+        now room in the pool, and wake those acquirers so that they can
+        open new connections. This must be called with the lock held.
+        """
+        while self._waiting_list and self.size < self.max_size:
+            self._opening += 1
+            self._waiting_list.notify(_OPEN)
+
     def acquire(self, graph_name=None, readonly=False, force_reset=False):
         """ Acquire a connection from the pool.
 
@@ -532,6 +710,8 @@ class ConnectionPool(object):
         a new connection will be created. If the pool is full and no
         free connections are available, this will block until a
         connection is released, or until the acquire call is cancelled.
+        Threads that need to wait are served in turn, each being handed
+        the next connection to be released.
 
         This method will return :py:`None` if and only if the maximum
         size of the pool is set to zero. In this special case, no
@@ -544,36 +724,105 @@ class ConnectionPool(object):
             reset before being returned; if false, this will only occur
             if the connection is not already in a clean state
         :return: a Bolt connection object
+        :raise RuntimeError: if no connection becomes available within
+            the acquire wait timeout
         """
-        # TODO: use graph_name and readonly
+        # The graph_name and readonly arguments are ignored here, as
+        # the connector has already picked this pool to suit them.
         log.debug("Acquiring connection from pool %r", self)
-        cx = None
-        while cx is None or cx.broken or cx.closed:
-            if self.max_size == 0:
-                return None
-            try:
-                # Plan A: select a free connection from the pool
-                cx = self._free_list.popleft()
-            except IndexError:
-                if self.size < self.max_size:
+        waited = 0.0
+        while True:
+            handed_over = False
+            with self._lock:
+                if self.max_size == 0:
+                    return None
+                if self._waiting_list:
+                    # Other threads are already waiting, so join the
+                    # back of the queue.
+                    ticket = None
+                elif self._free_list:
+                    # Plan A: select a free connection from the pool
+                    ticket = self._free_list.popleft()
+                    self._quarantine.add(ticket)
+                elif self.size < self.max_size:
                     # Plan B: if the pool isn't full, open
                     # a new connection
-                    cx = Connection.open(self.profile, user_agent=self.user_agent)
+                    self._opening += 1
+                    ticket = _OPEN
                 else:
-                    # Plan C: wait for more capacity to become
-                    # available, then try again
+                    ticket = None
+                if ticket is None:
+                    # Plan C: wait for a connection to be handed over,
+                    # or for a slot in which to open one
                     log.debug("Joining waiting list")
-                    if not self._waiting_list.wait(self.acquire_wait_timeout):
-                        raise RuntimeError("Unable to acquire connection")
+                    t0 = perf_counter()
+                    ticket = self._waiting_list.wait(self.acquire_wait_timeout)
+                    waited += perf_counter() - t0
+                    if ticket is None:
+                        self._metrics.timeouts += 1
+                        self._metrics.wait_time.observe(waited)
+                    elif ticket is _RETRY:
+                        continue
+                    elif ticket is not _OPEN and not force_reset:
+                        # A released connection has been handed over,
+                        # already sanitized and marked as in use.
+                        handed_over = True
+                    elif ticket is not _OPEN:
+                        self._in_use.remove(ticket)
+                        self._quarantine.add(ticket)
+            if handed_over:
+                return self._acquired(ticket, waited)
+            elif ticket is None:
+                self._metrics._emit("timeout", waited)
+                raise RuntimeError("Unable to acquire connection")
+            elif ticket is _OPEN:
+                cx = self._open()
             else:
-                cx = self._sanitize(cx, force_reset=force_reset)
-        self._in_use_list.append(cx)
+                cx = self._sanitize(ticket, force_reset=force_reset)
+                with self._lock:
+                    self._quarantine.discard(ticket)
+                    if cx is None:
+                        self._notify_capacity()
+                    else:
+                        self._in_use.add(cx)
+            if cx is not None:
+                return self._acquired(cx, waited)
+
+    def _acquired(self, cx, waited):
+        """ Record the acquisition of a connection, and return it.
+        """
+        with self._lock:
+            self._metrics.acquires += 1
+            if waited:
+                self._metrics.wait_time.observe(waited)
+        self._metrics._emit("acquire", waited)
+        return cx
+
+    def _open(self):
+        """ Open a new connection in a slot already reserved within
+        the pool, and mark it as in use.
+        """
+        cx = None
+        try:
+            cx = Connection.open(self.profile, user_agent=self.user_agent,
+                                 transport=self._transport)
+        finally:
+            with self._lock:
+                self._opening -= 1
+                if cx is None:
+                    # The slot is free again for another waiter.
+                    self._notify_capacity()
+                else:
+                    self._in_use.add(cx)
+                    self._metrics.creations += 1
+        self._metrics._emit("create")
         return cx
 
     def release(self, cx, force_reset=False):
         """ Release a Bolt connection, putting it back into the pool
         if the connection is healthy and the pool is not already at
-        capacity.
+        capacity. If any threads are waiting to acquire a connection,
+        it is handed directly to the first of these instead.
 
         :param cx: the connection to release
         :param force_reset: if true, the connection will be forcibly
@@ -584,35 +833,52 @@ class ConnectionPool(object):
             or if it does not belong to this pool
         """
         log.debug("Releasing connection %r", cx)
-        if cx in self._in_use_list:
-            self._in_use_list.remove(cx)
-            if self.size < self.max_size:
-                # If there is spare capacity in the pool, attempt to
-                # sanitize the connection and return it to the pool.
-                cx = self._sanitize(cx, force_reset=force_reset)
-                if cx:
-                    # Carry on only if sanitation succeeded.
-                    if self.size < self.max_size:
-                        # Check again if there is still capacity.
-                        self._free_list.append(cx)
-                        self._waiting_list.notify()
-                    else:
-                        # Otherwise, close the connection.
-                        cx.close()
+        with self._lock:
+            if cx in self._in_use:
+                self._in_use.remove(cx)
+                self._quarantine.add(cx)
+            elif cx in self._quarantine:
+                # Already being released, or sanitized on acquire.
+                return
+            elif cx in self._free_list:
+                raise ValueError("Connection is not in use")
             else:
-                # If the pool is full, simply close the connection.
-                cx.close()
-        elif cx in self._free_list:
-            raise ValueError("Connection is not in use")
-        elif cx in self._quarantine:
-            pass
-        else:
-            raise ValueError("Connection %r does not belong to this pool" % cx)
+                raise ValueError("Connection %r does not belong to this pool" % cx)
+            self._metrics.releases += 1
+            overfull = self.size > self.max_size
+        self._metrics._emit("release")
+        # Attempt to sanitize the connection, so that it can be
+        # returned to the pool, unless the pool has since shrunk.
+        healthy = not overfull and self._sanitize(cx, force_reset=force_reset)
+        with self._lock:
+            self._quarantine.discard(cx)
+            if healthy and self.size < self.max_size:
+                # Carry on only if sanitation succeeded and there is
+                # still capacity.
+                if self._waiting_list:
+                    self._in_use.add(cx)
+                    self._waiting_list.notify(cx)
+                else:
+                    self._free_list.append(cx)
+                return
+            # The slot left by a discarded connection can be filled by
+            # a new one.
+            self._notify_capacity()
+        if healthy or overfull:
+            # The connection is surplus to requirements.
+            cx.close()
+            self._discard(cx, "close")
 
     def prune(self):
-        """ Close all free connections.
+        """ Close all free connections, and any shared HTTP sockets
+        that have been idle for too long.
         """
-        self.__close(self._free_list)
+        with self._lock:
+            connections = list(self._free_list)
+            self._free_list.clear()
+        self.__close(connections)
+        if self._transport is not None:
+            self._transport.reap()
 
     def close(self):
         """ Close all connections immediately.
@@ -636,34 +902,48 @@ class ConnectionPool(object):
         rejected, and released connections will be closed instead
         of being returned to the pool.
         """
-        self.max_size = 0
-        self.prune()
-        self.__close(self._in_use_list)
-        self._waiting_list.notify()
-
-    @classmethod
-    def __close(cls, connections):
+        with self._lock:
+            self.max_size = 0
+            connections = list(self._free_list) + list(self._in_use)
+            self._free_list.clear()
+            self._in_use.clear()
+            self._waiting_list.notify_all(_RETRY)
+        self.__close(connections)
+        if self._transport is not None:
+            self._transport.close()
+
+    def __close(self, connections):
         """ Close all connections in the given list.
         """
-        closers = deque()
-        while True:
-            try:
-                cx = connections.popleft()
-            except IndexError:
-                break
-            else:
-                closers.append(cx.close)
-        for closer in closers:
-            closer()
+        for cx in connections:
+            cx.close()
+            self._discard(cx, "close")
 
 
 class Connector(object):
     """ A transaction manager and collection of connection pools linked
     to a remote Neo4j service.
+
+    A pool is kept for each server address in use. All work is carried
+    out against the server at the address in the connection profile,
+    unless the profile also lists the addresses of `readers` (such as
+    read replicas). In that case, read-only work is spread across the
+    readers, each time using the one with the fewest connections in use
+    and taking turns between those equally busy, while all other work
+    remains pinned to the primary server. Pools for readers are only
+    opened once first needed.
+
+    For a profile using one of the ``neo4j`` URI schemes, the readers
+    and writers are instead taken from the routing table of the
+    cluster, which is fetched from a router for each graph and cached
+    until it expires. A server that cannot be reached is removed from
+    the cached table, as is a writer that reports it is no longer the
+    leader, so that the table is refreshed before it is next needed.
     """
 
     @classmethod
-    def open(cls, profile=None, user_agent=None, init_size=None, max_size=None, max_age=None):
+    def open(cls, profile=None, user_agent=None, init_size=None, max_size=None, max_age=None,
+             acquire_wait_timeout=None, http_keep_alive=None, http_idle_timeout=None):
         """ Create a new connector.
 
         :param profile: a :class:`.ConnectionProfile` describing how to
@@ -678,11 +958,29 @@ class Connector(object):
         :param max_age: the maximum permitted age, in seconds, for
             connections to be retained within pools held by this
             connector
+        :param acquire_wait_timeout: the maximum time, in seconds, to
+            wait for a connection to become available when a pool is
+            full
+        :param http_keep_alive: the number of sockets to keep open for
+            reuse by the HTTP connections of each pool
+        :param http_idle_timeout: the time, in seconds, after which an
+            idle HTTP socket is closed
         """
-        return cls(profile, user_agent, init_size, max_size, max_age)
-
-    def __init__(self, profile, user_agent, init_size, max_size, max_age):
-        self._pool = ConnectionPool.open(profile, user_agent, init_size, max_size, max_age)
+        return cls(profile, user_agent, init_size, max_size, max_age, acquire_wait_timeout,
+                   http_keep_alive, http_idle_timeout)
+
+    def __init__(self, profile, user_agent, init_size, max_size, max_age,
+                 acquire_wait_timeout=None, http_keep_alive=None, http_idle_timeout=None):
+        self._http_settings = {"http_keep_alive": http_keep_alive,
+                               "http_idle_timeout": http_idle_timeout}
+        self._pool = ConnectionPool.open(profile, user_agent, init_size, max_size, max_age,
+                                         acquire_wait_timeout, **self._http_settings)
+        self._pools = {profile.address: self._pool}
+        self._pools_lock = Lock()
+        self._metrics = ConnectorMetrics(self._pools, self._pools_lock)
+        self._next_pool = 0
+        self._routing_tables = {}
+        self._routing_lock = RLock()
         self._transactions = {}
 
     def __repr__(self):
@@ -716,7 +1014,8 @@ class Connector(object):
 
     @max_size.setter
     def max_size(self, value):
-        self._pool.max_size = value
+        for pool in self.pools.values():
+            pool.max_size = value
 
     @property
     def max_age(self):
@@ -727,21 +1026,70 @@ class Connector(object):
 
     @property
     def acquire_wait_timeout(self):
+        """ The maximum time, in seconds, to wait for a connection to
+        become available when the pool is full.
+        """
         return self._pool.acquire_wait_timeout
 
+    @acquire_wait_timeout.setter
+    def acquire_wait_timeout(self, value):
+        for pool in self.pools.values():
+            pool.acquire_wait_timeout = value
+
+    @property
+    def pools(self):
+        """ A dictionary of the connection pools held by this
+        connector, keyed by server address.
+        """
+        with self._pools_lock:
+            return dict(self._pools)
+
     @property
     def in_use(self):
-        """ The number of connections in this pool that are currently
+        """ The number of connections in all pools that are currently
         in use.
         """
-        return self._pool.in_use
+        return sum(pool.in_use for pool in self.pools.values())
 
     @property
     def size(self):
         """ The total number of connections (both in-use and free)
-        currently owned by this connection pool.
+        currently owned by all pools.
+        """
+        return sum(pool.size for pool in self.pools.values())
+
+    @property
+    def metrics(self):
+        """ The :class:`.ConnectorMetrics` recorded across all pools
+        held by this connector.
+        """
+        return self._metrics
+
+    @property
+    def resets_sent(self):
+        """ The number of times a connection has been reset on being
+        acquired from, or released into, any pool.
+        """
+        return self._metrics.resets_sent
+
+    @property
+    def resets_avoided(self):
+        """ The number of times a connection has been acquired from, or
+        released into, any pool without needing to be reset.
+        """
+        return self._metrics.resets_avoided
+
+    def record_retry(self, delay):
+        """ Record the retry of a unit of work in the metrics of this
+        connector.
+        """
+        self._metrics._record_retry(delay)
+
+    def record_give_up(self):
+        """ Record, in the metrics of this connector, that a unit of
+        work will not be retried again.
         """
-        return self._pool.size
+        self._metrics._record_give_up()
 
     def acquire(self, graph_name=None, readonly=False, force_reset=False):
         """ Acquire a connection from the pool.
@@ -758,17 +1106,153 @@ class Connector(object):
         connection. This will be the case if the pool has been closed.
 
         :param graph_name:
-        :param readonly:
+        :param readonly: if true, and the profile lists any readers,
+            the connection will be acquired from the pool for one of
+            those; otherwise, it is acquired from the pool for the
+            primary server (for routed profiles, the readers and
+            writers are taken from the routing table instead)
         :param force_reset: if true, the connection will be forcibly
             reset before being returned; if false, this will only occur
             if the connection is not already in a clean state
         :return: a Bolt connection object
+        :raise RoutingError: if a routed profile is in use, and no
+            router or no suitable server can be reached
         """
-        cx = self._pool.acquire(graph_name, readonly, force_reset)
+        if self.profile.routing:
+            return self._acquire_routed(graph_name, readonly, force_reset)
+        if readonly and self.profile.readers:
+            pool = self._select_pool(self.profile.readers)
+        else:
+            pool = self._pool
+        return self._acquire_from(pool, graph_name, readonly, force_reset)
+
+    def _acquire_from(self, pool, graph_name=None, readonly=False, force_reset=False):
+        cx = pool.acquire(graph_name, readonly, force_reset)
         if cx:
             cx.pool = self
         return cx
 
+    def _acquire_routed(self, graph_name, readonly, force_reset):
+        """ Acquire a connection to a reader or writer listed in the
+        routing table for a graph. Each server that cannot be reached
+        is removed from the table, and another tried in its place.
+        """
+        tried = set()
+        while True:
+            table = self.routing_table(graph_name, readonly)
+            addresses = [address for address in (table.readers if readonly else table.writers)
+                         if address not in tried]
+            if not addresses:
+                raise RoutingError("Unable to connect to any %s for graph %r" % (
+                    "reader" if readonly else "writer", graph_name))
+            pool = self._select_pool(addresses)
+            address = pool.profile.address
+            try:
+                return self._acquire_from(pool, graph_name, readonly, force_reset)
+            except OSError as error:
+                log.debug("Unable to connect to %r (%s)", address, error)
+                tried.add(address)
+                self._deactivate(graph_name, address)
+
+    def _select_pool(self, addresses):
+        """ Select the pool for the server with the fewest connections
+        in use, taking turns between servers that are equally busy.
+        Pools are opened for servers as they are first selected.
+        """
+        with self._pools_lock:
+            first = self._next_pool
+            self._next_pool = first + 1
+            selected = None
+            for i in range(len(addresses)):
+                pool = self._pool_for(addresses[(first + i) % len(addresses)])
+                if selected is None or pool.in_use < selected.in_use:
+                    selected = pool
+            return selected
+
+    def _pool_for(self, address):
+        """ Return the pool for a server address, creating it if need
+        be. This must be called with the pool lock held.
+        """
+        try:
+            return self._pools[address]
+        except KeyError:
+            pool = self._pools[address] = ConnectionPool(
+                self.profile.with_address(address), self.user_agent,
+                self._pool.max_size, self._pool.max_age, self._pool.acquire_wait_timeout,
+                **self._http_settings)
+            self._metrics._attach(pool.metrics)
+            return pool
+
+    def routing_table(self, graph_name=None, readonly=False):
+        """ Return the routing table for a graph, fetching a new one
+        if none is cached, or if the one cached has expired or no
+        longer lists any routers or servers for the kind of work given.
+
+        :param graph_name: name of the graph, or :const:`None` for the
+            default graph
+        :param readonly: true if the table will be used to select a
+            reader, false for a writer
+        :return: a :class:`.RoutingTable`
+        :raise RoutingError: if no router can supply a routing table
+        """
+        with self._routing_lock:
+            table = self._routing_tables.get(graph_name)
+            if table is None or not table.is_fresh(readonly):
+                table = self._routing_tables[graph_name] = self._fetch_routing_table(
+                    graph_name, table)
+            return table
+
+    def _fetch_routing_table(self, graph_name, table=None):
+        """ Fetch a routing table from the first router able to supply
+        one, trying those listed in the previous table before the
+        server at the address in the connection profile.
+        """
+        routers = list(table.routers) if table else []
+        if self.profile.address not in routers:
+            routers.append(self.profile.address)
+        for address in routers:
+            with self._pools_lock:
+                pool = self._pool_for(address)
+            cx = None
+            try:
+                cx = self._acquire_from(pool, readonly=True)
+                table = RoutingTable.fetch(cx, graph_name)
+            except OSError as error:
+                log.debug("Unable to fetch routing table from %r (%s)", address, error)
+                if cx is not None:
+                    pool.release(cx)
+            else:
+                log.debug("Fetched routing table %r from %r", table, address)
+                return table
+        raise RoutingError("Unable to fetch routing table for graph %r" % graph_name)
+
+    def _deactivate(self, graph_name, address):
+        """ Remove a server that cannot be reached from the routing
+        table for a graph, and close any free connections to it.
+        """
+        with self._routing_lock:
+            table = self._routing_tables.get(graph_name)
+            if table is not None:
+                table.remove(address)
+        pool = self.pools.get(address)
+        if pool is not None:
+            pool.prune()
+
+    def _audit_routing(self, cx, graph_name, error):
+        """ Update the routing table for a graph following an error
+        raised by a routed connection.
+        """
+        if not self.profile.routing:
+            return
+        address = cx.profile.address
+        if isinstance(error, OSError):
+            self._deactivate(graph_name, address)
+        elif getattr(error, "code", None) in WRITE_FAILURE_CODES:
+            with self._routing_lock:
+                table = self._routing_tables.get(graph_name)
+                if table is not None:
+                    table.remove_writer(address)
+
     def release(self, cx, force_reset=False):
         """ Release a Bolt connection, putting it back into the pool
         if the connection is healthy and the pool is not already at
@@ -782,12 +1266,16 @@ class Connector(object):
         :raise ValueError: if the connection is not currently in use,
             or if it does not belong to this pool
         """
-        return self._pool.release(cx, force_reset)
+        pool = self.pools.get(cx.profile.address)
+        if pool is None:
+            raise ValueError("Connection %r does not belong to this connector" % cx)
+        return pool.release(cx, force_reset)
 
     def prune(self):
         """ Close all free connections.
         """
-        return self._pool.prune()
+        for pool in self.pools.values():
+            pool.prune()
 
     def close(self):
         """ Close all connections immediately.
@@ -811,7 +1299,8 @@ class Connector(object):
         rejected, and released connections will be closed instead
         of being returned to the pool.
         """
-        return self._pool.close()
+        for pool in self.pools.values():
+            pool.close()
 
     def reacquire(self, tx):
         """ Lookup and return the connection bound to this
@@ -844,37 +1333,81 @@ class Connector(object):
 
     def begin(self, graph_name, readonly=False, after=None, metadata=None, timeout=None):
         cx = self.acquire(graph_name, readonly=readonly)
-        return cx.begin(graph_name, after=after, metadata=metadata, timeout=timeout)
+        return cx.begin(graph_name, readonly=readonly, after=after, metadata=metadata,
+                        timeout=timeout)
 
     def commit(self, tx):
-        return self.reacquire(tx).commit(tx)
+        cx = self.reacquire(tx)
+        try:
+            return cx.commit(tx)
+        except Exception as error:
+            self._audit_routing(cx, tx.graph_name, error)
+            raise
 
     def rollback(self, tx):
         return self.reacquire(tx).rollback(tx)
 
-    def auto_run(self, graph_name, cypher, parameters=None, hydrant=None, readonly=False):
+    def auto_run(self, graph_name, cypher, parameters=None, hydrant=None, readonly=False,
+                 fetch_size=None):
         cx = self.acquire(graph_name, readonly)
-        if hydrant:
-            parameters = hydrant.dehydrate(parameters, version=cx.protocol_version)
-        result = cx.auto_run(graph_name, cypher, parameters)
-        cx.pull(result)
-        cx.sync(result)
+        try:
+            if hydrant:
+                parameters = hydrant.dehydrate(parameters, version=cx.protocol_version)
+            result = cx.auto_run(graph_name, cypher, parameters, readonly=readonly)
+            self._pull(cx, result, fetch_size)
+            cx.sync(result)
+        except Exception as error:
+            self._audit_routing(cx, graph_name, error)
+            raise
         return result
 
-    def run_in_tx(self, tx, cypher, parameters=None, hydrant=None):
+    def run_in_tx(self, tx, cypher, parameters=None, hydrant=None, pipelined=False,
+                  fetch_size=None):
+        """ Run a query within a transaction.
+
+        If `pipelined` is true, the requests for the query are queued
+        on the connection instead of being sent straight away. They
+        are then sent, along with any others queued before them, when
+        the result is first accessed or the transaction is completed.
+        """
         cx = self.reacquire(tx)
-        if hydrant:
-            parameters = hydrant.dehydrate(parameters, version=cx.protocol_version)
-        result = cx.run_in_tx(tx, cypher, parameters)
-        cx.pull(result)
-        cx.sync(result)  # TODO: avoid sync on every tx.run
+        try:
+            if hydrant:
+                parameters = hydrant.dehydrate(parameters, version=cx.protocol_version)
+            result = cx.run_in_tx(tx, cypher, parameters)
+            self._pull(cx, result, fetch_size)
+            if not pipelined:
+                cx.sync(result)
+        except Exception as error:
+            self._audit_routing(cx, tx.graph_name, error)
+            raise
         return result
 
+    def _pull(self, cx, result, fetch_size=None):
+        """ Pull the first batch of records for a result, or all of
+        them if the connection cannot pull records in batches.
+        """
+        if fetch_size is None:
+            fetch_size = self.profile.fetch_size
+        if cx.supports_fetch_size():
+            result.fetch_size = fetch_size
+            cx.pull(result, n=fetch_size)
+        else:
+            cx.pull(result)
+
     def _show_databases(self):
         cx = self.acquire("system", readonly=True)
-        result = cx.auto_run("system", "SHOW DATABASES")
+        try:
+            result = cx.auto_run("system", "SHOW DATABASES")
+        except TypeError:
+            # Multiple databases are not supported by this server
+            self.release(cx)
+            raise
         cx.pull(result)
         cx.sync(result)
+        # Read the result in full, as callers may stop early, and a
+        # streamed result would otherwise hold on to its connection.
+        result.buffer()
         return result
 
     def graph_names(self):
@@ -904,23 +1437,86 @@ class Connector(object):
             return None
 
 
-class WaitingList:
+class WaitingList(object):
+    """ A first-in-first-out queue of threads waiting to acquire a
+    connection from a pool.
 
-    def __init__(self):
+    Each waiter blocks on a condition of its own, built on the lock
+    that guards the pool, and is woken by being handed a value. All
+    methods must be called with that lock held.
+    """
+
+    def __init__(self, lock):
+        self._lock = lock
         self._wait_list = deque()
 
+    def __len__(self):
+        return len(self._wait_list)
+
+    def __bool__(self):
+        return bool(self._wait_list)
+
+    __nonzero__ = __bool__
+
     def wait(self, timeout=None):
-        event = Event()
-        self._wait_list.append(event)
-        return event.wait(timeout)
+        """ Join the back of the queue and wait to be handed a value.
+
+        :return: the value handed over, or :const:`None` if the
+            timeout expired first
+        """
+        waiter = _Waiter(Condition(self._lock))
+        self._wait_list.append(waiter)
+        deadline = None if timeout is None else perf_counter() + timeout
+        while not waiter.notified:
+            remaining = None if deadline is None else deadline - perf_counter()
+            if remaining is not None and remaining <= 0:
+                self._wait_list.remove(waiter)
+                return None
+            waiter.condition.wait(remaining)
+        return waiter.value
 
-    def notify(self):
+    def notify(self, value):
+        """ Hand a value to the waiter at the front of the queue, if
+        there is one.
+
+        :return: true if a waiter was notified, false otherwise
+        """
         try:
-            event = self._wait_list.popleft()
+            waiter = self._wait_list.popleft()
         except IndexError:
-            pass
+            return False
         else:
-            event.set()
+            waiter.notify(value)
+            return True
+
+    def notify_all(self, value):
+        """ Hand the same value to every waiter in the queue.
+        """
+        while self.notify(value):
+            pass
+
+
+class _Waiter(object):
+
+    __slots__ = ["condition", "notified", "value"]
+
+    def __init__(self, condition):
+        self.condition = condition
+        self.notified = False
+        self.value = None
+
+    def notify(self, value):
+        self.value = value
+        self.notified = True
+        self.condition.notify()
+
+
+#: Handed to a waiting acquirer that may open a new connection, in a
+#: slot already reserved within the pool.
+_OPEN = object()
+
+#: Handed to waiting acquirers when the pool is closed.
+_RETRY = object()
 
 
 class Transaction(object):
@@ -954,13 +1550,55 @@ class Result(object):
     def query_id(self):
         return None
 
+    @property
+    def autocommit(self):
+        """ Flag indicating whether this result belongs to an
+        auto-commit transaction, rather than an explicit one.
+        """
+        return False
+
+    def has_more(self):
+        """ Flag to indicate whether the server holds further records
+        for this result, beyond those pulled so far.
+        """
+        return False
+
     @property
     def protocol_version(self):
         return None
 
+    @property
+    def lazy_records(self):
+        """ Flag indicating whether the values of each record are
+        returned in packed form, to be unpacked only when accessed.
+        """
+        return False
+
+    #: Number of records pulled from the server in each batch, or -1
+    #: if all records are pulled at once.
+    fetch_size = -1
+
+    def pack_records(self):
+        """ Request that the values of records taken from now on be
+        returned in packed form, as :class:`.PackedList` objects,
+        whatever the connection profile says. Results that do not
+        receive PackStream data ignore this request.
+        """
+
     def buffer(self):
         raise NotImplementedError
 
+    def discard(self, sync=True):
+        """ Drop all remaining records for this result, without
+        hydrating them, and tell the server to stop streaming any
+        that it still holds.
+
+        :param sync: if false, records still to arrive are dropped as
+            they are received, instead of being cancelled by an
+            immediate exchange with the server
+        """
+        raise NotImplementedError
+
     def fields(self):
         raise NotImplementedError
 
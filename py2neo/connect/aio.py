@@ -0,0 +1,801 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Asynchronous Bolt connections, and a pool of them, for use with
+:mod:`asyncio`.
+
+Messages are encoded, decoded and tracked by exactly the same protocol
+objects as are used by the blocking client in :mod:`py2neo.connect.bolt`.
+Only the network I/O differs. Outgoing messages are buffered by an
+:class:`.AsyncWire` and flushed to an asyncio stream, while incoming
+data is received in bulk and handed over to the protocol object one
+whole message at a time, so that reading a message never blocks.
+
+This module requires Python 3.5 or above.
+"""
+
+
+from asyncio import get_event_loop, open_connection, wait_for, TimeoutError
+from collections import deque
+from logging import getLogger, DEBUG
+from socket import SOL_SOCKET, SO_KEEPALIVE
+
+from py2neo.connect import Address, Failure, TransactionError
+from py2neo.connect.bolt import Bolt
+from py2neo.connect.metrics import PoolMetrics
+from py2neo.connect.wire import ssl_context
+from py2neo.internal.compat import perf_counter
+
+
+log = getLogger(__name__)
+
+
+class AsyncWire(object):
+    """ Buffer for data sent and received over an asyncio stream.
+
+    This presents the same synchronous interface for reading and
+    writing as :class:`.Wire`, so that it can be used by the same
+    message reader and writer. Reads are only ever served from data
+    already received however, so each incoming message must first be
+    awaited through :meth:`.receive`.
+    """
+
+    #: Default size of the receive buffer, in bytes.
+    default_buffer_size = 65536
+
+    __closed = False
+
+    __broken = False
+
+    def __init__(self, reader, writer, buffer_size=None):
+        self.__reader = reader
+        self.__writer = writer
+        self.__input = bytearray(buffer_size or self.default_buffer_size)
+        self.__input_view = memoryview(self.__input)
+        self.__input_start = 0
+        self.__input_end = 0
+        self.__scan_start = 0
+        self.__messages = 0
+        self.__output = bytearray()
+
+    async def __receive(self):
+        """ Receive more data into the input buffer, making room for
+        it first if the buffer is full.
+        """
+        start = self.__input_start
+        end = self.__input_end
+        capacity = len(self.__input)
+        if end == capacity:
+            unread = end - start
+            if 2 * unread > capacity:
+                # A single message is taking up most of the buffer,
+                # so move it into a bigger one.
+                self.__input = bytearray(2 * capacity)
+                self.__input[:unread] = self.__input_view[start:end]
+                self.__input_view = memoryview(self.__input)
+            else:
+                self.__input[:unread] = self.__input[start:end]
+            self.__scan_start -= start
+            self.__input_start = 0
+            self.__input_end = end = unread
+        try:
+            data = await self.__reader.read(len(self.__input) - end)
+        except OSError:
+            self.__broken = True
+            raise
+        if not data:
+            self.__broken = True
+            raise OSError("Network read incomplete")
+        self.__input_end = end + len(data)
+        self.__input[end:self.__input_end] = data
+
+    def __scan(self):
+        """ Count the whole messages received since the last scan,
+        by walking over their chunk headers.
+        """
+        data = self.__input
+        end = self.__input_end
+        p = self.__scan_start
+        while True:
+            q = p
+            size = 0
+            while True:
+                if q + 2 > end:
+                    self.__scan_start = p
+                    return
+                chunk_size = data[q] << 8 | data[q + 1]
+                q += 2 + chunk_size
+                if chunk_size == 0:
+                    break
+                size += chunk_size
+            if size:
+                # Empty chunks between messages are not counted.
+                self.__messages += 1
+            p = q
+
+    async def receive(self):
+        """ Wait until a whole message has been received, which can
+        then be read without blocking.
+        """
+        while not self.__messages:
+            self.__scan()
+            if not self.__messages:
+                await self.__receive()
+        self.__messages -= 1
+
+    async def receive_exactly(self, n):
+        """ Wait for, and then read, exactly `n` bytes that do not
+        form part of a message, such as the handshake response.
+        """
+        while self.__input_end - self.__input_start < n:
+            await self.__receive()
+        data = self.read(n)
+        self.__scan_start = self.__input_start
+        return data
+
+    def __check(self, n):
+        if self.__input_end - self.__input_start < n:
+            raise RuntimeError("Read of %d bytes would block" % n)
+
+    def read(self, n):
+        """ Read exactly `n` bytes, returning a copy of the data.
+        """
+        self.__check(n)
+        p = self.__input_start
+        q = p + n
+        self.__input_start = q
+        return self.__input[p:q]
+
+    def read_view(self, n):
+        """ Read exactly `n` bytes, returning a memoryview onto the
+        input buffer instead of a copy. The view (and any views
+        derived from it) must be discarded before the next receive.
+        """
+        self.__check(n)
+        p = self.__input_start
+        q = p + n
+        self.__input_start = q
+        return self.__input_view[p:q]
+
+    def write(self, b):
+        self.__output.extend(b)
+
+    def send(self):
+        """ Pass all buffered output to the stream, without waiting
+        for it to be sent.
+        """
+        if self.__closed:
+            raise OSError("Closed")
+        size = len(self.__output)
+        if size:
+            try:
+                self.__writer.write(self.__output)
+            except (OSError, RuntimeError) as error:
+                self.__broken = True
+                raise OSError(error)
+            self.__output = bytearray()
+        return size
+
+    async def drain(self):
+        """ Pass all buffered output to the stream, and wait until
+        the stream is ready to accept more.
+        """
+        sent = self.send()
+        try:
+            await self.__writer.drain()
+        except OSError:
+            self.__broken = True
+            raise
+        return sent
+
+    def close(self):
+        try:
+            self.__writer.close()
+        except RuntimeError as error:
+            # The event loop has already been closed.
+            self.__broken = True
+            raise OSError(error)
+        else:
+            self.__closed = True
+
+    @property
+    def closed(self):
+        return self.__closed
+
+    @property
+    def broken(self):
+        return self.__broken
+
+    @property
+    def local_address(self):
+        return Address(self.__writer.get_extra_info("sockname"))
+
+    @property
+    def remote_address(self):
+        return Address(self.__writer.get_extra_info("peername"))
+
+
+class AsyncBolt(object):
+    """ An asynchronous Bolt connection.
+
+    This wraps one of the protocol objects defined in
+    :mod:`py2neo.connect.bolt`, which writes requests and processes
+    responses, over an :class:`.AsyncWire`. Operations that need to
+    wait for a response from the server are coroutines; those that
+    only write requests are ordinary methods.
+    """
+
+    #: The :class:`.AsyncConnectionPool` to which this connection
+    #: belongs, if any.
+    pool = None
+
+    @classmethod
+    async def open(cls, profile, user_agent=None):
+        log.debug("[#%04X] C: <DIAL> '%s'", 0, profile.address)
+        if profile.secure:
+            reader, writer = await open_connection(
+                profile.host, profile.port_number,
+                ssl=ssl_context(profile.verify, profile.host), server_hostname=profile.host)
+        else:
+            reader, writer = await open_connection(profile.host, profile.port_number)
+        s = writer.get_extra_info("socket")
+        if s is not None:
+            s.setsockopt(SOL_SOCKET, SO_KEEPALIVE, 1)
+        wire = AsyncWire(reader, writer)
+        local_port = wire.local_address.port_number
+        log.debug("[#%04X] S: <ACCEPT>", local_port)
+        wire.write(Bolt._handshake_request(local_port))
+        await wire.drain()
+        protocol_version = Bolt._handshake_response(local_port, await wire.receive_exactly(4))
+        cx = cls(Bolt._new(wire, profile, protocol_version, user_agent))
+        await cx._hello()
+        return cx
+
+    def __init__(self, bolt):
+        self._bolt = bolt
+        self._wire = bolt._wire
+
+    def __repr__(self):
+        return "<%s [#%04X] protocol_version=%r>" % (
+            self.__class__.__name__, self.local_port, self.protocol_version)
+
+    @property
+    def profile(self):
+        return self._bolt.profile
+
+    @property
+    def user_agent(self):
+        return self._bolt.user_agent
+
+    @property
+    def protocol_version(self):
+        return self._bolt.protocol_version
+
+    @property
+    def server_agent(self):
+        return self._bolt.server_agent
+
+    @property
+    def connection_id(self):
+        return self._bolt.connection_id
+
+    @property
+    def closed(self):
+        return self._bolt.closed
+
+    @property
+    def broken(self):
+        return self._bolt.broken
+
+    @property
+    def local_port(self):
+        return self._bolt.local_port
+
+    @property
+    def age(self):
+        """ The age of this connection in seconds.
+        """
+        return self._bolt.age
+
+    def close(self):
+        self._bolt.close()
+
+    def supports_fetch_size(self):
+        return self._bolt.supports_fetch_size()
+
+    async def _hello(self):
+        bolt = self._bolt
+        bolt._assert_open()
+        response = bolt._write_hello()
+        await self._sync(response)
+        await self._audit(response)
+        bolt._on_hello(response)
+
+    @property
+    def state(self):
+        return self._bolt.state
+
+    async def reset(self, force=False, pipelined=False):
+        bolt = self._bolt
+        bolt._assert_open()
+        if force or bolt.state != "idle":
+            response = bolt._write_reset()
+            if pipelined:
+                await self._send()
+            else:
+                await self._sync(response)
+                await self._audit(response)
+            return True
+        else:
+            return False
+
+    def auto_run(self, graph_name, cypher, parameters=None,
+                 readonly=False, after=None, metadata=None, timeout=None):
+        return self._bolt.auto_run(graph_name, cypher, parameters,
+                                   readonly, after, metadata, timeout)
+
+    async def begin(self, graph_name, readonly=False, after=None, metadata=None, timeout=None):
+        bolt = self._bolt
+        responses = bolt._write_begin(graph_name, readonly, after, metadata, timeout)
+        tx = bolt._transaction
+        if after:
+            await self._sync(*responses)
+            await self._audit(tx)
+        return tx
+
+    async def commit(self, tx):
+        bolt = self._bolt
+        await self._assert_open_transaction(tx)
+        # Pull the remainder of any result still streaming (or
+        # discard it, if no longer wanted) so that all records
+        # remain available after the transaction ends.
+        await self._send()
+        for result in tx.items():
+            await self._wait(result.last())
+            if result.has_more():
+                if result.discarded():
+                    bolt.discard(result)
+                else:
+                    bolt.pull(result)
+        responses = bolt._write_commit(tx)
+        await self._sync(*responses)
+        await self._audit(tx)
+        return bolt._bookmark(responses)
+
+    async def rollback(self, tx):
+        bolt = self._bolt
+        await self._assert_open_transaction(tx)
+        responses = bolt._write_rollback(tx)
+        await self._sync(*responses)
+        await self._audit(tx)
+        return bolt._bookmark(responses)
+
+    def run_in_tx(self, tx, cypher, parameters=None):
+        if tx.failed():
+            raise TransactionError("Transaction %r has failed", tx)
+        return self._bolt.run_in_tx(tx, cypher, parameters)
+
+    def pull(self, result, n=-1, capacity=-1):
+        return self._bolt.pull(result, n, capacity)
+
+    def discard(self, result, n=-1):
+        return self._bolt.discard(result, n)
+
+    async def sync(self, result):
+        await self._send()
+        await self._wait(result.last())
+        await self._audit(result)
+
+    async def buffer(self, result):
+        """ Wait for all records for a result to be received, pulling
+        any that remain on the server.
+        """
+        if not result.done():
+            await self.sync(result)
+        while result.has_more():
+            self._bolt.pull(result)
+            await self.sync(result)
+
+    async def fetch(self, result):
+        record = await self._fetch(result)
+        while record is None and result.has_more():
+            self._bolt.pull(result, result.fetch_size)
+            record = await self._fetch(result)
+        return record
+
+    async def _fetch(self, result):
+        if not result.has_records() and not result.done():
+            await self._send()
+            last = result.last()
+            responses = self._bolt._responses
+            while responses and responses[0] is not last:
+                await self._wait(responses[0])
+            await self._wait(last)
+            await self._audit(result)
+        record = result.take_record()
+        if record is None:
+            await self._audit(result)
+        return record
+
+    async def release(self):
+        if self.pool is not None:
+            await self.pool.release(self)
+
+    async def _assert_open_transaction(self, tx):
+        # A failure will already have caused this connection to be
+        # released, so this is checked before handing over to the
+        # protocol object, which would otherwise try to reset it.
+        if tx.failed():
+            await self._audit(tx)
+            raise TransactionError("Transaction %r has failed", tx)
+        self._bolt._assert_open_transaction(tx)
+
+    async def _send(self):
+        sent = await self._wire.drain()
+        if sent:
+            log.debug("[#%04X] C: <SENT %r bytes>", self.local_port, sent)
+
+    async def _wait(self, response):
+        """ Receive and process all incoming responses up to and
+        including a particular response.
+        """
+        bolt = self._bolt
+        receive = self._wire.receive
+        debug = log.isEnabledFor(DEBUG)
+        while not response.full() and not response.done():
+            await receive()
+            bolt._fetch_message(debug)
+            if not bolt._transaction and not bolt._responses:
+                await self.release()
+
+    async def _sync(self, *responses):
+        await self._send()
+        for response in responses:
+            await self._wait(response)
+
+    async def _audit(self, task):
+        try:
+            task.audit()
+        except Failure:
+            await self.reset(force=True)
+            raise
+
+
+class AsyncConnectionPool(object):
+    """ A pool of asynchronous connections to a remote Neo4j service.
+
+    This works in the same way as :class:`.ConnectionPool`, except that
+    acquiring and releasing connections are coroutines, and waiting for
+    a connection to become free does not block the event loop.
+    """
+
+    default_init_size = 1
+
+    default_max_size = 100
+
+    default_max_age = 3600
+
+    default_acquire_wait_timeout = 30
+
+    @classmethod
+    async def open(cls, profile, user_agent=None, init_size=None, max_size=None, max_age=None,
+                   acquire_wait_timeout=None):
+        """ Create a new connection pool, with an option to seed one
+        or more initial connections.
+
+        :param profile: a :class:`.ConnectionProfile` describing how to
+            connect to the remote service for which this pool operates
+        :param user_agent: a user agent string identifying the client
+            software
+        :param init_size: the number of seed connections to open
+        :param max_size: the maximum permitted number of simultaneous
+            connections that may be owned by this pool, both in-use and
+            free
+        :param max_age: the maximum permitted age, in seconds, for
+            connections to be retained in this pool
+        :param acquire_wait_timeout: the maximum time, in seconds, to
+            wait for a connection to become available when the pool is
+            full
+        """
+        pool = cls(profile, user_agent, max_size, max_age, acquire_wait_timeout)
+        seeds = [await pool.acquire() for _ in range(init_size or cls.default_init_size)]
+        for seed in seeds:
+            await pool.release(seed)
+        return pool
+
+    def __init__(self, profile, user_agent, max_size, max_age, acquire_wait_timeout=None):
+        self._profile = profile
+        self._user_agent = user_agent
+        self._max_size = max_size or self.default_max_size
+        self._max_age = max_age or self.default_max_age
+        self._acquire_wait_timeout = acquire_wait_timeout or self.default_acquire_wait_timeout
+        self._opening = 0
+        self._in_use = set()
+        self._quarantine = set()
+        self._free_list = deque()
+        self._waiting_list = AsyncWaitingList()
+        self._metrics = PoolMetrics()
+
+    def __repr__(self):
+        return "<{} profile={!r} [{}{}{}]>".format(
+            self.__class__.__name__,
+            self.profile,
+            "|" * len(self._in_use),
+            "." * len(self._free_list),
+            " " * (self.max_size - self.size),
+        )
+
+    @property
+    def profile(self):
+        """ The connection profile for which this pool operates.
+        """
+        return self._profile
+
+    @property
+    def user_agent(self):
+        """ The user agent for connections in this pool.
+        """
+        return self._user_agent
+
+    @property
+    def max_size(self):
+        """ The maximum permitted number of simultaneous connections
+        that may be owned by this pool, both in-use and free.
+        """
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value):
+        old_value = self._max_size
+        self._max_size = value
+        if value > old_value:
+            self._waiting_list.notify()
+
+    @property
+    def max_age(self):
+        """ The maximum permitted age, in seconds, for connections to
+        be retained in this pool.
+        """
+        return self._max_age
+
+    @property
+    def acquire_wait_timeout(self):
+        """ The maximum time, in seconds, to wait for a connection to
+        become available when the pool is full.
+        """
+        return self._acquire_wait_timeout
+
+    @acquire_wait_timeout.setter
+    def acquire_wait_timeout(self, value):
+        self._acquire_wait_timeout = value
+
+    @property
+    def in_use(self):
+        """ The number of connections in this pool that are currently
+        in use.
+        """
+        return len(self._in_use)
+
+    @property
+    def size(self):
+        """ The total number of connections currently owned by this
+        connection pool. As well as those in use and those free, this
+        includes connections still being opened or being reset, so
+        that other tasks cannot overfill the pool in the meantime.
+        """
+        return (len(self._in_use) + len(self._free_list) +
+                len(self._quarantine) + self._opening)
+
+    @property
+    def metrics(self):
+        """ The :class:`.PoolMetrics` recorded for this pool.
+        """
+        return self._metrics
+
+    @property
+    def resets_sent(self):
+        """ The number of times a connection has been reset on being
+        acquired from, or released into, this pool.
+        """
+        return self._metrics.resets_sent
+
+    @property
+    def resets_avoided(self):
+        """ The number of times a connection has been acquired from, or
+        released into, this pool without needing to be reset, as it was
+        already idle.
+        """
+        return self._metrics.resets_avoided
+
+    async def _sanitize(self, cx, force_reset=False):
+        """ Attempt to clean up a connection, such that it can be
+        reused, returning :const:`None` if it is broken, closed or
+        expired.
+        """
+        if cx.broken or cx.closed:
+            self._discard(cx, "break")
+            return None
+        expired = self.max_age is not None and cx.age > self.max_age
+        if expired:
+            cx.close()
+            self._discard(cx, "expire")
+            return None
+        self._quarantine.add(cx)
+        if await cx.reset(force=force_reset, pipelined=True):
+            self._metrics.resets_sent += 1
+        else:
+            self._metrics.resets_avoided += 1
+        self._quarantine.remove(cx)
+        return cx
+
+    def _discard(self, cx, event):
+        lifetime = cx.age
+        if event == "break":
+            self._metrics.breakages += 1
+        elif event == "expire":
+            self._metrics.expirations += 1
+        self._metrics.lifetime.observe(lifetime)
+        self._metrics._emit(event, lifetime)
+
+    async def acquire(self, graph_name=None, readonly=False, force_reset=False):
+        """ Acquire a connection from the pool.
+
+        This returns a free connection if there is one, or otherwise
+        opens a new connection if the pool is not full. If the pool is
+        full, this waits until a connection is released.
+
+        :param graph_name:
+        :param readonly:
+        :param force_reset: if true, the connection will be forcibly
+            reset before being returned; if false, this will only occur
+            if the connection is not already in a clean state
+        :return: an :class:`.AsyncBolt` connection object, or
+            :const:`None` if the pool has been closed
+        """
+        log.debug("Acquiring connection from pool %r", self)
+        cx = None
+        waited = 0.0
+        while cx is None or cx.broken or cx.closed:
+            if self.max_size == 0:
+                return None
+            try:
+                cx = self._free_list.popleft()
+            except IndexError:
+                if self.size < self.max_size:
+                    self._opening += 1
+                    try:
+                        cx = await AsyncBolt.open(self.profile, user_agent=self.user_agent)
+                    finally:
+                        self._opening -= 1
+                    cx.pool = self
+                    self._metrics.creations += 1
+                    self._metrics._emit("create")
+                else:
+                    log.debug("Joining waiting list")
+                    t0 = perf_counter()
+                    notified = await self._waiting_list.wait(self.acquire_wait_timeout)
+                    waited += perf_counter() - t0
+                    if not notified:
+                        self._metrics.timeouts += 1
+                        self._metrics.wait_time.observe(waited)
+                        self._metrics._emit("timeout", waited)
+                        raise RuntimeError("Unable to acquire connection")
+            else:
+                cx = await self._sanitize(cx, force_reset=force_reset)
+        self._in_use.add(cx)
+        self._metrics.acquires += 1
+        if waited:
+            self._metrics.wait_time.observe(waited)
+        self._metrics._emit("acquire", waited)
+        return cx
+
+    async def release(self, cx, force_reset=False):
+        """ Release a connection, putting it back into the pool if the
+        connection is healthy and the pool is not already at capacity.
+
+        :param cx: the connection to release
+        :param force_reset: if true, the connection will be forcibly
+            reset before being released back into the pool; if false,
+            this will only occur if the connection is not already in a
+            clean state
+        :raise ValueError: if the connection is not currently in use,
+            or if it does not belong to this pool
+        """
+        log.debug("Releasing connection %r", cx)
+        if cx in self._in_use:
+            self._in_use.remove(cx)
+            self._metrics.releases += 1
+            self._metrics._emit("release")
+            if self.size < self.max_size:
+                if await self._sanitize(cx, force_reset=force_reset):
+                    if self.size < self.max_size:
+                        self._free_list.append(cx)
+                        self._waiting_list.notify()
+                    else:
+                        cx.close()
+                        self._discard(cx, "close")
+                else:
+                    # The slot left by a discarded connection can be
+                    # filled by a new one.
+                    self._waiting_list.notify()
+            else:
+                cx.close()
+                self._discard(cx, "close")
+        elif cx in self._free_list:
+            raise ValueError("Connection is not in use")
+        elif cx in self._quarantine:
+            pass
+        else:
+            raise ValueError("Connection %r does not belong to this pool" % cx)
+
+    def prune(self):
+        """ Close all free connections.
+        """
+        self.__close(self._free_list)
+
+    def close(self):
+        """ Close all connections immediately, and wake any tasks
+        waiting to acquire a connection.
+
+        As for :meth:`.ConnectionPool.close`, this sets the maximum
+        pool size to zero, which must be increased again before the
+        pool can be reused.
+        """
+        self.max_size = 0
+        self.prune()
+        self.__close(self._in_use)
+        self._waiting_list.notify_all()
+
+    def __close(self, connections):
+        closing = list(connections)
+        connections.clear()
+        for cx in closing:
+            cx.close()
+            self._discard(cx, "close")
+
+
+class AsyncWaitingList(object):
+
+    def __init__(self):
+        self._wait_list = deque()
+
+    async def wait(self, timeout=None):
+        future = get_event_loop().create_future()
+        self._wait_list.append(future)
+        try:
+            await wait_for(future, timeout)
+        except TimeoutError:
+            return False
+        else:
+            return True
+
+    def notify(self):
+        # Waiters that have since timed out are skipped, so that the
+        # notification is not lost.
+        while self._wait_list:
+            future = self._wait_list.popleft()
+            if not future.done():
+                future.set_result(None)
+                break
+
+    def notify_all(self):
+        while self._wait_list:
+            future = self._wait_list.popleft()
+            if not future.done():
+                future.set_result(None)
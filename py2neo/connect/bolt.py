@@ -18,7 +18,7 @@
 
 from collections import deque
 from itertools import islice
-from logging import getLogger
+from logging import getLogger, DEBUG
 from socket import socket, SOL_SOCKET, SO_KEEPALIVE
 
 from py2neo.meta import bolt_user_agent
@@ -64,11 +64,19 @@ class Bolt(Connection):
     def open(cls, profile, user_agent=None):
         wire = cls._connect(profile)
         protocol_version = cls._handshake(wire)
+        bolt = cls._new(wire, profile, protocol_version, user_agent)
+        bolt._hello()
+        return bolt
+
+    @classmethod
+    def _new(cls, wire, profile, protocol_version, user_agent=None):
+        """ Create a connection object for an agreed protocol version,
+        over a wire on which the handshake has been completed.
+        """
         subclass = cls._get_subclass(protocol_version)
         if subclass is None:
             raise RuntimeError("Unable to agree supported protocol version")
         bolt = subclass(wire, profile, (user_agent or bolt_user_agent()))
-        bolt._hello()
         bolt.__local_port = wire.local_address.port_number
         return bolt
 
@@ -89,15 +97,22 @@ class Bolt(Connection):
     @classmethod
     def _handshake(cls, wire):
         local_port = wire.local_address.port_number
+        wire.write(cls._handshake_request(local_port))
+        wire.send()
+        return cls._handshake_response(local_port, wire.read(4))
+
+    @classmethod
+    def _handshake_request(cls, local_port):
         log.debug("[#%04X] C: <BOLT>", local_port)
-        wire.write(b"\x60\x60\xB0\x17")
         versions = list(reversed(cls.protocol_catalogue()))[:4]
         log.debug("[#%04X] C: <PROTOCOL> %s",
                   local_port, " | ".join("%d.%d" % v for v in versions))
-        wire.write(b"".join(bytes(bytearray([0, 0, minor, major]))
-                            for major, minor in versions).ljust(16, b"\x00"))
-        wire.send()
-        v = bytearray(wire.read(4))
+        return b"\x60\x60\xB0\x17" + b"".join(bytes(bytearray([0, 0, minor, major]))
+                                               for major, minor in versions).ljust(16, b"\x00")
+
+    @classmethod
+    def _handshake_response(cls, local_port, data):
+        v = bytearray(data)
         log.debug("[#%04X] S: <PROTOCOL> %d.%d", local_port, v[-1], v[-2])
         return v[-1], v[-2]
 
@@ -150,15 +165,21 @@ class Bolt1(Bolt):
 
     def _hello(self):
         self._assert_open()
+        response = self._write_hello()
+        self._sync(response)
+        self._audit(response)
+        self._on_hello(response)
+
+    def _write_hello(self):
         extra = {"scheme": "basic",
                  "principal": self.profile.user,
                  "credentials": self.profile.password}
         clean_extra = dict(extra)
         clean_extra.update({"credentials": "*******"})
         log.debug("[#%04X] C: INIT %r %r", self.local_port, self.user_agent, clean_extra)
-        response = self._write_request(0x01, self.user_agent, extra, vital=True)
-        self._sync(response)
-        self._audit(response)
+        return self._write_request(0x01, self.user_agent, extra, vital=True)
+
+    def _on_hello(self, response):
         self.connection_id = response.metadata.get("connection_id")
         self.server_agent = response.metadata.get("server")
         if self.server_agent.startswith("Neo4j/"):
@@ -166,13 +187,40 @@ class Bolt1(Bolt):
         else:
             raise RuntimeError("Unexpected server agent {!r}".format(self.server_agent))
 
-    def reset(self, force=False):
+    @property
+    def state(self):
+        tx = self._transaction
+        if tx is None:
+            return "idle"
+        elif tx.failed():
+            return "failed"
+        elif not tx.complete():
+            return "transaction"
+        elif not tx.done():
+            return "streaming"
+        else:
+            return "idle"
+
+    def reset(self, force=False, pipelined=False):
         self._assert_open()
-        if force or self._transaction is not None:
-            log.debug("[#%04X] C: RESET", self.local_port)
-            response = self._write_request(0x0F, vital=True)
-            self._sync(response)
-            self._audit(response)
+        if force or self.state != "idle":
+            response = self._write_reset()
+            if pipelined:
+                self._send()
+            else:
+                self._sync(response)
+                self._audit(response)
+            return True
+        else:
+            return False
+
+    def _write_reset(self):
+        log.debug("[#%04X] C: RESET", self.local_port)
+        response = self._write_request(0x0F, vital=True)
+        # Any transaction held is ended by the reset, whether or not
+        # the response to it has yet been received.
+        self._transaction = None
+        return response
 
     def _begin(self, graph_name=None, readonly=False, after=None, metadata=None, timeout=None):
         self._assert_open()
@@ -193,39 +241,57 @@ class Bolt1(Bolt):
         return self._run(graph_name, cypher, parameters or {}, final=True)
 
     def begin(self, graph_name, readonly=False, after=None, metadata=None, timeout=None):
+        responses = self._write_begin(graph_name, readonly, after, metadata, timeout)
+        tx = self._transaction
+        if after:
+            self._sync(*responses)
+            self._audit(tx)
+        self._bind(tx)
+        return tx
+
+    def _write_begin(self, graph_name, readonly=False, after=None, metadata=None, timeout=None):
         self._begin(graph_name, readonly, after, metadata, timeout)
         log.debug("[#%04X] C: RUN 'BEGIN' %r", self.local_port, self._transaction.extra)
         log.debug("[#%04X] C: DISCARD_ALL", self.local_port)
-        responses = (self._write_request(0x10, "BEGIN", self._transaction.extra),
-                     self._write_request(0x2F))
-        if after:
-            self._sync(*responses)
-            self._audit(self._transaction)
-        self._bind()
-        return self._transaction
+        return (self._write_request(0x10, "BEGIN", self._transaction.extra),
+                self._write_request(0x2F))
 
     def commit(self, tx):
+        responses = self._write_commit(tx)
+        self._sync(*responses)
+        self._audit(tx)
+        self._unbind(tx)
+        return self._bookmark(responses)
+
+    def _write_commit(self, tx):
         self._assert_open()
         self._assert_open_transaction(tx)
         self._transaction.set_complete()
         log.debug("[#%04X] C: RUN 'COMMIT' {}", self.local_port)
         log.debug("[#%04X] C: DISCARD_ALL", self.local_port)
-        self._sync(self._write_request(0x10, "COMMIT", {}),
-                   self._write_request(0x2F))
-        self._audit(self._transaction)
-        self._unbind()
-        return Bookmark()
+        return (self._write_request(0x10, "COMMIT", {}),
+                self._write_request(0x2F))
 
     def rollback(self, tx):
+        responses = self._write_rollback(tx)
+        self._sync(*responses)
+        self._audit(tx)
+        self._unbind(tx)
+        return self._bookmark(responses)
+
+    def _write_rollback(self, tx):
         self._assert_open()
         self._assert_open_transaction(tx)
         self._transaction.set_complete()
         log.debug("[#%04X] C: RUN 'ROLLBACK' {}", self.local_port)
         log.debug("[#%04X] C: DISCARD_ALL", self.local_port)
-        self._sync(self._write_request(0x10, "ROLLBACK", {}),
-                   self._write_request(0x2F))
-        self._audit(self._transaction)
-        self._unbind()
+        return (self._write_request(0x10, "ROLLBACK", {}),
+                self._write_request(0x2F))
+
+    def _bookmark(self, responses):
+        """ Return the bookmark for a transaction, given the responses
+        to the requests that ended it.
+        """
         return Bookmark()
 
     def run_in_tx(self, tx, cypher, parameters=None):
@@ -236,7 +302,7 @@ class Bolt1(Bolt):
     def _run(self, graph_name, cypher, parameters, extra=None, final=False):
         log.debug("[#%04X] C: RUN %r %r", self.local_port, cypher, parameters)
         response = self._write_request(0x10, cypher, parameters)
-        result = BoltResult(graph_name, self, response)
+        result = BoltResult(graph_name, self, response, autocommit=final)
         self._transaction.append(result, final=final)
         return result
 
@@ -267,11 +333,17 @@ class Bolt1(Bolt):
 
     def fetch(self, result):
         if not result.has_records() and not result.done():
-            while self._responses[0] is not result.last():
+            # The requests for this result may still be queued, if
+            # they were pipelined behind others in a transaction.
+            self._send()
+            last = result.last()
+            while self._responses and self._responses[0] is not last:
                 self._wait(self._responses[0])
-            self._wait(result.last())
+            self._wait(last)
             self._audit(result)
         record = result.take_record()
+        if record is None:
+            self._audit(result)
         return record
 
     def _assert_no_transaction(self):
@@ -279,6 +351,12 @@ class Bolt1(Bolt):
             raise TransactionError("Bolt connection already holds transaction %r", self._transaction)
 
     def _assert_open_transaction(self, tx):
+        if tx.failed():
+            # A failure already received for a pipelined query will
+            # have caused this connection to be released and reset.
+            self._unbind(tx)
+            self._audit(tx)
+            raise TransactionError("Transaction %r has failed", tx)
         if self._transaction is not tx:
             raise TypeError("Transaction %r is not open on this connection", self._transaction)
 
@@ -308,45 +386,61 @@ class Bolt1(Bolt):
         This method calls fetch, but does not raise an exception on
         FAILURE.
         """
+        debug = log.isEnabledFor(DEBUG)
+        while not response.full() and not response.done():
+            self._fetch_message(debug)
+            if not self._transaction and not self._responses:
+                # With no transaction or response outstanding, the
+                # connection can be released.
+                self.release()
+
+    def _fetch_message(self, debug=False):
+        """ Fetch and process the next incoming message.
 
-        def fetch():
-            """ Fetch and process the next incoming message.
-
-            This method does not raise an exception on receipt of a
-            FAILURE message. Instead, it sets the response (and
-            consequently the parent query and transaction) to a failed
-            state. It is the responsibility of the caller to convert this
-            failed state into an exception.
-            """
-            rs = self._responses[0]
-            tag, fields = self._reader.read_message()
-            if tag == 0x70:
+        This method does not raise an exception on receipt of a
+        FAILURE message. Instead, it sets the response (and
+        consequently the parent query and transaction) to a failed
+        state. It is the responsibility of the caller to convert this
+        failed state into an exception.
+        """
+        rs = self._responses[0]
+        discarding = rs.discarding
+        # Records are held in packed form until taken, so that they
+        # can still be decoded column by column if so requested after
+        # they have arrived.
+        tag, fields = self._reader.read_message(skip_records=discarding, pack_records=True)
+        if tag == 0x71:
+            if discarding:
+                # The reader skips records for a discarded result
+                # and returns only the size of each.
+                rs.drop_record(fields)
+            else:
+                if debug:
+                    log.debug("[#%04X] S: RECORD %s", self.local_port, " ".join(map(repr, fields)))
+                rs.add_record(fields[0], self._reader.size)
+        elif tag == 0x70:
+            if debug:
                 log.debug("[#%04X] S: SUCCESS %s", self.local_port, " ".join(map(repr, fields)))
-                rs.set_success(**fields[0])
-                self._responses.popleft()
-                self._metadata.update(fields[0])
-            elif tag == 0x71:
-                log.debug("[#%04X] S: RECORD %s", self.local_port, " ".join(map(repr, fields)))
-                rs.add_record(fields[0])
-            elif tag == 0x7F:
+            rs.set_success(**fields[0])
+            self._responses.popleft()
+            self._metadata.update(fields[0])
+        elif tag == 0x7F:
+            if debug:
                 log.debug("[#%04X] S: FAILURE %s", self.local_port, " ".join(map(repr, fields)))
-                rs.set_failure(**fields[0])
-                self._responses.popleft()
-                if rs.vital:
-                    self._wire.close()
-            elif tag == 0x7E and not rs.vital:
-                log.debug("[#%04X] S: IGNORED", self.local_port)
-                rs.set_ignored()
-                self._responses.popleft()
-            else:
-                log.debug("[#%04X] S: <ERROR>", self.local_port)
+            rs.set_failure(**fields[0])
+            self._responses.popleft()
+            if self._transaction is not None:
+                self._transaction.set_failed()
+            if rs.vital:
                 self._wire.close()
-                raise RuntimeError("Unexpected protocol message #%02X", tag)
-
-        while not response.full() and not response.done():
-            fetch()
-            if not self._transaction:
-                self.release()
+        elif tag == 0x7E and not rs.vital:
+            log.debug("[#%04X] S: IGNORED", self.local_port)
+            rs.set_ignored()
+            self._responses.popleft()
+        else:
+            log.debug("[#%04X] S: <ERROR>", self.local_port)
+            self._wire.close()
+            raise RuntimeError("Unexpected protocol message #%02X", tag)
 
     def _sync(self, *responses):
         self._send()
@@ -365,13 +459,13 @@ class Bolt1(Bolt):
             self.reset(force=True)
             raise
 
-    def _bind(self):
+    def _bind(self, tx):
         if self.pool:
-            self.pool.bind(self._transaction, self)
+            self.pool.bind(tx, self)
 
-    def _unbind(self):
+    def _unbind(self, tx):
         if self.pool:
-            self.pool.unbind(self._transaction)
+            self.pool.unbind(tx)
 
 
 class Bolt2(Bolt1):
@@ -383,8 +477,7 @@ class Bolt3(Bolt2):
 
     protocol_version = (3, 0)
 
-    def _hello(self):
-        self._assert_open()
+    def _write_hello(self):
         extra = {"user_agent": self.user_agent,
                  "scheme": "basic",
                  "principal": self.profile.user,
@@ -392,9 +485,9 @@ class Bolt3(Bolt2):
         clean_extra = dict(extra)
         clean_extra.update({"credentials": "*******"})
         log.debug("[#%04X] C: HELLO %r", self.local_port, clean_extra)
-        response = self._write_request(0x01, extra, vital=True)
-        self._sync(response)
-        self._audit(response)
+        return self._write_request(0x01, extra, vital=True)
+
+    def _on_hello(self, response):
         self.server_agent = response.metadata.get("server")
         self.connection_id = response.metadata.get("connection_id")
 
@@ -411,40 +504,30 @@ class Bolt3(Bolt2):
                                             readonly, after, metadata, timeout)
         return self._run(graph_name, cypher, parameters or {}, self._transaction.extra, final=True)
 
-    def begin(self, graph_name, readonly=False, after=None, metadata=None, timeout=None):
+    def _write_begin(self, graph_name, readonly=False, after=None, metadata=None, timeout=None):
         self._assert_open()
         self._assert_no_transaction()
         self._transaction = BoltTransaction(graph_name, self.protocol_version,
                                             readonly, after, metadata, timeout)
         log.debug("[#%04X] C: BEGIN %r", self.local_port, self._transaction.extra)
-        response = self._write_request(0x11, self._transaction.extra)
-        if after:
-            self._sync(response)
-            self._audit(self._transaction)
-        self._bind()
-        return self._transaction
+        return (self._write_request(0x11, self._transaction.extra),)
 
-    def commit(self, tx):
+    def _write_commit(self, tx):
         self._assert_open()
         self._assert_open_transaction(tx)
         self._transaction.set_complete()
         log.debug("[#%04X] C: COMMIT", self.local_port)
-        response = self._write_request(0x12)
-        self._sync(response)
-        self._audit(self._transaction)
-        self._unbind()
-        return Bookmark(response.metadata.get("bookmark"))
+        return (self._write_request(0x12),)
 
-    def rollback(self, tx):
+    def _write_rollback(self, tx):
         self._assert_open()
         self._assert_open_transaction(tx)
         self._transaction.set_complete()
         log.debug("[#%04X] C: ROLLBACK", self.local_port)
-        response = self._write_request(0x13)
-        self._sync(response)
-        self._audit(self._transaction)
-        self._unbind()
-        return Bookmark(response.metadata.get("bookmark"))
+        return (self._write_request(0x13),)
+
+    def _bookmark(self, responses):
+        return Bookmark(responses[-1].metadata.get("bookmark"))
 
     def run(self, tx, cypher, parameters=None):
         self._assert_open()
@@ -454,7 +537,7 @@ class Bolt3(Bolt2):
     def _run(self, graph_name, cypher, parameters, extra=None, final=False):
         log.debug("[#%04X] C: RUN %r %r %r", self.local_port, cypher, parameters, extra or {})
         response = self._write_request(0x10, cypher, parameters, extra or {})
-        result = BoltResult(graph_name, self, response)
+        result = BoltResult(graph_name, self, response, autocommit=final)
         self._transaction.append(result, final=final)
         return result
 
@@ -463,28 +546,57 @@ class Bolt4x0(Bolt3):
 
     protocol_version = (4, 0)
 
-    def _assert_is_last_result(self, result):
+    def supports_fetch_size(self):
+        return True
+
+    def commit(self, tx):
+        self._assert_open()
+        self._assert_open_transaction(tx)
+        # Pull the remainder of any result still streaming, so that
+        # all records remain available after the transaction ends.
+        self._send()
+        for result in tx.items():
+            self._wait(result.last())
+            if result.has_more():
+                if result.discarded():
+                    self.discard(result)
+                else:
+                    self.pull(result)
+        return super(Bolt4x0, self).commit(tx)
+
+    def _stream_args(self, result, n):
         if not self._transaction:
             raise TransactionError("No active transaction")
+        args = {"n": n}
         if result is not self._transaction.last():
-            raise NotImplementedError("Random query access is not yet supported")
+            # Records for an earlier result in the same transaction
+            # must be requested by query ID.
+            args["qid"] = result.query_id
+        return args
 
     def pull(self, result, n=-1, capacity=-1):
         self._assert_open()
-        self._assert_is_last_result(result)  # TODO: random query access (qid)
-        args = {"n": n}
+        args = self._stream_args(result, n)
         log.debug("[#%04X] C: PULL %r", self.local_port, args)
         response = self._write_request(0x3F, args, capacity=capacity)
-        result.append(response, final=(n == -1))
+        # A result is not done until the last response pulled for
+        # it arrives without the 'has_more' flag.
+        result.append(response, final=True)
         return response
 
+    def fetch(self, result):
+        record = super(Bolt4x0, self).fetch(result)
+        while record is None and result.has_more():
+            self.pull(result, result.fetch_size)
+            record = super(Bolt4x0, self).fetch(result)
+        return record
+
     def discard(self, result, n=-1):
         self._assert_open()
-        self._assert_is_last_result(result)  # TODO: random query access (qid)
-        args = {"n": n}
+        args = self._stream_args(result, n)
         log.debug("[#%04X] C: DISCARD %r", self.local_port, args)
         response = self._write_request(0x2F, args)
-        result.append(response, final=(n == -1))
+        result.append(response, final=True)
         return response
 
 
@@ -574,6 +686,19 @@ class BoltTransaction(ItemizedTask, Transaction):
         self.after = after
         self.metadata = metadata
         self.timeout = timeout
+        self._failed = False
+
+    def set_failed(self):
+        """ Mark this transaction as failed, following a failure
+        received by the connection on which it is open.
+        """
+        self._failed = True
+
+    def failed(self):
+        # Tracked as a flag, rather than checked against every query
+        # in the transaction, as this is tested for every message
+        # received and the number of queries is unbounded.
+        return self._failed
 
     @property
     def extra(self):
@@ -591,7 +716,6 @@ class BoltTransaction(ItemizedTask, Transaction):
         return extra
 
 
-# TODO: use 'has_more' metadata from PULL success response
 class BoltResult(ItemizedTask, Result):
     """ A query carried out over a Bolt connection.
 
@@ -601,11 +725,16 @@ class BoltResult(ItemizedTask, Result):
     failure of the query.
     """
 
-    def __init__(self, graph_name, cx, response):
+    def __init__(self, graph_name, cx, response, autocommit=False):
         ItemizedTask.__init__(self)
         Result.__init__(self, graph_name)
         self.__record_type = None
         self.__cx = cx
+        self.__autocommit = autocommit
+        self.__discarded = False
+        self.__packing = cx.profile.lazy_records
+        self.__dropped_records = 0
+        self.__dropped_bytes = 0
         self.append(response)
 
     @property
@@ -616,13 +745,49 @@ class BoltResult(ItemizedTask, Result):
     def query_id(self):
         return self.header().metadata.get("qid")
 
+    @property
+    def autocommit(self):
+        return self.__autocommit
+
     @property
     def protocol_version(self):
         return self.__cx.protocol_version
 
+    @property
+    def lazy_records(self):
+        return self.__cx.profile.lazy_records
+
+    def append(self, response, final=False):
+        # A response already done and emptied of records can be
+        # dropped when another is pulled, so that finding the next
+        # record does not slow down as more batches are pulled.
+        items = self._items
+        if len(items) > 1:
+            last = items[-1]
+            if last.done() and not last.failed() and not last.has_records():
+                items.pop()
+                self.__dropped_records += last.dropped_records
+                self.__dropped_bytes += last.dropped_bytes
+        if self.__discarded:
+            response.discard_records()
+        super(BoltResult, self).append(response, final)
+
     def buffer(self):
+        cx = self.__cx
         if not self.done():
-            self.__cx.sync(self)
+            cx.sync(self)
+        while self.has_more():
+            cx.pull(self)
+            cx.sync(self)
+
+    def done(self):
+        return super(BoltResult, self).done() and not self.has_more()
+
+    def has_more(self):
+        """ Flag to indicate whether the server holds further records
+        for this result, beyond those pulled so far.
+        """
+        return bool(self._items[-1].metadata.get("has_more"))
 
     def header(self):
         self.__cx.sync(self)
@@ -633,7 +798,26 @@ class BoltResult(ItemizedTask, Result):
 
     def summary(self):
         return dict(self._items[-1].metadata,
-                    connection=self.__cx.profile.to_dict())
+                    connection=self.__cx.profile.to_dict(),
+                    dropped_records=self.__dropped_records + sum(
+                        response.dropped_records for response in self._items),
+                    dropped_bytes=self.__dropped_bytes + sum(
+                        response.dropped_bytes for response in self._items))
+
+    def discard(self, sync=True):
+        self.__discarded = True
+        for response in self._items:
+            response.discard_records()
+        if sync and self.has_more():
+            cx = self.__cx
+            cx.discard(self)
+            cx.sync(self)
+
+    def discarded(self):
+        return self.__discarded
+
+    def pack_records(self):
+        self.__packing = True
 
     def fetch(self):
         return self.__cx.fetch(self)
@@ -647,7 +831,9 @@ class BoltResult(ItemizedTask, Result):
             record = response.take_record()
             if record is None:
                 continue
-            return record
+            if self.__packing:
+                return record
+            return record.unpack()
         return None
 
     def peek_records(self, limit):
@@ -656,8 +842,16 @@ class BoltResult(ItemizedTask, Result):
             records.extend(response.peek_records(limit - len(records)))
             if len(records) == limit:
                 break
+        if not self.__packing:
+            records = [record.unpack() for record in records]
         return records
 
+    def audit(self):
+        super(BoltResult, self).audit()
+        if any(response.ignored() for response in self._items):
+            raise TransactionError("Query ignored by the server following "
+                                   "an earlier failure")
+
 
 class BoltResponse(Task):
 
@@ -667,11 +861,20 @@ class BoltResponse(Task):
     #   2 = failure
     #   3 = ignored
 
+    #: Flag to indicate that records for this response are to be
+    #: dropped on arrival, without being unpacked.
+    discarding = False
+
+    dropped_records = 0
+
+    dropped_bytes = 0
+
     def __init__(self, capacity=-1, vital=False):
         super(BoltResponse, self).__init__()
         self.capacity = capacity
         self.vital = vital
         self._records = deque()
+        self._record_sizes = deque()
         self._status = 0
         self._metadata = {}
         self._failure = None
@@ -686,17 +889,36 @@ class BoltResponse(Task):
         else:
             return "<BoltResponse ?>"
 
-    def add_record(self, values):
+    def add_record(self, values, size=0):
         self._records.append(values)
+        self._record_sizes.append(size)
+
+    def drop_record(self, size):
+        self.dropped_records += 1
+        self.dropped_bytes += size
+
+    def discard_records(self):
+        """ Drop all records held by this response, and any that
+        arrive from now on.
+        """
+        self.dropped_records += len(self._records)
+        self.dropped_bytes += sum(self._record_sizes)
+        self._records.clear()
+        self._record_sizes.clear()
+        if not self.done():
+            self.discarding = True
 
     def has_records(self):
         return bool(self._records)
 
     def take_record(self):
         try:
-            return self._records.popleft()
+            values = self._records.popleft()
         except IndexError:
             return None
+        else:
+            self._record_sizes.popleft()
+            return values
 
     def peek_records(self, n):
         return islice(self._records, 0, n)
@@ -726,6 +948,9 @@ class BoltResponse(Task):
     def failed(self):
         return self._status >= 2
 
+    def ignored(self):
+        return self._status == 3
+
     def audit(self):
         if self._failure:
             self.set_ignored()
@@ -18,64 +18,244 @@
 
 from __future__ import absolute_import
 
-from collections import OrderedDict
+from collections import deque, OrderedDict
 from logging import getLogger
 from json import dumps as json_dumps, loads as json_loads
+from ssl import SSLContext
 
 from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, make_headers
 
 from py2neo import http_user_agent
-from py2neo.internal.compat import urlsplit
+from py2neo.internal.compat import QueueEmpty, QueueFull, perf_counter, urlsplit
 from py2neo.internal.versioning import Version
 from py2neo.connect import Connection, Transaction, TransactionError, Result, Bookmark
-from py2neo.connect.json import JSONHydrant
+from py2neo.connect.json import JSONHydrant, JSONReader, JSONRecord
 
 
 log = getLogger(__name__)
 
 
+#: Number of bytes read from a streamed response at a time.
+STREAM_CHUNK_SIZE = 65536
+
+
+class HTTPTransport(object):
+    """ A set of keep-alive sockets to a single HTTP server, shared by
+    all the HTTP connections that a :class:`.ConnectionPool` opens.
+
+    Up to `max_size` sockets are kept open between requests. Any more
+    needed at the same time are opened for one request only. A socket
+    left idle for longer than `idle_timeout` seconds is closed instead
+    of being reused, as the server may already have dropped it. Over
+    TLS, the session negotiated by one socket is offered by the next
+    one opened, so that it can skip the full handshake.
+    """
+
+    default_max_size = 10
+
+    default_idle_timeout = 60.0
+
+    def __init__(self, profile, max_size=None, idle_timeout=None):
+        self.profile = profile
+        self.max_size = max_size or self.default_max_size
+        self.idle_timeout = idle_timeout or self.default_idle_timeout
+        #: Version of Neo4j, once discovered by the first connection.
+        self.neo4j_version = None
+        self._sockets_opened = 0
+        self._last_reaped = perf_counter()
+        if profile.secure:
+            self._ssl_context = _SessionContext.for_profile(profile)
+            self._pool = _HTTPSConnectionPool(
+                self,
+                host=profile.host,
+                port=profile.port_number,
+                maxsize=self.max_size,
+                block=False,
+                ssl_context=self._ssl_context,
+                assert_hostname=None if profile.verify else False,
+            )
+        else:
+            self._ssl_context = None
+            self._pool = _HTTPConnectionPool(
+                self,
+                host=profile.host,
+                port=profile.port_number,
+                maxsize=self.max_size,
+                block=False,
+            )
+
+    def __repr__(self):
+        return "<%s profile=%r max_size=%r>" % (self.__class__.__name__,
+                                                 self.profile, self.max_size)
+
+    @property
+    def sockets_opened(self):
+        """ The number of sockets opened by this transport so far.
+        """
+        return self._sockets_opened
+
+    @property
+    def sessions_reused(self):
+        """ The number of TLS handshakes that resumed an earlier
+        session instead of negotiating a new one.
+        """
+        return self._ssl_context.sessions_reused if self._ssl_context else 0
+
+    def request(self, method, url, headers, body=None, preload_content=True):
+        return self._pool.request(method=method, url=url, headers=headers, body=body,
+                                  preload_content=preload_content)
+
+    def reap(self):
+        """ Close all sockets that have been idle for longer than the
+        idle timeout.
+        """
+        self._last_reaped = perf_counter()
+        self._close_idle(self.idle_timeout)
+
+    def close(self):
+        """ Close all idle sockets. The transport can still be used
+        afterwards, opening new sockets as they are needed.
+        """
+        self._close_idle(0)
+
+    def _close_idle(self, min_idle_time):
+        queue = self._pool.pool
+        if queue is None:
+            return
+        # Take each pooled socket out in turn, so that none can be
+        # handed out while it is being closed.
+        taken = []
+        while True:
+            try:
+                taken.append(queue.get(block=False))
+            except QueueEmpty:
+                break
+        for conn in taken:
+            if conn is not None and conn.sock is not None and _idle_time(conn) >= min_idle_time:
+                conn.close()
+            # Another thread may have returned a socket to the pool
+            # while it was empty, taking the slot that this one came
+            # from. Waiting for the slot to free up again could block
+            # forever, so close any socket that no longer fits.
+            try:
+                queue.put(conn, block=False)
+            except QueueFull:
+                if conn is not None:
+                    conn.close()
+
+    def _checked_in(self, conn):
+        conn._idle_since = perf_counter()
+        if self._ssl_context is not None:
+            session = getattr(conn.sock, "session", None)
+            if session is not None:
+                self._ssl_context.session = session
+        if conn._idle_since - self._last_reaped > self.idle_timeout:
+            self.reap()
+
+
+def _idle_time(conn):
+    idle_since = getattr(conn, "_idle_since", None)
+    return 0.0 if idle_since is None else perf_counter() - idle_since
+
+
+class _IdleTimeoutMixin(object):
+    """ Connection pool behaviour for :class:`.HTTPTransport`, which
+    records when each socket becomes idle and closes any socket that
+    has been idle for too long before handing it out again.
+    """
+
+    def __init__(self, transport, **kwargs):
+        super(_IdleTimeoutMixin, self).__init__(**kwargs)
+        self.transport = transport
+
+    def _get_conn(self, timeout=None):
+        conn = super(_IdleTimeoutMixin, self)._get_conn(timeout)
+        if conn.sock is not None and _idle_time(conn) > self.transport.idle_timeout:
+            log.debug("Closing idle socket to %s", self.host)
+            conn.close()
+        if conn.sock is None:
+            # A socket will be opened for the next request.
+            self.transport._sockets_opened += 1
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None and conn.sock is not None:
+            self.transport._checked_in(conn)
+        super(_IdleTimeoutMixin, self)._put_conn(conn)
+
+
+class _HTTPConnectionPool(_IdleTimeoutMixin, HTTPConnectionPool):
+
+    pass
+
+
+class _HTTPSConnectionPool(_IdleTimeoutMixin, HTTPSConnectionPool):
+
+    pass
+
+
+class _SessionContext(SSLContext):
+    """ An SSL context that offers the most recent TLS session for
+    resumption by each new socket that it wraps.
+    """
+
+    session = None
+
+    sessions_reused = 0
+
+    @classmethod
+    def for_profile(cls, profile):
+        from ssl import CERT_NONE, PROTOCOL_TLS_CLIENT
+        from certifi import where as cert_where
+        context = cls(PROTOCOL_TLS_CLIENT)
+        if profile.verify:
+            context.load_verify_locations(cert_where())
+        else:
+            context.check_hostname = False
+            context.verify_mode = CERT_NONE
+        return context
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        if self.session is not None:
+            kwargs.setdefault("session", self.session)
+        s = super(_SessionContext, self).wrap_socket(sock, *args, **kwargs)
+        if s.session_reused:
+            self.sessions_reused += 1
+        return s
+
+
 class HTTP(Connection):
+    """ A logical connection to a Neo4j server over HTTP. Requests are
+    sent through an :class:`.HTTPTransport`, which may be shared with
+    other connections, so opening one of these does not itself open a
+    socket.
+    """
 
     @classmethod
     def default_hydrant(cls, profile, graph):
         return JSONHydrant(graph)
 
     @classmethod
-    def open(cls, profile, user_agent=None):
-        http = cls(profile, (user_agent or http_user_agent()))
+    def open(cls, profile, user_agent=None, transport=None):
+        http = cls(profile, (user_agent or http_user_agent()), transport)
         http._hello()
         return http
 
-    def __init__(self, profile, user_agent):
+    def __init__(self, profile, user_agent, transport=None):
         super(HTTP, self).__init__(profile, user_agent)
-        self.http_pool = None
+        if transport is None:
+            self.transport = HTTPTransport(profile, max_size=1)
+            self._owns_transport = True
+        else:
+            self.transport = transport
+            self._owns_transport = False
         self.headers = make_headers(basic_auth=":".join(profile.auth))
         self._transactions = set()
         self.__closed = False
-        self._make_pool(profile)
-
-    def _make_pool(self, profile):
-        if profile.secure:
-            from ssl import CERT_NONE, CERT_REQUIRED
-            from certifi import where as cert_where
-            self.http_pool = HTTPSConnectionPool(
-                host=profile.host,
-                port=profile.port_number,
-                maxsize=1,
-                block=True,
-                cert_reqs=CERT_REQUIRED if profile.verify else CERT_NONE,
-                ca_certs=cert_where()
-            )
-        else:
-            self.http_pool = HTTPConnectionPool(
-                host=profile.host,
-                port=profile.port_number,
-                maxsize=1,
-                block=True,
-            )
 
     def close(self):
-        self.http_pool.close()
+        if self._owns_transport:
+            self.transport.close()
         self.__closed = True
 
     @property
@@ -91,7 +271,15 @@ class HTTP(Connection):
         raise NotImplementedError
 
     def _hello(self):
-        r = self.http_pool.request(method="GET",
+        # The server version is fetched by the first connection only,
+        # and shared with the others through the transport.
+        if self.transport.neo4j_version is None:
+            self.transport.neo4j_version = self._fetch_neo4j_version()
+        self.neo4j_version = self.transport.neo4j_version
+        self.server_agent = "Neo4j/{}.{}.{}".format(*self.neo4j_version.major_minor_patch)
+
+    def _fetch_neo4j_version(self):
+        r = self.transport.request(method="GET",
                                    url="/",
                                    headers=dict(self.headers))
         metadata = json_loads(r.data.decode("utf-8"))
@@ -103,14 +291,14 @@ class HTTP(Connection):
             #   "neo4j_version" : "4.0.0",
             #   "neo4j_edition" : "community"
             # }
-            self.neo4j_version = Version.parse(metadata["neo4j_version"])  # Neo4j 4.x
+            return Version.parse(metadata["neo4j_version"])  # Neo4j 4.x
         else:                               # Neo4j 3.x
             # {
             #   "data" : "http://localhost:7474/db/data/",
             #   "management" : "http://localhost:7474/db/manage/",
             #   "bolt" : "bolt://localhost:7687"
             # }
-            r = self.http_pool.request(method="GET",
+            r = self.transport.request(method="GET",
                                        url="/db/data/",
                                        headers=dict(self.headers))
             metadata = json_loads(r.data.decode("utf-8"))
@@ -130,20 +318,30 @@ class HTTP(Connection):
             #   "node_labels" : "http://localhost:7474/db/data/labels",
             #   "neo4j_version" : "3.5.12"
             # }
-            self.neo4j_version = Version.parse(metadata["neo4j_version"])  # Neo4j 3.x
-        self.server_agent = "Neo4j/{}.{}.{}".format(*self.neo4j_version.major_minor_patch)
+            return Version.parse(metadata["neo4j_version"])  # Neo4j 3.x
 
     def auto_run(self, graph_name, cypher, parameters=None,
                  readonly=False, after=None, metadata=None, timeout=None):
         if graph_name and not self.supports_multi():
             raise TypeError("Neo4j {}.{} does not support "
                             "named graphs".format(*self.neo4j_version.major_minor))
-        r = self._post(HTTPTransaction.autocommit_uri(graph_name), cypher, parameters)
+        streaming = self.profile.http_streaming
+        r = self._post(HTTPTransaction.autocommit_uri(graph_name),
+                       [self._statement(cypher, parameters, streaming)], stream=streaming)
         assert r.status == 200  # TODO: other codes
+        if streaming:
+            try:
+                return HTTPStreamingResult(graph_name, r)
+            finally:
+                self.release()
         rs = HTTPResponse.from_json(r.data.decode("utf-8"))
         rs.audit()
-        self.release()
-        return HTTPResult(graph_name, rs.result())
+        result = rs.result()
+        try:
+            self._complete_paths(graph_name, [result])
+        finally:
+            self.release()
+        return HTTPResult(graph_name, result)
 
     def begin(self, graph_name, readonly=False, after=None, metadata=None, timeout=None):
         if graph_name and not self.supports_multi():
@@ -171,30 +369,55 @@ class HTTP(Connection):
     def commit(self, tx):
         self._assert_valid_tx(tx)
         self._transactions.remove(tx)
-        r = self._post(tx.commit_uri())
-        assert r.status == 200  # TODO: other codes
-        rs = HTTPResponse.from_json(r.data.decode("utf-8"))
-        rs.audit()
-        self.release()
+        tx.end_stream()
+        try:
+            # Any queries still queued are sent along with the commit.
+            rs = self._send(tx, commit=True)
+            rs.audit()
+        finally:
+            self.release()
         return Bookmark()
 
     def rollback(self, tx):
         self._assert_valid_tx(tx)
         self._transactions.remove(tx)
-        r = self._delete(tx.uri())
-        assert r.status == 200  # TODO: other codes
-        rs = HTTPResponse.from_json(r.data.decode("utf-8"))
-        rs.audit()
+        tx.end_stream(discard=True)
+        for _, result in tx.pending:
+            result._fail(TransactionError("Transaction rolled back before query was sent"))
+        tx.pending = []
+        if tx.failure is None:
+            # After a failure, the server will already have rolled
+            # back the transaction.
+            r = self._delete(tx.uri())
+            assert r.status == 200  # TODO: other codes
+            rs = HTTPResponse.from_json(r.data.decode("utf-8"))
+            rs.audit()
         self.release()
         return Bookmark()
 
     def run_in_tx(self, tx, cypher, parameters=None):
-        r = self._post(tx.uri(), cypher, parameters)
-        assert r.status == 200  # TODO: other codes
-        rs = HTTPResponse.from_json(r.data.decode("utf-8"))
-        rs.audit()
+        tx.end_stream()
+        streaming = self.profile.http_streaming
+        statement = self._statement(cypher, parameters, streaming)
+        if streaming:
+            # A streamed result must be the only one in its response,
+            # so is sent straight away, after any queued before it.
+            if tx.pending:
+                self._send(tx)
+            self._assert_open_tx(tx)
+            r = self._post(tx.uri(), [statement], stream=True)
+            assert r.status == 200  # TODO: other codes
+            try:
+                tx.stream = HTTPStreamingResult(tx.graph_name, r, profile=self.profile)
+                return tx.stream
+            finally:
+                self.release()
+        self._assert_open_tx(tx)
+        result = HTTPResult(tx.graph_name, profile=self.profile)
+        result._batch = (self, tx)
+        tx.pending.append((statement, result))
         self.release()
-        return HTTPResult(tx.graph_name, rs.result(), profile=self.profile)
+        return result
 
     def pull(self, result, n=-1):
         pass
@@ -203,7 +426,8 @@ class HTTP(Connection):
         pass
 
     def sync(self, result):
-        pass
+        if isinstance(result, HTTPResult):
+            result._wait()
 
     def fetch(self, result):
         record = result.take_record()
@@ -215,31 +439,152 @@ class HTTP(Connection):
         if tx not in self._transactions:
             raise TransactionError("Invalid transaction")
 
-    def _post(self, url, statement=None, parameters=None):
-        if statement:
-            statements = [
-                OrderedDict([
-                    ("statement", statement),
-                    ("parameters", parameters or {}),
-                    ("resultDataContents", ["REST"]),
-                    ("includeStats", True),
-                ])
-            ]
+    def _assert_open_tx(self, tx):
+        if tx.failure is not None:
+            raise TransactionError("Transaction %r has failed" % tx.txid)
+
+    def _send(self, tx, commit=False):
+        """ Send all queries queued in a transaction in a single
+        request, optionally committing the transaction at the same
+        time, and hand each result to the cursor of the query
+        concerned.
+
+        On failure, the server stops at the query that failed and
+        rolls back the transaction. The failure is then raised by the
+        cursor of the first query without a result, and of any queued
+        after it. A query that fails part way through its result has
+        the records returned before the failure, so unless it is the
+        last query sent, the failure is instead raised by the cursors
+        of the queries after it, and when the transaction is
+        committed.
+
+        :returns: :class:`.HTTPResponse` for the request
+        """
+        if tx.failure is not None:
+            raise tx.failure
+        pending, tx.pending = tx.pending, []
+        url = tx.commit_uri() if commit else tx.uri()
+        r = self._post(url, [statement for statement, _ in pending])
+        assert r.status == 200  # TODO: other codes
+        rs = HTTPResponse.from_json(r.data.decode("utf-8"))
+        errors = rs.errors()
+        count = rs.result_count()
+        if errors:
+            from py2neo.database import GraphError
+            tx.failure = GraphError.hydrate(errors[0])
+            if count == len(pending) and not commit:
+                # Only the last query can have failed.
+                count -= 1
+        if tx.failure is None:
+            # Once committed, the transaction can no longer be used,
+            # but anything it created can then be seen from outside.
+            self._complete_paths(tx.graph_name, [rs.result(i) for i in range(count)],
+                                 None if commit else tx)
+        for i, (_, result) in enumerate(pending):
+            if i < count:
+                result._load(rs.result(i))
+            else:
+                result._fail(tx.failure)
+        return rs
+
+    def _complete_paths(self, graph_name, results, tx=None):
+        """ Add the relationships of any paths to the graph format of
+        each row that lacks one, in the raw results given.
+
+        The REST format of a path identifies its relationships only by
+        URI, so these are looked up with a single query for all of the
+        results, run within the transaction that returned them, if one
+        is given and still open.
+        """
+        rows = []
+        r_ids = set()
+        for result in results:
+            for row in result.get("data", ()):
+                if "graph" not in row:
+                    row_r_ids = _path_relationship_ids(row["rest"])
+                    if row_r_ids:
+                        rows.append((row, row_r_ids))
+                        r_ids.update(row_r_ids)
+        if not rows:
+            return
+        url = tx.uri() if tx is not None else HTTPTransaction.autocommit_uri(graph_name)
+        statement = OrderedDict([
+            ("statement", "MATCH ()-[r]->() WHERE id(r) IN $x RETURN r"),
+            ("parameters", {"x": sorted(r_ids)}),
+            ("resultDataContents", ["graph"]),
+        ])
+        r = self._post(url, [statement])
+        assert r.status == 200  # TODO: other codes
+        rs = HTTPResponse.from_json(r.data.decode("utf-8"))
+        rs.audit()
+        found = {}
+        for row in rs.result().get("data", ()):
+            for rel in row["graph"]["relationships"]:
+                found[int(rel["id"])] = rel
+        for row, row_r_ids in rows:
+            row["graph"] = {"nodes": [],
+                            "relationships": [found[r_id] for r_id in row_r_ids if r_id in found]}
+
+    def _statement(self, cypher, parameters=None, stream=False):
+        if self.profile.http_graph_format or stream:
+            # The graph format carries the nodes and relationships
+            # of paths, which the REST format only gives as URIs. A
+            # streamed result must always carry it, as these cannot
+            # be looked up afterwards (see _complete_paths) while the
+            # response is still being read.
+            contents = ["REST", "graph"]
         else:
-            statements = []
-        return self.http_pool.request(method="POST",
+            contents = ["REST"]
+        return OrderedDict([
+            ("statement", cypher),
+            ("parameters", parameters or {}),
+            ("resultDataContents", contents),
+            ("includeStats", True),
+        ])
+
+    def _post(self, url, statements=(), stream=False):
+        return self.transport.request(method="POST",
                                       url=url,
                                       headers=dict(self.headers, **{"Content-Type": "application/json"}),
-                                      body=json_dumps({"statements": statements}))
+                                      body=json_dumps({"statements": list(statements)}),
+                                      preload_content=not stream)
 
     def _delete(self, url):
-        return self.http_pool.request(method="DELETE",
+        return self.transport.request(method="DELETE",
                                       url=url,
                                       headers=dict(self.headers))
 
 
 class HTTPTransaction(Transaction):
 
+    #: The streamed result of the last query run in this transaction,
+    #: if it may not yet have been read in full.
+    stream = None
+
+    #: The failure that caused the server to roll back this
+    #: transaction, if any.
+    failure = None
+
+    def __init__(self, graph_name, txid=None, readonly=False):
+        super(HTTPTransaction, self).__init__(graph_name, txid, readonly)
+        # Statements not yet sent to the server, each paired with the
+        # result that will receive its outcome.
+        self.pending = []
+
+    def end_stream(self, discard=False):
+        """ Finish reading the streamed result of the last query run
+        in this transaction, buffering the remaining records, or
+        dropping them if `discard` is true. The server only accepts
+        the next request for a transaction once the response to the
+        last has been read.
+        """
+        stream, self.stream = self.stream, None
+        if stream is not None:
+            if discard:
+                stream.discard()
+            else:
+                stream.buffer()
+
     @classmethod
     def autocommit_uri(cls, graph_name):
         if graph_name:
@@ -268,36 +613,88 @@ class HTTPTransaction(Transaction):
 
 
 class HTTPResult(Result):
+    """ Result of a query run over HTTP, read in full from the
+    response.
 
-    def __init__(self, graph_name, result, profile=None):
+    A result created without the content of a response is one for a
+    query still queued in its transaction. The queue is sent to the
+    server as soon as anything is asked of such a result.
+    """
+
+    def __init__(self, graph_name, result=None, profile=None):
         Result.__init__(self, graph_name)
-        self._columns = result.get("columns", ())
-        self._data = result.get("data", [])
+        self._columns = ()
+        self._data = []
         self._summary = {}
-        if "stats" in result:
-            self._summary["stats"] = result["stats"]
         if profile:
             self._summary["connection"] = profile.to_dict()
         self._cursor = 0
+        self._failure = None
+        self._discarded = False
+        # The connection and transaction that will send the query for
+        # this result, if it has not been sent already.
+        self._batch = None
+        if result is not None:
+            self._load(result)
+
+    def _load(self, result):
+        self._batch = None
+        self._columns = result.get("columns", ())
+        self._data = result.get("data", [])
+        if "stats" in result:
+            self._summary["stats"] = result["stats"]
+        if self._discarded:
+            self.discard()
+
+    def _fail(self, failure):
+        self._batch = None
+        self._failure = failure
+
+    def _wait(self):
+        """ Send the query for this result, if still queued, and raise
+        any failure that it caused.
+        """
+        if self._batch is not None:
+            cx, tx = self._batch
+            cx._send(tx)
+        if self._failure is not None:
+            raise self._failure
 
     def buffer(self):
-        pass
+        self._wait()
+
+    def discard(self, sync=True):
+        if self._batch is not None:
+            # Drop the records once they arrive, rather than send the
+            # query early.
+            self._discarded = True
+            return
+        # All records arrive with the response, so these can only be
+        # dropped locally.
+        dropped = len(self._data) - self._cursor
+        self._summary["dropped_records"] = self._summary.get("dropped_records", 0) + dropped
+        self._data = []
+        self._cursor = 0
 
     def fields(self):
+        self._wait()
         return self._columns
 
     def summary(self):
+        self._wait()
         return self._summary
 
     def fetch(self):
         return self.take_record()
 
     def has_records(self):
+        self._wait()
         return self._cursor < len(self._data)
 
     def take_record(self):
+        self._wait()
         try:
-            record = self._data[self._cursor]["rest"]
+            record = JSONRecord.from_row(self._data[self._cursor])
         except IndexError:
             return None
         else:
@@ -305,20 +702,153 @@ class HTTPResult(Result):
             return record
 
     def peek_records(self, limit):
+        self._wait()
         records = []
         for i in range(limit):
             try:
-                records.append(self._data[self._cursor + i]["rest"])
+                records.append(JSONRecord.from_row(self._data[self._cursor + i]))
             except IndexError:
                 break
         return records
 
 
+class HTTPStreamingResult(Result):
+    """ Result of a query run over HTTP, whose records are parsed from
+    the response as they arrive, instead of after the whole response
+    has been read. Only the current record is held in memory, unless
+    records are peeked ahead or buffered.
+
+    Errors reported by the server after the first record has been
+    read are raised once the last record has been fetched.
+    """
+
+    def __init__(self, graph_name, response, profile=None):
+        Result.__init__(self, graph_name)
+        self._response = response
+        self._reader = JSONReader(response.stream(STREAM_CHUNK_SIZE))
+        self._columns = ()
+        self._summary = {}
+        if profile:
+            self._summary["connection"] = profile.to_dict()
+        self._buffered = deque()
+        self._done = False
+        self._records = self._read()
+        # Read as far as the first record, so that the columns are
+        # known and any immediate failure is raised straight away.
+        self._buffer_one()
+
+    def _read(self):
+        reader = self._reader
+        errors = []
+        complete = False
+        try:
+            for key in reader.members():
+                if key == "results":
+                    for index in reader.items():
+                        if index == 0:
+                            for record in self._read_result():
+                                yield record
+                        else:
+                            reader.value()
+                elif key == "errors":
+                    errors = reader.value()
+                else:
+                    reader.value()
+            complete = True
+        finally:
+            self._done = True
+            if complete:
+                # Read to the very end of the response, so that the
+                # socket can be reused.
+                self._response.drain_conn()
+            else:
+                # Close the socket rather than read a response that
+                # could be arbitrarily large.
+                self._response.close()
+                self._response.release_conn()
+        if errors:
+            from py2neo.database import GraphError
+            raise GraphError.hydrate(errors[0])
+
+    def _read_result(self):
+        reader = self._reader
+        for key in reader.members():
+            if key == "columns":
+                self._columns = reader.value()
+            elif key == "data":
+                for _ in reader.items():
+                    yield JSONRecord.from_row(reader.value())
+            elif key == "stats":
+                self._summary["stats"] = reader.value()
+            else:
+                reader.value()
+
+    def _buffer_one(self):
+        try:
+            self._buffered.append(next(self._records))
+        except StopIteration:
+            return False
+        else:
+            return True
+
+    def buffer(self):
+        self._buffered.extend(self._records)
+
+    def discard(self, sync=True):
+        dropped = len(self._buffered)
+        self._buffered.clear()
+        self._records.close()
+        self._summary["dropped_records"] = self._summary.get("dropped_records", 0) + dropped
+
+    def fields(self):
+        return self._columns
+
+    def summary(self):
+        return self._summary
+
+    def fetch(self):
+        return self.take_record()
+
+    def has_records(self):
+        return bool(self._buffered) or self._buffer_one()
+
+    def take_record(self):
+        if self._buffered:
+            return self._buffered.popleft()
+        try:
+            return next(self._records)
+        except StopIteration:
+            return None
+
+    def peek_records(self, limit):
+        while len(self._buffered) < limit and self._buffer_one():
+            pass
+        return list(self._buffered)[:limit]
+
+
+def _path_relationship_ids(values):
+    """ Return the identities of the relationships within all paths
+    found among a list of values in REST format.
+    """
+    r_ids = []
+    stack = list(values)
+    while stack:
+        value = stack.pop()
+        if isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, dict) and "self" not in value:
+            if "nodes" in value and "relationships" in value:
+                r_ids.extend(int(uri.rpartition("/")[-1]) for uri in value["relationships"])
+            else:
+                stack.extend(value.values())
+    return r_ids
+
+
 class HTTPResponse(object):
 
     @classmethod
     def from_json(cls, data):
-        return cls(json_loads(data, object_hook=JSONHydrant.json_to_packstream))
+        return cls(json_loads(data))
 
     def __init__(self, content):
         self._content = content
@@ -326,6 +856,9 @@ class HTTPResponse(object):
     def columns(self):
         return tuple(self._content.get("columns", ()))
 
+    def result_count(self):
+        return len(self._content.get("results", ()))
+
     def result(self, index=0):
         try:
             results = self._content["results"]
@@ -19,24 +19,189 @@
 # limitations under the License.
 
 
+from codecs import getincrementaldecoder
 from collections import namedtuple
+from json import JSONDecoder
 
 from py2neo.connect import Hydrant
 from py2neo.internal.compat import Sequence, Mapping, integer_types, string_types
-from py2neo.matching import RelationshipMatcher
 
 
 INT64_MIN = -(2 ** 63)
 INT64_MAX = 2 ** 63 - 1
 
+_WHITESPACE = " \t\n\r"
+
+
+class JSONReader(object):
+    """ Incremental reader for a JSON document that arrives in chunks
+    of bytes, such as the body of a streamed HTTP response.
+
+    The structure of the document is walked one object member or array
+    item at a time, using :meth:`.members` and :meth:`.items`, and the
+    value at each position is either walked in the same way or read in
+    full with :meth:`.value`. Only the unread remainder of the current
+    chunk is held in memory, along with the value being read.
+
+    :param chunks: iterable of byte strings, in UTF-8
+    :param object_hook: function applied to each object decoded by
+        :meth:`.value`, as for :func:`json.loads`
+    """
+
+    def __init__(self, chunks, object_hook=None):
+        self._chunks = iter(chunks)
+        self._decoder = getincrementaldecoder("utf-8")()
+        self._json = JSONDecoder(object_hook=object_hook)
+        self._buffer = u""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """ Read the next chunk into the buffer, dropping whatever has
+        already been read. Return false if there are no more chunks.
+        """
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """ Return the next character that is not whitespace, without
+        consuming it, or an empty string at the end of the document.
+        """
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            end = len(buffer)
+            while pos < end and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < end:
+                return buffer[pos]
+            if not self._fill():
+                return u""
+
+    def expect(self, char):
+        """ Consume the next character that is not whitespace, which
+        must be `char`.
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError("Expected %r at JSON position %d, found %r" % (char, self._pos, found))
+        self._pos += 1
+
+    def value(self):
+        """ Read and return the next complete value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                # The value may only be incomplete, rather than invalid.
+                if not self._fill():
+                    raise
+            else:
+                # A number at the very end of the buffer may yet have
+                # more digits to come.
+                if end < len(self._buffer) or not self._fill():
+                    self._pos = end
+                    return value
+
+    def members(self):
+        """ Walk the next value, which must be an object, yielding the
+        key of each member in turn. The value of each member must be
+        read, or walked, before the next key is requested.
+        """
+        self.expect(u"{")
+        if self.peek() == u"}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(u":")
+            yield key
+            if self.peek() == u",":
+                self._pos += 1
+            else:
+                self.expect(u"}")
+                return
+
+    def items(self):
+        """ Walk the next value, which must be an array, yielding the
+        index of each item in turn. Each item must be read, or walked,
+        before the next index is requested.
+        """
+        self.expect(u"[")
+        if self.peek() == u"]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.peek() == u",":
+                self._pos += 1
+            else:
+                self.expect(u"]")
+                return
+
+
+class JSONRecord(list):
+    """ The values of a record received over HTTP, in REST format,
+    along with the graph format of the same record, which lists every
+    node and relationship that appears within those values.
+    """
+
+    __slots__ = ["graph"]
+
+    def __init__(self, values, graph):
+        list.__init__(self, values)
+        self.graph = graph
+
+    @classmethod
+    def from_row(cls, row):
+        """ Return the values of a row of an HTTP result, as a
+        :class:`.JSONRecord` if the row includes its graph format, or
+        as a plain list otherwise.
+        """
+        graph = row.get("graph")
+        if graph:
+            return cls(row["rest"], graph)
+        else:
+            return row["rest"]
+
 
 class JSONHydrant(Hydrant):
+    """ Hydrant for values carried over HTTP, in the REST format of
+    the transactional endpoint.
+
+    Nodes, relationships and paths are built directly from the JSON
+    objects that represent them, in a single pass over each decoded
+    value. The function that does this is built on first use and then
+    reused for every subsequent record.
+
+    The REST format of a path identifies its nodes and relationships
+    only by URI, so these are taken from the graph format of the
+    record, which a :class:`.JSONRecord` carries. The connection makes
+    sure that this lists the relationships of every path (see
+    :meth:`.HTTP._complete_paths`), so hydration never needs to query
+    the database itself.
+    """
 
     unbound_relationship = namedtuple("UnboundRelationship", ["id", "type", "properties"])
 
     def __init__(self, graph):
         self.graph = graph
-        self.hydration_functions = {}
+        self._hydrator = None
 
     @classmethod
     def _uri_to_id(cls, uri):
@@ -45,103 +210,88 @@ class JSONHydrant(Hydrant):
         _, _, identity = uri.rpartition("/")
         return int(identity)
 
-    @classmethod
-    def json_to_packstream(cls, data):
-        """ This converts from JSON format into PackStream prior to
-        proper hydration. This code needs to die horribly in a freak
-        yachting accident.
+    def hydrate(self, keys, values, entities=None, version=None):
+        """ Convert decoded JSON values into native values.
         """
-        from py2neo.connect.packstream import Structure
-        # TODO: other partial hydration
-        if "self" in data:
-            if "type" in data:
-                return Structure(ord(b"R"),
-                                 cls._uri_to_id(data["self"]),
-                                 cls._uri_to_id(data["start"]),
-                                 cls._uri_to_id(data["end"]),
-                                 data["type"],
-                                 data["data"])
-            else:
-                return Structure(ord(b"N"),
-                                 cls._uri_to_id(data["self"]),
-                                 data["metadata"]["labels"],
-                                 data["data"])
-        elif "nodes" in data and "relationships" in data:
-            nodes = [Structure(ord(b"N"), i, None, None) for i in map(cls._uri_to_id, data["nodes"])]
-            relps = [Structure(ord(b"r"), i, None, None) for i in map(cls._uri_to_id, data["relationships"])]
-            seq = [i // 2 + 1 for i in range(2 * len(data["relationships"]))]
-            for i, direction in enumerate(data["directions"]):
-                if direction == "<-":
-                    seq[2 * i] *= -1
-            return Structure(ord(b"P"), nodes, relps, seq)
+        hydrate_object = self._hydrator
+        if hydrate_object is None:
+            hydrate_object = self._hydrator = self._compile_hydrator()
+        record_graph = getattr(values, "graph", None)
+        if entities:
+            return tuple(hydrate_object(value, entities.get(keys[i]), record_graph)
+                         for i, value in enumerate(values))
         else:
-            # from warnings import warn
-            # warn("Map literals returned over the Neo4j HTTP interface are ambiguous "
-            #      "and may be unintentionally hydrated as graph objects")
-            return data
+            return tuple(hydrate_object(value, None, record_graph) for value in values)
 
-    def hydrate(self, keys, values, entities=None, version=None):
-        """ Convert JSON values into native values. This is the other half
-        of the HTTP hydration process, and is basically a copy of the
-        Bolt/PackStream hydration code. It needs to be combined with the
-        code in `json_to_packstream` so that hydration is done in a single
-        pass.
-        """
+    def _compile_hydrator(self):
+        from py2neo.data import Node, Relationship, Path
 
         graph = self.graph
-        if entities is None:
-            entities = {}
-
-        def hydrate_object(obj, inst=None):
-            from py2neo.data import Node, Relationship, Path
-            from py2neo.connect.packstream import Structure
-            if isinstance(obj, Structure):
-                tag = obj.tag
-                fields = obj.fields
-                if tag == ord(b"N"):
-                    return Node.hydrate(self.graph, fields[0], fields[1], hydrate_object(fields[2]), into=inst)
-                elif tag == ord(b"R"):
-                    return Relationship.hydrate(self.graph, fields[0],
-                                                     fields[1], fields[2],
-                                                     fields[3], hydrate_object(fields[4]), into=inst)
-                elif tag == ord(b"P"):
-                    # Herein lies a dirty hack to retrieve missing relationship
-                    # detail for paths received over HTTP.
-                    nodes = [hydrate_object(node) for node in fields[0]]
-                    u_rels = []
-                    typeless_u_rel_ids = []
-                    for r in fields[1]:
-                        u_rel = self.unbound_relationship(*map(hydrate_object, r))
-                        assert u_rel.type is None
-                        typeless_u_rel_ids.append(u_rel.id)
-                        u_rels.append(u_rel)
-                    if typeless_u_rel_ids:
-                        r_dict = {r.identity: r for r in RelationshipMatcher(graph).get(typeless_u_rel_ids)}
-                        for i, u_rel in enumerate(u_rels):
-                            if u_rel.type is None:
-                                u_rels[i] = self.unbound_relationship(
-                                    u_rel.id,
-                                    type(r_dict[u_rel.id]).__name__,
-                                    u_rel.properties
-                                )
-                    sequence = fields[2]
-                    return Path.hydrate(self.graph, nodes, u_rels, sequence)
-                else:
-                    try:
-                        f = self.hydration_functions[tag]
-                    except KeyError:
-                        # If we don't recognise the structure type, just return it as-is
-                        return obj
+        uri_to_id = self._uri_to_id
+        unbound_relationship = self.unbound_relationship
+
+        def hydrate_object(o, inst=None, record_graph=None):
+            t = type(o)
+            if t is list:
+                return [hydrate_object(value, None, record_graph) for value in o]
+            elif t is dict:
+                # Map literals returned over HTTP are ambiguous, so any
+                # that look like graph objects are hydrated as such.
+                if "self" in o:
+                    if "type" in o:
+                        return hydrate_relationship(o, inst)
                     else:
-                        return f(*map(hydrate_object, obj.fields))
-            elif isinstance(obj, list):
-                return list(map(hydrate_object, obj))
-            elif isinstance(obj, dict):
-                return {key: hydrate_object(value) for key, value in obj.items()}
+                        return hydrate_node(o, inst)
+                elif "nodes" in o and "relationships" in o:
+                    return hydrate_path(o, record_graph)
+                else:
+                    return {key: hydrate_object(value, None, record_graph)
+                            for key, value in o.items()}
+            else:
+                return o
+
+        def hydrate_node(o, inst):
+            # Property values can only be scalars, or lists of
+            # scalars, so need no hydration of their own.
+            return Node.hydrate(graph, uri_to_id(o["self"]), o["metadata"]["labels"],
+                                o["data"], into=inst)
+
+        def hydrate_relationship(o, inst):
+            return Relationship.hydrate(graph, uri_to_id(o["self"]),
+                                        uri_to_id(o["start"]), uri_to_id(o["end"]),
+                                        o["type"], o["data"], into=inst)
+
+        def hydrate_path(o, record_graph):
+            if record_graph:
+                graph_nodes = {int(n["id"]): n for n in record_graph.get("nodes", ())}
+                graph_rels = {int(r["id"]): r for r in record_graph.get("relationships", ())}
             else:
-                return obj
+                graph_nodes = graph_rels = {}
+            nodes = []
+            for uri in o["nodes"]:
+                n_id = uri_to_id(uri)
+                n = graph_nodes.get(n_id)
+                if n is None:
+                    nodes.append(Node.hydrate(graph, n_id))
+                else:
+                    nodes.append(Node.hydrate(graph, n_id, n["labels"], n["properties"]))
+            r_ids = [uri_to_id(uri) for uri in o["relationships"]]
+            u_rels = []
+            for r_id in r_ids:
+                r = graph_rels.get(r_id)
+                if r is None:
+                    # The relationship no longer exists, so its type
+                    # cannot be known.
+                    u_rels.append(unbound_relationship(r_id, None, None))
+                else:
+                    u_rels.append(unbound_relationship(r_id, r["type"], r["properties"]))
+            sequence = [i // 2 + 1 for i in range(2 * len(r_ids))]
+            for i, direction in enumerate(o["directions"]):
+                if direction == "<-":
+                    sequence[2 * i] *= -1
+            return Path.hydrate(graph, nodes, u_rels, sequence)
 
-        return tuple(hydrate_object(value, entities.get(keys[i])) for i, value in enumerate(values))
+        return hydrate_object
 
     def dehydrate(self, data, version=None):
         """ Dehydrate to JSON.
@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Metrics for connection pools.
+
+Each :class:`.ConnectionPool` records a :class:`.PoolMetrics` object,
+available as `pool.metrics`. Counters and histograms are updated in
+place as connections are acquired, released, opened and closed, so
+reading them costs no more than an attribute lookup.
+
+A :class:`.Connector` may hold several pools: one for the primary
+server, and others for readers and for servers found through routing.
+Its :class:`.ConnectorMetrics`, available as `connector.metrics`, sum
+the figures of all of these. To export figures as they change, add a
+listener::
+
+    >>> def listener(event, value):
+    ...     print(event, value)
+    >>> graph.service.connector.metrics.add_listener(listener)
+
+Listeners are called with the name of an event and a value associated
+with it:
+
+============  ========================================================
+Event         Value
+============  ========================================================
+``acquire``   seconds spent waiting for the connection (``0.0`` if a
+              connection was available immediately)
+``release``   :const:`None`
+``create``    :const:`None`
+``timeout``   seconds spent waiting before giving up
+``expire``    lifetime of the connection, in seconds
+``break``     lifetime of the connection, in seconds
+``close``     lifetime of the connection, in seconds
+``retry``     seconds to wait before retrying a unit of work
+``give_up``   :const:`None`
+============  ========================================================
+
+A listener added to the metrics of a connector is called for the
+events of every pool it holds, including pools opened later on.
+Retries of units of work carried out by a :class:`.Graph` are counted
+by the connector itself, as they do not belong to any one pool.
+
+Listeners may be called from any thread that uses the pool, and
+should return quickly.
+"""
+
+
+from bisect import bisect_left
+
+
+#: Default upper bounds, in seconds, of the buckets used for a
+#: histogram of time spent waiting to acquire a connection.
+WAIT_TIME_BOUNDS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+#: Default upper bounds, in seconds, of the buckets used for a
+#: histogram of connection lifetimes.
+LIFETIME_BOUNDS = (1.0, 10.0, 60.0, 300.0, 600.0, 1800.0, 3600.0)
+
+
+class Histogram(object):
+    """ A histogram of observed values, counted in buckets with fixed
+    upper bounds. Values above the highest bound are counted in an
+    extra, unbounded bucket.
+    """
+
+    def __init__(self, bounds):
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def __repr__(self):
+        return "<%s count=%r mean=%r max=%r>" % (self.__class__.__name__,
+                                                 self._count, self.mean, self._max)
+
+    def __len__(self):
+        return self._count
+
+    def observe(self, value):
+        """ Record a value.
+        """
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._total += value
+        if value > self._max:
+            self._max = value
+
+    @property
+    def count(self):
+        """ The number of values observed.
+        """
+        return self._count
+
+    @property
+    def total(self):
+        """ The sum of all values observed.
+        """
+        return self._total
+
+    @property
+    def mean(self):
+        """ The mean of all values observed, or :const:`None` if none
+        have been.
+        """
+        return self._total / self._count if self._count else None
+
+    @property
+    def max(self):
+        """ The largest value observed.
+        """
+        return self._max
+
+    def merge(self, other):
+        """ Add the values observed by another histogram, which must
+        have the same bounds, to those observed by this one.
+        """
+        if other._bounds != self._bounds:
+            raise ValueError("Cannot merge histograms with different bounds")
+        for i, count in enumerate(other._counts):
+            self._counts[i] += count
+        self._count += other._count
+        self._total += other._total
+        if other._max > self._max:
+            self._max = other._max
+
+    def buckets(self):
+        """ Return a list of `(bound, count)` pairs, one for each
+        bucket, in which the count is the number of values observed
+        that were no greater than the bound, but greater than that of
+        the previous bucket. The bound of the last bucket is
+        :const:`None`.
+        """
+        return list(zip(self._bounds + (None,), self._counts))
+
+
+class PoolMetrics(object):
+    """ Counters and histograms describing the activity of a
+    connection pool.
+    """
+
+    def __init__(self):
+        #: Number of connections acquired from the pool.
+        self.acquires = 0
+        #: Number of connections released back to the pool.
+        self.releases = 0
+        #: Number of new connections opened by the pool.
+        self.creations = 0
+        #: Number of connections closed on exceeding the maximum age.
+        self.expirations = 0
+        #: Number of connections discarded on being found broken.
+        self.breakages = 0
+        #: Number of acquire calls that gave up waiting.
+        self.timeouts = 0
+        #: Number of times a connection was reset on being acquired or
+        #: released.
+        self.resets_sent = 0
+        #: Number of times a connection was acquired or released
+        #: without needing to be reset, as it was already idle.
+        self.resets_avoided = 0
+        #: Number of times a unit of work was retried after a
+        #: transient failure (see :class:`.RetryPolicy`).
+        self.retries = 0
+        #: Number of units of work that failed with a retryable error
+        #: but were not retried again, as the retry policy was spent.
+        self.retries_exhausted = 0
+        #: Time, in seconds, spent waiting for a connection by each
+        #: acquire call that had to wait.
+        self.wait_time = Histogram(WAIT_TIME_BOUNDS)
+        #: Age, in seconds, of each connection when it left the pool.
+        self.lifetime = Histogram(LIFETIME_BOUNDS)
+        self._listeners = []
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, " ".join(
+            "%s=%r" % item for item in sorted(self.counters().items())))
+
+    def counters(self):
+        """ Return a dictionary of the current value of each counter.
+        """
+        return {
+            "acquires": self.acquires,
+            "releases": self.releases,
+            "creations": self.creations,
+            "expirations": self.expirations,
+            "breakages": self.breakages,
+            "timeouts": self.timeouts,
+            "resets_sent": self.resets_sent,
+            "resets_avoided": self.resets_avoided,
+            "retries": self.retries,
+            "retries_exhausted": self.retries_exhausted,
+        }
+
+    def add_listener(self, listener):
+        """ Add a function to be called for each pool event, with the
+        name of the event and a value associated with it.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """ Remove a listener previously added.
+        """
+        self._listeners.remove(listener)
+
+    def _emit(self, event, value=None):
+        for listener in self._listeners:
+            listener(event, value)
+
+
+def _summed(name, doc):
+    """ Build a property that sums a counter across all pools.
+    """
+
+    def fget(self):
+        return sum(getattr(metrics, name) for metrics in self.by_address().values())
+
+    return property(fget, doc=doc)
+
+
+class ConnectorMetrics(object):
+    """ Counters and histograms describing the activity of all the
+    connection pools held by a :class:`.Connector`, summed across
+    those pools each time they are read.
+    """
+
+    def __init__(self, pools, lock):
+        # The dictionary of pools belongs to the connector, and is
+        # only changed while the lock is held.
+        self._pools = pools
+        self._lock = lock
+        self._retries = 0
+        self._retries_exhausted = 0
+        self._listeners = []
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, " ".join(
+            "%s=%r" % item for item in sorted(self.counters().items())))
+
+    acquires = _summed("acquires", "Number of connections acquired from all pools.")
+
+    releases = _summed("releases", "Number of connections released back to all pools.")
+
+    creations = _summed("creations", "Number of new connections opened by all pools.")
+
+    expirations = _summed("expirations", "Number of connections closed on exceeding "
+                                         "the maximum age.")
+
+    breakages = _summed("breakages", "Number of connections discarded on being found broken.")
+
+    timeouts = _summed("timeouts", "Number of acquire calls that gave up waiting.")
+
+    resets_sent = _summed("resets_sent", "Number of times a connection was reset on being "
+                                         "acquired or released.")
+
+    resets_avoided = _summed("resets_avoided", "Number of times a connection was acquired or "
+                                               "released without needing to be reset.")
+
+    @property
+    def retries(self):
+        """ Number of times a unit of work was retried after a
+        transient failure.
+        """
+        return self._retries + sum(metrics.retries for metrics in self.by_address().values())
+
+    @property
+    def retries_exhausted(self):
+        """ Number of units of work that failed with a retryable error
+        but were not retried again, as the retry policy was spent.
+        """
+        return self._retries_exhausted + sum(metrics.retries_exhausted
+                                             for metrics in self.by_address().values())
+
+    @property
+    def wait_time(self):
+        """ Time, in seconds, spent waiting for a connection by each
+        acquire call that had to wait, across all pools.
+        """
+        histogram = Histogram(WAIT_TIME_BOUNDS)
+        for metrics in self.by_address().values():
+            histogram.merge(metrics.wait_time)
+        return histogram
+
+    @property
+    def lifetime(self):
+        """ Age, in seconds, of each connection when it left its pool,
+        across all pools.
+        """
+        histogram = Histogram(LIFETIME_BOUNDS)
+        for metrics in self.by_address().values():
+            histogram.merge(metrics.lifetime)
+        return histogram
+
+    def by_address(self):
+        """ Return a dictionary of the :class:`.PoolMetrics` of each
+        pool, keyed by server address.
+        """
+        with self._lock:
+            return {address: pool.metrics for address, pool in self._pools.items()}
+
+    def counters(self):
+        """ Return a dictionary of the current value of each counter,
+        summed across all pools.
+        """
+        return {
+            "acquires": self.acquires,
+            "releases": self.releases,
+            "creations": self.creations,
+            "expirations": self.expirations,
+            "breakages": self.breakages,
+            "timeouts": self.timeouts,
+            "resets_sent": self.resets_sent,
+            "resets_avoided": self.resets_avoided,
+            "retries": self.retries,
+            "retries_exhausted": self.retries_exhausted,
+        }
+
+    def add_listener(self, listener):
+        """ Add a function to be called for each event of every pool,
+        with the name of the event and a value associated with it.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            for pool in self._pools.values():
+                pool.metrics.add_listener(listener)
+
+    def remove_listener(self, listener):
+        """ Remove a listener previously added.
+        """
+        with self._lock:
+            self._listeners.remove(listener)
+            for pool in self._pools.values():
+                pool.metrics.remove_listener(listener)
+
+    def _attach(self, metrics):
+        """ Add every listener to the metrics of a newly opened pool.
+        This must be called with the lock held.
+        """
+        for listener in self._listeners:
+            metrics.add_listener(listener)
+
+    def _record_retry(self, delay):
+        with self._lock:
+            self._retries += 1
+        self._emit("retry", delay)
+
+    def _record_give_up(self):
+        with self._lock:
+            self._retries_exhausted += 1
+        self._emit("give_up")
+
+    def _emit(self, event, value=None):
+        for listener in self._listeners:
+            listener(event, value)
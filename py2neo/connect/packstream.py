@@ -21,12 +21,13 @@
 
 from __future__ import division
 
-from codecs import decode
+from codecs import utf_8_decode
 from collections import namedtuple
-from struct import pack as struct_pack, unpack as struct_unpack
+from struct import Struct, pack as struct_pack, unpack as struct_unpack
+from sys import version_info
 
 from py2neo.connect import Hydrant
-from py2neo.internal.compat import Sequence, Mapping, bytes_types, integer_types, string_types, bstr
+from py2neo.internal.compat import Sequence, Mapping, integer_types, string_types, unicode_types, utf8_types
 
 
 PACKED_UINT_8 = [struct_pack(">B", value) for value in range(0x100)]
@@ -40,21 +41,50 @@ UNPACKED_MARKERS.update({bytes(bytearray([z])): z for z in range(0x00, 0x80)})
 UNPACKED_MARKERS.update({bytes(bytearray([z + 256])): z for z in range(-0x10, 0x00)})
 
 
+UINT_8 = Struct(">B")
+UINT_16 = Struct(">H")
+UINT_32 = Struct(">I")
+INT_8 = Struct(">b")
+INT_16 = Struct(">h")
+INT_32 = Struct(">i")
+INT_64 = Struct(">q")
+FLOAT_64 = Struct(">d")
+
+
 INT64_MIN = -(2 ** 63)
 INT64_MAX = 2 ** 63
 
 
+if version_info >= (3,):
+    _buffer = memoryview
+    _buffer_bytes = memoryview.tobytes
+else:
+    # Items of a Python 2 memoryview are one-byte strings rather
+    # than integers, so decode from a bytearray copy instead.
+    _buffer = bytearray
+    _buffer_bytes = bytes
+
+
 EndOfStream = object()
 
 
-class Structure:
+class Structure(object):
+    """ A PackStream structure, consisting of a tag and a fixed number
+    of fields.
+
+    Instances have no `__dict__` and hold their fields in a tuple, so
+    each structure costs one small object plus that tuple.
+    """
+
+    __slots__ = ("tag", "fields")
 
     def __init__(self, tag, *fields):
         self.tag = tag
-        self.fields = list(fields)
+        self.fields = fields
 
     def __repr__(self):
-        return "Structure[#%02X](%s)" % (self.tag, ", ".join(map(repr, self.fields)))
+        return "Structure[#%02X](%s)" % (ord(self.tag) if isinstance(self.tag, bytes) else self.tag,
+                                         ", ".join(map(repr, self.fields)))
 
     def __eq__(self, other):
         try:
@@ -65,649 +95,971 @@ class Structure:
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    __hash__ = None
+
     def __len__(self):
         return len(self.fields)
 
     def __getitem__(self, key):
         return self.fields[key]
 
-    def __setitem__(self, key, value):
-        self.fields[key] = value
+    def __iter__(self):
+        return iter(self.fields)
+
+
+def _new_structure(tag, fields):
+    """ Create a structure directly from a tag and a tuple of fields,
+    bypassing the argument handling of the constructor.
+    """
+    structure = _new_object(Structure)
+    structure.tag = tag
+    structure.fields = fields
+    return structure
 
 
-class Packer:
+_new_object = object.__new__
 
-    def __init__(self, stream):
-        self.stream = stream
-        self._write = self.stream.write
+
+class Packer(object):
+    """ PackStream encoder that writes directly into a single growable
+    buffer.
+
+    The encoding routine for each value is selected by looking up its
+    exact type in a dispatch table, falling back to a walk of the
+    method resolution order for subclasses of the supported types.
+    Encoded map keys are cached, since the same few keys tend to recur
+    across many maps.
+    """
+
+    def __init__(self, buffer=None):
+        self._buffer = bytearray() if buffer is None else buffer
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def getvalue(self):
+        """ Return a copy of all packed data as a bytes object.
+        """
+        return bytes(self._buffer)
 
     def pack_raw(self, data):
-        self._write(data)
+        self._buffer += data
 
     def pack(self, value):
-        return self._pack(value)
-
-    def _pack(self, value):
-        write = self._write
-
-        # None
-        if value is None:
-            write(b"\xC0")  # NULL
-
-        # Boolean
-        elif value is True:
-            write(b"\xC3")
-        elif value is False:
-            write(b"\xC2")
-
-        # Float (only double precision is supported)
-        elif isinstance(value, float):
-            write(b"\xC1")
-            write(struct_pack(">d", value))
-
-        # Integer
-        elif isinstance(value, integer_types):
-            if -0x10 <= value < 0x80:
-                write(PACKED_UINT_8[value % 0x100])
-            elif -0x80 <= value < -0x10:
-                write(b"\xC8")
-                write(PACKED_UINT_8[value % 0x100])
-            elif -0x8000 <= value < 0x8000:
-                write(b"\xC9")
-                write(PACKED_UINT_16[value % 0x10000])
-            elif -0x80000000 <= value < 0x80000000:
-                write(b"\xCA")
-                write(struct_pack(">i", value))
-            elif INT64_MIN <= value < INT64_MAX:
-                write(b"\xCB")
-                write(struct_pack(">q", value))
-            else:
-                raise OverflowError("Integer %s out of range" % value)
-
-        # String
-        elif isinstance(value, string_types):
-            encoded = bstr(value)
-            self.pack_string_header(len(encoded))
-            self.pack_raw(encoded)
-
-        # Bytes
-        elif isinstance(value, bytes_types):
-            self.pack_bytes_header(len(value))
-            self.pack_raw(bytes(value))
-
-        # List
-        elif isinstance(value, list):
-            self.pack_list_header(len(value))
-            for item in value:
-                self._pack(item)
-
-        # Map
-        elif isinstance(value, dict):
-            self.pack_map_header(len(value))
-            for key, item in value.items():
-                self._pack(key)
-                self._pack(item)
-
-        # Structure
-        elif isinstance(value, Structure):
-            self.pack_struct(value.tag, value.fields)
-
-        # Other
-        else:
-            raise TypeError("Values of type %s are not supported" % type(value))
+        return _pack_value(self._buffer, value)
 
     def pack_bytes_header(self, size):
-        write = self._write
-        if size < 0x100:
-            write(b"\xCC")
-            write(PACKED_UINT_8[size])
-        elif size < 0x10000:
-            write(b"\xCD")
-            write(PACKED_UINT_16[size])
-        elif size < 0x100000000:
-            write(b"\xCE")
-            write(struct_pack(">I", size))
-        else:
-            raise OverflowError("Bytes header size out of range")
+        _pack_header(self._buffer, size, 0xCC, 0xCD, 0xCE, "Bytes")
 
     def pack_string_header(self, size):
-        write = self._write
-        if size == 0x00:
-            write(b"\x80")
-        elif size == 0x01:
-            write(b"\x81")
-        elif size == 0x02:
-            write(b"\x82")
-        elif size == 0x03:
-            write(b"\x83")
-        elif size == 0x04:
-            write(b"\x84")
-        elif size == 0x05:
-            write(b"\x85")
-        elif size == 0x06:
-            write(b"\x86")
-        elif size == 0x07:
-            write(b"\x87")
-        elif size == 0x08:
-            write(b"\x88")
-        elif size == 0x09:
-            write(b"\x89")
-        elif size == 0x0A:
-            write(b"\x8A")
-        elif size == 0x0B:
-            write(b"\x8B")
-        elif size == 0x0C:
-            write(b"\x8C")
-        elif size == 0x0D:
-            write(b"\x8D")
-        elif size == 0x0E:
-            write(b"\x8E")
-        elif size == 0x0F:
-            write(b"\x8F")
-        elif size < 0x100:
-            write(b"\xD0")
-            write(PACKED_UINT_8[size])
-        elif size < 0x10000:
-            write(b"\xD1")
-            write(PACKED_UINT_16[size])
-        elif size < 0x100000000:
-            write(b"\xD2")
-            write(struct_pack(">I", size))
+        if size < 0x10:
+            self._buffer.append(0x80 + size)
         else:
-            raise OverflowError("String header size out of range")
+            _pack_header(self._buffer, size, 0xD0, 0xD1, 0xD2, "String")
 
     def pack_list_header(self, size):
-        write = self._write
-        if size == 0x00:
-            write(b"\x90")
-        elif size == 0x01:
-            write(b"\x91")
-        elif size == 0x02:
-            write(b"\x92")
-        elif size == 0x03:
-            write(b"\x93")
-        elif size == 0x04:
-            write(b"\x94")
-        elif size == 0x05:
-            write(b"\x95")
-        elif size == 0x06:
-            write(b"\x96")
-        elif size == 0x07:
-            write(b"\x97")
-        elif size == 0x08:
-            write(b"\x98")
-        elif size == 0x09:
-            write(b"\x99")
-        elif size == 0x0A:
-            write(b"\x9A")
-        elif size == 0x0B:
-            write(b"\x9B")
-        elif size == 0x0C:
-            write(b"\x9C")
-        elif size == 0x0D:
-            write(b"\x9D")
-        elif size == 0x0E:
-            write(b"\x9E")
-        elif size == 0x0F:
-            write(b"\x9F")
-        elif size < 0x100:
-            write(b"\xD4")
-            write(PACKED_UINT_8[size])
-        elif size < 0x10000:
-            write(b"\xD5")
-            write(PACKED_UINT_16[size])
-        elif size < 0x100000000:
-            write(b"\xD6")
-            write(struct_pack(">I", size))
+        if size < 0x10:
+            self._buffer.append(0x90 + size)
         else:
-            raise OverflowError("List header size out of range")
+            _pack_header(self._buffer, size, 0xD4, 0xD5, 0xD6, "List")
 
     def pack_list_stream_header(self):
-        self._write(b"\xD7")
+        self._buffer.append(0xD7)
 
     def pack_map_header(self, size):
-        write = self._write
-        if size == 0x00:
-            write(b"\xA0")
-        elif size == 0x01:
-            write(b"\xA1")
-        elif size == 0x02:
-            write(b"\xA2")
-        elif size == 0x03:
-            write(b"\xA3")
-        elif size == 0x04:
-            write(b"\xA4")
-        elif size == 0x05:
-            write(b"\xA5")
-        elif size == 0x06:
-            write(b"\xA6")
-        elif size == 0x07:
-            write(b"\xA7")
-        elif size == 0x08:
-            write(b"\xA8")
-        elif size == 0x09:
-            write(b"\xA9")
-        elif size == 0x0A:
-            write(b"\xAA")
-        elif size == 0x0B:
-            write(b"\xAB")
-        elif size == 0x0C:
-            write(b"\xAC")
-        elif size == 0x0D:
-            write(b"\xAD")
-        elif size == 0x0E:
-            write(b"\xAE")
-        elif size == 0x0F:
-            write(b"\xAF")
-        elif size < 0x100:
-            write(b"\xD8")
-            write(PACKED_UINT_8[size])
-        elif size < 0x10000:
-            write(b"\xD9")
-            write(PACKED_UINT_16[size])
-        elif size < 0x100000000:
-            write(b"\xDA")
-            write(struct_pack(">I", size))
+        if size < 0x10:
+            self._buffer.append(0xA0 + size)
         else:
-            raise OverflowError("Map header size out of range")
+            _pack_header(self._buffer, size, 0xD8, 0xD9, 0xDA, "Map")
 
     def pack_map_stream_header(self):
-        self._write(b"\xDB")
+        self._buffer.append(0xDB)
 
     def pack_struct(self, signature, fields):
-        if len(signature) != 1 or not isinstance(signature, bytes):
-            raise ValueError("Structure signature must be a single byte value")
-        write = self._write
-        size = len(fields)
-        if size == 0x00:
-            write(b"\xB0")
-        elif size == 0x01:
-            write(b"\xB1")
-        elif size == 0x02:
-            write(b"\xB2")
-        elif size == 0x03:
-            write(b"\xB3")
-        elif size == 0x04:
-            write(b"\xB4")
-        elif size == 0x05:
-            write(b"\xB5")
-        elif size == 0x06:
-            write(b"\xB6")
-        elif size == 0x07:
-            write(b"\xB7")
-        elif size == 0x08:
-            write(b"\xB8")
-        elif size == 0x09:
-            write(b"\xB9")
-        elif size == 0x0A:
-            write(b"\xBA")
-        elif size == 0x0B:
-            write(b"\xBB")
-        elif size == 0x0C:
-            write(b"\xBC")
-        elif size == 0x0D:
-            write(b"\xBD")
-        elif size == 0x0E:
-            write(b"\xBE")
-        elif size == 0x0F:
-            write(b"\xBF")
-        else:
-            raise OverflowError("Structure size out of range")
-        write(signature)
-        for field in fields:
-            self._pack(field)
+        _pack_struct(self._buffer, signature, fields)
 
     def pack_end_of_stream(self):
-        self._write(b"\xDF")
+        self._buffer.append(0xDF)
+
+
+MARKED_UINT_8 = Struct(">BB")
+MARKED_UINT_16 = Struct(">BH")
+MARKED_UINT_32 = Struct(">BI")
+MARKED_INT_8 = Struct(">Bb")
+MARKED_INT_16 = Struct(">Bh")
+MARKED_INT_32 = Struct(">Bi")
+MARKED_INT_64 = Struct(">Bq")
+MARKED_FLOAT_64 = Struct(">Bd")
+
+#: Upper bound on the number of encoded map keys retained in the cache.
+MAX_CACHED_KEYS = 4096
+
+#: Longest map key, in characters, that will be retained in the cache.
+MAX_CACHED_KEY_LENGTH = 64
+
+_encoded_keys = {}
+
+
+def _pack_value(b, value):
+    try:
+        f = _PACKERS[type(value)]
+    except KeyError:
+        f = _packer_for_subclass(type(value))
+    f(b, value)
+
+
+def _pack_header(b, size, marker_8, marker_16, marker_32, name):
+    if size < 0x100:
+        b += MARKED_UINT_8.pack(marker_8, size)
+    elif size < 0x10000:
+        b += MARKED_UINT_16.pack(marker_16, size)
+    elif size < 0x100000000:
+        b += MARKED_UINT_32.pack(marker_32, size)
+    else:
+        raise OverflowError("%s header size out of range" % name)
+
+
+def _pack_none(b, value):
+    b.append(0xC0)
+
+
+def _pack_bool(b, value):
+    b.append(0xC3 if value else 0xC2)
+
+
+def _pack_float(b, value):
+    b += MARKED_FLOAT_64.pack(0xC1, value)
+
+
+def _pack_int(b, value):
+    if -0x10 <= value < 0x80:
+        b.append(value & 0xFF)
+    elif -0x80 <= value < -0x10:
+        b += MARKED_INT_8.pack(0xC8, value)
+    elif -0x8000 <= value < 0x8000:
+        b += MARKED_INT_16.pack(0xC9, value)
+    elif -0x80000000 <= value < 0x80000000:
+        b += MARKED_INT_32.pack(0xCA, value)
+    elif INT64_MIN <= value < INT64_MAX:
+        b += MARKED_INT_64.pack(0xCB, value)
+    else:
+        raise OverflowError("Integer %s out of range" % value)
+
+
+def _pack_encoded_string(b, encoded):
+    size = len(encoded)
+    if size < 0x10:
+        b.append(0x80 + size)
+    else:
+        _pack_header(b, size, 0xD0, 0xD1, 0xD2, "String")
+    b += encoded
+
+
+def _pack_unicode(b, value):
+    _pack_encoded_string(b, value.encode("utf-8"))
+
+
+def _pack_bytes(b, value):
+    _pack_header(b, len(value), 0xCC, 0xCD, 0xCE, "Bytes")
+    b += value
+
+
+def _pack_list(b, value):
+    size = len(value)
+    if size < 0x10:
+        b.append(0x90 + size)
+    else:
+        _pack_header(b, size, 0xD4, 0xD5, 0xD6, "List")
+    packers = _PACKERS
+    for item in value:
+        f = packers.get(type(item)) or _packer_for_subclass(type(item))
+        f(b, item)
+
+
+def _encode_key(key):
+    """ Encode a map key, caching the result if the key is a
+    reasonably short string. Returns :py:const:`None` for keys
+    that cannot be cached.
+    """
+    if type(key) not in unicode_types or len(key) > MAX_CACHED_KEY_LENGTH:
+        return None
+    encoded = bytearray()
+    _pack_unicode(encoded, key)
+    encoded = bytes(encoded)
+    if len(_encoded_keys) >= MAX_CACHED_KEYS:
+        _encoded_keys.clear()
+    _encoded_keys[key] = encoded
+    return encoded
+
+
+def _pack_dict(b, value):
+    size = len(value)
+    if size < 0x10:
+        b.append(0xA0 + size)
+    else:
+        _pack_header(b, size, 0xD8, 0xD9, 0xDA, "Map")
+    packers = _PACKERS
+    keys = _encoded_keys
+    for key, item in value.items():
+        encoded = keys.get(key) or _encode_key(key)
+        if encoded is None:
+            _pack_value(b, key)
+        else:
+            b += encoded
+        f = packers.get(type(item)) or _packer_for_subclass(type(item))
+        f(b, item)
+
+
+def _pack_struct(b, signature, fields):
+    if len(signature) != 1 or not isinstance(signature, bytes):
+        raise ValueError("Structure signature must be a single byte value")
+    size = len(fields)
+    if size > 0x0F:
+        raise OverflowError("Structure size out of range")
+    b.append(0xB0 + size)
+    b += signature
+    for field in fields:
+        _pack_value(b, field)
+
+
+def _pack_structure(b, value):
+    _pack_struct(b, value.tag, value.fields)
+
+
+_PACKERS = {
+    type(None): _pack_none,
+    bool: _pack_bool,
+    float: _pack_float,
+    bytearray: _pack_bytes,
+    list: _pack_list,
+    dict: _pack_dict,
+    Structure: _pack_structure,
+}
+_PACKERS.update({t: _pack_int for t in integer_types})
+_PACKERS.update({t: _pack_unicode for t in unicode_types})
+_PACKERS.update({t: _pack_encoded_string for t in utf8_types})
+if bytes not in _PACKERS:
+    # Byte strings have always been sent as PackStream strings, with
+    # only bytearray values being treated as byte arrays.
+    _PACKERS[bytes] = _pack_encoded_string
+
+
+def _packer_for_subclass(cls):
+    """ Find the encoding routine for a subclass of one of the
+    supported types, caching it for next time.
+    """
+    for base in cls.__mro__[1:]:
+        try:
+            f = _PACKERS[base]
+        except KeyError:
+            continue
+        else:
+            _PACKERS[cls] = f
+            return f
+    raise TypeError("Values of type %s are not supported" % cls)
 
 
 class UnpackStream(object):
+    """ Decoder for a buffer of PackStream-encoded values.
+
+    The handler for each value is selected by looking up its marker
+    byte in a 256-entry table. Fixed-width values are read in place
+    using precompiled :class:`struct.Struct` objects, so the buffer
+    is only ever sliced to extract the content of strings and bytes.
+    """
 
     def __init__(self, b):
-        self._mem = memoryview(b)
+        self._mem = _buffer(b)
         self._p = 0
 
     def unpack(self):
-        if self._p < len(self._mem):
-            marker = self._read_u8()
-        else:
+        p = self._p
+        try:
+            marker = self._mem[p]
+        except IndexError:
             raise ValueError("Nothing to unpack")  # TODO: better error
+        self._p = p + 1
+        return _UNPACKERS[marker](self, marker)
 
-        # Tiny Integer
-        if 0x00 <= marker <= 0x7F:
-            return marker
-        elif 0xF0 <= marker <= 0xFF:
-            return marker - 0x100
+    def unpack_structure_header(self):
+        """ Unpack the marker and tag byte that introduce a structure,
+        returning the number of fields and the tag.
+        """
+        p = self._p
+        try:
+            marker = self._mem[p]
+            tag = self._mem[p + 1]
+        except IndexError:
+            raise ValueError("Nothing to unpack")
+        if not 0xB0 <= marker <= 0xBF:
+            raise ValueError("Expected structure, found marker %02X" % marker)
+        self._p = p + 2
+        return marker & 0x0F, tag
 
-        # Null
-        elif marker == 0xC0:
-            return None
+    def skip(self):
+        """ Move past the next value without unpacking it.
+        """
+        self._p = _skip(self._mem, self._p, 1)
 
-        # Float
-        elif marker == 0xC1:
-            return self._read_f64be()
 
-        # Boolean
-        elif marker == 0xC2:
-            return False
-        elif marker == 0xC3:
-            return True
-
-        # Integer
-        elif marker == 0xC8:
-            return self._read_i8()
-        elif marker == 0xC9:
-            return self._read_i16be()
-        elif marker == 0xCA:
-            return self._read_i32be()
-        elif marker == 0xCB:
-            return self._read_i64be()
-
-        # Bytes
-        elif marker == 0xCC:
-            size = self._read_u8()
-            return self._read(size)
-        elif marker == 0xCD:
-            size = self._read_u16be()
-            return self._read(size)
-        elif marker == 0xCE:
-            size = self._read_u32be()
-            return self._read(size)
+def _constant_unpacker(value):
 
-        else:
-            marker_high = marker & 0xF0
-            # String
-            if marker_high == 0x80:  # TINY_STRING
-                return decode(self._read(marker & 0x0F), "utf-8")
-            elif marker == 0xD0:  # STRING_8:
-                size = self._read_u8()
-                return decode(self._read(size), "utf-8")
-            elif marker == 0xD1:  # STRING_16:
-                size = self._read_u16be()
-                return decode(self._read(size), "utf-8")
-            elif marker == 0xD2:  # STRING_32:
-                size = self._read_u32be()
-                return decode(self._read(size), "utf-8")
-
-            # List
-            elif 0x90 <= marker <= 0x9F or 0xD4 <= marker <= 0xD7:
-                return list(self._unpack_list_items(marker))
-
-            # Dictionary
-            elif 0xA0 <= marker <= 0xAF or 0xD8 <= marker <= 0xDB:
-                return self._unpack_dictionary(marker)
-
-            # Structure
-            elif 0xB0 <= marker <= 0xBF:
-                size, tag = self._unpack_structure_header(marker)
-                value = Structure(tag, *([None] * size))
-                for i in range(len(value)):
-                    value[i] = self.unpack()
-                return value
-
-            elif marker == 0xDF:  # END_OF_STREAM:
-                return EndOfStream
+    def unpack_constant(s, marker):
+        return value
 
-            else:
-                raise ValueError("Unknown PackStream marker %02X" % marker)
-
-    def _unpack_list_items(self, marker):
-        marker_high = marker & 0xF0
-        if marker_high == 0x90:
-            size = marker & 0x0F
-            if size == 0:
-                return
-            elif size == 1:
-                yield self.unpack()
-            else:
-                for _ in range(size):
-                    yield self.unpack()
-        elif marker == 0xD4:  # LIST_8:
-            size = self._read_u8()
-            for _ in range(size):
-                yield self.unpack()
-        elif marker == 0xD5:  # LIST_16:
-            size = self._read_u16be()
-            for _ in range(size):
-                yield self.unpack()
-        elif marker == 0xD6:  # LIST_32:
-            size = self._read_u32be()
-            for _ in range(size):
-                yield self.unpack()
-        elif marker == 0xD7:  # LIST_STREAM:
-            item = None
-            while item is not EndOfStream:
-                item = self.unpack()
-                if item is not EndOfStream:
-                    yield item
-        else:
-            return
-
-    def _unpack_dictionary(self, marker):
-        marker_high = marker & 0xF0
-        if marker_high == 0xA0:
-            size = marker & 0x0F
-            value = {}
-            for _ in range(size):
-                key = self.unpack()
-                value[key] = self.unpack()
-            return value
-        elif marker == 0xD8:  # MAP_8:
-            size = self._read_u8()
-            value = {}
-            for _ in range(size):
-                key = self.unpack()
-                value[key] = self.unpack()
-            return value
-        elif marker == 0xD9:  # MAP_16:
-            size = self._read_u16be()
-            value = {}
-            for _ in range(size):
-                key = self.unpack()
-                value[key] = self.unpack()
-            return value
-        elif marker == 0xDA:  # MAP_32:
-            size = self._read_u32be()
-            value = {}
-            for _ in range(size):
-                key = self.unpack()
-                value[key] = self.unpack()
-            return value
-        elif marker == 0xDB:  # MAP_STREAM:
-            value = {}
-            key = None
-            while key is not EndOfStream:
-                key = self.unpack()
-                if key is not EndOfStream:
-                    value[key] = self.unpack()
-            return value
-        else:
-            return None
+    return unpack_constant
+
+
+def _unpack_tiny_int(s, marker):
+    return marker
+
+
+def _unpack_negative_tiny_int(s, marker):
+    return marker - 0x100
+
+
+def _fixed_width_unpacker(struct):
+    unpack_from = struct.unpack_from
+    size = struct.size
+
+    def unpack_fixed_width(s, marker):
+        p = s._p
+        s._p = p + size
+        return unpack_from(s._mem, p)[0]
+
+    return unpack_fixed_width
+
+
+def _unpack_tiny_size(s, marker):
+    return marker & 0x0F
+
+
+_unpack_u8 = _fixed_width_unpacker(UINT_8)
+_unpack_u16 = _fixed_width_unpacker(UINT_16)
+_unpack_u32 = _fixed_width_unpacker(UINT_32)
+
+
+def _bytes_unpacker(unpack_size):
+
+    def unpack_bytes(s, marker):
+        size = unpack_size(s, marker)
+        p = s._p
+        q = p + size
+        s._p = q
+        return bytes(s._mem[p:q])
+
+    return unpack_bytes
+
+
+#: Upper bound on the number of decoded strings retained for reuse.
+MAX_INTERNED_STRINGS = 4096
+
+#: Longest string, in bytes, that will be retained for reuse.
+MAX_INTERNED_STRING_LENGTH = 64
+
+_interned_strings = {}
+
+
+def _decode_interned(data):
+    """ Decode a short UTF-8 string, returning the same string object
+    that was returned for the same bytes last time, if still cached.
+    Map keys, labels and relationship types repeat throughout most
+    results, so this saves both the decoding and the memory otherwise
+    taken by each duplicate.
+    """
+    key = _buffer_bytes(data)
+    value = _interned_strings.get(key)
+    if value is None:
+        value = utf_8_decode(key, "strict", True)[0]
+        if len(_interned_strings) >= MAX_INTERNED_STRINGS:
+            _interned_strings.clear()
+        _interned_strings[key] = value
+    return value
+
+
+def _unpack_interned(s):
+    """ Unpack the next value, which is expected to be a map key, a
+    label or a relationship type. If it is a short string, it is
+    decoded through the cache of interned strings.
+
+    Other string values, such as property values, are often unique,
+    so these are decoded directly instead, keeping the cache free for
+    the strings that do repeat.
+    """
+    p = s._p
+    try:
+        marker = s._mem[p]
+    except IndexError:
+        raise ValueError("Nothing to unpack")
+    if 0x80 <= marker <= 0x8F:
+        q = p + 1 + (marker & 0x0F)
+        s._p = q
+        return _decode_interned(s._mem[p + 1:q])
+    if marker == 0xD0:
+        size = s._mem[p + 1]
+        if size <= MAX_INTERNED_STRING_LENGTH:
+            q = p + 2 + size
+            s._p = q
+            return _decode_interned(s._mem[p + 2:q])
+    return s.unpack()
 
-    def _unpack_structure_header(self, marker):
-        marker_high = marker & 0xF0
-        if marker_high == 0xB0:  # TINY_STRUCT
-            signature = self._read_u8()
-            return marker & 0x0F, signature
-        else:
-            raise ValueError("Expected structure, found marker %02X" % marker)
 
-    def _read(self, n=1):
-        q = self._p + n
-        m = self._mem[self._p:q]
-        self._p = q
-        return m.tobytes()
-
-    def _read_u8(self):
-        q = self._p + 1
-        n, = struct_unpack(">B", self._mem[self._p:q])
-        self._p = q
-        return n
-
-    def _read_u16be(self):
-        q = self._p + 2
-        n, = struct_unpack(">H", self._mem[self._p:q])
-        self._p = q
-        return n
-
-    def _read_u32be(self):
-        q = self._p + 4
-        n, = struct_unpack(">I", self._mem[self._p:q])
-        self._p = q
-        return n
-
-    def _read_i8(self):
-        q = self._p + 1
-        z, = struct_unpack(">b", self._mem[self._p:q])
-        self._p = q
-        return z
-
-    def _read_i16be(self):
-        q = self._p + 2
-        z, = struct_unpack(">h", self._mem[self._p:q])
-        self._p = q
-        return z
-
-    def _read_i32be(self):
-        q = self._p + 4
-        z, = struct_unpack(">i", self._mem[self._p:q])
-        self._p = q
-        return z
-
-    def _read_i64be(self):
-        q = self._p + 8
-        z, = struct_unpack(">q", self._mem[self._p:q])
-        self._p = q
-        return z
-
-    def _read_f64be(self):
-        q = self._p + 8
-        r, = struct_unpack(">d", self._mem[self._p:q])
-        self._p = q
-        return r
+def _unpack_interned_list(s):
+    """ Unpack the next value, which is expected to be a list of
+    labels, interning each item.
+    """
+    p = s._p
+    try:
+        marker = s._mem[p]
+    except IndexError:
+        raise ValueError("Nothing to unpack")
+    if 0x90 <= marker <= 0x9F:
+        s._p = p + 1
+        return [_unpack_interned(s) for _ in range(marker & 0x0F)]
+    return s.unpack()
+
+
+def _unpack_tiny_string(s, marker):
+    p = s._p
+    q = p + (marker & 0x0F)
+    s._p = q
+    return utf_8_decode(s._mem[p:q], "strict", True)[0]
+
+
+def _string_unpacker(unpack_size):
+
+    def unpack_string(s, marker):
+        size = unpack_size(s, marker)
+        p = s._p
+        q = p + size
+        s._p = q
+        return utf_8_decode(s._mem[p:q], "strict", True)[0]
+
+    return unpack_string
+
+
+def _list_unpacker(unpack_size):
+
+    def unpack_list(s, marker):
+        unpack = s.unpack
+        return [unpack() for _ in range(unpack_size(s, marker))]
+
+    return unpack_list
+
+
+def _unpack_list_stream(s, marker):
+    unpack = s.unpack
+    value = []
+    item = unpack()
+    while item is not EndOfStream:
+        value.append(item)
+        item = unpack()
+    return value
+
+
+def _map_unpacker(unpack_size):
+
+    def unpack_map(s, marker):
+        unpack = s.unpack
+        value = {}
+        for _ in range(unpack_size(s, marker)):
+            key = _unpack_interned(s)
+            value[key] = unpack()
+        return value
+
+    return unpack_map
+
+
+def _unpack_map_stream(s, marker):
+    unpack = s.unpack
+    value = {}
+    key = _unpack_interned(s)
+    while key is not EndOfStream:
+        value[key] = unpack()
+        key = _unpack_interned(s)
+    return value
+
+
+def _unpack_tiny_struct(s, marker):
+    tag = _unpack_u8(s, marker)
+    size = marker & 0x0F
+    field_unpackers = _FIELD_UNPACKERS.get((tag, size))
+    if field_unpackers is None:
+        unpack = s.unpack
+        return _new_structure(tag, tuple([unpack() for _ in range(size)]))
+    return _new_structure(tag, tuple([unpack_field(s) for unpack_field in field_unpackers]))
+
+
+def _field_unpackers(size, index, unpack_field):
+    unpackers = [UnpackStream.unpack] * size
+    unpackers[index] = unpack_field
+    return tuple(unpackers)
+
+
+#: Functions used to unpack each field of the graph structures that
+#: hold labels or a relationship type, keyed by tag and number of
+#: fields. Both the original and the Bolt 5 layouts are listed.
+_FIELD_UNPACKERS = {
+    (0x4E, 3): _field_unpackers(3, 1, _unpack_interned_list),  # Node
+    (0x4E, 4): _field_unpackers(4, 1, _unpack_interned_list),
+    (0x52, 5): _field_unpackers(5, 3, _unpack_interned),       # Relationship
+    (0x52, 8): _field_unpackers(8, 3, _unpack_interned),
+    (0x72, 3): _field_unpackers(3, 1, _unpack_interned),       # UnboundRelationship
+    (0x72, 4): _field_unpackers(4, 1, _unpack_interned),
+}
+
+
+def _unpack_unknown(s, marker):
+    raise ValueError("Unknown PackStream marker %02X" % marker)
+
+
+def _build_unpackers():
+    table = [_unpack_unknown] * 0x100
+    for marker in range(0x00, 0x80):
+        table[marker] = _unpack_tiny_int
+    for marker in range(0xF0, 0x100):
+        table[marker] = _unpack_negative_tiny_int
+    for marker in range(0x80, 0x90):
+        table[marker] = _unpack_tiny_string
+    for marker in range(0x90, 0xA0):
+        table[marker] = _list_unpacker(_unpack_tiny_size)
+    for marker in range(0xA0, 0xB0):
+        table[marker] = _map_unpacker(_unpack_tiny_size)
+    for marker in range(0xB0, 0xC0):
+        table[marker] = _unpack_tiny_struct
+    table[0xC0] = _constant_unpacker(None)
+    table[0xC1] = _fixed_width_unpacker(FLOAT_64)
+    table[0xC2] = _constant_unpacker(False)
+    table[0xC3] = _constant_unpacker(True)
+    table[0xC8] = _fixed_width_unpacker(INT_8)
+    table[0xC9] = _fixed_width_unpacker(INT_16)
+    table[0xCA] = _fixed_width_unpacker(INT_32)
+    table[0xCB] = _fixed_width_unpacker(INT_64)
+    table[0xCC] = _bytes_unpacker(_unpack_u8)
+    table[0xCD] = _bytes_unpacker(_unpack_u16)
+    table[0xCE] = _bytes_unpacker(_unpack_u32)
+    table[0xD0] = _string_unpacker(_unpack_u8)
+    table[0xD1] = _string_unpacker(_unpack_u16)
+    table[0xD2] = _string_unpacker(_unpack_u32)
+    table[0xD4] = _list_unpacker(_unpack_u8)
+    table[0xD5] = _list_unpacker(_unpack_u16)
+    table[0xD6] = _list_unpacker(_unpack_u32)
+    table[0xD7] = _unpack_list_stream
+    table[0xD8] = _map_unpacker(_unpack_u8)
+    table[0xD9] = _map_unpacker(_unpack_u16)
+    table[0xDA] = _map_unpacker(_unpack_u32)
+    table[0xDB] = _unpack_map_stream
+    table[0xDF] = _constant_unpacker(EndOfStream)
+    return table
+
+
+_UNPACKERS = _build_unpackers()
+
+
+def _skip(mem, p, n):
+    """ Return the position that follows the `n` values packed from
+    position `p` onwards, without unpacking any of them.
+    """
+    skippers = _SKIPPERS
+    while n:
+        try:
+            marker = mem[p]
+        except IndexError:
+            raise ValueError("Nothing to skip")
+        # Each skipper returns the position after the value header and
+        # content, along with the number of nested values that follow.
+        p, count = skippers[marker](mem, p + 1, marker)
+        n += count - 1
+    return p
+
+
+def _fixed_width_skipper(width):
+
+    def skip_fixed_width(mem, p, marker):
+        return p + width, 0
+
+    return skip_fixed_width
+
+
+def _skip_tiny_string(mem, p, marker):
+    return p + (marker & 0x0F), 0
+
+
+def _skip_tiny_list(mem, p, marker):
+    return p, marker & 0x0F
+
+
+def _skip_tiny_map(mem, p, marker):
+    return p, 2 * (marker & 0x0F)
+
+
+def _skip_tiny_struct(mem, p, marker):
+    return p + 1, marker & 0x0F
+
+
+def _sized_skipper(size_struct, width, count):
+
+    size_width = size_struct.size
+    unpack_size_from = size_struct.unpack_from
+
+    def skip_sized(mem, p, marker):
+        size, = unpack_size_from(mem, p)
+        return p + size_width + width * size, count * size
+
+    return skip_sized
+
+
+def _skip_stream(mem, p, marker):
+    while mem[p] != 0xDF:
+        p = _skip(mem, p, 1)
+    return p + 1, 0
+
+
+def _skip_unknown(mem, p, marker):
+    raise ValueError("Unknown PackStream marker %02X" % marker)
+
+
+def _build_skippers():
+    table = [_skip_unknown] * 0x100
+    for marker in range(0x00, 0x80):
+        table[marker] = _fixed_width_skipper(0)
+    for marker in range(0xF0, 0x100):
+        table[marker] = _fixed_width_skipper(0)
+    for marker in range(0x80, 0x90):
+        table[marker] = _skip_tiny_string
+    for marker in range(0x90, 0xA0):
+        table[marker] = _skip_tiny_list
+    for marker in range(0xA0, 0xB0):
+        table[marker] = _skip_tiny_map
+    for marker in range(0xB0, 0xC0):
+        table[marker] = _skip_tiny_struct
+    for marker in (0xC0, 0xC2, 0xC3, 0xDF):
+        table[marker] = _fixed_width_skipper(0)
+    table[0xC1] = _fixed_width_skipper(8)
+    table[0xC8] = _fixed_width_skipper(1)
+    table[0xC9] = _fixed_width_skipper(2)
+    table[0xCA] = _fixed_width_skipper(4)
+    table[0xCB] = _fixed_width_skipper(8)
+    for marker, size_struct in ((0xCC, UINT_8), (0xCD, UINT_16), (0xCE, UINT_32),
+                                (0xD0, UINT_8), (0xD1, UINT_16), (0xD2, UINT_32)):
+        table[marker] = _sized_skipper(size_struct, 1, 0)
+    for marker, size_struct in ((0xD4, UINT_8), (0xD5, UINT_16), (0xD6, UINT_32)):
+        table[marker] = _sized_skipper(size_struct, 0, 1)
+    for marker, size_struct in ((0xD8, UINT_8), (0xD9, UINT_16), (0xDA, UINT_32)):
+        table[marker] = _sized_skipper(size_struct, 0, 2)
+    table[0xD7] = _skip_stream
+    table[0xDB] = _skip_stream
+    return table
+
+
+_SKIPPERS = _build_skippers()
+
+
+_INT_STRUCTS = (INT_8, INT_16, INT_32, INT_64)
+
+
+class PackedList(object):
+    """ A list of values held in packed form, from which each item is
+    only unpacked when it is accessed.
+
+    Items are located by skipping over those that precede them, and
+    only as far as the furthest item requested so far. Items are not
+    cached, so each access unpacks the item afresh.
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._size = None
+        self._offsets = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __len__(self):
+        if self._size is None:
+            self._unpack_header()
+        return self._size
+
+    def __getitem__(self, index):
+        if self._size is None:
+            self._unpack_header()
+        size = self._size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("PackedList index out of range")
+        offsets = self._offsets
+        if index >= len(offsets):
+            mem = _buffer(self._data)
+            p = offsets[-1]
+            while index >= len(offsets):
+                p = _skip(mem, p, 1)
+                offsets.append(p)
+        unpacker = UnpackStream(self._data)
+        unpacker._p = offsets[index]
+        return unpacker.unpack()
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def unpack(self):
+        """ Unpack all items at once, returning them as a list.
+        """
+        return UnpackStream(self._data).unpack()
+
+    def _unpack_header(self):
+        mem = _buffer(self._data)
+        try:
+            marker = mem[0]
+        except IndexError:
+            raise ValueError("Nothing to unpack")
+        if not (0x90 <= marker <= 0x9F or 0xD4 <= marker <= 0xD6):
+            raise ValueError("Expected list, found marker %02X" % marker)
+        p, self._size = _SKIPPERS[marker](mem, 1, marker)
+        self._offsets = [p]
+
+    def unpack_into(self, columns, unpack_other=None):
+        """ Unpack each item straight into the column at the same
+        index, without first collecting the items into a tuple.
+
+        Nulls, booleans, integers and floats are read directly from
+        the packed data and passed to the ``append_null``,
+        ``append_bool``, ``append_int`` and ``append_float`` methods
+        of the column respectively. Any other item is unpacked as
+        usual, passed through `unpack_other` (if given) together with
+        its index, and then passed to the ``append`` method.
+        """
+        if self._size is None:
+            self._unpack_header()
+        data = self._data
+        mem = _buffer(data)
+        p = self._offsets[0]
+        for i in range(self._size):
+            column = columns[i]
+            marker = mem[p]
+            if marker < 0x80:
+                column.append_int(marker)
+                p += 1
+            elif marker >= 0xF0:
+                column.append_int(marker - 0x100)
+                p += 1
+            elif marker == 0xC1:
+                column.append_float(FLOAT_64.unpack_from(mem, p + 1)[0])
+                p += 9
+            elif marker == 0xC0:
+                column.append_null()
+                p += 1
+            elif 0xC8 <= marker <= 0xCB:
+                struct = _INT_STRUCTS[marker - 0xC8]
+                column.append_int(struct.unpack_from(mem, p + 1)[0])
+                p += 1 + struct.size
+            elif marker == 0xC2 or marker == 0xC3:
+                column.append_bool(marker == 0xC3)
+                p += 1
+            else:
+                unpacker = UnpackStream(data)
+                unpacker._p = p
+                value = unpacker.unpack()
+                p = unpacker._p
+                if unpack_other is not None:
+                    value = unpack_other(i, value)
+                column.append(value)
 
 
 def packed(*values):
-    from io import BytesIO
-    b = BytesIO()
-    packer = Packer(b)
+    packer = Packer()
     for value in values:
         packer.pack(value)
-    return b.getvalue()
+    return packer.getvalue()
 
 
 class MessageReader(object):
-
-    def __init__(self, rx):
+    """ Reader for chunked Bolt messages.
+
+    A message carried in a single chunk (the vast majority) is decoded
+    directly from the receive buffer, without being copied. Messages
+    that span several chunks are joined into one buffer, copying each
+    chunk exactly once.
+
+    If `lazy_records` is set, the values carried by each RECORD message
+    are returned as a :class:`.PackedList` over a copy of the raw data
+    instead of being unpacked immediately. The same can be requested
+    for a single message by passing `pack_records` to
+    :meth:`.read_message`.
+
+    A RECORD message may also be skipped entirely, by passing
+    `skip_records` to :meth:`.read_message`. In this case, the size of
+    the message in bytes is returned in place of its fields. The size
+    of the last message read, skipped or not, is also available as
+    :attr:`.size`.
+    """
+
+    def __init__(self, rx, lazy_records=False):
         self.rx = rx
-
-    def _read_chunk(self):
-        size, = struct_unpack(">H", self.rx.read(2))
-        if size:
-            return self.rx.read(size)
-        else:
-            return b""
-
-    def read_message(self):
-        message = bytearray()
-        more = True
-        while more:
-            chunk = self._read_chunk()
-            if chunk:
-                message.extend(chunk)
-            else:
-                more = False
-        _, n = divmod(message[0], 0x10)
-        tag = message[1]
-        unpacker = UnpackStream(message[2:])
-        fields = tuple(unpacker.unpack() for _ in range(n))
-        return tag, fields
+        self.lazy_records = lazy_records
+        self.size = 0
+
+    def read_message(self, skip_records=False, pack_records=False):
+        rx = self.rx
+        lazy_records = self.lazy_records or pack_records
+        size = 0
+        while size == 0:
+            # Empty chunks between messages carry no data and can
+            # simply be skipped over.
+            size, = UINT_16.unpack(rx.read(2))
+        # Read each chunk together with the header of the one that
+        # follows, so that a message ending after this chunk can be
+        # recognised without reading any further.
+        view = rx.read_view(size + 2)
+        next_size, = UINT_16.unpack(view[size:])
+        if next_size == 0:
+            self.size = size
+            return _unpack_message(view[:size], lazy_records, skip_records)
+        message = bytearray(view[:size])
+        del view
+        while next_size:
+            view = rx.read_view(next_size + 2)
+            message += view[:next_size]
+            next_size, = UINT_16.unpack(view[next_size:])
+            del view
+        self.size = len(message)
+        return _unpack_message(message, lazy_records, skip_records)
+
+
+def _unpack_message(buffer, lazy_records=False, skip_records=False):
+    unpacker = UnpackStream(buffer)
+    size, tag = unpacker.unpack_structure_header()
+    if skip_records and tag == 0x71:
+        return tag, len(buffer)
+    if lazy_records and tag == 0x71 and size == 1:
+        # The buffer may belong to the wire, so the record data
+        # must be copied out before it can be kept.
+        return tag, (PackedList(bytearray(buffer[unpacker._p:])),)
+    unpack = unpacker.unpack
+    return tag, tuple([unpack() for _ in range(size)])
 
 
 class MessageWriter(object):
 
+    max_chunk_size = 0x7FFF
+
     def __init__(self, tx):
         self._tx = tx
 
-    def _write_chunk(self, data):
-        size = len(data)
-        self._tx.write(struct_pack(">H", size))
-        self._tx.write(data)
-
     def write_message(self, tag, *fields):
-        data = bytearray([0xB0 + len(fields), tag])
+        data = bytearray((0xB0 + len(fields), tag))
         for field in fields:
-            data.extend(packed(field))
-        for offset in range(0, len(data), 32767):
-            end = offset + 32767
-            self._write_chunk(data[offset:end])
-        self._write_chunk(b"")
+            _pack_value(data, field)
+        write = self._tx.write
+        size = len(data)
+        if size <= self.max_chunk_size:
+            write(UINT_16.pack(size))
+            write(data)
+        else:
+            view = memoryview(data)
+            for offset in range(0, size, self.max_chunk_size):
+                end = min(offset + self.max_chunk_size, size)
+                write(UINT_16.pack(end - offset))
+                write(view[offset:end])
+        write(b"\x00\x00")
 
     def send(self):
         return self._tx.send()
 
 
+def _protocol_version(version):
+    if version is None:
+        return 1, 0
+    elif isinstance(version, tuple):
+        return version
+    else:
+        return version, 0
+
+
+def _tagged(functions):
+    """ Index a dictionary of structure functions by both the byte tag
+    and its integer equivalent, so that structures can be matched
+    without converting the tag on every lookup.
+    """
+    tagged = dict(functions)
+    tagged.update({ord(tag): f for tag, f in functions.items()})
+    return tagged
+
+
 class PackStreamHydrant(Hydrant):
+    """ Hydrant for values carried over Bolt.
+
+    The functions used to convert between PackStream and native
+    values are built on first use for each protocol version and then
+    reused for every subsequent record, rather than being rebuilt for
+    every value.
+    """
 
     def __init__(self, graph):
         self.graph = graph
+        self._hydrators = {}
+        self._dehydrators = {}
 
     def hydrate(self, keys, values, entities=None, version=None):
         """ Convert PackStream values into native values.
         """
-        if version is None:
-            v = (1, 0)
-        elif isinstance(version, tuple):
-            v = version
+        v = _protocol_version(version)
+        try:
+            hydrate_object = self._hydrators[v]
+        except KeyError:
+            hydrate_object = self._hydrators[v] = self._compile_hydrator(v)
+        if entities:
+            return tuple(hydrate_object(value, entities.get(keys[i]))
+                         for i, value in enumerate(values))
         else:
-            v = (version, 0)
-        if entities is None:
-            entities = {}
-        return tuple(self._hydrate(value, entities.get(keys[i]), v)
-                     for i, value in enumerate(values))
+            return tuple(map(hydrate_object, values))
 
-    def _hydrate(self, obj, inst=None, version=None):
+    def _compile_hydrator(self, version):
         from neotime import Duration, Date, Time, DateTime
         from pytz import FixedOffset, timezone
         from py2neo.data import Node, Relationship, Path
         from py2neo.spatial import Point
 
+        graph = self.graph
         unbound_relationship = namedtuple("UnboundRelationship", ["id", "type", "properties"])
         unix_epoch_date = Date(1970, 1, 1)
         unix_epoch_date_ordinal = unix_epoch_date.to_ordinal()
 
-        def hydrate_object(o):
-            if isinstance(o, Structure):
-                tag = o.tag if isinstance(o.tag, bytes) else bytes(bytearray([o.tag]))
-                try:
-                    f = functions[tag]
-                except KeyError:
-                    # If we don't recognise the structure type, just return it as-is
-                    return o
-                else:
+        def hydrate_object(o, inst=None):
+            t = type(o)
+            if t is list:
+                return [hydrate_object(value, inst) for value in o]
+            elif t is dict:
+                return {key: hydrate_object(value, inst) for key, value in o.items()}
+            elif t is Structure:
+                tag = o.tag
+                f = entity_functions.get(tag)
+                if f is not None:
+                    return f(inst, *o.fields)
+                f = functions.get(tag)
+                if f is not None:
                     return f(*o.fields)
-            elif isinstance(o, list):
-                return list(map(hydrate_object, o))
-            elif isinstance(o, dict):
-                return {key: hydrate_object(value) for key, value in o.items()}
+                # If we don't recognise the structure type, just return it as-is
+                return o
             else:
                 return o
 
-        def hydrate_node(identity, labels, properties):
-            return Node.hydrate(self.graph, identity, labels, hydrate_object(properties), into=inst)
+        def hydrate_node(inst, identity, labels, properties):
+            return Node.hydrate(graph, identity, labels, hydrate_object(properties, inst), into=inst)
 
-        def hydrate_relationship(identity, start_node_id, end_node_id, r_type, properties):
-            return Relationship.hydrate(self.graph, identity, start_node_id, end_node_id,
-                                        r_type, hydrate_object(properties), into=inst)
+        def hydrate_relationship(inst, identity, start_node_id, end_node_id, r_type, properties):
+            return Relationship.hydrate(graph, identity, start_node_id, end_node_id,
+                                        r_type, hydrate_object(properties, inst), into=inst)
 
         def hydrate_path(nodes, relationships, sequence):
-            nodes = [Node.hydrate(self.graph, n_id, n_label, hydrate_object(n_properties))
+            nodes = [Node.hydrate(graph, n_id, n_label, hydrate_object(n_properties))
                      for n_id, n_label, n_properties in nodes]
             u_rels = []
             for r_id, r_type, r_properties in relationships:
                 u_rel = unbound_relationship(r_id, r_type, hydrate_object(r_properties))
                 u_rels.append(u_rel)
-            return Path.hydrate(self.graph, nodes, u_rels, sequence)
+            return Path.hydrate(graph, nodes, u_rels, sequence)
 
         def hydrate_date(days):
             """ Hydrator for `Date` values.
@@ -785,9 +1137,11 @@ class PackStreamHydrant(Hydrant):
                     raise ValueError("SRID %d requires %d coordinates (%d provided)" % (srid, dim, len(coordinates)))
                 return point_class(coordinates)
 
-        functions = {
+        entity_functions = _tagged({
             b"N": hydrate_node,
             b"R": hydrate_relationship,
+        })
+        functions = {
             b"P": hydrate_path,
         }
         if version >= (2, 0):
@@ -802,25 +1156,29 @@ class PackStreamHydrant(Hydrant):
                 b"X": hydrate_point,
                 b"Y": hydrate_point,
             })
+        functions = _tagged(functions)
 
-        return hydrate_object(obj)
+        return hydrate_object
 
     def dehydrate(self, data, version=None):
         """ Dehydrate to PackStream.
         """
+        v = _protocol_version(version)
+        try:
+            dehydrate_object = self._dehydrators[v]
+        except KeyError:
+            dehydrate_object = self._dehydrators[v] = self._compile_dehydrator(v)
+        return dehydrate_object(data)
+
+    def _compile_dehydrator(self, version):
         from datetime import date, time, datetime, timedelta
         from neotime import Duration, Date, Time, DateTime
         from pytz import utc
         from py2neo.spatial import Point
 
         unix_epoch_date = Date(1970, 1, 1)
-
-        if version is None:
-            v = (1, 0)
-        elif isinstance(version, tuple):
-            v = version
-        else:
-            v = (version, 0)
+        unix_epoch_date_ordinal = unix_epoch_date.toordinal()
+        supports_points = version >= (2, 0)
 
         def dehydrate_object(x):
             t = type(x)
@@ -842,6 +1200,11 @@ class PackStreamHydrant(Hydrant):
                         raise TypeError("Dictionary keys must be strings")
                     d[key] = dehydrate_object(x[key])
                 return d
+            elif supports_points and isinstance(x, Point):
+                # Point subclasses can be created at any time, so
+                # these are registered as they are first seen.
+                functions[t] = dehydrate_point
+                return dehydrate_point(x)
             elif isinstance(x, Sequence):
                 return list(map(dehydrate_object, x))
             else:
@@ -854,7 +1217,7 @@ class PackStreamHydrant(Hydrant):
             :type value: Date
             :return:
             """
-            return Structure(b"D", value.toordinal() - unix_epoch_date.toordinal())
+            return Structure(b"D", value.toordinal() - unix_epoch_date_ordinal)
 
         def dehydrate_time(value):
             """ Dehydrator for `time` values.
@@ -943,7 +1306,7 @@ class PackStreamHydrant(Hydrant):
                 raise ValueError("Cannot dehydrate Point with %d dimensions" % dim)
 
         functions = {}  # graph types cannot be used as parameters
-        if v >= (2, 0):
+        if version >= (2, 0):
             functions.update({
                 Date: dehydrate_date,
                 date: dehydrate_date,
@@ -960,4 +1323,4 @@ class PackStreamHydrant(Hydrant):
                 for cls in Point.__subclasses__()
             })
 
-        return dehydrate_object(data)
+        return dehydrate_object
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Routing support for Neo4j causal clusters.
+
+Where a connection profile uses one of the ``neo4j`` URI schemes, the
+servers to which work is sent are discovered from the routing table of
+the cluster, rather than being given directly. This table lists the
+servers able to act as routers (which can supply further routing
+tables), readers and writers, and is valid for a limited time only.
+"""
+
+
+from py2neo.connect.addressing import Address
+from py2neo.internal.compat import perf_counter
+
+
+#: Error codes which indicate that a server can no longer accept
+#: writes, and which therefore invalidate that server as a writer.
+WRITE_FAILURE_CODES = frozenset([
+    "Neo.ClientError.Cluster.NotALeader",
+    "Neo.ClientError.General.ForbiddenOnReadOnlyDatabase",
+])
+
+
+class RoutingError(Exception):
+    """ Raised when routing information cannot be obtained from any
+    router.
+    """
+
+
+class RoutingTable(object):
+    """ The routers, readers and writers for a graph within a cluster,
+    as listed by the routing procedure of that cluster.
+
+    :param routers: addresses of servers that can supply routing tables
+    :param readers: addresses of servers that can carry out reads
+    :param writers: addresses of servers that can carry out writes
+    :param ttl: time, in seconds, for which the table is valid
+    """
+
+    @classmethod
+    def fetch(cls, cx, graph_name=None):
+        """ Retrieve a routing table over a connection to a router,
+        using the routing procedure appropriate to the server.
+
+        :param cx: connection to a router
+        :param graph_name: name of the graph to route for, or
+            :const:`None` for the default graph
+        """
+        context = {"address": "%s:%s" % (cx.profile.host, cx.profile.port)}
+        if cx.protocol_version >= (4, 0):
+            result = cx.auto_run("system", "CALL dbms.routing.getRoutingTable($context, $database)",
+                                 {"context": context, "database": graph_name})
+        else:
+            result = cx.auto_run(None, "CALL dbms.cluster.routing.getRoutingTable($context)",
+                                 {"context": context})
+        cx.pull(result)
+        cx.sync(result)
+        ttl, servers = result.fetch()
+        return cls.parse(ttl, servers)
+
+    @classmethod
+    def parse(cls, ttl, servers):
+        """ Create a routing table from the values returned by the
+        routing procedure.
+        """
+        addresses = {"ROUTE": [], "READ": [], "WRITE": []}
+        for server in servers:
+            role = server.get("role")
+            if role in addresses:
+                addresses[role].extend(map(Address.parse, server.get("addresses", ())))
+        return cls(addresses["ROUTE"], addresses["READ"], addresses["WRITE"], ttl)
+
+    def __init__(self, routers=(), readers=(), writers=(), ttl=300):
+        self.routers = list(routers)
+        self.readers = list(readers)
+        self.writers = list(writers)
+        self.ttl = ttl
+        self._expiry = perf_counter() + ttl
+
+    def __repr__(self):
+        return "<%s routers=%r readers=%r writers=%r ttl=%r>" % (
+            self.__class__.__name__, self.routers, self.readers, self.writers, self.ttl)
+
+    def expired(self):
+        """ Return true if the time for which this table is valid has
+        passed.
+        """
+        return perf_counter() >= self._expiry
+
+    def is_fresh(self, readonly=False):
+        """ Return true if this table has not expired, and still lists
+        both routers and servers for the kind of work given.
+        """
+        if self.expired() or not self.routers:
+            return False
+        return bool(self.readers if readonly else self.writers)
+
+    def remove(self, address):
+        """ Remove a server, which can no longer be reached, from all
+        roles.
+        """
+        for addresses in (self.routers, self.readers, self.writers):
+            if address in addresses:
+                addresses.remove(address)
+
+    def remove_writer(self, address):
+        """ Remove a server from the list of writers only, for example
+        once it reports that it is no longer the leader.
+        """
+        if address in self.writers:
+            self.writers.remove(address)
@@ -19,52 +19,111 @@
 from py2neo.connect import Address
 
 
+def ssl_context(verify=True, hostname=None):
+    """ Create an SSL context for a secure connection, with or without
+    full certificate checks.
+    """
+    from ssl import SSLContext, PROTOCOL_TLS, CERT_NONE, CERT_REQUIRED
+    context = SSLContext(PROTOCOL_TLS)
+    if verify:
+        context.verify_mode = CERT_REQUIRED
+        context.check_hostname = bool(hostname)
+    else:
+        context.verify_mode = CERT_NONE
+    context.load_default_certs()
+    return context
+
+
 class Wire:
     """ Socket wrapper for reading and writing bytes.
+
+    Incoming data is received directly into a reusable buffer, using
+    as few `recv_into` calls as possible. Reads are then served from
+    that buffer, which is only compacted (or, for reads larger than
+    the buffer, replaced by a bigger one) when it runs out of space.
     """
 
+    #: Default size of the receive buffer, in bytes.
+    default_buffer_size = 65536
+
     __closed = False
 
     __broken = False
 
-    def __init__(self, s):
+    def __init__(self, s, buffer_size=None):
         self.__socket = s
-        self.__input = bytearray()
+        self.__input = bytearray(buffer_size or self.default_buffer_size)
+        self.__input_view = memoryview(self.__input)
+        self.__input_start = 0
+        self.__input_end = 0
         self.__output = bytearray()
 
     def secure(self, verify=True, hostname=None):
-        from ssl import SSLContext, PROTOCOL_TLS, CERT_NONE, CERT_REQUIRED
-        context = SSLContext(PROTOCOL_TLS)
-        if verify:
-            context.verify_mode = CERT_REQUIRED
-            context.check_hostname = bool(hostname)
-        else:
-            context.verify_mode = CERT_NONE
-        context.load_default_certs()
+        context = ssl_context(verify, hostname)
         try:
             self.__socket = context.wrap_socket(self.__socket, server_hostname=hostname)
         except OSError:
             # TODO: add connection failure/diagnostic callback
             raise OSError("Unable to establish secure connection with remote peer")
 
-    def read(self, n):
-        while len(self.__input) < n:
+    def __fill(self, n):
+        """ Ensure that at least `n` unread bytes are held in the
+        input buffer.
+        """
+        start = self.__input_start
+        end = self.__input_end
+        if end - start >= n:
+            return
+        capacity = len(self.__input)
+        if start + n > capacity:
+            # Not enough room after the unread data, so move that
+            # data to the front of the buffer, or into a new buffer
+            # if the read is larger than the buffer itself.
+            unread = self.__input[start:end]
+            if n > capacity:
+                self.__input = bytearray(max(n, 2 * capacity))
+                self.__input_view = memoryview(self.__input)
+            end -= start
+            start = 0
+            self.__input[:end] = unread
+            self.__input_start = start
+            self.__input_end = end
+        view = self.__input_view
+        while end - start < n:
             try:
-                received = self.__socket.recv(n)
+                received = self.__socket.recv_into(view[end:])
             except OSError:
                 self.__broken = True
                 raise
             else:
                 if received:
-                    self.__input.extend(received)
+                    end += received
+                    self.__input_end = end
                 else:
                     self.__broken = True
                     raise OSError("Network read incomplete "
                                   "(received %d of %d bytes)" %
-                                  (len(self.__input), n))
-        data = self.__input[:n]
-        self.__input[:n] = []
-        return data
+                                  (end - start, n))
+
+    def read(self, n):
+        """ Read exactly `n` bytes, returning a copy of the data.
+        """
+        self.__fill(n)
+        p = self.__input_start
+        q = p + n
+        self.__input_start = q
+        return self.__input[p:q]
+
+    def read_view(self, n):
+        """ Read exactly `n` bytes, returning a memoryview onto the
+        input buffer instead of a copy. The view (and any views
+        derived from it) must be discarded before the next read.
+        """
+        self.__fill(n)
+        p = self.__input_start
+        q = p + n
+        self.__input_start = q
+        return self.__input_view[p:q]
 
     def write(self, b):
         self.__output.extend(b)
@@ -72,16 +131,19 @@ class Wire:
     def send(self):
         if self.__closed:
             raise OSError("Closed")
+        size = len(self.__output)
         sent = 0
-        while self.__output:
-            try:
-                n = self.__socket.send(self.__output)
-            except OSError:
-                self.__broken = True
-                raise
-            else:
-                self.__output[:n] = []
-                sent += n
+        view = memoryview(self.__output)
+        try:
+            while sent < size:
+                try:
+                    sent += self.__socket.send(view[sent:])
+                except OSError:
+                    self.__broken = True
+                    raise
+        finally:
+            del view
+            del self.__output[:sent]
         return sent
 
     def close(self):
@@ -118,6 +118,9 @@ class Record(tuple, Mapping):
         values = tuple(self)[key]
         return self.__class__(zip(keys, values))
 
+    def __reduce__(self):
+        return self.__class__, (self.items(),)
+
     def get(self, key, default=None):
         """ Obtain a single value from the record by index or key. If the
         specified item does not exist, the default value is returned.
@@ -236,6 +239,120 @@ class Record(tuple, Mapping):
         return s
 
 
+class LazyRecord(Mapping):
+    """ A :class:`.Record` whose values are each loaded only when first
+    accessed.
+
+    A tuple must hold all of its values from the outset, so a lazy
+    record is not a tuple. It is instead registered as a virtual
+    subclass of :class:`.Record`, and offers all of the same methods.
+    Convert it with :func:`tuple` before using it for positional
+    %-formatting. A lazy record is pickled as a plain :class:`.Record`,
+    with all of its values loaded.
+
+    :param keys: the keys of the record
+    :param load: function that accepts a positional index and returns
+                 the value at that position
+    """
+
+    def __init__(self, keys, load):
+        self.__keys = tuple(keys)
+        self.__load = load
+        self.__values = {}
+
+    def __value(self, index):
+        try:
+            return self.__values[index]
+        except KeyError:
+            value = self.__values[index] = self.__load(index)
+            return value
+
+    def __reduce__(self):
+        return Record, (self.items(),)
+
+    def __repr__(self):
+        return "Record({%s})" % ", ".join("%r: %r" % item for item in self.items())
+
+    def __str__(self):
+        return "\t".join(map(repr, self))
+
+    def __eq__(self, other):
+        return dict(self) == dict(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return reduce(xor_operator, map(hash, self.items()))
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.__value(i)
+
+    def __contains__(self, value):
+        return any(v == value for v in self)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            keys = self.__keys[key]
+            values = [self.__value(i) for i in range(len(self))[key]]
+            return Record(zip(keys, values))
+        return self.__value(self.index(key))
+
+    def get(self, key, default=None):
+        try:
+            index = self.__keys.index(ustr(key))
+        except ValueError:
+            return default
+        return self.__value(index)
+
+    def index(self, key):
+        if isinstance(key, integer_types):
+            if 0 <= key < len(self.__keys):
+                return key
+            raise IndexError(key)
+        elif isinstance(key, string_types):
+            try:
+                return self.__keys.index(key)
+            except ValueError:
+                raise KeyError(key)
+        else:
+            raise TypeError(key)
+
+    def keys(self):
+        return list(self.__keys)
+
+    def values(self, *keys):
+        if keys:
+            return [value for _, value in self.items(*keys)]
+        return list(self)
+
+    def items(self, *keys):
+        if keys:
+            d = []
+            for key in keys:
+                try:
+                    i = self.index(key)
+                except KeyError:
+                    d.append((key, None))
+                else:
+                    d.append((self.__keys[i], self.__value(i)))
+            return d
+        return list(zip(self.__keys, self))
+
+    def data(self, *keys):
+        return dict(self.items(*keys))
+
+    def to_subgraph(self):
+        return Record.to_subgraph(self)
+
+
+Record.register(LazyRecord)
+
+
 class PropertyDict(dict):
     """ Mutable key-value property store.
 
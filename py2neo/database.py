@@ -20,20 +20,29 @@ from __future__ import absolute_import
 
 from collections import deque, OrderedDict
 from datetime import datetime
+from itertools import islice
+from logging import getLogger
+from random import uniform
 from time import sleep
 from warnings import warn
 
 from py2neo.connect import Connector, Connection, ConnectionProfile, TransactionError
+from py2neo.connect.packstream import PackedList
+from py2neo.connect.routing import WRITE_FAILURE_CODES
 from py2neo.cypher import cypher_escape
-from py2neo.data import Record, Table
+from py2neo.data import LazyRecord, Record, Table
 from py2neo.internal.caching import ThreadLocalEntityCache
-from py2neo.internal.compat import Mapping, string_types, xstr
-from py2neo.internal.operations import OperationError
+from py2neo.internal.columns import Column
+from py2neo.internal.compat import Mapping, perf_counter, string_types, xstr
+from py2neo.internal.operations import OperationError, restore_bindings, save_bindings
 from py2neo.internal.text import Words
 from py2neo.internal.versioning import Version
 from py2neo.matching import NodeMatcher, RelationshipMatcher
 
 
+log = getLogger(__name__)
+
+
 update_stats_keys = [
     "constraints_added",
     "constraints_removed",
@@ -98,6 +107,9 @@ class GraphService(object):
                 "init_size": settings.get("init_size"),
                 "max_size": settings.get("max_size"),
                 "max_age": settings.get("max_age"),
+                "acquire_wait_timeout": settings.get("acquire_wait_timeout"),
+                "http_keep_alive": settings.get("http_keep_alive"),
+                "http_idle_timeout": settings.get("http_idle_timeout"),
             }
             inst._connector = Connector.open(profile, **connector_settings)
             inst._graphs = {}
@@ -134,8 +146,10 @@ class GraphService(object):
             inst.service = self
             inst.__name__ = graph_name
             inst.schema = Schema(self)
+            inst.retry_policy = RetryPolicy()
             inst.node_cache = ThreadLocalEntityCache()
             inst.relationship_cache = ThreadLocalEntityCache()
+            inst._hydrant = Connection.default_hydrant(self._connector.profile, inst)
             self._graphs[graph_name] = inst
         return self._graphs[graph_name]
 
@@ -240,6 +254,9 @@ class Graph(object):
     - ``bolt`` - Bolt (unsecured)
     - ``bolt+s`` - Bolt (secured with full certificate checks)
     - ``bolt+ssc`` - Bolt (secured with no certificate checks)
+    - ``neo4j`` - Bolt with cluster routing (unsecured)
+    - ``neo4j+s`` - Bolt with cluster routing (secured with full certificate checks)
+    - ``neo4j+ssc`` - Bolt with cluster routing (secured with no certificate checks)
     - ``http`` - HTTP (unsecured)
     - ``https`` - HTTP (secured with full certificate checks)
     - ``http+s`` - HTTP (secured with full certificate checks)
@@ -247,21 +264,29 @@ class Graph(object):
 
     The full set of supported `settings` are:
 
-    ===================  ========================================================  ==============  =========================
-    Keyword              Description                                               Type            Default
-    ===================  ========================================================  ==============  =========================
-    ``scheme``           Use a specific URI scheme                                 str             ``'bolt'``
-    ``secure``           Use a secure connection (TLS)                             bool            ``False``
-    ``verify``           Verify the server certificate (if secure)                 bool            ``True``
-    ``host``             Database server host name                                 str             ``'localhost'``
-    ``port``             Database server port                                      int             ``7687``
-    ``address``          Colon-separated host and port string                      str             ``'localhost:7687'``
-    ``user``             User to authenticate as                                   str             ``'neo4j'``
-    ``password``         Password to use for authentication                        str             ``'password'``
-    ``auth``             A 2-tuple of (user, password)                             tuple           ``('neo4j', 'password')``
-    ``user_agent``       User agent to send for all connections                    str             `(depends on URI scheme)`
-    ``max_connections``  The maximum number of simultaneous connections permitted  int             40
-    ===================  ========================================================  ==============  =========================
+    ========================  ========================================================  ==============  =========================
+    Keyword                   Description                                               Type            Default
+    ========================  ========================================================  ==============  =========================
+    ``scheme``                Use a specific URI scheme                                 str             ``'bolt'``
+    ``secure``                Use a secure connection (TLS)                             bool            ``False``
+    ``verify``                Verify the server certificate (if secure)                 bool            ``True``
+    ``host``                  Database server host name                                 str             ``'localhost'``
+    ``port``                  Database server port                                      int             ``7687``
+    ``address``               Colon-separated host and port string                      str             ``'localhost:7687'``
+    ``user``                  User to authenticate as                                   str             ``'neo4j'``
+    ``password``              Password to use for authentication                        str             ``'password'``
+    ``auth``                  A 2-tuple of (user, password)                             tuple           ``('neo4j', 'password')``
+    ``user_agent``            User agent to send for all connections                    str             `(depends on URI scheme)`
+    ``max_connections``       The maximum number of simultaneous connections permitted  int             40
+    ``acquire_wait_timeout``  Seconds to wait for a free connection when all are busy   float           ``30``
+    ``readers``               Addresses of read replicas, for read-only work            list            ``[]``
+    ``http_keep_alive``       Sockets kept open for reuse by HTTP connections           int             ``10``
+    ``http_idle_timeout``     Seconds after which an idle HTTP socket is closed         float           ``60``
+    ``lazy_records``          Unpack record values only when accessed (Bolt only)       bool            ``False``
+    ``fetch_size``            Records to pull in each batch, or -1 for all (Bolt 4+)    int             ``-1``
+    ``http_streaming``        Parse HTTP results row by row as they arrive              bool            ``False``
+    ``http_graph_format``     Request path entities with each HTTP result               bool            ``False``
+    ========================  ========================================================  ==============  =========================
 
     Each setting can be provided as a keyword argument or as part of
     an URI. Therefore, the three examples below are all equivalent::
@@ -274,9 +299,11 @@ class Graph(object):
     Once obtained, the `Graph` instance provides direct or indirect
     access to most of the functionality available within py2neo.
 
-    Note that py2neo does not support routing with a Neo4j causal
-    cluster. For this functionality, please use the official Neo4j
-    Driver for Python.
+    To work with a Neo4j causal cluster, use one of the ``neo4j`` URI
+    schemes with the address of any core server. The routing table of
+    the cluster is then used to send read-only work (such as units of
+    work played with a `readonly` attribute) to readers, and all other
+    work to the leader.
     """
 
     #: The :class:`.GraphService` to which this :class:`.Graph` belongs.
@@ -285,6 +312,11 @@ class Graph(object):
     #: The :class:`.Schema` resource for this :class:`.Graph`.
     schema = None
 
+    #: The :class:`.RetryPolicy` applied to units of work played
+    #: against this :class:`.Graph`, and to the :meth:`.create`,
+    #: :meth:`.merge` and :meth:`.delete` methods.
+    retry_policy = None
+
     def __new__(cls, uri=None, name=None, **settings):
         gs = GraphService(uri, **settings)
         return gs[name]
@@ -323,7 +355,7 @@ class Graph(object):
         return GraphTransaction(self, True, readonly, after, metadata, timeout)
 
     def begin(self, autocommit=False, readonly=False,
-              after=None, metadata=None, timeout=None):
+              after=None, metadata=None, timeout=None, pipelined=False):
         """ Begin a new :class:`.GraphTransaction`.
 
         :param autocommit: if :py:const:`True`, the transaction will
@@ -332,11 +364,21 @@ class Graph(object):
         :param after:
         :param metadata:
         :param timeout:
+        :param pipelined: if :py:const:`True`, queries run within the
+                          transaction are not sent to the server one
+                          at a time, but are queued and sent together
+                          when a result is first needed or when the
+                          transaction is completed; any failure is
+                          raised by the cursor of the query concerned;
+                          over HTTP, queued queries are sent in a
+                          single request, along with the commit if
+                          they are still queued at that point
         """
         if autocommit:
             warn("Graph.begin(autocommit=True) is deprecated, "
                  "use Graph.auto() instead", category=DeprecationWarning, stacklevel=2)
-        return GraphTransaction(self, autocommit, readonly, after, metadata, timeout)
+        return GraphTransaction(self, autocommit, readonly, after, metadata, timeout,
+                                pipelined)
 
     def call(self, procedure, *args):
         """ Call a procedure by name.
@@ -365,8 +407,7 @@ class Graph(object):
         :param subgraph: a :class:`.Node`, :class:`.Relationship` or other
                        :class:`.Subgraph`
         """
-        with self.begin() as tx:
-            tx.create(subgraph)
+        self._update(subgraph, lambda tx: tx.create(subgraph))
 
     def delete(self, subgraph):
         """ Run a :meth:`.GraphTransaction.delete` operation within an
@@ -380,7 +421,7 @@ class Graph(object):
         :param subgraph: a :class:`.Node`, :class:`.Relationship` or other
                        :class:`.Subgraph` object
         """
-        self.auto().delete(subgraph)
+        self._update(subgraph, lambda tx: tx.delete(subgraph), autocommit=True)
 
     def delete_all(self):
         """ Delete all nodes and relationships from this :class:`.Graph`.
@@ -475,8 +516,7 @@ class Graph(object):
         :param label: label on which to match any existing nodes
         :param property_keys: property keys on which to match any existing nodes
         """
-        with self.begin() as tx:
-            tx.merge(subgraph, label, *property_keys)
+        self._update(subgraph, lambda tx: tx.merge(subgraph, label, *property_keys))
 
     @property
     def name(self):
@@ -515,13 +555,22 @@ class Graph(object):
 
         If the function has a `readonly` attribute, and this is set to
         a truthy value, then it will be executed in a read-only
-        environment, if possible.
+        environment, if possible. Where the `readers` setting lists
+        the addresses of read replicas, such work is carried out on
+        one of those instead of on the primary server.
 
         If the function has a `timeout` attribute, and no `timeout`
         argument is passed to this method call, then the value of the
         function attribute will be used instead for setting the
         timeout.
 
+        If the unit of work fails with an error that the
+        :attr:`.retry_policy` of this graph counts as retryable, such
+        as a deadlock or a change of cluster leader, the transaction
+        is rolled back and the function is called again in a new
+        transaction. The function should therefore have no side
+        effects beyond those carried out within the transaction.
+
         :param work: function containing the unit of work
         :param args: sequence of additional positional arguments to
             pass into the function
@@ -537,20 +586,20 @@ class Graph(object):
             raise TypeError("Unit of work is not callable")
         kwargs = dict(kwargs or {})
         readonly = getattr(work, "readonly", False)
-        if readonly:
-            # TODO: remove this warning when readonly is implemented
-            warn("Acquisition of readonly connections is not yet supported; "
-                 "a read-write connection will be used instead")
         if not timeout:
             timeout = getattr(work, "timeout", None)
-        tx = self.begin(readonly=readonly, after=after, metadata=metadata, timeout=timeout)
-        try:
-            work(tx, *args or (), **kwargs or {})
-        except Exception:  # TODO: catch transient and retry, if within limit
-            tx.rollback()
-            raise
-        else:
-            return tx.commit()
+
+        def attempt():
+            tx = self.begin(readonly=readonly, after=after, metadata=metadata, timeout=timeout)
+            try:
+                work(tx, *args or (), **kwargs)
+            except Exception:
+                tx.rollback()
+                raise
+            else:
+                return tx.commit()
+
+        return self._retry(attempt)
 
     def pull(self, subgraph):
         """ Pull data to one or more entities from their remote counterparts.
@@ -577,16 +626,19 @@ class Graph(object):
         """
         return RelationshipMatcher(self)
 
-    def run(self, cypher, parameters=None, **kwparameters):
+    def run(self, cypher, parameters=None, fetch_size=None, **kwparameters):
         """ Run a :meth:`.GraphTransaction.run` operation within an
         `autocommit` :class:`.GraphTransaction`.
 
         :param cypher: Cypher statement
         :param parameters: dictionary of parameters
+        :param fetch_size: number of records to pull from the server
+                           in each batch, or -1 to pull all records at
+                           once; defaults to the `fetch_size` setting
         :param kwparameters: extra keyword parameters
         :return:
         """
-        return self.auto().run(cypher, parameters, **kwparameters)
+        return self.auto().run(cypher, parameters, fetch_size=fetch_size, **kwparameters)
 
     def separate(self, subgraph):
         """ Run a :meth:`.GraphTransaction.separate` operation within an
@@ -601,6 +653,41 @@ class Graph(object):
         """
         self.auto().separate(subgraph)
 
+    def _retry(self, function):
+        return self.retry_policy.call(function, pool=self.service.connector)
+
+    def _update(self, subgraph, update, autocommit=False):
+        """ Apply an update function to a subgraph within a
+        transaction, retrying according to the retry policy. The
+        transaction is pipelined, so that queries which do not depend
+        on one another are sent to the server together. The remote
+        bindings of the nodes and relationships in the subgraph are
+        restored after each failed attempt. Objects other than
+        subgraphs, such as OGM objects, are not retried, since their
+        bindings cannot be restored in this way.
+        """
+        try:
+            bindings = save_bindings(subgraph)
+        except AttributeError:
+            bindings = None
+
+        def attempt():
+            try:
+                if autocommit:
+                    update(self.auto())
+                else:
+                    with self.begin(pipelined=True) as tx:
+                        update(tx)
+            except Exception:
+                if bindings is not None:
+                    restore_bindings(bindings)
+                raise
+
+        if bindings is None:
+            attempt()
+        else:
+            self._retry(attempt)
+
 
 class SystemGraph(Graph):
     """ A subclass of :class:`.Graph` that provides access to the
@@ -851,6 +938,105 @@ class TransientError(GraphError):
     """
 
 
+class RetryPolicy(object):
+    """ A policy for retrying units of work that fail with a transient
+    error, such as a deadlock or a change of cluster leader.
+
+    Each retry follows a delay that starts at `initial_delay` and
+    grows by a factor of `multiplier` with every attempt. Each delay
+    is varied at random by up to `jitter` (a fraction of the delay),
+    so that clients which fail together do not all retry together.
+    Work is attempted no more than `max_attempts` times in all, and
+    is not retried if the retry would start more than `max_time`
+    seconds after the first attempt.
+
+        >>> from py2neo import Graph, RetryPolicy
+        >>> g = Graph()
+        >>> g.retry_policy = RetryPolicy(max_attempts=10, max_time=60)
+
+    :param max_attempts: maximum number of attempts, including the
+        first
+    :param max_time: maximum time, in seconds, from the start of the
+        first attempt to the start of the last
+    :param initial_delay: delay, in seconds, before the first retry
+    :param multiplier: factor by which each delay exceeds the last
+    :param jitter: maximum random variation of each delay, as a
+        fraction of that delay
+    :param errors: tuple of exception classes that are retryable;
+        defaults to :class:`.TransientError` only
+    :param codes: Neo4j status codes that are retryable whatever the
+        class of error; defaults to those raised by a cluster member
+        that can no longer accept writes, following a change of leader
+    """
+
+    #: Status codes of transient errors caused by the client, which
+    #: are never retried.
+    non_retryable_codes = frozenset([
+        "Neo.TransientError.Transaction.Terminated",
+        "Neo.TransientError.Transaction.LockClientStopped",
+    ])
+
+    def __init__(self, max_attempts=5, max_time=30.0, initial_delay=1.0,
+                 multiplier=2.0, jitter=0.2, errors=None, codes=None):
+        self.max_attempts = max_attempts
+        self.max_time = max_time
+        self.initial_delay = initial_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.errors = (TransientError,) if errors is None else tuple(errors)
+        self.codes = WRITE_FAILURE_CODES if codes is None else frozenset(codes)
+
+    def __repr__(self):
+        return "%s(max_attempts=%r, max_time=%r, initial_delay=%r, multiplier=%r, " \
+               "jitter=%r)" % (self.__class__.__name__, self.max_attempts, self.max_time,
+                               self.initial_delay, self.multiplier, self.jitter)
+
+    def is_retryable(self, error):
+        """ Determine whether an error raised by a unit of work means
+        that the work can be retried.
+        """
+        code = getattr(error, "code", None)
+        if code in self.non_retryable_codes:
+            return False
+        return isinstance(error, self.errors) or code in self.codes
+
+    def delays(self):
+        """ Yield the delay, in seconds, before each retry in turn.
+        """
+        delay = self.initial_delay
+        for _ in range(1, self.max_attempts):
+            yield delay * (1.0 + uniform(-self.jitter, self.jitter))
+            delay *= self.multiplier
+
+    def call(self, function, pool=None):
+        """ Call a function, calling it again each time it fails with
+        a retryable error for as long as this policy allows.
+
+        :param function: function to call, with no arguments
+        :param pool: :class:`.ConnectionPool` or :class:`.Connector`
+                     in whose metrics to count retries
+        :return: the value returned by the function
+        :raise: the last error raised by the function
+        """
+        deadline = perf_counter() + self.max_time
+        delays = self.delays()
+        while True:
+            try:
+                return function()
+            except Exception as error:
+                if not self.is_retryable(error):
+                    raise
+                delay = next(delays, None)
+                if delay is None or perf_counter() + delay > deadline:
+                    if pool is not None:
+                        pool.record_give_up()
+                    raise
+                log.debug("Retrying in %.3fs after %s: %s", delay, error.__class__.__name__, error)
+                if pool is not None:
+                    pool.record_retry(delay)
+            sleep(delay)
+
+
 class GraphTransactionError(GraphError):
     """ Raised when actions are attempted against a :class:`.GraphTransaction`
     that is no longer available for use, or a transaction is otherwise invalid.
@@ -864,9 +1050,11 @@ class GraphTransaction(object):
     _finished = False
 
     def __init__(self, graph, autocommit=False, readonly=False,
-                 after=None, metadata=None, timeout=None):
+                 after=None, metadata=None, timeout=None, pipelined=False):
         self._graph = graph
         self._autocommit = autocommit
+        self._readonly = readonly
+        self._pipelined = pipelined
         self._entities = deque()
         self._connector = self.graph.service.connector
         if autocommit:
@@ -902,12 +1090,24 @@ class GraphTransaction(object):
         """
         return self._finished
 
-    def run(self, cypher, parameters=None, **kwparameters):
+    def run(self, cypher, parameters=None, fetch_size=None, **kwparameters):
         """ Send a Cypher statement to the server for execution and return
         a :py:class:`.Cursor` for navigating its result.
 
+        Over Bolt 4.0 and above, records are pulled from the server in
+        batches of `fetch_size`, with the next batch pulled only once
+        the cursor has consumed the last. This keeps memory use bounded
+        for large results. Earlier protocol versions always pull all
+        records at once. Over HTTP, the whole response is read before
+        the first record is returned, unless the `http_streaming`
+        setting is enabled, in which case records are parsed one by
+        one as the cursor consumes them.
+
         :param cypher: Cypher statement
         :param parameters: dictionary of parameters
+        :param fetch_size: number of records to pull from the server
+                           in each batch, or -1 to pull all records at
+                           once; defaults to the `fetch_size` setting
         :returns: :py:class:`.Cursor` object
         """
         self._assert_unfinished()
@@ -917,15 +1117,17 @@ class GraphTransaction(object):
             entities = {}
 
         try:
-            hydrant = Connection.default_hydrant(self._connector.profile, self.graph)
+            hydrant = self.graph._hydrant
             parameters = dict(parameters or {}, **kwparameters)
-            if self._transaction:
-                result = self._connector.run_in_tx(self._transaction, cypher, parameters, hydrant)
+            if self._transaction is not None:
+                result = self._connector.run_in_tx(self._transaction, cypher, parameters, hydrant,
+                                                   self._pipelined, fetch_size)
             else:
-                result = self._connector.auto_run(self.graph.name, cypher, parameters, hydrant)
+                result = self._connector.auto_run(self.graph.name, cypher, parameters, hydrant,
+                                                  self._readonly, fetch_size)
             return Cursor(result, hydrant, entities)
         finally:
-            if not self._transaction:
+            if self._transaction is None:
                 self.finish()
 
     def finish(self):
@@ -964,7 +1166,13 @@ class GraphTransaction(object):
         :param parameters: dictionary of parameters
         :returns: single return value or :const:`None`
         """
-        return self.run(cypher, parameters, **kwparameters).evaluate(0)
+        # Only the first record is needed, so pull no more than one
+        # and discard the rest.
+        cursor = self.run(cypher, parameters, fetch_size=1, **kwparameters)
+        try:
+            return cursor.evaluate(0)
+        finally:
+            cursor.close()
 
     def create(self, subgraph):
         """ Create remote nodes and relationships that correspond to those in a
@@ -1171,14 +1379,25 @@ class Cursor(object):
         self._result = result
         self._hydrant = hydrant
         self._entities = entities
+        self._keys = None
         self._current = None
         self._closed = False
 
     def __del__(self):
-        try:
-            self.close()
-        except OSError:
-            pass
+        # Records still outstanding for an abandoned cursor, such as
+        # one from a pipelined transaction, are dropped unread as they
+        # arrive during a later exchange on the same connection,
+        # instead of forcing a round trip here. An auto-commit result
+        # whose remaining records are still held by the server is the
+        # exception: no later exchange will come, and its connection
+        # is only released once those records are discarded.
+        if not self._closed:
+            try:
+                result = self._result
+                result.discard(sync=result.autocommit and result.has_more())
+            except Exception:
+                pass
+            self._closed = True
 
     def __repr__(self):
         return repr(self.preview(3))
@@ -1206,11 +1425,28 @@ class Cursor(object):
         """
         return self._current
 
+    @property
+    def fetch_size(self):
+        """ The number of records pulled from the server in each batch,
+        or -1 if all remaining records are pulled at once. This can be
+        changed at any time, taking effect from the next batch.
+        """
+        return self._result.fetch_size
+
+    @fetch_size.setter
+    def fetch_size(self, value):
+        self._result.fetch_size = value
+
     def close(self):
         """ Close this cursor and free up all associated resources.
+
+        Any records not yet read are dropped without being hydrated,
+        and the server is told to discard those that it has not yet
+        sent. The numbers of records and bytes dropped in this way
+        are available from the :meth:`.summary`.
         """
         if not self._closed:
-            self._result.buffer()   # force consumption of remaining data
+            self._result.discard()
             self._closed = True
 
     def keys(self):
@@ -1281,19 +1517,43 @@ class Cursor(object):
             raise ValueError("Cursor can only move forwards")
         amount = int(amount)
         moved = 0
-        v = self._result.protocol_version
+        result = self._result
+        hydrant = self._hydrant
+        keys = self._keys
+        v = result.protocol_version
+        lazy = result.lazy_records
         while moved != amount:
-            values = self._result.fetch()
+            values = result.fetch()
             if values is None:
                 break
             else:
-                keys = self._result.fields()  # TODO: don't do this for every record
-                if self._hydrant:
-                    values = self._hydrant.hydrate(keys, values, entities=self._entities, version=v)
-                self._current = Record(zip(keys, values))
+                if keys is None:
+                    keys = self._keys = result.fields()
+                if lazy:
+                    self._current = LazyRecord(keys, self._loader(keys, values, v))
+                else:
+                    if hydrant:
+                        values = hydrant.hydrate(keys, values, entities=self._entities, version=v)
+                    self._current = Record(zip(keys, values))
                 moved += 1
         return moved
 
+    def _loader(self, keys, values, version):
+        """ Return a function that unpacks and hydrates a single value
+        from a lazy record on demand.
+        """
+        hydrant = self._hydrant
+        entities = self._entities
+
+        def load(index):
+            if hydrant:
+                return hydrant.hydrate(keys[index:index + 1], (values[index],),
+                                       entities=entities, version=version)[0]
+            else:
+                return values[index]
+
+        return load
+
     def preview(self, limit=1):
         """ Construct a :class:`.Table` containing a preview of
         upcoming records, including no more than the given `limit`.
@@ -1390,25 +1650,122 @@ class Cursor(object):
                     s |= s_
         return s
 
-    def to_ndarray(self, dtype=None, order='K'):
+    def to_ndarray(self, dtype=None, order='K', columnar=False):
         """ Consume and extract the entire result as a
         `numpy.ndarray <https://docs.scipy.org/doc/numpy/reference/generated/numpy.ndarray.html>`_.
 
+        If `columnar` is set, the result is first decoded column by
+        column, as for :meth:`.to_columns`, and the columns are then
+        stacked side by side. In this case, if any column contains
+        nulls, a `numpy.ma.MaskedArray` is returned.
+
         .. note::
            This method requires `numpy` to be installed.
 
         :param dtype:
         :param order:
+        :param columnar: decode into typed columns without creating
+                         :class:`.Record` objects
         :warns: If `numpy` is not installed
         :returns: `ndarray <https://docs.scipy.org/doc/numpy/reference/generated/numpy.ndarray.html>`__ object.
         """
         try:
-            from numpy import array
+            from numpy import array, column_stack, ma
         except ImportError:
             warn("Numpy is not installed.")
             raise
         else:
-            return array(list(map(list, self)), dtype=dtype, order=order)
+            if not columnar:
+                return array(list(map(list, self)), dtype=dtype, order=order)
+            columns = list(self.to_columns().values())
+            if not columns:
+                return array([], dtype=dtype, order=order)
+            if any(isinstance(column, ma.MaskedArray) for column in columns):
+                stacked = ma.column_stack(columns)
+            else:
+                stacked = column_stack(columns)
+            return stacked.astype(dtype or stacked.dtype, order=order, copy=False)
+
+    def to_columns(self, batch_size=1024):
+        """ Consume and extract the entire result as a dictionary of
+        one-dimensional `numpy.ndarray` objects, one for each field and
+        keyed by field name.
+
+        No :class:`.Record` objects are created. The type of each
+        column (int64, float64, bool or object) is selected from the
+        values in the first `batch_size` records, and is widened if a
+        later value does not fit. Columns that contain nulls are
+        returned as `numpy.ma.MaskedArray` objects, masked where each
+        null occurs.
+
+        Over Bolt, where records are held in packed form until taken,
+        each field of the remaining records is decoded straight into
+        the buffer for its column: nulls, booleans, integers and
+        floats are read directly from the PackStream data, and only
+        other values are unpacked and hydrated individually. Records
+        from other sources are unpacked and hydrated as usual before
+        their values are appended.
+
+        .. note::
+           This method requires `numpy` to be installed.
+
+        :param batch_size: number of records used to select the type of
+                           each column
+        :warns: If `numpy` is not installed
+        :returns: :class:`collections.OrderedDict` of `ndarray` objects
+        """
+        try:
+            import numpy
+        except ImportError:
+            warn("Numpy is not installed.")
+            raise
+        else:
+            result = self._result
+            result.pack_records()
+            batch = list(islice(self._rows(), batch_size))
+            keys = self.keys() or []
+            columns = [Column.from_values([row[i] for row in batch]) for i in range(len(keys))]
+            appenders = [column.append for column in columns]
+            hydrant = self._hydrant
+            entities = self._entities
+            v = result.protocol_version
+
+            def hydrate(index, value):
+                return hydrant.hydrate(keys[index:index + 1], (value,),
+                                       entities=entities, version=v)[0]
+
+            unpack_other = hydrate if hydrant else None
+            while True:
+                values = result.fetch()
+                if values is None:
+                    break
+                if isinstance(values, PackedList):
+                    values.unpack_into(columns, unpack_other)
+                else:
+                    if hydrant:
+                        values = hydrant.hydrate(keys, values, entities=entities, version=v)
+                    for append, value in zip(appenders, values):
+                        append(value)
+            return OrderedDict((key, column.to_ndarray()) for key, column in zip(keys, columns))
+
+    def _rows(self):
+        """ Consume and yield the values of each remaining record,
+        without creating :class:`.Record` objects.
+        """
+        result = self._result
+        hydrant = self._hydrant
+        entities = self._entities
+        keys = self._keys
+        v = result.protocol_version
+        while True:
+            values = result.fetch()
+            if values is None:
+                break
+            if keys is None:
+                keys = self._keys = result.fields()
+            if hydrant:
+                values = hydrant.hydrate(keys, values, entities=entities, version=v)
+            yield values
 
     def to_series(self, field=0, index=None, dtype=None):
         """ Consume and extract one field of the entire result as a
@@ -1494,6 +1851,19 @@ class CypherSummary(object):
     def connection(self):
         return self._data.get("connection")
 
+    @property
+    def dropped_records(self):
+        """ Number of records dropped unread when the cursor was closed.
+        """
+        return self._data.get("dropped_records", 0)
+
+    @property
+    def dropped_bytes(self):
+        """ Number of bytes of record data skipped without being
+        unpacked when the cursor was closed.
+        """
+        return self._data.get("dropped_bytes", 0)
+
 
 class CypherStats(Mapping):
     """ Container for a set of statistics drawn from Cypher query execution.
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from array import array
+
+from py2neo.internal.compat import integer_types
+
+
+_TYPE_CODES = {
+    "int64": "q",
+    "float64": "d",
+    "bool": "b",
+}
+
+_NULLS = {
+    "int64": 0,
+    "float64": 0.0,
+    "bool": False,
+    "object": None,
+}
+
+_TYPES = {
+    "int64": frozenset(integer_types),
+    "float64": frozenset(integer_types + (float,)),
+    "bool": frozenset([bool]),
+}
+
+
+def infer_kind(values):
+    """ Select the narrowest kind of column able to hold all of the
+    given values, ignoring nulls.
+    """
+    types = set(type(value) for value in values if value is not None)
+    if not types:
+        return "object"
+    for kind in ("bool", "int64", "float64"):
+        if types <= _TYPES[kind]:
+            return kind
+    return "object"
+
+
+class Column(object):
+    """ A growable buffer for the values of a single result column,
+    held in a compact typed array wherever possible.
+
+    A column holds values of one kind: ``"int64"``, ``"float64"``,
+    ``"bool"`` or ``"object"``. Nulls are stored as a zero value (or
+    :const:`None` for object columns) and recorded in a mask, which is
+    only created once the first null is seen. A value that does not
+    fit the kind of the column causes the column to be widened, from
+    int64 to float64 where possible, otherwise to object. Values whose
+    type is already known, such as those read from packed data, can be
+    added by the typed ``append_*`` methods, without a type check.
+    """
+
+    def __init__(self, kind="object"):
+        self.kind = kind
+        if kind == "object":
+            self.values = []
+            self._types = None
+        else:
+            self.values = array(_TYPE_CODES[kind])
+            self._types = _TYPES[kind]
+        self._null = _NULLS[kind]
+        self.mask = None
+
+    @classmethod
+    def from_values(cls, values):
+        """ Create a column of the kind inferred from a batch of values,
+        and fill it with those values.
+        """
+        column = cls(infer_kind(values))
+        column.extend(values)
+        return column
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        if value is None:
+            self.append_null()
+            return
+        if self._types is not None:
+            if type(value) in self._types:
+                try:
+                    self.values.append(value)
+                except OverflowError:
+                    self._widen("object")
+                    self.values.append(value)
+            elif self.kind == "int64" and isinstance(value, float):
+                self._widen("float64")
+                self.values.append(value)
+            else:
+                self._widen("object")
+                self.values.append(value)
+        else:
+            self.values.append(value)
+        if self.mask is not None:
+            self.mask.append(0)
+
+    def append_null(self):
+        if self.mask is None:
+            self.mask = array("b", [0]) * len(self.values)
+        self.values.append(self._null)
+        self.mask.append(1)
+
+    def append_int(self, value):
+        """ Append a value already known to be a 64-bit integer.
+        """
+        if self.kind == "bool":
+            self._widen("object")
+        self.values.append(value)
+        if self.mask is not None:
+            self.mask.append(0)
+
+    def append_float(self, value):
+        """ Append a value already known to be a float.
+        """
+        kind = self.kind
+        if kind == "int64":
+            self._widen("float64")
+        elif kind == "bool":
+            self._widen("object")
+        self.values.append(value)
+        if self.mask is not None:
+            self.mask.append(0)
+
+    def append_bool(self, value):
+        """ Append a value already known to be a boolean.
+        """
+        kind = self.kind
+        if kind == "int64" or kind == "float64":
+            self._widen("object")
+        self.values.append(value)
+        if self.mask is not None:
+            self.mask.append(0)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def _widen(self, kind):
+        if kind == "object":
+            if self.kind == "bool":
+                values = list(map(bool, self.values))
+            else:
+                values = self.values.tolist()
+            if self.mask is not None:
+                values = [None if null else value for value, null in zip(values, self.mask)]
+            self.values = values
+            self._types = None
+        else:
+            self.values = array(_TYPE_CODES[kind], self.values)
+            self._types = _TYPES[kind]
+        self.kind = kind
+        self._null = _NULLS[kind]
+
+    def to_ndarray(self):
+        """ Return the contents of this column as a one-dimensional
+        `numpy.ndarray`, or as a `numpy.ma.MaskedArray` if the column
+        contains any nulls. Typed columns share memory with the buffer
+        from which they are created.
+        """
+        from numpy import bool_, empty, float64, frombuffer, int64, ma
+        dtypes = {"int64": int64, "float64": float64, "bool": bool_}
+        size = len(self.values)
+        if self.kind == "object":
+            # Assign items individually, so that lists held within
+            # the column are not mistaken for extra dimensions.
+            data = empty(size, dtype=object)
+            for i, value in enumerate(self.values):
+                data[i] = value
+        elif size:
+            data = frombuffer(self.values, dtype=dtypes[self.kind])
+        else:
+            data = empty(0, dtype=dtypes[self.kind])
+        if self.mask is None:
+            return data
+        else:
+            return ma.MaskedArray(data, mask=frombuffer(self.mask, dtype=bool_))
@@ -43,6 +43,11 @@ try:
 except ImportError:
     from time import time as perf_counter
 
+try:
+    from queue import Empty as QueueEmpty, Full as QueueFull
+except ImportError:
+    from Queue import Empty as QueueEmpty, Full as QueueFull
+
 from io import StringIO
 import os
 from socket import error as SocketError
@@ -25,6 +25,8 @@ __all__ = [
     "merge_subgraph",
     "pull_subgraph",
     "push_subgraph",
+    "restore_bindings",
+    "save_bindings",
     "separate_subgraph",
     "subgraph_exists",
 ]
@@ -84,8 +86,7 @@ def _create_nodes(tx, labels, data):
     assert isinstance(labels, frozenset)
     label_string = "".join(":" + cypher_escape(label) for label in sorted(labels))
     cypher = "UNWIND $x AS data CREATE (_%s) SET _ = data RETURN id(_)" % label_string
-    for record in tx.run(cypher, x=data):
-        yield record[0]
+    return tx.run(cypher, x=data)
 
 
 def _merge_nodes(tx, p_label, p_key, labels, data):
@@ -96,14 +97,13 @@ def _merge_nodes(tx, p_label, p_key, labels, data):
     :param p_key:
     :param labels:
     :param data: list of (p_value, properties)
-    :return:
+    :return: cursor of node identities
     """
     assert isinstance(labels, frozenset)
     label_string = ":".join(cypher_escape(label) for label in sorted(labels))
     cypher = "UNWIND $x AS data MERGE (_:%s {%s:data[0]}) SET _:%s SET _ = data[1] RETURN id(_)" % (
         cypher_escape(p_label), cypher_escape(p_key), label_string)
-    for record in tx.run(cypher, x=data):
-        yield record[0]
+    return tx.run(cypher, x=data)
 
 
 def _merge_relationships(tx, r_type, data):
@@ -112,14 +112,30 @@ def _merge_relationships(tx, r_type, data):
     :param tx:
     :param r_type:
     :param data: list of (a_id, b_id, properties)
-    :return:
+    :return: cursor of relationship identities
     """
     cypher = ("UNWIND $x AS data "
               "MATCH (a) WHERE id(a) = data[0] "
               "MATCH (b) WHERE id(b) = data[1] "
               "MERGE (a)-[_:%s]->(b) SET _ = data[2] RETURN id(_)" % cypher_escape(r_type))
-    for record in tx.run(cypher, x=data):
-        yield record[0]
+    return tx.run(cypher, x=data)
+
+
+def _bind_relationships(tx, relationships_by_type):
+    """ Merge relationships of each type, and bind each to its remote
+    counterpart. The queries for all types are run before any result
+    is read, so that a pipelined transaction can send them together.
+    """
+    graph = tx.graph
+    cursors = [(relationships, _merge_relationships(tx, r_type, list(map(
+        lambda r: [r.start_node.identity, r.end_node.identity, dict(r)], relationships))))
+        for r_type, relationships in relationships_by_type.items()]
+    for relationships, cursor in cursors:
+        for i, record in enumerate(cursor):
+            relationship = relationships[i]
+            relationship.graph = graph
+            relationship.identity = record[0]
+            graph.relationship_cache.update(record[0], relationship)
 
 
 def create_subgraph(tx, subgraph):
@@ -131,22 +147,20 @@ def create_subgraph(tx, subgraph):
     :return:
     """
     graph = tx.graph
-    for labels, nodes in _node_create_dict(n for n in subgraph.nodes if n.graph is None).items():
-        identities = _create_nodes(tx, labels, list(map(dict, nodes)))
-        for i, identity in enumerate(identities):
+    # The queries for every set of labels are run before any node
+    # identities are read, so that a pipelined transaction can send
+    # them together.
+    cursors = [(labels, nodes, _create_nodes(tx, labels, list(map(dict, nodes))))
+               for labels, nodes in _node_create_dict(n for n in subgraph.nodes
+                                                      if n.graph is None).items()]
+    for labels, nodes, cursor in cursors:
+        for i, record in enumerate(cursor):
             node = nodes[i]
             node.graph = graph
-            node.identity = identity
+            node.identity = record[0]
             node._remote_labels = labels
-            graph.node_cache.update(identity, node)
-    for r_type, relationships in _rel_create_dict(r for r in subgraph.relationships if r.graph is None).items():
-        identities = _merge_relationships(tx, r_type, list(map(
-            lambda r: [r.start_node.identity, r.end_node.identity, dict(r)], relationships)))
-        for i, identity in enumerate(identities):
-            relationship = relationships[i]
-            relationship.graph = graph
-            relationship.identity = identity
-            graph.relationship_cache.update(identity, relationship)
+            graph.node_cache.update(record[0], node)
+    _bind_relationships(tx, _rel_create_dict(r for r in subgraph.relationships if r.graph is None))
 
 
 def merge_subgraph(tx, subgraph, p_label, p_key):
@@ -160,11 +174,14 @@ def merge_subgraph(tx, subgraph, p_label, p_key):
     :return:
     """
     graph = tx.graph
+    cursors = []
     for (pl, pk, labels), nodes in _node_merge_dict(p_label, p_key, (n for n in subgraph.nodes if n.graph is None)).items():
         if pl is None or pk is None:
             raise ValueError("Primary label and primary key are required for MERGE operation")
-        identities = list(_merge_nodes(tx, pl, pk, labels,
-                                       list(map(lambda n: [n.get(pk), dict(n)], nodes))))
+        cursors.append((pl, pk, labels, nodes, _merge_nodes(
+            tx, pl, pk, labels, list(map(lambda n: [n.get(pk), dict(n)], nodes)))))
+    for pl, pk, labels, nodes, cursor in cursors:
+        identities = [record[0] for record in cursor]
         if len(identities) > len(nodes):
             raise OperationError("Found %d matching nodes for primary label %r and primary "
                                  "key %r with labels %r but merging requires no more than "
@@ -175,14 +192,7 @@ def merge_subgraph(tx, subgraph, p_label, p_key):
             node.identity = identity
             node._remote_labels = labels
             graph.node_cache.update(identity, node)
-    for r_type, relationships in _rel_create_dict(r for r in subgraph.relationships if r.graph is None).items():
-        identities = _merge_relationships(tx, r_type, list(map(
-            lambda r: [r.start_node.identity, r.end_node.identity, dict(r)], relationships)))
-        for i, identity in enumerate(identities):
-            relationship = relationships[i]
-            relationship.graph = graph
-            relationship.identity = identity
-            graph.relationship_cache.update(identity, relationship)
+    _bind_relationships(tx, _rel_create_dict(r for r in subgraph.relationships if r.graph is None))
 
 
 def delete_subgraph(tx, subgraph):
@@ -314,6 +324,42 @@ def subgraph_exists(tx, subgraph):
     return tx.evaluate(statement, parameters) == len(node_ids) + len(relationship_ids)
 
 
+def save_bindings(subgraph):
+    """ Record the remote bindings of the nodes and relationships in a
+    local :class:`.Subgraph`, so that they can be restored if the
+    transaction in which they change is rolled back.
+
+    :param subgraph:
+    :return: a list of saved bindings, for :func:`.restore_bindings`
+    """
+    bindings = []
+    for node in subgraph.nodes:
+        bindings.append((node, node.graph, node.identity, node._remote_labels))
+    for relationship in subgraph.relationships:
+        bindings.append((relationship, relationship.graph, relationship.identity, None))
+    return bindings
+
+
+def restore_bindings(bindings):
+    """ Restore remote bindings previously saved by
+    :func:`.save_bindings`, updating entity caches to match.
+
+    :param bindings:
+    """
+    for entity, graph, identity, remote_labels in bindings:
+        is_node = remote_labels is not None
+        if entity.graph is not None:
+            cache = entity.graph.node_cache if is_node else entity.graph.relationship_cache
+            cache.update(entity.identity, None)
+        entity.graph = graph
+        entity.identity = identity
+        if is_node:
+            entity._remote_labels = remote_labels
+        if graph is not None:
+            cache = graph.node_cache if is_node else graph.relationship_cache
+            cache.update(identity, entity)
+
+
 class OperationError(Exception):
 
     pass
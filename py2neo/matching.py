@@ -337,12 +337,12 @@ class NodeMatch(object):
     def __len__(self):
         """ Return the number of nodes matched.
         """
-        return self.graph.evaluate(*self._query_and_parameters(count=True))
+        return self.graph.auto(readonly=True).evaluate(*self._query_and_parameters(count=True))
 
     def __iter__(self):
         """ Iterate through all matching nodes.
         """
-        for record in self.graph.run(*self._query_and_parameters()):
+        for record in self.graph.auto(readonly=True).run(*self._query_and_parameters()):
             yield record[0]
 
     def all(self):
@@ -375,7 +375,7 @@ class NodeMatch(object):
 
         :return: a single matching :class:`.Node` or :const:`None`
         """
-        return self.graph.evaluate(*self._query_and_parameters())
+        return self.graph.auto(readonly=True).evaluate(*self._query_and_parameters())
 
     def _query_and_parameters(self, count=False):
         """ A tuple of the Cypher query and parameters used to select
@@ -566,13 +566,13 @@ class RelationshipMatch(object):
     def __len__(self):
         """ Return the number of relationships matched.
         """
-        return self.graph.evaluate(*self._query_and_parameters(count=True))
+        return self.graph.auto(readonly=True).evaluate(*self._query_and_parameters(count=True))
 
     def __iter__(self):
         """ Iterate through all matching relationships.
         """
         query, parameters = self._query_and_parameters()
-        for record in self.graph.run(query, parameters):
+        for record in self.graph.auto(readonly=True).run(query, parameters):
             yield record[0]
 
     def all(self):
@@ -606,7 +606,7 @@ class RelationshipMatch(object):
 
         :return: a single matching :class:`.Relationship` or :const:`None`
         """
-        return self.graph.evaluate(*self._query_and_parameters())
+        return self.graph.auto(readonly=True).evaluate(*self._query_and_parameters())
 
     def _query_and_parameters(self, count=False):
         """ A tuple of the Cypher query and parameters used to select
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Time taken to run many small queries concurrently, with the
+blocking client spread across a pool of threads compared with the
+asynchronous client running them all as tasks on a single event loop.
+
+The round trip time is injected by a stub Bolt server and defaults to
+one millisecond; set `PY2NEO_BENCHMARK_LATENCY` to change it.
+"""
+
+
+from asyncio import gather, new_event_loop
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+
+from pytest import fixture
+
+from py2neo.aio import AsyncGraph
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.benchmark import best_of, report, scaled
+from test.fixtures.bolt import Script, StubBoltServer
+
+
+LATENCY = float(getenv("PY2NEO_BENCHMARK_LATENCY", "0.001"))
+
+COUNT = scaled(1000)
+
+MAX_SIZE = 100
+
+QUERY = "RETURN 1"
+
+
+@fixture(scope="module")
+def server():
+    script = Script().on(QUERY, ["1"], [[1]])
+    with StubBoltServer(script, latency=LATENCY) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def threaded(graph, executor):
+    assert sum(executor.map(lambda _: graph.evaluate(QUERY), range(COUNT))) == COUNT
+
+
+def asynchronous(graph, loop):
+
+    async def f():
+        return await gather(*[graph.evaluate(QUERY) for _ in range(COUNT)])
+
+    assert sum(loop.run_until_complete(f())) == COUNT
+
+
+def test_concurrent_queries(server):
+    name = "%d concurrent queries (%.1fms RTT, %s)"
+    graph = Graph(server.uri, max_size=MAX_SIZE)
+    with ThreadPoolExecutor(max_workers=MAX_SIZE) as executor:
+        t = best_of(threaded, graph, executor)
+    report(name % (COUNT, 1000 * LATENCY, "%d threads" % MAX_SIZE), t, COUNT, "queries")
+    loop = new_event_loop()
+    try:
+        graph = AsyncGraph(server.uri, max_size=MAX_SIZE)
+        t = best_of(asynchronous, graph, loop)
+        graph.close()
+    finally:
+        loop.close()
+    report(name % (COUNT, 1000 * LATENCY, "asyncio"), t, COUNT, "queries")
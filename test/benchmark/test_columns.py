@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+""" Extraction of a numeric result into NumPy and pandas structures,
+comparing the columnar path with the record-based methods.
+"""
+
+
+from pytest import importorskip
+
+from py2neo.connect.packstream import MessageReader, MessageWriter, PackStreamHydrant
+from py2neo.connect.wire import Wire
+from py2neo.database import Cursor
+from py2neo.internal.caching import ThreadLocalEntityCache
+
+from test.fixtures.benchmark import best_of, report, scaled
+
+
+KEYS = [u"id", u"score", u"active", u"rank"]
+
+
+class Sink(object):
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, b):
+        self.data.extend(b)
+
+
+class BufferSocket(object):
+
+    def __init__(self, data):
+        self._data = memoryview(data)
+        self._p = 0
+
+    def recv_into(self, buffer):
+        n = min(len(buffer), len(self._data) - self._p)
+        buffer[:n] = self._data[self._p:self._p + n]
+        self._p += n
+        return n
+
+
+class FakeGraph(object):
+
+    def __init__(self):
+        self.node_cache = ThreadLocalEntityCache()
+        self.relationship_cache = ThreadLocalEntityCache()
+
+
+class FakeResult(object):
+    """ Stand-in for a network result, serving records straight from
+    a message reader.
+    """
+
+    protocol_version = (4, 0)
+
+    lazy_records = False
+
+    def __init__(self, data, count, packable=True):
+        self._reader = MessageReader(Wire(BufferSocket(data)))
+        self._remaining = count
+        self._packable = packable
+        self._packing = False
+
+    def buffer(self):
+        pass
+
+    def fields(self):
+        return KEYS
+
+    def pack_records(self):
+        self._packing = self._packable
+
+    def fetch(self):
+        if not self._remaining:
+            return None
+        self._remaining -= 1
+        tag, fields = self._reader.read_message(pack_records=self._packing)
+        return fields[0]
+
+
+def record_stream(count):
+    sink = Sink()
+    writer = MessageWriter(sink)
+    for i in range(count):
+        writer.write_message(0x71, [i, i / 7.0, i % 3 == 0, None if i % 10 == 0 else i % 100])
+    return bytes(sink.data)
+
+
+def cursor(data, count, packable=True):
+    return Cursor(FakeResult(data, count, packable), PackStreamHydrant(FakeGraph()))
+
+
+def test_numeric_result_extraction():
+    importorskip("numpy")
+    importorskip("pandas")
+    n = scaled(20000)
+    data = record_stream(n)
+    rows = cursor(data, n).to_ndarray()
+    columns = cursor(data, n).to_ndarray(columnar=True)
+    unpacked_columns = cursor(data, n, packable=False).to_ndarray(columnar=True)
+    assert columns.tolist() == unpacked_columns.tolist() == rows.tolist()
+    for name, method, kwargs, packable in [
+            ("to_ndarray", "to_ndarray", {}, True),
+            ("to_data_frame", "to_data_frame", {}, True),
+            ("to_columns (unpacked records)", "to_columns", {}, False),
+            ("to_columns", "to_columns", {}, True),
+            ("to_ndarray(columnar=True)", "to_ndarray", {"columnar": True}, True)]:
+        t = best_of(lambda: getattr(cursor(data, n, packable), method)(**kwargs))
+        report("numeric result via %s" % name, t, n, "records")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Cost of reading the first record of a large result and then
+closing the cursor, with the rest of the result either read and
+hydrated (as before) or discarded.
+
+Records are served by a stub Bolt server in the same process.
+"""
+
+
+from pytest import fixture
+
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.benchmark import best_of, report, scaled
+from test.fixtures.bolt import Script, StubBoltServer, generated
+
+
+COUNT = scaled(10000)
+
+REPEAT = scaled(5)
+
+QUERY = "MATCH (a:Person) RETURN a.name, a.age, a.score, a.active"
+
+
+def row(i):
+    return [u"Person %d" % i, i % 100, i / 7.0, i % 2 == 0]
+
+
+@fixture(scope="module")
+def graph():
+    script = Script().on(QUERY, ["a.name", "a.age", "a.score", "a.active"],
+                         generated(COUNT, row))
+    with StubBoltServer(script) as server:
+        yield Graph(server.uri)
+        GraphService.forget_all()
+
+
+def read_all(graph):
+    for _ in range(REPEAT):
+        cursor = graph.run(QUERY)
+        next(cursor)
+        list(cursor)
+
+
+def close_early(graph, fetch_size):
+    for _ in range(REPEAT):
+        cursor = graph.run(QUERY, fetch_size=fetch_size)
+        next(cursor)
+        cursor.close()
+
+
+def evaluate(graph):
+    for _ in range(REPEAT):
+        graph.evaluate(QUERY)
+
+
+def test_discard(graph):
+    report("First record, then read the rest", best_of(read_all, graph), REPEAT, "queries")
+    report("First record, then close (fetch_size=-1)", best_of(close_early, graph, -1), REPEAT, "queries")
+    report("First record, then close (fetch_size=100)", best_of(close_early, graph, 100), REPEAT, "queries")
+    report("Graph.evaluate", best_of(evaluate, graph), REPEAT, "queries")
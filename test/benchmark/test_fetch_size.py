@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Peak client memory and throughput while iterating over a large
+result, pulling all records at once compared with pulling them in
+batches of a fixed size.
+
+Records are served by a stub Bolt server in the same process, which
+streams its output, so its own allocations add little to the peak.
+"""
+
+
+from pytest import fixture
+
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.benchmark import best_of, peak_memory, report, report_memory, scaled
+from test.fixtures.bolt import Script, StubBoltServer, generated
+
+
+COUNT = scaled(20000)
+
+QUERY = "MATCH (a:Person) RETURN a.name, a.age, a.score, a.active"
+
+
+def row(i):
+    return [u"Person %d" % i, i % 100, i / 7.0, i % 2 == 0]
+
+
+@fixture(scope="module")
+def graph():
+    script = Script().on(QUERY, ["a.name", "a.age", "a.score", "a.active"],
+                         generated(COUNT, row))
+    with StubBoltServer(script) as server:
+        yield Graph(server.uri)
+        GraphService.forget_all()
+
+
+def iterate(graph, fetch_size):
+    for _ in graph.run(QUERY, fetch_size=fetch_size):
+        pass
+
+
+def test_fetch_size(graph):
+    for fetch_size in (-1, 1000):
+        name = "Cursor iteration (fetch_size=%d)" % fetch_size
+        report(name, best_of(iterate, graph, fetch_size), COUNT, "records")
+        report_memory(name + " peak", peak_memory(iterate, graph, fetch_size), COUNT, "record")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" End-to-end client throughput for :class:`.Graph` operations,
+served by an in-process stub Bolt server in place of Neo4j.
+
+These figures cover the whole client stack, from the public API down
+to the socket, so they are best used to compare one revision of the
+client against another. The server runs in the same process, so its
+own work is included in the timings. Set `PY2NEO_BENCHMARK_LATENCY` to a number of
+seconds to inject a delay into every network round trip.
+"""
+
+
+from os import getenv
+
+from pytest import fixture
+
+from py2neo.data import Node, Subgraph
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.benchmark import best_of, report, scaled
+from test.fixtures.bolt import Script, StubBoltServer, generated, node, unwind_identities
+
+
+LATENCY = float(getenv("PY2NEO_BENCHMARK_LATENCY", "0"))
+
+STREAM = scaled(20000)
+
+
+def person(i):
+    return [node(i, ["Person"], {"name": "Person %d" % i, "age": i % 100})]
+
+
+@fixture(scope="module")
+def graph():
+    script = Script(default=unwind_identities)
+    script.on("RETURN 1", ["1"], [[1]])
+    script.on("MATCH (a:Person) RETURN a", ["a"], generated(STREAM, person))
+    script.on("UNWIND range(1, $n) AS i RETURN i", ["i"],
+              lambda parameters: ([i] for i in range(1, parameters["n"] + 1)))
+    with StubBoltServer(script, latency=LATENCY) as server:
+        yield Graph(server.uri)
+        GraphService.forget_all()
+
+
+def test_graph_run(graph):
+    n = scaled(500)
+
+    def run():
+        for _ in range(n):
+            graph.run("RETURN 1").evaluate()
+
+    report("Graph.run (auto-commit, one record)", best_of(run), n, "queries")
+
+
+def test_transaction_run(graph):
+    n = scaled(500)
+
+    def run():
+        tx = graph.begin()
+        for _ in range(n):
+            tx.run("RETURN 1").evaluate()
+        tx.commit()
+
+    report("GraphTransaction.run (one record)", best_of(run), n, "queries")
+
+
+def test_cursor_iteration_over_nodes(graph):
+
+    def iterate():
+        for _ in graph.run("MATCH (a:Person) RETURN a"):
+            pass
+
+    report("Cursor iteration (node records)", best_of(iterate), STREAM, "records")
+
+
+def test_cursor_iteration_over_integers(graph):
+
+    def iterate():
+        for _ in graph.run("UNWIND range(1, $n) AS i RETURN i", n=STREAM):
+            pass
+
+    report("Cursor iteration (integer records)", best_of(iterate), STREAM, "records")
+
+
+def test_create(graph):
+    n = scaled(2000)
+
+    def create():
+        graph.create(Subgraph([Node("Person", name="Person %d" % i) for i in range(n)]))
+
+    report("Graph.create (%d node subgraph)" % n, best_of(create), n, "nodes")
+
+
+def test_merge(graph):
+    n = scaled(2000)
+
+    def merge():
+        graph.merge(Subgraph([Node("Person", name="Person %d" % i) for i in range(n)]),
+                    "Person", "name")
+
+    report("Graph.merge (%d node subgraph)" % n, best_of(merge), n, "nodes")
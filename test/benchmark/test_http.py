@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Auto-commit query throughput over HTTPS against a stub server, and
+the cost of opening an HTTP connection with and without a shared
+transport. A connection with a transport of its own must carry out a
+TLS handshake and fetch the server version before it can be used,
+whereas one opened on the shared transport of a pool does neither.
+Also, transactions of several queries, sent one request per query and
+pipelined into a single request along with the commit.
+"""
+
+
+from pytest import fixture, mark
+
+from py2neo.connect import ConnectionProfile
+from py2neo.connect.http import HTTP, HTTPTransport
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.benchmark import best_of, report, scaled
+from test.fixtures.http import Script, StubHTTPServer
+
+
+pytestmark = mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+
+@fixture(scope="module")
+def server():
+    with StubHTTPServer(Script().on("RETURN 1", ["1"], [[1]]), secure=True) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def run_queries(graph, n):
+    for _ in range(n):
+        graph.evaluate("RETURN 1")
+
+
+def run_transactions(graph, n, size, pipelined):
+    for _ in range(n):
+        tx = graph.begin(pipelined=pipelined)
+        for _ in range(size):
+            tx.run("RETURN 1")
+        tx.commit()
+
+
+def open_connections(profile, transport, n):
+    for _ in range(n):
+        HTTP.open(profile, transport=transport).close()
+
+
+def test_auto_commit_over_https(server):
+    graph = Graph(server.uri)
+    n = scaled(500)
+    seconds = best_of(run_queries, graph, n)
+    report("Auto-commit queries over HTTPS", seconds, n, "queries")
+    assert graph.service.connector._pool._transport.sockets_opened == 1
+
+
+def test_open_connection_over_https(server):
+    profile = ConnectionProfile(server.uri)
+    n = scaled(50)
+    seconds = best_of(open_connections, profile, None, n)
+    report("Open HTTPS connection (own transport)", seconds, n, "connections")
+    transport = HTTPTransport(profile)
+    seconds = best_of(open_connections, profile, transport, n)
+    report("Open HTTPS connection (shared transport)", seconds, n, "connections")
+    assert transport.sockets_opened == 1
+
+
+def test_pipelined_transactions_over_https(server):
+    graph = Graph(server.uri)
+    n = scaled(50)
+    seconds = best_of(run_transactions, graph, n, 10, False)
+    report("Transactions of 10 queries over HTTPS (unpipelined)", seconds, n, "tx")
+    seconds = best_of(run_transactions, graph, n, 10, True)
+    report("Transactions of 10 queries over HTTPS (pipelined)", seconds, n, "tx")
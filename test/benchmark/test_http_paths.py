@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Reading a result of paths over HTTP, where each path has
+relationships not seen before. With the graph format of each record
+(the ``http_graph_format`` setting), paths are hydrated from the
+response alone. Without it, as for responses in the REST format only,
+the relationships of all paths in the result are looked up with one
+further query. Before that, a lookup query was run for each record.
+"""
+
+
+from pytest import fixture
+
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.benchmark import best_of, report, scaled
+from test.fixtures.http import Script, StubHTTPServer
+
+
+LOOKUP = "MATCH ()-[r]->() WHERE id(r) IN $x RETURN r"
+
+LEGACY_LOOKUP = "MATCH ()-[r]->() WHERE id(r) IN $x RETURN id(r), type(r)"
+
+COUNT = scaled(200)
+
+
+def node_json(identity):
+    return {"self": "http://localhost:7474/db/neo4j/node/%d" % identity,
+            "metadata": {"id": identity, "labels": ["Person"]},
+            "data": {"name": "Person %d" % identity}}
+
+
+def path_rows(count, graph):
+    """ Build one row per path, of two nodes and one relationship.
+    Rows without the graph format return the nodes of each path
+    alongside it, so that only relationship types are unknown.
+    """
+    rows = []
+    for i in range(count):
+        a, b, r = 2 * i, 2 * i + 1, i
+        path = {"start": "http://localhost:7474/db/neo4j/node/%d" % a,
+                "nodes": ["http://localhost:7474/db/neo4j/node/%d" % n for n in (a, b)],
+                "length": 1,
+                "relationships": ["http://localhost:7474/db/neo4j/relationship/%d" % r],
+                "end": "http://localhost:7474/db/neo4j/node/%d" % b,
+                "directions": ["->"]}
+        if graph:
+            rows.append({"rest": [None, None, path], "graph": {
+                "nodes": [{"id": str(n), "labels": ["Person"],
+                           "properties": {"name": "Person %d" % n}} for n in (a, b)],
+                "relationships": [{"id": str(r), "type": "KNOWS", "startNode": str(a),
+                                   "endNode": str(b), "properties": {}}]}})
+        else:
+            rows.append({"rest": [node_json(a), node_json(b), path]})
+    return rows
+
+
+def relationship_json(identity):
+    return {"self": "http://localhost:7474/db/neo4j/relationship/%d" % identity,
+            "start": "http://localhost:7474/db/neo4j/node/%d" % (2 * identity),
+            "end": "http://localhost:7474/db/neo4j/node/%d" % (2 * identity + 1),
+            "type": "KNOWS",
+            "metadata": {"id": identity, "type": "KNOWS"},
+            "data": {}}
+
+
+def lookup(parameters):
+    return [[relationship_json(r_id)] for r_id in parameters["x"]]
+
+
+def legacy_lookup(parameters):
+    return [[r_id, "KNOWS"] for r_id in parameters["x"]]
+
+
+@fixture(scope="module")
+def server():
+    script = (Script()
+              .on("RETURN paths", ["a", "b", "p"], path_rows(COUNT, graph=True))
+              .on("RETURN paths without graph", ["a", "b", "p"], path_rows(COUNT, graph=False))
+              .on(LOOKUP, ["r"], lookup)
+              .on(LEGACY_LOOKUP, ["id(r)", "type(r)"], legacy_lookup))
+    with StubHTTPServer(script) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def read_paths(uri, cypher, **settings):
+    # A new service for each run, so that nothing is cached.
+    GraphService.forget_all()
+    for _ in Graph(uri, **settings).run(cypher):
+        pass
+
+
+def read_paths_with_legacy_lookup(uri):
+    """ Read the same result, then look up the type of each
+    relationship with one query per record, as hydration used to.
+    """
+    GraphService.forget_all()
+    graph = Graph(uri, http_graph_format=True)
+    for i, _ in enumerate(graph.run("RETURN paths")):
+        graph.run(LEGACY_LOOKUP, x=[i]).data()
+
+
+def test_path_result_over_http(server):
+    t_old = best_of(read_paths_with_legacy_lookup, server.uri)
+    lookups = server.statements().count(LOOKUP)
+    t_lookup = best_of(read_paths, server.uri, "RETURN paths without graph")
+    runs = server.statements().count("RETURN paths without graph")
+    assert server.statements().count(LOOKUP) - lookups == runs
+    lookups = server.statements().count(LOOKUP)
+    t_graph = best_of(read_paths, server.uri, "RETURN paths", http_graph_format=True)
+    assert server.statements().count(LOOKUP) == lookups
+    report("read HTTP path result (lookup per record)", t_old, COUNT, "records")
+    report("read HTTP path result (lookup per result)", t_lookup, COUNT, "records")
+    report("read HTTP path result (graph format)", t_graph, COUNT, "records")
+    assert t_lookup < t_old
+    assert t_graph < t_old
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Peak memory and time to first record when reading a large result
+over HTTP, with the whole response parsed at once and with records
+parsed one by one as they arrive (the ``http_streaming`` setting).
+"""
+
+
+from pytest import fixture, mark
+
+from py2neo.database import Graph, GraphService
+from py2neo.internal.compat import perf_counter
+
+from test.fixtures.benchmark import peak_memory, report, report_memory, scaled
+from test.fixtures.bolt import generated
+from test.fixtures.http import Script, StubHTTPServer
+
+
+pytestmark = mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+CYPHER = "UNWIND range(1, $n) AS n RETURN n, $text AS text"
+
+ROWS = scaled(20000)
+
+
+@fixture(scope="module")
+def server():
+    script = Script().on(CYPHER, ["n", "text"], generated(ROWS, lambda i: [i, "x" * 100]))
+    with StubHTTPServer(script) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def read_all(graph):
+    for _ in graph.run(CYPHER):
+        pass
+
+
+def first_record(graph):
+    t0 = perf_counter()
+    cursor = graph.run(CYPHER)
+    next(cursor)
+    t = perf_counter() - t0
+    cursor.close()
+    return t
+
+
+def test_streaming_memory(server):
+    buffered = Graph(server.uri)
+    streaming = Graph(server.uri, http_streaming=True)
+    read_all(buffered)
+    read_all(streaming)
+    buffered_peak = peak_memory(read_all, buffered)
+    streaming_peak = peak_memory(read_all, streaming)
+    report_memory("Peak memory reading HTTP result (buffered)", buffered_peak, ROWS, "record")
+    report_memory("Peak memory reading HTTP result (streaming)", streaming_peak, ROWS, "record")
+    assert streaming_peak < buffered_peak / 4
+
+
+def test_streaming_time_to_first_record(server):
+    buffered = Graph(server.uri)
+    streaming = Graph(server.uri, http_streaming=True)
+    buffered_time = min(first_record(buffered) for _ in range(3))
+    streaming_time = min(first_record(streaming) for _ in range(3))
+    report("First record of HTTP result (buffered)", buffered_time, 1, "records")
+    report("First record of HTTP result (streaming)", streaming_time, 1, "records")
+    assert streaming_time < buffered_time
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Hydration throughput for a stream of node records, comparing
+:class:`.PackStreamHydrant` with the original per-value hydrant.
+
+The workload is a scaled-down version of a one million record node
+stream; use `PY2NEO_BENCHMARK_SCALE=200` for the full size.
+"""
+
+
+from collections import namedtuple, deque
+
+from py2neo.connect import Hydrant
+from py2neo.connect.packstream import PackStreamHydrant, Structure, UnpackStream, packed
+from py2neo.data import Record
+from py2neo.database import Cursor
+from py2neo.internal.caching import ThreadLocalEntityCache
+
+from test.fixtures.benchmark import best_of, report, scaled
+
+
+class LegacyPackStreamHydrant(Hydrant):
+    """ The original hydrant, which rebuilds its hydration functions
+    for every value, kept here as a baseline.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def hydrate(self, keys, values, entities=None, version=None):
+        """ Convert PackStream values into native values.
+        """
+        if version is None:
+            v = (1, 0)
+        elif isinstance(version, tuple):
+            v = version
+        else:
+            v = (version, 0)
+        if entities is None:
+            entities = {}
+        return tuple(self._hydrate(value, entities.get(keys[i]), v)
+                     for i, value in enumerate(values))
+
+    def _hydrate(self, obj, inst=None, version=None):
+        from neotime import Duration, Date, Time, DateTime
+        from pytz import FixedOffset, timezone
+        from py2neo.data import Node, Relationship, Path
+        from py2neo.spatial import Point
+
+        unbound_relationship = namedtuple("UnboundRelationship", ["id", "type", "properties"])
+        unix_epoch_date = Date(1970, 1, 1)
+        unix_epoch_date_ordinal = unix_epoch_date.to_ordinal()
+
+        def hydrate_object(o):
+            if isinstance(o, Structure):
+                tag = o.tag if isinstance(o.tag, bytes) else bytes(bytearray([o.tag]))
+                try:
+                    f = functions[tag]
+                except KeyError:
+                    # If we don't recognise the structure type, just return it as-is
+                    return o
+                else:
+                    return f(*o.fields)
+            elif isinstance(o, list):
+                return list(map(hydrate_object, o))
+            elif isinstance(o, dict):
+                return {key: hydrate_object(value) for key, value in o.items()}
+            else:
+                return o
+
+        def hydrate_node(identity, labels, properties):
+            return Node.hydrate(self.graph, identity, labels, hydrate_object(properties), into=inst)
+
+        def hydrate_relationship(identity, start_node_id, end_node_id, r_type, properties):
+            return Relationship.hydrate(self.graph, identity, start_node_id, end_node_id,
+                                        r_type, hydrate_object(properties), into=inst)
+
+        def hydrate_path(nodes, relationships, sequence):
+            nodes = [Node.hydrate(self.graph, n_id, n_label, hydrate_object(n_properties))
+                     for n_id, n_label, n_properties in nodes]
+            u_rels = []
+            for r_id, r_type, r_properties in relationships:
+                u_rel = unbound_relationship(r_id, r_type, hydrate_object(r_properties))
+                u_rels.append(u_rel)
+            return Path.hydrate(self.graph, nodes, u_rels, sequence)
+
+        def hydrate_date(days):
+            """ Hydrator for `Date` values.
+
+            :param days:
+            :return: Date
+            """
+            return Date.from_ordinal(unix_epoch_date_ordinal + days)
+
+        def hydrate_time(nanoseconds, tz=None):
+            """ Hydrator for `Time` and `LocalTime` values.
+
+            :param nanoseconds:
+            :param tz:
+            :return: Time
+            """
+            seconds, nanoseconds = map(int, divmod(nanoseconds, 1000000000))
+            minutes, seconds = map(int, divmod(seconds, 60))
+            hours, minutes = map(int, divmod(minutes, 60))
+            seconds = (1000000000 * seconds + nanoseconds) / 1000000000
+            t = Time(hours, minutes, seconds)
+            if tz is None:
+                return t
+            tz_offset_minutes, tz_offset_seconds = divmod(tz, 60)
+            zone = FixedOffset(tz_offset_minutes)
+            return zone.localize(t)
+
+        def hydrate_datetime(seconds, nanoseconds, tz=None):
+            """ Hydrator for `DateTime` and `LocalDateTime` values.
+
+            :param seconds:
+            :param nanoseconds:
+            :param tz:
+            :return: datetime
+            """
+            minutes, seconds = map(int, divmod(seconds, 60))
+            hours, minutes = map(int, divmod(minutes, 60))
+            days, hours = map(int, divmod(hours, 24))
+            seconds = (1000000000 * seconds + nanoseconds) / 1000000000
+            t = DateTime.combine(Date.from_ordinal(unix_epoch_date_ordinal + days), Time(hours, minutes, seconds))
+            if tz is None:
+                return t
+            if isinstance(tz, int):
+                tz_offset_minutes, tz_offset_seconds = divmod(tz, 60)
+                zone = FixedOffset(tz_offset_minutes)
+            else:
+                zone = timezone(tz)
+            return zone.localize(t)
+
+        def hydrate_duration(months, days, seconds, nanoseconds):
+            """ Hydrator for `Duration` values.
+
+            :param months:
+            :param days:
+            :param seconds:
+            :param nanoseconds:
+            :return: `duration` namedtuple
+            """
+            return Duration(months=months, days=days, seconds=seconds, nanoseconds=nanoseconds)
+
+        def hydrate_point(srid, *coordinates):
+            """ Create a new instance of a Point subclass from a raw
+            set of fields. The subclass chosen is determined by the
+            given SRID; a ValueError will be raised if no such
+            subclass can be found.
+            """
+            try:
+                point_class, dim = Point.class_for_srid(srid)
+            except KeyError:
+                point = Point(coordinates)
+                point.srid = srid
+                return point
+            else:
+                if len(coordinates) != dim:
+                    raise ValueError("SRID %d requires %d coordinates (%d provided)" % (srid, dim, len(coordinates)))
+                return point_class(coordinates)
+
+        functions = {
+            b"N": hydrate_node,
+            b"R": hydrate_relationship,
+            b"P": hydrate_path,
+        }
+        if version >= (2, 0):
+            functions.update({
+                b"D": hydrate_date,
+                b"T": hydrate_time,         # time zone offset
+                b"t": hydrate_time,         # no time zone
+                b"F": hydrate_datetime,     # time zone offset
+                b"f": hydrate_datetime,     # time zone name
+                b"d": hydrate_datetime,     # no time zone
+                b"E": hydrate_duration,
+                b"X": hydrate_point,
+                b"Y": hydrate_point,
+            })
+
+        return hydrate_object(obj)
+
+
+class FakeGraph(object):
+
+    def __init__(self):
+        self.node_cache = ThreadLocalEntityCache()
+        self.relationship_cache = ThreadLocalEntityCache()
+
+
+class FakeResult(object):
+    """ Stand-in for a network result, serving pre-decoded records.
+    """
+
+    protocol_version = (4, 0)
+
+    lazy_records = False
+
+    def __init__(self, records):
+        self._records = deque(records)
+        self.field_lookups = 0
+
+    def buffer(self):
+        pass
+
+    def fields(self):
+        self.field_lookups += 1
+        return [u"n"]
+
+    def fetch(self):
+        try:
+            return self._records.popleft()
+        except IndexError:
+            return None
+
+
+def node_records(count):
+    data = packed(*(Structure(b"N", i, [u"Person"], {u"name": u"Person %d" % i, u"age": i % 100})
+                    for i in range(count)))
+    unpacker = UnpackStream(data)
+    return [(unpacker.unpack(),) for _ in range(count)]
+
+
+def hydrate_all(hydrant, keys, records):
+    for values in records:
+        hydrant.hydrate(keys, values, version=(4, 0))
+
+
+def legacy_iterate(hydrant, records):
+    result = FakeResult(records)
+    v = result.protocol_version
+    while True:
+        values = result.fetch()
+        if values is None:
+            break
+        keys = result.fields()
+        values = hydrant.hydrate(keys, values, entities={}, version=v)
+        Record(zip(keys, values))
+    return result
+
+
+def iterate(hydrant, records):
+    result = FakeResult(records)
+    for _ in Cursor(result, hydrant, {}):
+        pass
+    return result
+
+
+def test_node_stream_hydration():
+    n = scaled(5000)
+    records = node_records(n)
+    keys = [u"n"]
+    graph = FakeGraph()
+    old = LegacyPackStreamHydrant(graph).hydrate(keys, records[0], version=(4, 0))
+    new = PackStreamHydrant(graph).hydrate(keys, records[0], version=(4, 0))
+    assert old == new
+    t_old = best_of(lambda: hydrate_all(LegacyPackStreamHydrant(FakeGraph()), keys, records))
+    t_new = best_of(lambda: hydrate_all(PackStreamHydrant(FakeGraph()), keys, records))
+    report("hydrate node stream (per value)", t_old, n, "records")
+    report("hydrate node stream (compiled per version)", t_new, n, "records")
+
+
+def test_node_stream_cursor():
+    n = scaled(5000)
+    records = node_records(n)
+    assert iterate(PackStreamHydrant(FakeGraph()), records).field_lookups == 1
+    t_old = best_of(lambda: legacy_iterate(LegacyPackStreamHydrant(FakeGraph()), records))
+    t_new = best_of(lambda: iterate(PackStreamHydrant(FakeGraph()), records))
+    report("iterate node stream (per value, keys per record)", t_old, n, "records")
+    report("iterate node stream (Cursor)", t_new, n, "records")
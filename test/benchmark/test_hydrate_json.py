@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Decoding and hydration of node-heavy HTTP results, comparing the
+single-pass :class:`.JSONHydrant` with the original two-pass hydrant,
+which converts each JSON entity into a PackStream structure while
+decoding and then walks every value again to hydrate it.
+"""
+
+
+from collections import namedtuple
+from json import dumps as json_dumps, loads as json_loads
+
+from py2neo.connect import Hydrant
+from py2neo.connect.json import JSONHydrant
+from py2neo.internal.caching import ThreadLocalEntityCache
+
+from test.fixtures.benchmark import best_of, report, scaled
+
+
+class LegacyJSONHydrant(Hydrant):
+    """ The original hydrant, kept here as a baseline.
+    """
+
+    unbound_relationship = namedtuple("UnboundRelationship", ["id", "type", "properties"])
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.hydration_functions = {}
+
+    @classmethod
+    def _uri_to_id(cls, uri):
+        _, _, identity = uri.rpartition("/")
+        return int(identity)
+
+    @classmethod
+    def json_to_packstream(cls, data):
+        from py2neo.connect.packstream import Structure
+        if "self" in data:
+            if "type" in data:
+                return Structure(ord(b"R"),
+                                 cls._uri_to_id(data["self"]),
+                                 cls._uri_to_id(data["start"]),
+                                 cls._uri_to_id(data["end"]),
+                                 data["type"],
+                                 data["data"])
+            else:
+                return Structure(ord(b"N"),
+                                 cls._uri_to_id(data["self"]),
+                                 data["metadata"]["labels"],
+                                 data["data"])
+        else:
+            return data
+
+    def hydrate(self, keys, values, entities=None, version=None):
+        if entities is None:
+            entities = {}
+
+        def hydrate_object(obj, inst=None):
+            from py2neo.data import Node, Relationship
+            from py2neo.connect.packstream import Structure
+            if isinstance(obj, Structure):
+                tag = obj.tag
+                fields = obj.fields
+                if tag == ord(b"N"):
+                    return Node.hydrate(self.graph, fields[0], fields[1], hydrate_object(fields[2]), into=inst)
+                elif tag == ord(b"R"):
+                    return Relationship.hydrate(self.graph, fields[0],
+                                                fields[1], fields[2],
+                                                fields[3], hydrate_object(fields[4]), into=inst)
+                else:
+                    try:
+                        f = self.hydration_functions[tag]
+                    except KeyError:
+                        return obj
+                    else:
+                        return f(*map(hydrate_object, obj.fields))
+            elif isinstance(obj, list):
+                return list(map(hydrate_object, obj))
+            elif isinstance(obj, dict):
+                return {key: hydrate_object(value) for key, value in obj.items()}
+            else:
+                return obj
+
+        return tuple(hydrate_object(value, entities.get(keys[i])) for i, value in enumerate(values))
+
+
+class FakeGraph(object):
+
+    def __init__(self):
+        self.node_cache = ThreadLocalEntityCache()
+        self.relationship_cache = ThreadLocalEntityCache()
+
+
+def node_response(count):
+    """ Build the body of an HTTP response carrying one node per record,
+    along with a list of a few property values.
+    """
+    data = []
+    for i in range(count):
+        data.append({
+            "rest": [{"self": "http://localhost:7474/db/neo4j/node/%d" % i,
+                      "metadata": {"id": i, "labels": ["Person"]},
+                      "data": {"name": "Person %d" % i, "age": i % 100}},
+                     ["a", "b", "c"]],
+            "meta": [{"id": i, "type": "node", "deleted": False}, None],
+        })
+    return json_dumps({"results": [{"columns": ["n", "tags"], "data": data}], "errors": []})
+
+
+def legacy_decode(body):
+    keys = ["n", "tags"]
+    hydrant = LegacyJSONHydrant(FakeGraph())
+    content = json_loads(body, object_hook=LegacyJSONHydrant.json_to_packstream)
+    return [hydrant.hydrate(keys, row["rest"]) for row in content["results"][0]["data"]]
+
+
+def decode(body):
+    keys = ["n", "tags"]
+    hydrant = JSONHydrant(FakeGraph())
+    content = json_loads(body)
+    return [hydrant.hydrate(keys, row["rest"]) for row in content["results"][0]["data"]]
+
+
+def test_node_result_hydration():
+    n = scaled(5000)
+    body = node_response(n)
+    old = legacy_decode(body)
+    new = decode(body)
+    assert [(a.identity, set(a.labels), dict(a), tags) for a, tags in old] == \
+           [(a.identity, set(a.labels), dict(a), tags) for a, tags in new]
+    t_old = best_of(legacy_decode, body)
+    t_new = best_of(decode, body)
+    report("decode and hydrate HTTP node result (two pass)", t_old, n, "records")
+    report("decode and hydrate HTTP node result (single pass)", t_new, n, "records")
+    assert t_new < t_old
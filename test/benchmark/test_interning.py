@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+""" Memory and time taken to decode a stream of nodes, with and without
+reuse of the repeated label and key strings. Only keys, labels and
+relationship types are interned, so short property values that are
+all distinct, such as identifiers, leave the cache untouched.
+"""
+
+
+from codecs import utf_8_decode
+from uuid import uuid4
+
+from py2neo.connect import packstream
+from py2neo.connect.packstream import Structure, UnpackStream, packed
+
+from test.fixtures.benchmark import best_of, report, report_memory, retained_memory, scaled
+
+
+def node_stream(count):
+    return packed(*(Structure(b"N", i, [u"Person", u"Employee"],
+                              {u"name": u"Person %d" % i, u"age": i % 100, u"email": None,
+                               u"department": u"Sales", u"active": True, u"score": 1.5,
+                               u"joined": 2000 + i % 20, u"team": u"Team %d" % (i % 10),
+                               u"level": i % 5, u"manager": i // 10})
+                    for i in range(count)))
+
+
+def decode_all(data, count):
+    unpack = UnpackStream(data).unpack
+    return [unpack() for _ in range(count)]
+
+
+def decode_without_interning(monkeypatch, data, count):
+    monkeypatch.setattr(packstream, "_decode_interned",
+                        lambda b: utf_8_decode(b, "strict", True)[0])
+    try:
+        return decode_all(data, count)
+    finally:
+        monkeypatch.undo()
+
+
+def test_node_stream_string_interning(monkeypatch):
+    n = scaled(20000)
+    data = node_stream(n)
+    assert decode_without_interning(monkeypatch, data, n) == decode_all(data, n)
+    m_old = retained_memory(decode_without_interning, monkeypatch, data, n)
+    m_new = retained_memory(decode_all, data, n)
+    t_old = best_of(decode_without_interning, monkeypatch, data, n)
+    t_new = best_of(decode_all, data, n)
+    report_memory("decoded nodes (no interning)", m_old, n, "node")
+    report_memory("decoded nodes (interned strings)", m_new, n, "node")
+    report("decode nodes (no interning)", t_old, n, "nodes")
+    report("decode nodes (interned strings)", t_new, n, "nodes")
+
+
+def test_distinct_values_do_not_displace_interned_keys(monkeypatch):
+    n = scaled(20000)
+    data = packed(*(Structure(b"N", i, [u"Person"], {u"uuid": str(uuid4()), u"name": u"Person %d" % i})
+                    for i in range(n)))
+    monkeypatch.setattr(packstream, "_interned_strings", {})
+    decode_all(data, n)
+    assert sorted(packstream._interned_strings.values()) == [u"Person", u"name", u"uuid"]
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+""" Cost of reading one field from each of a stream of wide records,
+with records unpacked eagerly as they arrive compared with records
+left packed until their fields are accessed.
+"""
+
+
+from collections import deque
+
+from py2neo.connect.packstream import MessageReader, MessageWriter
+from py2neo.connect.wire import Wire
+from py2neo.database import Cursor
+
+from test.fixtures.benchmark import best_of, report, scaled
+
+
+WIDTH = 50
+
+
+class Sink(object):
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, b):
+        self.data.extend(b)
+
+
+class BufferSocket(object):
+
+    def __init__(self, data):
+        self._data = memoryview(data)
+        self._p = 0
+
+    def recv_into(self, buffer):
+        n = min(len(buffer), len(self._data) - self._p)
+        buffer[:n] = self._data[self._p:self._p + n]
+        self._p += n
+        return n
+
+
+class FakeResult(object):
+    """ Stand-in for a network result, serving records straight from
+    a message reader.
+    """
+
+    protocol_version = (4, 0)
+
+    def __init__(self, reader, count, lazy_records):
+        self._reader = reader
+        self._remaining = count
+        self.lazy_records = lazy_records
+
+    def buffer(self):
+        pass
+
+    def fields(self):
+        return [u"f%d" % i for i in range(WIDTH)]
+
+    def fetch(self):
+        if not self._remaining:
+            return None
+        self._remaining -= 1
+        tag, fields = self._reader.read_message()
+        return fields[0]
+
+
+def record_stream(count):
+    sink = Sink()
+    writer = MessageWriter(sink)
+    row = [u"value %d" % i if i % 2 else {u"id": i, u"tags": [u"a", u"b"]} for i in range(WIDTH)]
+    for _ in range(count):
+        writer.write_message(0x71, row)
+    return bytes(sink.data)
+
+
+def read_one_field(data, count, lazy_records):
+    reader = MessageReader(Wire(BufferSocket(data)), lazy_records=lazy_records)
+    cursor = Cursor(FakeResult(reader, count, lazy_records))
+    return deque((record[u"f1"] for record in cursor), maxlen=1).pop()
+
+
+def test_read_one_field_of_wide_records():
+    n = scaled(5000)
+    data = record_stream(n)
+    assert read_one_field(data, n, False) == read_one_field(data, n, True) == u"value 1"
+    t_eager = best_of(read_one_field, data, n, False)
+    t_lazy = best_of(read_one_field, data, n, True)
+    report("read 1 of %d fields (eager records)" % WIDTH, t_eager, n, "records")
+    report("read 1 of %d fields (lazy records)" % WIDTH, t_lazy, n, "records")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Bolt message read throughput over an in-process socket pair,
+comparing zero-copy reassembly with the original copy-per-chunk reader.
+"""
+
+
+from socket import socketpair
+from struct import unpack as struct_unpack
+from threading import Thread
+
+from py2neo.connect.packstream import MessageReader, MessageWriter, Structure, UnpackStream
+from py2neo.connect.wire import Wire
+
+from test.fixtures.benchmark import best_of, report, scaled
+
+
+class LegacyWire(object):
+    """ Receive side of the original :class:`.Wire`, which trims each
+    read from the front of its input buffer.
+    """
+
+    def __init__(self, s):
+        self.__socket = s
+        self.__input = bytearray()
+
+    def read(self, n):
+        while len(self.__input) < n:
+            received = self.__socket.recv(n)
+            if not received:
+                raise OSError("Network read incomplete")
+            self.__input.extend(received)
+        data = self.__input[:n]
+        self.__input[:n] = []
+        return data
+
+
+class LegacyMessageReader(object):
+    """ The original reader, which copies every chunk into a new
+    message buffer and then copies the message body again.
+    """
+
+    def __init__(self, rx):
+        self.rx = rx
+
+    def _read_chunk(self):
+        size, = struct_unpack(">H", self.rx.read(2))
+        if size:
+            return self.rx.read(size)
+        else:
+            return b""
+
+    def read_message(self):
+        message = bytearray()
+        more = True
+        while more:
+            chunk = self._read_chunk()
+            if chunk:
+                message.extend(chunk)
+            else:
+                more = False
+        _, n = divmod(message[0], 0x10)
+        tag = message[1]
+        unpacker = UnpackStream(message[2:])
+        fields = tuple(unpacker.unpack() for _ in range(n))
+        return tag, fields
+
+
+class Sink(object):
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, b):
+        self.data.extend(b)
+
+
+def encode_records(records):
+    sink = Sink()
+    writer = MessageWriter(sink)
+    for record in records:
+        writer.write_message(0x71, record)
+    return bytes(sink.data)
+
+
+def read_all(wire_class, reader_class, data, count):
+    client, server = socketpair()
+    sender = Thread(target=server.sendall, args=(data,))
+    sender.start()
+    try:
+        reader = reader_class(wire_class(client))
+        for _ in range(count):
+            reader.read_message()
+    finally:
+        sender.join()
+        client.close()
+        server.close()
+
+
+def run(name, records):
+    data = encode_records(records)
+    count = len(records)
+    t_old = best_of(read_all, LegacyWire, LegacyMessageReader, data, count)
+    t_new = best_of(read_all, Wire, MessageReader, data, count)
+    report("read %s (copying reader)" % name, t_old, len(data), "B")
+    report("read %s (zero-copy reader)" % name, t_new, len(data), "B")
+
+
+def test_read_small_records():
+    run("small records", [[i, u"name %d" % i, i / 2.0] for i in range(scaled(20000))])
+
+
+def test_read_node_records():
+    run("node records", [[Structure(b"N", i, [u"Person"], {u"name": u"Person %d" % i, u"age": i % 90})]
+                         for i in range(scaled(10000))])
+
+
+def test_read_multi_chunk_records():
+    run("multi-chunk records", [[u"x" * 100000] for _ in range(scaled(100))])
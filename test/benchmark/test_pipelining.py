@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Time taken to run a transaction of many small queries over a link
+with a fixed round trip time, with each query synchronised as it is
+run compared with all queries pipelined together.
+
+The round trip time is injected by a stub Bolt server and defaults to
+one millisecond; set `PY2NEO_BENCHMARK_LATENCY` to change it.
+"""
+
+
+from os import getenv
+
+from pytest import fixture
+
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.benchmark import best_of, report, scaled
+from test.fixtures.bolt import Script, StubBoltServer
+
+
+LATENCY = float(getenv("PY2NEO_BENCHMARK_LATENCY", "0.001"))
+
+
+@fixture(scope="module")
+def graph():
+    script = Script().on("CREATE (a:Person {name: $name})", [], [])
+    with StubBoltServer(script, latency=LATENCY) as server:
+        yield Graph(server.uri)
+        GraphService.forget_all()
+
+
+def transaction(graph, n, pipelined):
+    tx = graph.begin(pipelined=pipelined)
+    for i in range(n):
+        tx.run("CREATE (a:Person {name: $name})", name="Person %d" % i)
+    tx.commit()
+
+
+def test_transaction_of_small_queries(graph):
+    n = scaled(200)
+    name = "Transaction of %d queries (%.1fms RTT, %s)"
+    synced = best_of(transaction, graph, n, False)
+    report(name % (n, 1000 * LATENCY, "synced"), synced, n, "queries")
+    pipelined = best_of(transaction, graph, n, True)
+    report(name % (n, 1000 * LATENCY, "pipelined"), pipelined, n, "queries")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Rate at which a single thread can acquire and release a pooled
+connection, with and without a metrics listener attached, showing the
+cost of pool bookkeeping on the hot path.
+"""
+
+
+from pytest import fixture
+
+from py2neo.connect import ConnectionPool, ConnectionProfile
+
+from test.fixtures.benchmark import best_of, report, scaled
+from test.fixtures.bolt import Script, StubBoltServer
+
+
+@fixture(scope="module")
+def pool():
+    with StubBoltServer(Script()) as server:
+        pool = ConnectionPool.open(ConnectionProfile(server.uri))
+        yield pool
+        pool.close()
+
+
+def acquire_and_release(pool, n):
+    for _ in range(n):
+        pool.release(pool.acquire())
+
+
+def test_acquire_and_release(pool):
+    n = scaled(20000)
+    seconds = best_of(acquire_and_release, pool, n)
+    report("Acquire and release", seconds, n, "cycles")
+    events = []
+
+    def listener(event, value):
+        events.append(event)
+
+    pool.metrics.add_listener(listener)
+    try:
+        seconds = best_of(acquire_and_release, pool, n)
+    finally:
+        pool.metrics.remove_listener(listener)
+    report("Acquire and release (with listener)", seconds, n, "cycles")
+    assert pool.metrics.acquires == pool.metrics.releases
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Time taken to run many short auto-commit queries over a link with
+a fixed round trip time, and the number of round trips made for each.
+Connections released to the pool in an idle state are reused without
+being reset, so each query should need only a single round trip.
+
+The round trip time is injected by a stub Bolt server and defaults to
+one millisecond; set `PY2NEO_BENCHMARK_LATENCY` to change it.
+"""
+
+
+from os import getenv
+
+from pytest import fixture
+
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.benchmark import REPEAT, best_of, report, scaled
+from test.fixtures.bolt import Script, StubBoltServer
+
+
+LATENCY = float(getenv("PY2NEO_BENCHMARK_LATENCY", "0.001"))
+
+
+@fixture(scope="module")
+def server():
+    script = Script().on("RETURN 1", ["1"], [[1]])
+    with StubBoltServer(script, latency=LATENCY) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def auto_commit(graph, n):
+    for _ in range(n):
+        graph.evaluate("RETURN 1")
+
+
+def test_short_auto_commit_queries(server):
+    graph = Graph(server.uri)
+    n = scaled(200)
+    auto_commit(graph, 1)
+    round_trips = server.round_trips
+    seconds = best_of(auto_commit, graph, n)
+    per_query = float(server.round_trips - round_trips) / (n * REPEAT)
+    report("Auto-commit queries (%.1fms RTT)" % (1000 * LATENCY), seconds, n, "queries")
+    print("%-56s %14.2f round trips/query  (%d resets avoided)" % (
+        "Auto-commit queries", per_query, graph.service.connector.resets_avoided))
+    assert not server.requests_named("RESET")
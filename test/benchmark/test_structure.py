@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+""" Memory retained by, and time taken to decode, PackStream structures
+compared with the original dictionary-backed structure class.
+"""
+
+
+from py2neo.connect import packstream
+from py2neo.connect.packstream import Structure, UnpackStream, packed
+
+from test.fixtures.benchmark import best_of, report, report_memory, retained_memory, scaled
+
+
+class LegacyStructure:
+    """ The original structure class, kept here as a baseline.
+    """
+
+    def __init__(self, tag, *fields):
+        self.tag = tag
+        self.fields = list(fields)
+
+
+def legacy_structure(tag, fields):
+    return LegacyStructure(tag, *fields)
+
+
+WORKLOADS = {
+    "dates": lambda i: Structure(b"D", i),
+    "nodes": lambda i: Structure(b"N", i, [], {}),
+    "relationships": lambda i: Structure(b"R", i, i, i + 1, u"KNOWS", {}),
+}
+
+
+def decode_all(data, count):
+    unpack = UnpackStream(data).unpack
+    return [unpack() for _ in range(count)]
+
+
+def decode_legacy(monkeypatch, data, count):
+    monkeypatch.setattr(packstream, "_new_structure", legacy_structure)
+    try:
+        return decode_all(data, count)
+    finally:
+        monkeypatch.undo()
+
+
+def test_structure_memory_and_decoding(monkeypatch):
+    n = scaled(20000)
+    for name, workload in sorted(WORKLOADS.items()):
+        data = packed(*map(workload, range(n)))
+        m_old = retained_memory(decode_legacy, monkeypatch, data, n)
+        m_new = retained_memory(decode_all, data, n)
+        t_old = best_of(decode_legacy, monkeypatch, data, n)
+        t_new = best_of(decode_all, data, n)
+        report_memory("%s (dictionary-backed)" % name, m_old, n, "struct")
+        report_memory("%s (slotted)" % name, m_new, n, "struct")
+        report("decode %s (dictionary-backed)" % name, t_old, n, "structs")
+        report("decode %s (slotted)" % name, t_new, n, "structs")
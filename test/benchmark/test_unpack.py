@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Decoding throughput of :class:`.UnpackStream` compared with the
+original if/elif marker chain.
+"""
+
+
+from codecs import decode
+from struct import unpack as struct_unpack
+
+from py2neo.connect.packstream import EndOfStream, Structure, UnpackStream, packed
+
+from test.fixtures.benchmark import best_of, report, scaled
+
+
+class LegacyUnpackStream(object):
+    """ The original if/elif decoder, kept here as a baseline.
+    """
+
+    def __init__(self, b):
+        self._mem = memoryview(b)
+        self._p = 0
+
+    def unpack(self):
+        if self._p < len(self._mem):
+            marker = self._read_u8()
+        else:
+            raise ValueError("Nothing to unpack")  # TODO: better error
+
+        # Tiny Integer
+        if 0x00 <= marker <= 0x7F:
+            return marker
+        elif 0xF0 <= marker <= 0xFF:
+            return marker - 0x100
+
+        # Null
+        elif marker == 0xC0:
+            return None
+
+        # Float
+        elif marker == 0xC1:
+            return self._read_f64be()
+
+        # Boolean
+        elif marker == 0xC2:
+            return False
+        elif marker == 0xC3:
+            return True
+
+        # Integer
+        elif marker == 0xC8:
+            return self._read_i8()
+        elif marker == 0xC9:
+            return self._read_i16be()
+        elif marker == 0xCA:
+            return self._read_i32be()
+        elif marker == 0xCB:
+            return self._read_i64be()
+
+        # Bytes
+        elif marker == 0xCC:
+            size = self._read_u8()
+            return self._read(size)
+        elif marker == 0xCD:
+            size = self._read_u16be()
+            return self._read(size)
+        elif marker == 0xCE:
+            size = self._read_u32be()
+            return self._read(size)
+
+        else:
+            marker_high = marker & 0xF0
+            # String
+            if marker_high == 0x80:  # TINY_STRING
+                return decode(self._read(marker & 0x0F), "utf-8")
+            elif marker == 0xD0:  # STRING_8:
+                size = self._read_u8()
+                return decode(self._read(size), "utf-8")
+            elif marker == 0xD1:  # STRING_16:
+                size = self._read_u16be()
+                return decode(self._read(size), "utf-8")
+            elif marker == 0xD2:  # STRING_32:
+                size = self._read_u32be()
+                return decode(self._read(size), "utf-8")
+
+            # List
+            elif 0x90 <= marker <= 0x9F or 0xD4 <= marker <= 0xD7:
+                return list(self._unpack_list_items(marker))
+
+            # Dictionary
+            elif 0xA0 <= marker <= 0xAF or 0xD8 <= marker <= 0xDB:
+                return self._unpack_dictionary(marker)
+
+            # Structure
+            elif 0xB0 <= marker <= 0xBF:
+                size, tag = self._unpack_structure_header(marker)
+                fields = [None] * size
+                for i in range(size):
+                    fields[i] = self.unpack()
+                return Structure(tag, *fields)
+
+            elif marker == 0xDF:  # END_OF_STREAM:
+                return EndOfStream
+
+            else:
+                raise ValueError("Unknown PackStream marker %02X" % marker)
+
+    def _unpack_list_items(self, marker):
+        marker_high = marker & 0xF0
+        if marker_high == 0x90:
+            size = marker & 0x0F
+            if size == 0:
+                return
+            elif size == 1:
+                yield self.unpack()
+            else:
+                for _ in range(size):
+                    yield self.unpack()
+        elif marker == 0xD4:  # LIST_8:
+            size = self._read_u8()
+            for _ in range(size):
+                yield self.unpack()
+        elif marker == 0xD5:  # LIST_16:
+            size = self._read_u16be()
+            for _ in range(size):
+                yield self.unpack()
+        elif marker == 0xD6:  # LIST_32:
+            size = self._read_u32be()
+            for _ in range(size):
+                yield self.unpack()
+        elif marker == 0xD7:  # LIST_STREAM:
+            item = None
+            while item is not EndOfStream:
+                item = self.unpack()
+                if item is not EndOfStream:
+                    yield item
+        else:
+            return
+
+    def _unpack_dictionary(self, marker):
+        marker_high = marker & 0xF0
+        if marker_high == 0xA0:
+            size = marker & 0x0F
+            value = {}
+            for _ in range(size):
+                key = self.unpack()
+                value[key] = self.unpack()
+            return value
+        elif marker == 0xD8:  # MAP_8:
+            size = self._read_u8()
+            value = {}
+            for _ in range(size):
+                key = self.unpack()
+                value[key] = self.unpack()
+            return value
+        elif marker == 0xD9:  # MAP_16:
+            size = self._read_u16be()
+            value = {}
+            for _ in range(size):
+                key = self.unpack()
+                value[key] = self.unpack()
+            return value
+        elif marker == 0xDA:  # MAP_32:
+            size = self._read_u32be()
+            value = {}
+            for _ in range(size):
+                key = self.unpack()
+                value[key] = self.unpack()
+            return value
+        elif marker == 0xDB:  # MAP_STREAM:
+            value = {}
+            key = None
+            while key is not EndOfStream:
+                key = self.unpack()
+                if key is not EndOfStream:
+                    value[key] = self.unpack()
+            return value
+        else:
+            return None
+
+    def _unpack_structure_header(self, marker):
+        marker_high = marker & 0xF0
+        if marker_high == 0xB0:  # TINY_STRUCT
+            signature = self._read_u8()
+            return marker & 0x0F, signature
+        else:
+            raise ValueError("Expected structure, found marker %02X" % marker)
+
+    def _read(self, n=1):
+        q = self._p + n
+        m = self._mem[self._p:q]
+        self._p = q
+        return m.tobytes()
+
+    def _read_u8(self):
+        q = self._p + 1
+        n, = struct_unpack(">B", self._mem[self._p:q])
+        self._p = q
+        return n
+
+    def _read_u16be(self):
+        q = self._p + 2
+        n, = struct_unpack(">H", self._mem[self._p:q])
+        self._p = q
+        return n
+
+    def _read_u32be(self):
+        q = self._p + 4
+        n, = struct_unpack(">I", self._mem[self._p:q])
+        self._p = q
+        return n
+
+    def _read_i8(self):
+        q = self._p + 1
+        z, = struct_unpack(">b", self._mem[self._p:q])
+        self._p = q
+        return z
+
+    def _read_i16be(self):
+        q = self._p + 2
+        z, = struct_unpack(">h", self._mem[self._p:q])
+        self._p = q
+        return z
+
+    def _read_i32be(self):
+        q = self._p + 4
+        z, = struct_unpack(">i", self._mem[self._p:q])
+        self._p = q
+        return z
+
+    def _read_i64be(self):
+        q = self._p + 8
+        z, = struct_unpack(">q", self._mem[self._p:q])
+        self._p = q
+        return z
+
+    def _read_f64be(self):
+        q = self._p + 8
+        r, = struct_unpack(">d", self._mem[self._p:q])
+        self._p = q
+        return r
+
+
+
+
+def node(i):
+    return Structure(b"N", i, [u"Person", u"Employee"],
+                     {u"name": u"Person %d" % i, u"age": i % 100,
+                      u"score": i / 7.0, u"active": i % 2 == 0})
+
+
+WORKLOADS = {
+    "small ints": [i % 200 - 16 for i in range(1000)],
+    "wide ints": [i * 100003 for i in range(1000)],
+    "short strings": [u"value %d" % i for i in range(1000)],
+    "floats": [i / 3.0 for i in range(1000)],
+    "node records": [[node(i), i, u"x"] for i in range(100)],
+}
+
+
+def decode_all(cls, data, n):
+    for _ in range(n):
+        cls(data).unpack()
+
+
+def test_unpack_throughput():
+    for name, value in sorted(WORKLOADS.items()):
+        data = packed(value)
+        n = scaled(50)
+        assert UnpackStream(data).unpack() == LegacyUnpackStream(data).unpack()
+        t_old = best_of(decode_all, LegacyUnpackStream, data, n)
+        t_new = best_of(decode_all, UnpackStream, data, n)
+        report("unpack %s (if/elif chain)" % name, t_old, n * len(data), "B")
+        report("unpack %s (marker table)" % name, t_new, n * len(data), "B")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Raw read and send throughput of :class:`.Wire` over an in-process
+socket pair, compared with the original `recv`-per-read implementation.
+"""
+
+
+from socket import socketpair
+from threading import Thread
+
+from py2neo.connect.wire import Wire
+
+from test.fixtures.benchmark import best_of, report, scaled
+
+
+class LegacyWire(object):
+    """ The original :class:`.Wire`, which calls `recv` for exactly the
+    bytes needed and trims consumed data from the front of its buffers.
+    """
+
+    def __init__(self, s):
+        self.__socket = s
+        self.__input = bytearray()
+        self.__output = bytearray()
+
+    def read(self, n):
+        while len(self.__input) < n:
+            received = self.__socket.recv(n)
+            if not received:
+                raise OSError("Network read incomplete")
+            self.__input.extend(received)
+        data = self.__input[:n]
+        self.__input[:n] = []
+        return data
+
+    def write(self, b):
+        self.__output.extend(b)
+
+    def send(self):
+        sent = 0
+        while self.__output:
+            n = self.__socket.send(self.__output)
+            self.__output[:n] = []
+            sent += n
+        return sent
+
+
+def drain(s, size):
+    received = 0
+    while received < size:
+        data = s.recv(1048576)
+        if not data:
+            break
+        received += len(data)
+
+
+def read_all(wire_class, data, message_size):
+    client, server = socketpair()
+    sender = Thread(target=server.sendall, args=(data,))
+    sender.start()
+    try:
+        wire = wire_class(client)
+        for _ in range(len(data) // message_size):
+            wire.read(message_size)
+    finally:
+        sender.join()
+        client.close()
+        server.close()
+
+
+def send_all(wire_class, message, count):
+    client, server = socketpair()
+    receiver = Thread(target=drain, args=(server, len(message) * count))
+    receiver.start()
+    try:
+        wire = wire_class(client)
+        for _ in range(count):
+            wire.write(message)
+        wire.send()
+    finally:
+        receiver.join()
+        client.close()
+        server.close()
+
+
+def run_read(name, message_size, count):
+    data = b"x" * (message_size * count)
+    t_old = best_of(read_all, LegacyWire, data, message_size)
+    t_new = best_of(read_all, Wire, data, message_size)
+    report("read %s (recv per read)" % name, t_old, len(data), "B")
+    report("read %s (recv_into buffer)" % name, t_new, len(data), "B")
+
+
+def run_send(name, message_size, count):
+    message = b"x" * message_size
+    t_old = best_of(send_all, LegacyWire, message, count)
+    t_new = best_of(send_all, Wire, message, count)
+    report("send %s (trimmed output)" % name, t_old, message_size * count, "B")
+    report("send %s (offset output)" % name, t_new, message_size * count, "B")
+
+
+def test_read_small_messages():
+    run_read("small messages", 24, scaled(50000))
+
+
+def test_read_large_messages():
+    run_read("large messages", 1048576, scaled(8))
+
+
+def test_send_small_messages():
+    run_send("small messages", 24, scaled(50000))
+
+
+def test_send_large_messages():
+    run_send("large messages", 1048576, scaled(8))
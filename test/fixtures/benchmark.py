@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" Helpers for the benchmarks under `test/benchmark`.
+
+Workloads are kept small by default so that the benchmarks can run as
+part of an ordinary test session. Set the `PY2NEO_BENCHMARK_SCALE`
+environment variable to a larger multiplier for more stable figures,
+and run pytest with `-s` to see the results.
+"""
+
+
+from gc import collect
+from os import getenv
+from tracemalloc import get_traced_memory, start, stop
+
+from py2neo.internal.compat import perf_counter
+
+
+SCALE = float(getenv("PY2NEO_BENCHMARK_SCALE", "1"))
+
+REPEAT = int(getenv("PY2NEO_BENCHMARK_REPEAT", "3"))
+
+
+def scaled(n):
+    """ Scale a workload size by the configured benchmark scale.
+    """
+    return max(1, int(n * SCALE))
+
+
+def best_of(f, *args, **kwargs):
+    """ Call a function repeatedly and return the shortest time taken
+    by any one call, in seconds.
+    """
+    best = None
+    for _ in range(REPEAT):
+        t0 = perf_counter()
+        f(*args, **kwargs)
+        t = perf_counter() - t0
+        if best is None or t < best:
+            best = t
+    return best
+
+
+def report(name, seconds, count, unit="ops"):
+    """ Print a single line of benchmark output.
+    """
+    rate = count / seconds if seconds else float("inf")
+    print("%-56s %14.1f %s/s  (%d in %.3fs)" % (name, rate, unit, count, seconds))
+    return rate
+
+
+def retained_memory(f, *args, **kwargs):
+    """ Call a function and return the number of bytes of memory
+    still allocated by that call once it has returned, including the
+    value that it returns.
+    """
+    collect()
+    start()
+    try:
+        value = f(*args, **kwargs)
+        collect()
+        size, _ = get_traced_memory()
+    finally:
+        stop()
+    del value
+    return size
+
+
+def peak_memory(f, *args, **kwargs):
+    """ Call a function and return the highest number of bytes of
+    memory allocated at any one time during that call.
+    """
+    collect()
+    start()
+    try:
+        f(*args, **kwargs)
+        _, peak = get_traced_memory()
+    finally:
+        stop()
+    return peak
+
+
+def report_memory(name, size, count, unit="item"):
+    """ Print a single line of memory usage output.
+    """
+    print("%-56s %14.1f B/%s  (%d bytes for %d)" % (name, size / count, unit, size, count))
+    return size / count
@@ -0,0 +1,496 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+""" An in-process Bolt server for exercising the client without Neo4j.
+
+The server speaks just enough of Bolt 1 to 4.0 to carry a client
+through the handshake, authentication, auto-commit and explicit
+transactions. Queries are answered by a :class:`.Script`, which maps
+Cypher text to canned or generated records. For example::
+
+    script = Script().on("RETURN 1", ["1"], [[1]])
+    with StubBoltServer(script) as server:
+        graph = Graph(server.uri)
+        assert graph.evaluate("RETURN 1") == 1
+
+Replies to each batch of requests read from the socket are sent back
+together, after an optional delay, so that `latency` is applied once
+per network round trip, much as it would be by a real network.
+"""
+
+
+from itertools import chain
+from socket import socket, error as SocketError, timeout as SocketTimeout, \
+    AF_INET, SOCK_STREAM, SOL_SOCKET, SO_REUSEADDR, IPPROTO_TCP, TCP_NODELAY, SHUT_RDWR
+from threading import Thread
+from time import sleep
+
+from py2neo.connect.packstream import MessageWriter, Structure, UnpackStream, UINT_16
+
+
+BOLT_MAGIC = b"\x60\x60\xB0\x17"
+
+REQUEST_NAMES = {
+    0x01: "HELLO",
+    0x02: "GOODBYE",
+    0x0E: "ACK_FAILURE",
+    0x0F: "RESET",
+    0x10: "RUN",
+    0x11: "BEGIN",
+    0x12: "COMMIT",
+    0x13: "ROLLBACK",
+    0x2F: "DISCARD",
+    0x3F: "PULL",
+}
+
+
+def node(identity, labels=(), properties=None):
+    """ Build a node structure, as it would be sent by the server.
+    """
+    return Structure(b"N", identity, list(labels), dict(properties or {}))
+
+
+def relationship(identity, start, end, type_, properties=None):
+    """ Build a relationship structure, as it would be sent by the
+    server.
+    """
+    return Structure(b"R", identity, start, end, type_, dict(properties or {}))
+
+
+def generated(count, row=None):
+    """ Return a record source that yields `count` records on each
+    run. Each record is built by calling `row` with its index, or is
+    simply ``[index]`` by default.
+    """
+    if row is None:
+        def row(i):
+            return [i]
+
+    def records(parameters):
+        return (row(i) for i in range(count))
+
+    return records
+
+
+def unwind_identities(cypher, parameters):
+    """ Reply to an ``UNWIND $x AS data ... RETURN id(_)`` statement,
+    such as those issued by `create` and `merge`, with one identity for
+    each item of data.
+    """
+    return ["id(_)"], [[i] for i in range(len(parameters.get("x") or ()))]
+
+
+class ScriptError(Exception):
+    """ Raised by a script for a statement that it cannot answer. The
+    server reports this to the client as a FAILURE.
+    """
+
+    code = "Neo.ClientError.Statement.SyntaxError"
+
+
+class Script(object):
+    """ A table of replies, keyed by Cypher text.
+
+    Each reply consists of a list of field names and a source of
+    records. That source may be a sequence of records, which is
+    replayed on every run, or a function that accepts the query
+    parameters and returns an iterable of records. Statements not
+    found in the table are passed to the `default` function, if one
+    is given, which should return a `(fields, records)` pair.
+    """
+
+    def __init__(self, default=None):
+        self.default = default
+        self._replies = {}
+
+    def on(self, cypher, fields=(), records=()):
+        """ Add a reply for a particular statement, returning the
+        script itself so that calls can be chained.
+        """
+        self._replies[cypher] = (list(fields), records)
+        return self
+
+    def __call__(self, cypher, parameters):
+        try:
+            fields, records = self._replies[cypher]
+        except KeyError:
+            if self.default is None:
+                raise ScriptError("No reply scripted for %r" % cypher)
+            return self.default(cypher, parameters)
+        else:
+            if callable(records):
+                records = records(parameters)
+            return fields, records
+
+
+class StubBoltServer(object):
+    """ Scripted Bolt server, listening on an ephemeral port of the
+    loopback interface and serving each connection from its own
+    thread.
+
+    :param script: callable that accepts Cypher text and parameters
+        and returns a `(fields, records)` pair
+    :param protocol_version: the Bolt protocol version to agree with
+        clients, as a `(major, minor)` tuple
+    :param server_agent: server agent string returned on
+        authentication
+    :param latency: delay, in seconds, applied before sending each
+        batch of replies
+    :param graph_names: names of the graphs reported by
+        ``SHOW DATABASES``, the first of which is the default
+    """
+
+    def __init__(self, script=None, protocol_version=(4, 0), server_agent=None,
+                 latency=0.0, graph_names=("neo4j",)):
+        self.script = script or Script()
+        self.protocol_version = protocol_version
+        self.server_agent = server_agent or "Neo4j/%d.%d.0" % protocol_version
+        self.latency = latency
+        self.graph_names = list(graph_names)
+        #: Every request received, as a `(name, fields)` pair.
+        self.requests = []
+        #: Number of batches of replies sent, across all connections.
+        self.round_trips = 0
+        self.connection_count = 0
+        self._listener = None
+        self._thread = None
+        self._connections = []
+        self._running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def address(self):
+        return self._listener.getsockname()
+
+    @property
+    def uri(self):
+        return "bolt://%s:%d" % self.address
+
+    def requests_named(self, name):
+        """ Return the fields of every request received with a given
+        name, such as ``"RUN"``.
+        """
+        return [fields for n, fields in self.requests if n == name]
+
+    def start(self):
+        self._listener = socket(AF_INET, SOCK_STREAM)
+        self._listener.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(32)
+        self._listener.settimeout(0.1)
+        self._running = True
+        self._thread = Thread(target=self._accept_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+        self._listener.close()
+        for connection in list(self._connections):
+            connection.close()
+        for connection in list(self._connections):
+            connection.join()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                s, _ = self._listener.accept()
+            except SocketTimeout:
+                continue
+            except SocketError:
+                break
+            s.settimeout(None)
+            s.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+            self.connection_count += 1
+            connection = _StubConnection(self, s, self.connection_count)
+            self._connections.append(connection)
+            connection.start()
+
+
+class _StubConnection(object):
+    """ Server side of a single Bolt connection.
+    """
+
+    def __init__(self, server, s, number):
+        self.server = server
+        self.socket = s
+        self.number = number
+        self.version = None
+        self.failed = False
+        self.in_transaction = False
+        self.streams = {}
+        self.qid = -1
+        self.bookmark = 0
+        self._input = bytearray()
+        self._output = bytearray()
+        self._writer = MessageWriter(self)
+        self._thread = Thread(target=self._serve)
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def join(self):
+        self._thread.join()
+
+    def close(self):
+        try:
+            self.socket.shutdown(SHUT_RDWR)
+        except SocketError:
+            pass
+        self.socket.close()
+
+    # MessageWriter transport
+
+    def write(self, b):
+        self._output.extend(b)
+
+    def send(self):
+        if self.server.latency:
+            sleep(self.server.latency)
+        return self._flush()
+
+    def _flush(self):
+        data = bytes(self._output)
+        del self._output[:]
+        self.socket.sendall(data)
+        return len(data)
+
+    def _receive(self):
+        data = self.socket.recv(65536)
+        if not data:
+            raise EOFError("Connection closed by client")
+        self._input.extend(data)
+
+    def _serve(self):
+        try:
+            if not self._handshake():
+                return
+            while True:
+                self._receive()
+                messages = self._read_messages()
+                for message in messages:
+                    if not self._handle(message):
+                        return
+                if messages:
+                    self.server.round_trips += 1
+                    self.send()
+        except (EOFError, SocketError):
+            pass
+        finally:
+            self.socket.close()
+
+    def _handshake(self):
+        while len(self._input) < 20:
+            self._receive()
+        if bytes(self._input[:4]) != BOLT_MAGIC:
+            return False
+        proposals = [(p[3], p[2]) for p in (self._input[i:i + 4] for i in range(4, 20, 4))]
+        del self._input[:20]
+        if self.server.protocol_version in proposals:
+            self.version = self.server.protocol_version
+            major, minor = self.version
+            self.write(bytearray([0, 0, minor, major]))
+            self.send()
+            return True
+        else:
+            self.write(b"\x00\x00\x00\x00")
+            self.send()
+            return False
+
+    def _read_messages(self):
+        """ Remove and return every complete message held in the input
+        buffer.
+        """
+        data = self._input
+        end = len(data)
+        messages = []
+        p = 0
+        while True:
+            q = p
+            chunks = []
+            complete = False
+            while q + 2 <= end:
+                size, = UINT_16.unpack(bytes(data[q:q + 2]))
+                q += 2
+                if size == 0:
+                    if chunks:
+                        complete = True
+                        break
+                    p = q  # no-op chunk between messages
+                elif q + size <= end:
+                    chunks.append(bytes(data[q:q + size]))
+                    q += size
+                else:
+                    break
+            if not complete:
+                break
+            messages.append(b"".join(chunks))
+            p = q
+        del data[:p]
+        return messages
+
+    def _handle(self, message):
+        unpacker = UnpackStream(message)
+        size, tag = unpacker.unpack_structure_header()
+        fields = [unpacker.unpack() for _ in range(size)]
+        name = REQUEST_NAMES.get(tag, "#%02X" % tag)
+        self.server.requests.append((name, fields))
+        if tag == 0x02:
+            return False
+        if tag == 0x0F or (tag == 0x0E and self.version < (3, 0)):
+            self.failed = False
+            self.in_transaction = False
+            self.streams.clear()
+            self._success()
+        elif self.failed:
+            self._writer.write_message(0x7E)
+        elif tag == 0x01:
+            self._success(server=self.server.server_agent,
+                          connection_id="bolt-%d" % self.number)
+        elif tag == 0x10:
+            self._run(*fields)
+        elif tag == 0x3F:
+            self._pull(*self._stream_args(fields))
+        elif tag == 0x2F:
+            self._discard(*self._stream_args(fields))
+        elif tag == 0x11:
+            self._begin()
+        elif tag in (0x12, 0x13):
+            self._end(commit=(tag == 0x12))
+        else:
+            self._failure("Neo.ClientError.Request.Invalid",
+                          "Unsupported request %s" % name)
+        return True
+
+    def _success(self, **metadata):
+        self._writer.write_message(0x70, metadata)
+
+    def _failure(self, code, message):
+        self.failed = True
+        self.streams.clear()
+        self._writer.write_message(0x7F, {"code": code, "message": message})
+
+    def _begin(self):
+        self.in_transaction = True
+        self.streams.clear()
+        self.qid = -1
+        self._success()
+
+    def _end(self, commit):
+        self.in_transaction = False
+        if commit:
+            self.bookmark += 1
+            self._success(bookmark="stub:%d" % self.bookmark)
+        else:
+            self._success()
+
+    def _run(self, cypher, parameters, extra=None):
+        if self.version < (3, 0) and cypher in ("BEGIN", "COMMIT", "ROLLBACK"):
+            if cypher == "BEGIN":
+                self.in_transaction = True
+            else:
+                self.in_transaction = False
+            self._success(fields=[])
+            self._open_stream(())
+            return
+        if cypher == "SHOW DATABASES" and (extra or {}).get("db") == "system":
+            fields, records = self._show_databases()
+        else:
+            try:
+                fields, records = self.server.script(cypher, parameters)
+            except ScriptError as error:
+                self._failure(error.code, str(error))
+                return
+        metadata = {"fields": list(fields), "t_first": 0}
+        qid = self._open_stream(records)
+        if self.in_transaction and self.version >= (4, 0):
+            metadata["qid"] = qid
+        self._success(**metadata)
+
+    def _open_stream(self, records):
+        if not self.in_transaction:
+            self.streams.clear()
+        self.qid += 1
+        self.streams[self.qid] = iter(records)
+        return self.qid
+
+    def _stream_args(self, fields):
+        """ Return the number of records and the query ID from the
+        fields of a PULL or DISCARD request.
+        """
+        extra = fields[0] if fields else {}
+        qid = extra.get("qid", -1)
+        if qid == -1:
+            qid = self.qid
+        return extra.get("n", -1), qid
+
+    def _show_databases(self):
+        fields = ["name", "address", "role", "requestedStatus",
+                  "currentStatus", "error", "default"]
+        default = self.server.graph_names[0]
+        records = [[name, "localhost:7687", "standalone", "online", "online", "", name == default]
+                   for name in ["system"] + self.server.graph_names]
+        return fields, records
+
+    def _pull(self, n, qid):
+        records = self.streams.get(qid, iter(()))
+        write_message = self._writer.write_message
+        count = 0
+        for record in records:
+            write_message(0x71, list(record))
+            count += 1
+            if len(self._output) >= 65536:
+                # Stream large results, rather than holding them
+                # in memory until the whole batch is written.
+                self._flush()
+            if count == n:
+                break
+        for record in records:
+            # Put back the record taken to check for more.
+            self.streams[qid] = chain([record], records)
+            self._success(has_more=True)
+            return
+        self.streams.pop(qid, None)
+        self._success(**self._summary())
+
+    def _discard(self, n, qid):
+        records = self.streams.get(qid, iter(()))
+        if n != -1:
+            for _ in zip(range(n), records):
+                pass
+            for record in records:
+                self.streams[qid] = chain([record], records)
+                self._success(has_more=True)
+                return
+        self.streams.pop(qid, None)
+        self._success(**self._summary())
+
+    def _summary(self):
+        summary = {"t_last": 0, "type": "rw"}
+        if not self.in_transaction:
+            self.bookmark += 1
+            summary["bookmark"] = "stub:%d" % self.bookmark
+        return summary
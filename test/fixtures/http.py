@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" An in-process HTTP server for exercising the client without Neo4j.
+
+The server implements the transactional Cypher endpoints of the Neo4j
+4.x HTTP API, answering queries from a :class:`.Script` in the same way
+as the stub Bolt server. For example::
+
+    script = Script().on("RETURN 1", ["1"], [[1]])
+    with StubHTTPServer(script) as server:
+        graph = Graph(server.uri)
+        assert graph.evaluate("RETURN 1") == 1
+
+Connections are kept alive between requests, and can optionally be
+secured with TLS, using the self-signed certificate in `stub.pem`.
+Like Neo4j, the server streams each response body as it is generated,
+so an error raised while records are being produced is reported
+after those records have been sent.
+
+Records are given in the REST format. Where a statement asks for the
+``graph`` format as well, the graph representation of each record is
+built from the nodes and relationships found among its values. A
+record may instead be given as a complete row, as a dictionary with
+``rest`` and ``graph`` entries, for values such as paths, whose REST
+format does not include the entities within them.
+"""
+
+
+from json import dumps as json_dumps, loads as json_loads
+from os.path import dirname, join as path_join
+from re import compile as re_compile
+from socket import IPPROTO_TCP, TCP_NODELAY
+from sys import exc_info
+from threading import Lock, Thread
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from test.fixtures.bolt import Script, ScriptError
+
+
+#: Certificate and private key used by secure stub servers.
+CERTIFICATE = path_join(dirname(__file__), "stub.pem")
+
+TX_PATH = re_compile(r"^/db/([^/]+)/tx(?:/(\d+))?(/commit)?$")
+
+
+class StubHTTPServer(object):
+    """ Scripted HTTP server, listening on an ephemeral port of the
+    loopback interface and serving each connection from its own
+    thread.
+
+    :param script: callable that accepts Cypher text and parameters
+        and returns a `(fields, records)` pair
+    :param secure: true to serve over TLS
+    :param neo4j_version: the Neo4j version reported by the server
+    :param graph_names: names of the graphs reported by
+        ``SHOW DATABASES``, the first of which is the default
+    """
+
+    def __init__(self, script=None, secure=False, neo4j_version="4.0.0",
+                 graph_names=("neo4j",)):
+        self.script = script or Script()
+        self.secure = secure
+        self.neo4j_version = neo4j_version
+        self.graph_names = list(graph_names)
+        #: Every request received, as a `(method, path, statements)`
+        #: tuple.
+        self.requests = []
+        #: Number of connections accepted.
+        self.connection_count = 0
+        #: Number of TLS connections that resumed an earlier session.
+        self.sessions_reused = 0
+        self._server = None
+        self._thread = None
+        self._lock = Lock()
+        self._next_txid = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    @property
+    def uri(self):
+        return "%s://%s:%d" % (("http+ssc" if self.secure else "http",) + tuple(self.address))
+
+    def statements(self):
+        """ Return the text of every statement received.
+        """
+        return [statement for _, _, statements in self.requests for statement in statements]
+
+    def start(self):
+        self._server = _ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._server.stub = self
+        if self.secure:
+            from ssl import PROTOCOL_TLS_SERVER, SSLContext
+            context = SSLContext(PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(CERTIFICATE)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._thread = Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05})
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _begin(self):
+        with self._lock:
+            self._next_txid += 1
+            return self._next_txid
+
+    def _run(self, graph_name, statements):
+        """ Generate the body of the response to a list of statements,
+        piece by piece.
+        """
+        errors = []
+        yield u'{"results":['
+        for i, statement in enumerate(statements):
+            cypher = statement["statement"]
+            parameters = statement.get("parameters") or {}
+            if cypher == "SHOW DATABASES" and graph_name == "system":
+                fields, records = self._show_databases()
+            else:
+                try:
+                    fields, records = self.script(cypher, parameters)
+                except ScriptError as error:
+                    errors.append({"code": error.code, "message": str(error)})
+                    break
+            graph = "graph" in statement.get("resultDataContents", ())
+            yield u'%s{"columns":%s,"data":[' % (u"," if i else u"", json_dumps(list(fields)))
+            try:
+                for j, record in enumerate(records):
+                    yield (u"," if j else u"") + json_dumps(_row(record, graph))
+            except ScriptError as error:
+                errors.append({"code": error.code, "message": str(error)})
+            yield u']}'
+            if errors:
+                break
+        yield u'],"errors":%s}' % json_dumps(errors)
+
+    def _show_databases(self):
+        fields = ["name", "address", "role", "requestedStatus",
+                  "currentStatus", "error", "default"]
+        default = self.graph_names[0]
+        records = [[name, "localhost:7687", "standalone", "online", "online", "", name == default]
+                   for name in ["system"] + self.graph_names]
+        return fields, records
+
+
+def _row(record, graph=False):
+    """ Build a row of a result from a record, with or without its
+    graph representation.
+    """
+    if isinstance(record, dict):
+        row = dict(record)
+    else:
+        row = {"rest": list(record)}
+        if graph:
+            row["graph"] = _graph(record)
+    row.setdefault("meta", [None] * len(row["rest"]))
+    if not graph:
+        row.pop("graph", None)
+    return row
+
+
+def _graph(values):
+    """ Build the graph representation of a record from the nodes and
+    relationships found among its REST values.
+    """
+    nodes = {}
+    relationships = {}
+
+    def visit(value):
+        if isinstance(value, list):
+            for item in value:
+                visit(item)
+        elif isinstance(value, dict):
+            if "self" in value:
+                identity = value["self"].rpartition("/")[-1]
+                if "type" in value:
+                    relationships[identity] = {
+                        "id": identity,
+                        "type": value["type"],
+                        "startNode": value["start"].rpartition("/")[-1],
+                        "endNode": value["end"].rpartition("/")[-1],
+                        "properties": value["data"],
+                    }
+                else:
+                    nodes[identity] = {
+                        "id": identity,
+                        "labels": value["metadata"]["labels"],
+                        "properties": value["data"],
+                    }
+            else:
+                for item in value.values():
+                    visit(item)
+
+    visit(values)
+    return {"nodes": list(nodes.values()), "relationships": list(relationships.values())}
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    def get_request(self):
+        s, address = HTTPServer.get_request(self)
+        s.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+        stub = self.stub
+        with stub._lock:
+            stub.connection_count += 1
+            if getattr(s, "session_reused", False):
+                stub.sessions_reused += 1
+        return s, address
+
+    def handle_error(self, request, client_address):
+        # Clients close the socket to abandon a response part way
+        # through, which is expected rather than an error.
+        if not isinstance(exc_info()[1], ConnectionError):
+            HTTPServer.handle_error(self, request, client_address)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def stub(self):
+        return self.server.stub
+
+    def do_GET(self):
+        self.stub.requests.append(("GET", self.path, []))
+        if self.path == "/":
+            self._reply(200, {
+                "neo4j_version": self.stub.neo4j_version,
+                "neo4j_edition": "community",
+                "transaction": "http://localhost:7474/db/{databaseName}/tx",
+            })
+        else:
+            self._reply(404, {"errors": []})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json_loads(self.rfile.read(length).decode("utf-8")) if length else {}
+        statements = body.get("statements") or []
+        self.stub.requests.append(("POST", self.path, [s["statement"] for s in statements]))
+        matched = TX_PATH.match(self.path)
+        if not matched:
+            self._reply(404, {"errors": []})
+            return
+        graph_name, txid, commit = matched.groups()
+        body = self.stub._run(graph_name, statements)
+        if txid is None and not commit:
+            txid = self.stub._begin()
+            location = "http://%s:%d/db/%s/tx/%d" % (self.stub.address + (graph_name, txid))
+            self._stream(201, body, Location=location)
+        else:
+            self._stream(200, body)
+
+    def do_DELETE(self):
+        self.stub.requests.append(("DELETE", self.path, []))
+        self._reply(200, {"results": [], "errors": []})
+
+    def _stream(self, status, body, **headers):
+        """ Send a response body in chunks, each made up of pieces of
+        the body totalling around 8 kB.
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        pieces = []
+        size = 0
+        for piece in body:
+            pieces.append(piece.encode("utf-8"))
+            size += len(pieces[-1])
+            if size >= 8192:
+                self._write_chunk(b"".join(pieces))
+                pieces = []
+                size = 0
+        if pieces:
+            self._write_chunk(b"".join(pieces))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data):
+        self.wfile.write(b"%X\r\n" % len(data) + data + b"\r\n")
+
+    def _reply(self, status, content, **headers):
+        data = json_dumps(content).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Many threads sharing one small connection pool, each running short
+auto-commit queries and transactions. The pool must never exceed its
+maximum size, must hand every thread a connection in turn and must
+leave no connection in use once all threads are done.
+
+Run pytest with `-s` to see throughput and the longest time any one
+thread waited to acquire a connection.
+"""
+
+
+from threading import Thread
+
+from pytest import fixture
+
+from py2neo.database import Graph, GraphService
+from py2neo.internal.compat import perf_counter
+
+from test.fixtures.benchmark import report, scaled
+from test.fixtures.bolt import Script, StubBoltServer
+
+
+THREADS = 64
+
+MAX_SIZE = 8
+
+
+@fixture
+def server():
+    script = Script().on("RETURN 1", ["1"], [[1]])
+    with StubBoltServer(script) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def test_threads_sharing_small_pool(server):
+    graph = Graph(server.uri, max_size=MAX_SIZE)
+    connector = graph.service.connector
+    n = scaled(50)
+    errors = []
+    waits = []
+    sizes = []
+
+    def work():
+        longest = 0.0
+        try:
+            for i in range(n):
+                t0 = perf_counter()
+                cx = connector.acquire()
+                longest = max(longest, perf_counter() - t0)
+                sizes.append(connector.size)
+                connector.release(cx)
+                if i % 2:
+                    assert graph.evaluate("RETURN 1") == 1
+                else:
+                    tx = graph.begin()
+                    assert tx.evaluate("RETURN 1") == 1
+                    tx.commit()
+        except Exception as error:
+            errors.append(error)
+        finally:
+            waits.append(longest)
+
+    threads = [Thread(target=work) for _ in range(THREADS)]
+    t0 = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = perf_counter() - t0
+
+    report("%d threads sharing a pool of %d" % (THREADS, MAX_SIZE),
+           seconds, THREADS * n, "queries")
+    print("%-56s %14.1f ms" % ("Longest wait to acquire", 1000 * max(waits)))
+    assert not errors
+    assert max(sizes) <= MAX_SIZE
+    assert server.connection_count <= MAX_SIZE
+    assert connector.in_use == 0
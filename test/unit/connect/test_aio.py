@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from asyncio import StreamReader, gather, new_event_loop
+from io import BytesIO
+
+from pytest import fixture, raises
+
+from py2neo.aio import AsyncGraph
+from py2neo.connect.aio import AsyncWire
+from py2neo.connect.packstream import MessageReader, MessageWriter
+from py2neo.data import Node
+from py2neo.database import ClientError
+
+from test.fixtures.bolt import Script, StubBoltServer, generated, node, unwind_identities
+
+
+UNWIND_25 = "UNWIND range(0, 24) AS i RETURN i"
+
+LARGE = "UNWIND range(0, 9999) AS i RETURN i, 'x' * i"
+
+
+def run(coroutine):
+    loop = new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@fixture(params=[(1, 0), (3, 0), (4, 0)], ids=["bolt1", "bolt3", "bolt4"])
+def server(request):
+    script = Script(default=unwind_identities)
+    script.on("RETURN 1", ["1"], [[1]])
+    script.on("MATCH (a:Person) RETURN a", ["a"],
+              generated(3, lambda i: [node(i, ["Person"], {"name": "P%d" % i})]))
+    script.on(UNWIND_25, ["i"], generated(25))
+    script.on(LARGE, ["i", "s"], generated(2000, lambda i: [i, u"x" * (i % 100)]))
+    with StubBoltServer(script, protocol_version=request.param) as server:
+        yield server
+
+
+@fixture
+def strict_server(server):
+    script = Script().on("RETURN 1", ["1"], [[1]])
+    with StubBoltServer(script, protocol_version=server.protocol_version) as strict:
+        yield strict
+
+
+def test_wire_receives_messages_larger_than_buffer():
+
+    async def f():
+        data = BytesIO()
+        writer = MessageWriter(data)
+        for i in range(3):
+            writer.write_message(0x71, [u"x" * (100 * i)])
+        reader = StreamReader()
+        reader.feed_data(data.getvalue())
+        reader.feed_eof()
+        wire = AsyncWire(reader, None, buffer_size=64)
+        messages = MessageReader(wire)
+        received = []
+        for _ in range(3):
+            await wire.receive()
+            received.append(messages.read_message())
+        return received
+
+    assert run(f()) == [(0x71, ([u"x" * (100 * i)],)) for i in range(3)]
+
+
+def test_evaluate(server):
+
+    async def f():
+        async with AsyncGraph(server.uri) as graph:
+            return await graph.evaluate("RETURN 1")
+
+    assert run(f()) == 1
+
+
+def test_cursor_iteration_hydrates_nodes(server):
+
+    async def f():
+        async with AsyncGraph(server.uri) as graph:
+            cursor = await graph.run("MATCH (a:Person) RETURN a")
+            return [record["a"] async for record in cursor]
+
+    nodes = run(f())
+    assert [a["name"] for a in nodes] == ["P0", "P1", "P2"]
+    assert all(isinstance(a, Node) and a.identity is not None for a in nodes)
+
+
+def test_large_result_spans_many_reads(server):
+
+    async def f():
+        async with AsyncGraph(server.uri) as graph:
+            cursor = await graph.run(LARGE)
+            return await cursor.data()
+
+    data = run(f())
+    assert len(data) == 2000
+    assert data[-1] == {"i": 1999, "s": u"x" * 99}
+
+
+def test_fetch_size_pulls_records_in_batches(server):
+
+    async def f():
+        async with AsyncGraph(server.uri) as graph:
+            cursor = await graph.run(UNWIND_25, fetch_size=10)
+            return [record["i"] async for record in cursor]
+
+    assert run(f()) == list(range(25))
+    if server.protocol_version >= (4, 0):
+        assert [fields[0]["n"] for fields in server.requests_named("PULL")] == [10, 10, 10]
+
+
+def test_closing_cursor_discards_remaining_records(server):
+
+    async def f():
+        async with AsyncGraph(server.uri) as graph:
+            cursor = await graph.run(UNWIND_25, fetch_size=10)
+            await cursor.forward()
+            await cursor.close()
+            summary = await cursor.summary()
+            return summary.dropped_records
+
+    dropped = run(f())
+    if server.protocol_version >= (4, 0):
+        assert dropped == 9
+        assert server.requests_named("DISCARD")
+    else:
+        assert dropped == 24
+
+
+def test_explicit_transaction(server):
+
+    async def f():
+        async with AsyncGraph(server.uri) as graph:
+            tx = await graph.begin()
+            async with tx:
+                cursor = await tx.run("RETURN 1")
+                value = await cursor.evaluate()
+            return value, tx.finished()
+
+    assert run(f()) == (1, True)
+    if server.protocol_version >= (3, 0):
+        assert server.requests_named("COMMIT")
+
+
+def test_concurrent_queries_share_bounded_pool(server):
+
+    async def f():
+        async with AsyncGraph(server.uri, max_size=4) as graph:
+            values = await gather(*[graph.evaluate("RETURN 1") for _ in range(50)])
+            return values, graph.pool.size
+
+    values, size = run(f())
+    assert values == [1] * 50
+    assert size <= 4
+    assert server.connection_count <= 4
+
+
+def test_idle_connection_is_not_reset(server):
+
+    async def f():
+        async with AsyncGraph(server.uri, max_size=1) as graph:
+            for _ in range(5):
+                await graph.evaluate("RETURN 1")
+            return graph.pool.resets_sent, graph.pool.resets_avoided
+
+    sent, avoided = run(f())
+    assert sent == 0
+    assert avoided > 0
+    assert not server.requests_named("RESET")
+
+
+def test_failure_is_raised_and_connection_recovers(strict_server):
+
+    async def f():
+        async with AsyncGraph(strict_server.uri, max_size=1) as graph:
+            with raises(ClientError):
+                await graph.run("RETURN 2")
+            return await graph.evaluate("RETURN 1"), graph.pool.resets_sent
+
+    assert run(f()) == (1, 1)
+    assert strict_server.connection_count == 1
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from gc import collect
+
+from pytest import fixture, importorskip, raises
+
+from py2neo.data import Node
+from py2neo.connect import TransactionError
+from py2neo.database import ClientError, Graph, GraphService
+
+from test.fixtures.bolt import Script, StubBoltServer, generated, node, unwind_identities
+
+
+@fixture(params=[(1, 0), (3, 0), (4, 0)], ids=["bolt1", "bolt3", "bolt4"])
+def server(request):
+    script = Script(default=unwind_identities)
+    script.on("RETURN 1", ["1"], [[1]])
+    script.on("MATCH (a:Person) RETURN a", ["a"],
+              generated(3, lambda i: [node(i, ["Person"], {"name": "P%d" % i})]))
+    script.on("UNWIND range(0, 24) AS i RETURN i", ["i"], generated(25))
+    with StubBoltServer(script, protocol_version=request.param) as server:
+        yield server
+        GraphService.forget_all()
+
+
+@fixture
+def graph(server):
+    return Graph(server.uri)
+
+
+@fixture
+def strict_graph(server):
+    script = Script().on("RETURN 1", ["1"], [[1]])
+    with StubBoltServer(script, protocol_version=server.protocol_version) as strict:
+        yield Graph(strict.uri)
+        GraphService.forget_all()
+
+
+def test_handshake_agrees_server_version(server, graph):
+    cx = graph.service.connector.acquire()
+    try:
+        assert cx.protocol_version == server.protocol_version
+    finally:
+        graph.service.connector.release(cx)
+
+
+def test_auto_run(graph):
+    assert graph.evaluate("RETURN 1") == 1
+
+
+def test_cursor_iteration(graph):
+    names = [record["a"]["name"] for record in graph.run("MATCH (a:Person) RETURN a")]
+    assert names == ["P0", "P1", "P2"]
+
+
+def test_explicit_transaction(server, graph):
+    tx = graph.begin()
+    assert tx.evaluate("RETURN 1") == 1
+    tx.commit()
+    assert tx.finished()
+    assert any(name == "COMMIT" or (name == "RUN" and fields[0] == "COMMIT")
+               for name, fields in server.requests)
+
+
+def test_create_binds_node(graph):
+    alice = Node("Person", name="Alice")
+    graph.create(alice)
+    assert alice.graph is graph
+    assert alice.identity == 0
+
+
+def test_merge_binds_node(graph):
+    alice = Node("Person", name="Alice")
+    graph.merge(alice, "Person", "name")
+    assert alice.graph is graph
+    assert alice.identity == 0
+
+
+def test_unscripted_statement_fails_and_connection_recovers(strict_graph):
+    with raises(ClientError):
+        strict_graph.run("RETURN 2")
+    assert strict_graph.evaluate("RETURN 1") == 1
+
+
+def test_pipelined_transaction_sends_queries_on_first_access(server, graph):
+    tx = graph.begin(pipelined=True)
+    round_trips = server.round_trips
+    cursors = [tx.run("RETURN 1") for _ in range(10)]
+    assert server.round_trips == round_trips
+    assert cursors[0].evaluate() == 1
+    assert server.round_trips == round_trips + 1
+    tx.commit()
+    assert [cursor.evaluate() for cursor in cursors[1:]] == [1] * 9
+    assert len(server.requests_named("RUN")) >= 10
+
+
+def test_pipelined_failure_is_raised_by_failed_cursor(strict_graph):
+    tx = strict_graph.begin(pipelined=True)
+    cursors = [tx.run("RETURN 1"), tx.run("RETURN 2"), tx.run("RETURN 1")]
+    assert cursors[0].evaluate() == 1
+    with raises(ClientError):
+        cursors[1].evaluate()
+    with raises(TransactionError):
+        cursors[2].evaluate()
+    with raises(ClientError):
+        tx.commit()
+
+
+def test_pipelined_failure_is_raised_on_commit(strict_graph):
+    tx = strict_graph.begin(pipelined=True)
+    cursors = [tx.run("RETURN 1"), tx.run("RETURN 2")]
+    with raises(ClientError):
+        tx.commit()
+    assert cursors[0].evaluate() == 1
+    with raises(ClientError):
+        cursors[1].evaluate()
+    assert strict_graph.evaluate("RETURN 1") == 1
+
+
+UNWIND_25 = "UNWIND range(0, 24) AS i RETURN i"
+
+
+def pull_sizes(server):
+    return [fields[0]["n"] if fields else -1 for fields in server.requests_named("PULL")]
+
+
+def test_fetch_size_pulls_records_in_batches(server, graph):
+    cursor = graph.run(UNWIND_25, fetch_size=10)
+    assert [record["i"] for record in cursor] == list(range(25))
+    if server.protocol_version >= (4, 0):
+        assert pull_sizes(server)[-3:] == [10, 10, 10]
+    else:
+        assert pull_sizes(server)[-1] == -1
+
+
+def test_fetch_size_from_settings(server):
+    graph = Graph(server.uri, fetch_size=20)
+    assert graph.run(UNWIND_25).evaluate() == 0
+    if server.protocol_version >= (4, 0):
+        assert pull_sizes(server)[-1] == 20
+
+
+def test_fetch_size_can_be_changed_during_iteration(server, graph):
+    cursor = graph.run(UNWIND_25, fetch_size=10)
+    values = [next(cursor)["i"]]
+    cursor.fetch_size = 4
+    values.extend(record["i"] for record in cursor)
+    assert values == list(range(25))
+    if server.protocol_version >= (4, 0):
+        assert pull_sizes(server)[-5:] == [10, 4, 4, 4, 4]
+
+
+def test_to_columns_across_batches(server, graph):
+    importorskip("numpy")
+    columns = graph.run(UNWIND_25, fetch_size=10).to_columns(batch_size=4)
+    assert columns["i"].dtype.name == "int64"
+    assert columns["i"].tolist() == list(range(25))
+
+
+def test_to_columns_hydrates_nodes(graph):
+    importorskip("numpy")
+    columns = graph.run("MATCH (a:Person) RETURN a").to_columns(batch_size=1)
+    nodes = columns["a"].tolist()
+    assert all(isinstance(a, Node) for a in nodes)
+    assert [a["name"] for a in nodes] == ["P0", "P1", "P2"]
+
+
+def test_interleaved_results_in_transaction(server, graph):
+    tx = graph.begin()
+    a = tx.run(UNWIND_25, fetch_size=5)
+    b = tx.run(UNWIND_25, fetch_size=5)
+    assert [record["i"] for record in a] == list(range(25))
+    assert [record["i"] for record in b] == list(range(25))
+    tx.commit()
+
+
+def test_partly_read_results_remain_available_after_commit(graph):
+    tx = graph.begin()
+    cursor = tx.run(UNWIND_25, fetch_size=5)
+    assert next(cursor)["i"] == 0
+    tx.commit()
+    assert [record["i"] for record in cursor] == list(range(1, 25))
+
+
+def test_closing_cursor_discards_records_left_on_server(server, graph):
+    cursor = graph.run(UNWIND_25, fetch_size=10)
+    assert next(cursor)["i"] == 0
+    cursor.close()
+    summary = cursor.summary()
+    if server.protocol_version >= (4, 0):
+        assert server.requests_named("DISCARD")[-1] == [{"n": -1}]
+        assert pull_sizes(server)[-1] == 10
+        assert summary.dropped_records == 9
+    else:
+        assert not server.requests_named("DISCARD")
+        assert summary.dropped_records == 24
+    # The records dropped had all been buffered already.
+    assert summary.dropped_bytes > 0
+
+
+def test_closing_cursor_counts_bytes_of_buffered_records(server, graph):
+    cursor = graph.run(UNWIND_25)
+    assert cursor.evaluate() == 0
+    cursor.close()
+    summary = cursor.summary()
+    assert summary.dropped_records == 24
+    # Each RECORD message holds a structure header, a one-item
+    # list header and a tiny integer.
+    assert summary.dropped_bytes == 24 * 4
+
+
+def test_abandoned_auto_commit_cursor_releases_connection(server):
+    graph = Graph(server.uri, max_size=1, acquire_wait_timeout=2)
+    cursor = graph.run(UNWIND_25, fetch_size=10)
+    assert next(cursor)["i"] == 0
+    del cursor
+    collect()
+    assert graph.service.connector.in_use == 0
+    assert graph.evaluate("RETURN 1") == 1
+    if server.protocol_version >= (4, 0):
+        assert server.requests_named("DISCARD")
+
+
+def test_closing_pipelined_cursor_skips_records_unread(server, graph):
+    tx = graph.begin(pipelined=True)
+    cursor = tx.run(UNWIND_25)
+    cursor.close()
+    assert tx.evaluate("RETURN 1") == 1
+    tx.commit()
+    summary = cursor.summary()
+    assert summary.dropped_records == 25
+    assert summary.dropped_bytes > 0
+
+
+def test_evaluate_does_not_stream_whole_result(server, graph):
+    assert graph.evaluate(UNWIND_25) == 0
+    if server.protocol_version >= (4, 0):
+        assert pull_sizes(server)[-1] == 1
+        assert server.requests_named("DISCARD")
+
+
+def test_idle_connection_is_not_reset(server, graph):
+    for _ in range(5):
+        assert graph.evaluate("RETURN 1") == 1
+        assert len(list(graph.run("MATCH (a:Person) RETURN a"))) == 3
+    tx = graph.begin()
+    tx.run("RETURN 1")
+    tx.commit()
+    connector = graph.service.connector
+    assert not server.requests_named("RESET")
+    assert connector.resets_sent == 0
+    assert connector.resets_avoided > 0
+
+
+def test_abandoned_transaction_is_reset_with_next_request(server, graph):
+    connector = graph.service.connector
+    cx = connector.acquire()
+    cx.begin(None)
+    connector.release(cx)
+    assert connector.resets_sent == 1
+    assert graph.evaluate("RETURN 1") == 1
+    names = [name for name, _ in server.requests]
+    assert "RESET" in names
+    assert names.index("RESET") < len(names) - names[::-1].index("RUN") - 1
+
+
+def test_failed_connection_is_reset(strict_graph):
+    with raises(ClientError):
+        strict_graph.run("RETURN 2")
+    assert strict_graph.service.connector.resets_sent == 1
+    assert strict_graph.evaluate("RETURN 1") == 1
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pytest import fixture
+
+from py2neo.data import Node
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.bolt import Script, StubBoltServer, unwind_identities
+
+
+def reply(cypher, parameters):
+    if "UNWIND" in cypher:
+        return unwind_identities(cypher, parameters)
+    return ["n"], [[1]]
+
+
+@fixture
+def servers():
+    servers = [StubBoltServer(Script(default=reply)) for _ in range(3)]
+    for server in servers:
+        server.start()
+    yield servers
+    GraphService.forget_all()
+    for server in servers:
+        server.stop()
+
+
+@fixture
+def graph(servers):
+    primary, readers = servers[0], servers[1:]
+    return Graph(primary.uri, readers=["%s:%d" % reader.address for reader in readers])
+
+
+def runs(server):
+    """ Count the queries run on a server, other than those used to
+    look up the default graph name.
+    """
+    return len([fields for fields in server.requests_named("RUN")
+                if fields[0] != "SHOW DATABASES"])
+
+
+def test_reads_are_balanced_across_readers(servers, graph):
+    primary, reader_1, reader_2 = servers
+    for _ in range(6):
+        assert graph.auto(readonly=True).evaluate("RETURN 1") == 1
+    assert runs(reader_1) == 3
+    assert runs(reader_2) == 3
+    assert runs(primary) == 0
+
+
+def test_writes_are_pinned_to_primary(servers, graph):
+    primary, reader_1, reader_2 = servers
+    graph.evaluate("RETURN 1")
+    graph.create(Node("Person", name="Alice"))
+    with graph.begin() as tx:
+        tx.evaluate("RETURN 1")
+    assert runs(primary) == 3
+    assert runs(reader_1) == runs(reader_2) == 0
+
+
+def test_readonly_transaction_runs_on_reader(servers, graph):
+    primary, reader_1, reader_2 = servers
+    with graph.begin(readonly=True) as tx:
+        assert tx.evaluate("RETURN 1") == 1
+    assert runs(primary) == 0
+    begins = reader_1.requests_named("BEGIN") + reader_2.requests_named("BEGIN")
+    assert [extra["mode"] for extra, in begins] == ["r"]
+
+
+def test_readonly_unit_of_work_runs_on_reader(servers, graph):
+    primary, reader_1, reader_2 = servers
+
+    def work(tx):
+        assert tx.evaluate("RETURN 1") == 1
+
+    work.readonly = True
+    graph.play(work)
+    assert runs(primary) == 0
+    assert runs(reader_1) + runs(reader_2) == 1
+
+
+def test_node_matcher_reads_from_reader(servers, graph):
+    primary, reader_1, reader_2 = servers
+    assert len(graph.nodes.match("Person")) == 1
+    assert runs(primary) == 0
+    assert runs(reader_1) + runs(reader_2) == 1
+
+
+def test_busy_reader_is_avoided(servers, graph):
+    primary, reader_1, reader_2 = servers
+    connector = graph.service.connector
+    cx = connector.acquire(readonly=True)
+    try:
+        for _ in range(4):
+            graph.auto(readonly=True).evaluate("RETURN 1")
+    finally:
+        connector.release(cx)
+    busy, idle = (reader_1, reader_2) if cx.profile.port == reader_1.address[1] \
+        else (reader_2, reader_1)
+    assert runs(busy) == 0
+    assert runs(idle) == 4
+    assert set(connector.pools) == {server.address for server in servers}
+
+
+def test_metrics_cover_every_pool(servers, graph):
+    connector = graph.service.connector
+    events = []
+    connector.metrics.add_listener(lambda event, value: events.append(event))
+    graph.evaluate("RETURN 1")
+    for _ in range(2):
+        graph.auto(readonly=True).evaluate("RETURN 1")
+    metrics = connector.metrics
+    by_address = metrics.by_address()
+    assert set(by_address) == {server.address for server in servers}
+    assert metrics.acquires == sum(m.acquires for m in by_address.values())
+    assert metrics.acquires > connector._pool.metrics.acquires
+    # Reader pools opened after the listener was added report to it.
+    assert events.count("acquire") == 3
+    assert metrics.resets_avoided == sum(m.resets_avoided for m in by_address.values())
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Thread
+from time import sleep
+
+from pytest import fixture, mark, raises
+
+from py2neo.connect import ConnectionPool, ConnectionProfile
+from py2neo.data import Node, Relationship, Subgraph
+from py2neo.connect.http import HTTP, HTTPStreamingResult, HTTPTransport
+from py2neo.database import ClientError, Graph, GraphService
+from py2neo.internal.compat import QueueEmpty
+
+from test.fixtures.bolt import ScriptError, generated, unwind_identities
+from test.fixtures.http import Script, StubHTTPServer
+
+
+pytestmark = mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+
+
+@fixture(params=[False, True], ids=["http", "https"])
+def server(request):
+    with StubHTTPServer(Script().on("RETURN 1", ["1"], [[1]]), secure=request.param) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def test_queries_share_one_socket(server):
+    graph = Graph(server.uri)
+    for _ in range(10):
+        assert graph.evaluate("RETURN 1") == 1
+    with graph.begin() as tx:
+        assert tx.evaluate("RETURN 1") == 1
+    assert server.connection_count == 1
+
+
+def test_pool_connections_share_transport(server):
+    pool = ConnectionPool.open(ConnectionProfile(server.uri), max_size=4)
+    connections = [pool.acquire() for _ in range(4)]
+    assert all(isinstance(cx, HTTP) for cx in connections)
+    assert len(set(cx.transport for cx in connections)) == 1
+    for cx in connections:
+        pool.release(cx)
+    # Only the first connection asks the server for its version.
+    assert len([r for r in server.requests if r[:2] == ("GET", "/")]) == 1
+    assert server.connection_count == 1
+    pool.close()
+
+
+def test_concurrent_queries_keep_limited_sockets(server):
+    graph = Graph(server.uri, max_size=8, http_keep_alive=2)
+    errors = []
+
+    def work():
+        try:
+            for _ in range(10):
+                assert graph.evaluate("RETURN 1") == 1
+        except Exception as error:
+            errors.append(error)
+
+    threads = [Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    transport = graph.service.connector._pool._transport
+    assert transport.max_size == 2
+    assert transport._pool.pool.qsize() == 2
+
+
+def test_idle_socket_is_reaped(server):
+    graph = Graph(server.uri, http_idle_timeout=0.05)
+    graph.evaluate("RETURN 1")
+    graph.evaluate("RETURN 1")
+    assert server.connection_count == 1
+    sleep(0.1)
+    graph.evaluate("RETURN 1")
+    assert server.connection_count == 2
+
+
+def test_closed_transport_can_be_reused(server):
+    profile = ConnectionProfile(server.uri)
+    transport = HTTPTransport(profile)
+    cx = HTTP.open(profile, transport=transport)
+    transport.close()
+    cx.auto_run("neo4j", "RETURN 1")
+    assert transport.sockets_opened == 2
+    assert server.connection_count == 2
+
+
+def test_close_does_not_block_on_socket_returned_meanwhile(server):
+    profile = ConnectionProfile(server.uri)
+    transport = HTTPTransport(profile, max_size=2)
+    cx = HTTP.open(profile, transport=transport)
+    queue = transport._pool.pool
+    get = queue.get
+    requests = []
+
+    def get_or_request(*args, **kwargs):
+        try:
+            return get(*args, **kwargs)
+        except QueueEmpty:
+            if not requests:
+                # While close() holds every slot, another thread
+                # makes a request on a one-off socket and returns it
+                # to the pool.
+                requests.append(None)
+                thread = Thread(target=cx.auto_run, args=("neo4j", "RETURN 1"))
+                thread.start()
+                thread.join()
+            raise
+
+    queue.get = get_or_request
+    closer = Thread(target=transport.close)
+    closer.daemon = True
+    closer.start()
+    closer.join(5)
+    assert not closer.is_alive()
+    assert len(requests) == 1
+    assert queue.qsize() == 2
+
+
+def test_tls_session_is_resumed():
+    with StubHTTPServer(Script().on("RETURN 1", ["1"], [[1]]), secure=True) as server:
+        profile = ConnectionProfile(server.uri)
+        transport = HTTPTransport(profile)
+        cx = HTTP.open(profile, transport=transport)
+        for _ in range(3):
+            cx.auto_run("neo4j", "RETURN 1")
+            transport.close()
+        assert server.connection_count == 3
+        assert transport.sessions_reused == 2
+        assert server.sessions_reused == 2
+
+
+def failing_after(count):
+
+    def records(parameters):
+        for i in range(count):
+            yield [i]
+        raise ScriptError("Boom")
+
+    return records
+
+
+def failing(parameters):
+    raise ScriptError("Boom")
+
+
+@fixture
+def streaming_server():
+    script = (Script()
+              .on("RETURN 1", ["1"], [[1]])
+              .on("UNWIND range(1, 1000) AS n RETURN n", ["n"], generated(1000, lambda i: [i + 1]))
+              .on("FAIL LATE", ["n"], failing_after(3))
+              .on("CREATE ()", [], []))
+    with StubHTTPServer(script) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def test_streamed_records_match_buffered_records(streaming_server):
+    cypher = "UNWIND range(1, 1000) AS n RETURN n"
+    buffered = Graph(streaming_server.uri).run(cypher).data()
+    GraphService.forget_all()
+    count = streaming_server.connection_count
+    graph = Graph(streaming_server.uri, http_streaming=True)
+    cursor = graph.run(cypher)
+    assert isinstance(cursor._result, HTTPStreamingResult)
+    assert cursor.keys() == ["n"]
+    assert cursor.data() == buffered
+    assert graph.evaluate("RETURN 1") == 1
+    assert streaming_server.connection_count == count + 1
+
+
+def test_abandoned_stream_leaves_transport_usable(streaming_server):
+    graph = Graph(streaming_server.uri, http_streaming=True)
+    cursor = graph.run("UNWIND range(1, 1000) AS n RETURN n")
+    assert cursor.evaluate() == 1
+    cursor.close()
+    assert graph.evaluate("RETURN 1") == 1
+    assert graph.evaluate("RETURN 1") == 1
+
+
+def test_streams_within_transaction(streaming_server):
+    graph = Graph(streaming_server.uri, http_streaming=True)
+    tx = graph.begin()
+    first = tx.run("UNWIND range(1, 1000) AS n RETURN n")
+    second = tx.run("RETURN 1")
+    assert second.evaluate() == 1
+    assert len(first.data()) == 1000
+    tx.commit()
+    assert streaming_server.connection_count == 1
+
+
+def test_error_after_records_is_raised_at_end_of_stream(streaming_server):
+    graph = Graph(streaming_server.uri, http_streaming=True)
+    cursor = graph.run("FAIL LATE")
+    records = []
+    with raises(ClientError):
+        for record in cursor:
+            records.append(record[0])
+    assert records == [0, 1, 2]
+    assert graph.evaluate("RETURN 1") == 1
+
+
+@fixture
+def batching_server():
+    script = (Script(default=unwind_identities)
+              .on("RETURN 1", ["1"], [[1]])
+              .on("RETURN 2", ["2"], [[2]])
+              .on("RETURN x", [], failing)
+              .on("RETURN 1/0", ["1/0"], failing_after(0))
+              .on("UNWIND range(1, 3) AS n RETURN n", ["n"], [[1], [2], [3]]))
+    with StubHTTPServer(script) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def posts(server):
+    return [(path, statements) for method, path, statements in server.requests
+            if method == "POST" and not path.startswith("/db/system/")]
+
+
+def test_pipelined_queries_are_sent_with_commit(batching_server):
+    graph = Graph(batching_server.uri)
+    tx = graph.begin(pipelined=True)
+    cursors = [tx.run("RETURN 1"), tx.run("UNWIND range(1, 3) AS n RETURN n"), tx.run("RETURN 2")]
+    tx.commit()
+    assert [cursor.data() for cursor in cursors] == [
+        [{"1": 1}], [{"n": 1}, {"n": 2}, {"n": 3}], [{"2": 2}]]
+    assert posts(batching_server) == [
+        ("/db/neo4j/tx", []),
+        ("/db/neo4j/tx/1/commit", ["RETURN 1", "UNWIND range(1, 3) AS n RETURN n", "RETURN 2"]),
+    ]
+
+
+def test_pipelined_queries_are_sent_when_result_needed(batching_server):
+    graph = Graph(batching_server.uri)
+    with graph.begin(pipelined=True) as tx:
+        first = tx.run("RETURN 1")
+        second = tx.run("RETURN 2")
+        assert second.evaluate() == 2
+        third = tx.run("UNWIND range(1, 3) AS n RETURN n")
+    assert first.evaluate() == 1
+    assert len(third.data()) == 3
+    assert [statements for _, statements in posts(batching_server)] == [
+        [], ["RETURN 1", "RETURN 2"], ["UNWIND range(1, 3) AS n RETURN n"]]
+
+
+def test_unpipelined_queries_are_sent_one_by_one(batching_server):
+    graph = Graph(batching_server.uri)
+    with graph.begin() as tx:
+        tx.run("RETURN 1")
+        tx.run("RETURN 2")
+    assert [statements for _, statements in posts(batching_server)] == [
+        [], ["RETURN 1"], ["RETURN 2"], []]
+
+
+def test_failure_is_raised_by_cursor_concerned(batching_server):
+    graph = Graph(batching_server.uri)
+    tx = graph.begin(pipelined=True)
+    good = tx.run("RETURN 1")
+    bad = tx.run("RETURN x")
+    after = tx.run("RETURN 2")
+    assert good.evaluate() == 1
+    with raises(ClientError):
+        bad.data()
+    with raises(ClientError):
+        after.data()
+    with raises(ClientError):
+        tx.commit()
+    assert [method for method, _, _ in batching_server.requests].count("DELETE") == 0
+
+
+def test_create_sends_node_queries_together(batching_server):
+    graph = Graph(batching_server.uri)
+    a = Node("Person", name="Alice")
+    b = Node("Person", "Employee", name="Bob")
+    c = Node("Company", name="Acme")
+    graph.create(Subgraph(relationships=[Relationship(a, "KNOWS", b),
+                                         Relationship(b, "WORKS_FOR", c),
+                                         Relationship(a, "LIKES", c)]))
+    statements = [statements for _, statements in posts(batching_server)]
+    assert len(statements) == 4
+    assert statements[0] == []
+    assert len(statements[1]) == 3 and all("CREATE" in s for s in statements[1])
+    assert len(statements[2]) == 3 and all("MERGE (a)" in s for s in statements[2])
+    assert statements[3] == []
+    assert all(entity.graph is graph for entity in (a, b, c))
+
+
+def test_failure_part_way_through_last_query(batching_server):
+    graph = Graph(batching_server.uri)
+    tx = graph.begin(pipelined=True)
+    good = tx.run("RETURN 1")
+    bad = tx.run("RETURN 1/0")
+    with raises(ClientError):
+        bad.data()
+    assert good.evaluate() == 1
+    tx.rollback()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from pytest import fixture, mark, raises
+
+from py2neo.connect.json import JSONReader
+from py2neo.data import Node, Path, Relationship
+from py2neo.database import Graph, GraphService
+
+from test.fixtures.http import Script, StubHTTPServer
+
+
+DOCUMENT = (u'{"results": [{"columns": ["n", "s"], "data": ['
+            u'{"rest": [1, "café"]}, {"rest": [-2.5e3, "x,y]"]}, {"rest": [12345, null]}'
+            u']}], "errors": []}').encode("utf-8")
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def walk(reader):
+    found = {}
+    for key in reader.members():
+        if key == "results":
+            for _ in reader.items():
+                for name in reader.members():
+                    if name == "data":
+                        found["data"] = [reader.value()["rest"] for _ in reader.items()]
+                    else:
+                        found[name] = reader.value()
+        else:
+            found[key] = reader.value()
+    return found
+
+
+@mark.parametrize("size", [1, 2, 3, 7, 64, len(DOCUMENT)])
+def test_document_split_anywhere_is_read_in_full(size):
+    found = walk(JSONReader(chunked(DOCUMENT, size)))
+    assert found == {
+        "columns": ["n", "s"],
+        "data": [[1, u"café"], [-2500.0, u"x,y]"], [12345, None]],
+        "errors": [],
+    }
+
+
+def test_empty_object_and_array():
+    reader = JSONReader([b'{"a": [ ], "b": { }}'])
+    assert [(key, reader.value()) for key in reader.members()] == [("a", []), ("b", {})]
+    reader = JSONReader([b" [ ] "])
+    assert list(reader.items()) == []
+    assert reader.peek() == u""
+
+
+def test_object_hook_is_applied_to_values():
+    reader = JSONReader([b'[{"a": 1}, {"a": 2}]'], object_hook=lambda o: o["a"])
+    assert [reader.value() for _ in reader.items()] == [1, 2]
+
+
+def test_unexpected_character():
+    reader = JSONReader([b'[1, 2}'])
+    with raises(ValueError):
+        list(reader.value() for _ in reader.items())
+
+
+def test_truncated_document():
+    reader = JSONReader(chunked(b'[{"a": 1}, {"a"', 4))
+    with raises(ValueError):
+        list(reader.value() for _ in reader.items())
+
+
+def node_json(identity, labels, properties):
+    return {"self": "http://localhost:7474/db/neo4j/node/%d" % identity,
+            "metadata": {"id": identity, "labels": labels},
+            "data": properties}
+
+
+def relationship_json(identity, start, end, r_type, properties):
+    return {"self": "http://localhost:7474/db/neo4j/relationship/%d" % identity,
+            "start": "http://localhost:7474/db/neo4j/node/%d" % start,
+            "end": "http://localhost:7474/db/neo4j/node/%d" % end,
+            "type": r_type,
+            "metadata": {"id": identity, "type": r_type},
+            "data": properties}
+
+
+def path_json(node_ids, relationship_ids, directions):
+    node_uri = "http://localhost:7474/db/neo4j/node/%d"
+    return {"start": node_uri % node_ids[0],
+            "nodes": [node_uri % i for i in node_ids],
+            "length": len(relationship_ids),
+            "relationships": ["http://localhost:7474/db/neo4j/relationship/%d" % i
+                              for i in relationship_ids],
+            "end": node_uri % node_ids[-1],
+            "directions": directions}
+
+
+def graph_json(nodes, relationships):
+    return {"nodes": [{"id": str(n["metadata"]["id"]), "labels": n["metadata"]["labels"],
+                       "properties": n["data"]} for n in nodes],
+            "relationships": [{"id": str(r["metadata"]["id"]), "type": r["type"],
+                               "startNode": r["start"].rpartition("/")[-1],
+                               "endNode": r["end"].rpartition("/")[-1],
+                               "properties": r["data"]} for r in relationships]}
+
+
+ALICE = node_json(1, ["Person"], {"name": "Alice"})
+BOB = node_json(2, ["Person"], {"name": "Bob"})
+CAROL = node_json(3, ["Person"], {"name": "Carol"})
+KNOWS = relationship_json(10, 1, 2, "KNOWS", {"since": 1999})
+LIKES = relationship_json(11, 3, 2, "LIKES", {})
+PATH = path_json([1, 2, 3], [10, 11], ["->", "<-"])
+
+
+LOOKUP = "MATCH ()-[r]->() WHERE id(r) IN $x RETURN r"
+
+
+def relationships(parameters):
+    # Answers the lookup of relationships for paths. Relationship 12
+    # has since been deleted.
+    found = {10: KNOWS, 11: LIKES}
+    return [[found[r_id]] for r_id in parameters["x"] if r_id in found]
+
+
+@fixture
+def server():
+    script = (Script()
+              .on(LOOKUP, ["r"], relationships)
+              .on("RETURN node", ["a"], [[ALICE]])
+              .on("RETURN relationship", ["a", "b", "r"], [[ALICE, BOB, KNOWS]])
+              .on("RETURN map", ["m"], [[{"a": [1, {"b": node_json(2, [], {})}], "c": None}]])
+              .on("RETURN path", ["p"], [{"rest": [PATH],
+                                          "graph": graph_json([ALICE, BOB, CAROL],
+                                                              [KNOWS, LIKES])}])
+              .on("RETURN paths with nodes", ["a", "b", "c", "p"],
+                  [{"rest": [ALICE, BOB, CAROL, PATH],
+                    "graph": graph_json([ALICE, BOB, CAROL], [KNOWS, LIKES])}] * 2)
+              .on("RETURN deleted path", ["a", "b", "p"],
+                  [{"rest": [ALICE, BOB, path_json([1, 2], [12], ["->"])]}]))
+    with StubHTTPServer(script) as server:
+        yield server
+        GraphService.forget_all()
+
+
+def lookups(server):
+    return [path for _, path, statements in server.requests if LOOKUP in statements]
+
+
+@fixture
+def graph(server):
+    return Graph(server.uri)
+
+
+def test_hydrate_node(graph):
+    a = graph.evaluate("RETURN node")
+    assert isinstance(a, Node)
+    assert a.identity == 1
+    assert a.graph is graph
+    assert set(a.labels) == {"Person"}
+    assert dict(a) == {"name": "Alice"}
+
+
+def test_hydrate_relationship(graph):
+    a, b, r = graph.run("RETURN relationship").next()
+    assert isinstance(r, Relationship)
+    assert r.identity == 10
+    assert type(r).__name__ == "KNOWS"
+    assert r.start_node is a
+    assert r.end_node is b
+    assert dict(r) == {"since": 1999}
+
+
+def test_hydrate_nested_values(graph):
+    m = graph.evaluate("RETURN map")
+    assert m["c"] is None
+    assert m["a"][0] == 1
+    assert isinstance(m["a"][1]["b"], Node)
+    assert m["a"][1]["b"].identity == 2
+
+
+def test_hydrate_path(server):
+    graph = Graph(server.uri, http_graph_format=True)
+    p = graph.evaluate("RETURN path")
+    assert isinstance(p, Path)
+    assert [n.identity for n in p.nodes] == [1, 2, 3]
+    assert [n["name"] for n in p.nodes] == ["Alice", "Bob", "Carol"]
+    assert [type(r).__name__ for r in p.relationships] == ["KNOWS", "LIKES"]
+    assert [(r.start_node.identity, r.end_node.identity) for r in p.relationships] == [(1, 2), (3, 2)]
+    assert dict(p.relationships[0]) == {"since": 1999}
+    assert server.statements()[-1] == "RETURN path"
+
+
+def test_paths_of_result_are_completed_with_one_lookup(server, graph):
+    records = list(graph.run("RETURN paths with nodes"))
+    assert len(records) == 2
+    for record in records:
+        p = record["p"]
+        assert [type(r).__name__ for r in p.relationships] == ["KNOWS", "LIKES"]
+        assert dict(p.relationships[0]) == {"since": 1999}
+    assert len(lookups(server)) == 1
+
+
+def test_graph_format_is_only_requested_if_enabled(server, graph):
+    counts = []
+    for g in (graph, Graph(server.uri, http_graph_format=True)):
+        p = g.run("RETURN paths with nodes").next()["p"]
+        assert [type(r).__name__ for r in p.relationships] == ["KNOWS", "LIKES"]
+        counts.append(len(lookups(server)))
+    # Without the graph format, relationships must be looked up.
+    assert counts == [1, 1]
+
+
+def test_paths_are_completed_within_transaction(server, graph):
+    tx = graph.begin()
+    p = tx.run("RETURN paths with nodes").next()["p"]
+    assert [type(r).__name__ for r in p.relationships] == ["KNOWS", "LIKES"]
+    path, = lookups(server)
+    # Relationships created by the transaction can only be seen from
+    # within it.
+    assert path == "/db/neo4j/tx/%s" % tx._transaction.txid
+    tx.commit()
+
+
+def test_paths_are_completed_after_commit(server, graph):
+    tx = graph.begin(pipelined=True)
+    cursor = tx.run("RETURN paths with nodes")
+    tx.commit()
+    p = cursor.next()["p"]
+    assert [type(r).__name__ for r in p.relationships] == ["KNOWS", "LIKES"]
+    path, = lookups(server)
+    assert path == "/db/neo4j/tx/commit"
+
+
+def test_deleted_relationship_in_path_has_no_type(server, graph):
+    p = graph.run("RETURN deleted path").next()["p"]
+    assert [r.identity for r in p.relationships] == [12]
+    assert [(r.start_node.identity, r.end_node.identity) for r in p.relationships] == [(1, 2)]
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from py2neo.connect.metrics import Histogram, PoolMetrics
+
+
+def test_empty_histogram():
+    histogram = Histogram([1, 10])
+    assert histogram.count == 0
+    assert histogram.mean is None
+    assert histogram.buckets() == [(1, 0), (10, 0), (None, 0)]
+
+
+def test_histogram_counts_values_in_buckets():
+    histogram = Histogram([1, 10])
+    for value in [0.5, 1, 2, 10, 11, 100]:
+        histogram.observe(value)
+    assert histogram.buckets() == [(1, 2), (10, 2), (None, 2)]
+    assert histogram.count == len(histogram) == 6
+    assert histogram.total == 124.5
+    assert histogram.mean == 124.5 / 6
+    assert histogram.max == 100
+
+
+def test_metrics_counters():
+    metrics = PoolMetrics()
+    metrics.acquires += 2
+    metrics.timeouts += 1
+    counters = metrics.counters()
+    assert counters["acquires"] == 2
+    assert counters["timeouts"] == 1
+    assert counters["releases"] == 0
+
+
+def test_metrics_listeners():
+    metrics = PoolMetrics()
+    events = []
+
+    def listener(event, value):
+        events.append((event, value))
+
+    metrics.add_listener(listener)
+    metrics._emit("acquire", 0.5)
+    metrics.remove_listener(listener)
+    metrics._emit("release")
+    assert events == [("acquire", 0.5)]
+
+
+def test_merged_histogram():
+    histogram = Histogram([1, 10])
+    other = Histogram([1, 10])
+    histogram.observe(0.5)
+    other.observe(2)
+    other.observe(100)
+    histogram.merge(other)
+    assert histogram.buckets() == [(1, 1), (10, 1), (None, 1)]
+    assert histogram.total == 102.5
+    assert histogram.max == 100
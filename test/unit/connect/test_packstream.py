@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import OrderedDict
+from math import isnan
+from struct import unpack as struct_unpack
+
+from neotime import Date
+from pytest import mark, raises
+
+from py2neo.connect import packstream
+from py2neo.connect.packstream import MessageReader, MessageWriter, PackedList, PackStreamHydrant, \
+    UnpackStream, Structure, packed
+from py2neo.connect.wire import Wire
+from py2neo.data import Node
+from py2neo.internal.caching import ThreadLocalEntityCache
+from py2neo.internal.columns import Column
+from py2neo.spatial import CartesianPoint
+
+
+def unpacked(b):
+    return UnpackStream(b).unpack()
+
+
+@mark.parametrize("value", [
+    None, True, False,
+    0, 1, -1, 0x7F, -0x10, -0x11, -0x80, -0x81, 0x80, 0x7FFF, -0x8000,
+    0x8000, -0x8001, 0x7FFFFFFF, -0x80000000, 0x80000000, -0x80000001,
+    0x7FFFFFFFFFFFFFFF, -0x8000000000000000,
+    0.0, 1.5, -1.5, 1e300,
+    u"", u"a", u"hello, world", u"été", u"x" * 15, u"x" * 16,
+    u"x" * 0xFF, u"x" * 0x100, u"x" * 0x10000,
+    [], [1], [1, u"two", 3.0], list(range(16)), list(range(0x100)),
+    list(range(0x10000)), [[], [[]]],
+    {}, {u"a": 1}, {u"a": [1, {u"b": None}]},
+    {u"k%d" % i: i for i in range(16)},
+    {u"k%d" % i: i for i in range(0x100)},
+])
+def test_round_trip(value):
+    assert unpacked(packed(value)) == value
+
+
+@mark.parametrize("size", [0, 1, 0xFF, 0x100, 0x10000])
+def test_bytes_round_trip(size):
+    value = bytearray(range(7)) * size
+    assert unpacked(packed(value)) == value
+
+
+def test_nan_round_trip():
+    assert isnan(unpacked(packed(float("nan"))))
+
+
+def test_structure_round_trip():
+    value = unpacked(packed(Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})))
+    assert isinstance(value, Structure)
+    assert value.tag == ord(b"N")
+    assert value.fields == (1, [u"Person"], {u"name": u"Alice"})
+
+
+def test_list_stream():
+    assert unpacked(b"\xD7\x01\x02\x03\xDF") == [1, 2, 3]
+
+
+def test_map_stream():
+    assert unpacked(b"\xDB\x81a\x01\x81b\x02\xDF") == {u"a": 1, u"b": 2}
+
+
+def test_unpack_from_memoryview_slice():
+    b = bytearray(b"\x00\x00" + packed([1, 2, 3]))
+    assert unpacked(memoryview(b)[2:]) == [1, 2, 3]
+
+
+def test_consecutive_values():
+    s = UnpackStream(packed(1, u"two", [3]))
+    assert s.unpack() == 1
+    assert s.unpack() == u"two"
+    assert s.unpack() == [3]
+    with raises(ValueError):
+        s.unpack()
+
+
+def test_unknown_marker():
+    with raises(ValueError):
+        unpacked(b"\xE0")
+
+
+def test_map_keys_are_shared():
+    key = u"x" * 20
+    first, second = unpacked(packed([{u"name": 1, key: 2}, {u"name": 3, key: 4}]))
+    assert list(first) == list(second) == [u"name", key]
+    assert all(k1 is k2 for k1, k2 in zip(first, second))
+
+
+def test_labels_and_types_are_shared():
+    first, second = unpacked(packed([
+        Structure(b"N", 1, [u"Person"], {}), Structure(b"N", 2, [u"Person"], {})]))
+    assert first.fields[1][0] is second.fields[1][0]
+    first, second = unpacked(packed([
+        Structure(b"R", 1, 2, 3, u"KNOWS", {}), Structure(b"r", 4, u"KNOWS", {})]))
+    assert first.fields[3] == u"KNOWS"
+    assert first.fields[3] is second.fields[1]
+
+
+def test_values_are_not_shared(monkeypatch):
+    monkeypatch.setattr(packstream, "_interned_strings", {})
+    first, second = unpacked(packed([u"Person", u"Person"]))
+    assert first == second == u"Person"
+    assert first is not second
+    assert not packstream._interned_strings
+
+
+def test_long_keys_are_not_shared():
+    key = u"x" * (packstream.MAX_INTERNED_STRING_LENGTH + 1)
+    first, second = unpacked(packed([{key: 1}, {key: 2}]))
+    assert list(first) == list(second)
+    assert list(first)[0] is not list(second)[0]
+
+
+def test_interned_strings_are_bounded(monkeypatch):
+    monkeypatch.setattr(packstream, "MAX_INTERNED_STRINGS", 10)
+    monkeypatch.setattr(packstream, "_interned_strings", {})
+    value = {u"s%d" % i: i for i in range(25)}
+    assert unpacked(packed(value)) == value
+    assert len(packstream._interned_strings) <= 10
+
+
+SKIPPABLE_VALUES = [
+    None, True, 1, -1, 0x80, 0x8000, 0x80000000, 1.5,
+    u"a", u"x" * 0x100, u"x" * 0x10000, bytearray(b"\x01\x02"),
+    [1, [2, u"three"]], list(range(0x100)), {u"a": {u"b": [1]}},
+    {u"k%d" % i: i for i in range(0x100)},
+    Structure(b"N", 1, [u"Person"], {u"name": u"Alice"}),
+]
+
+
+@mark.parametrize("value", SKIPPABLE_VALUES)
+def test_skip(value):
+    s = UnpackStream(packed(value, u"next"))
+    s.skip()
+    assert s.unpack() == u"next"
+
+
+def test_skip_streams():
+    s = UnpackStream(b"\xD7\x01\xD7\x02\xDF\xDF\xDB\x81a\x01\xDF\x81z")
+    s.skip()
+    s.skip()
+    assert s.unpack() == u"z"
+
+
+def test_packed_list():
+    values = PackedList(bytearray(packed(SKIPPABLE_VALUES[:-1])))
+    assert len(values) == len(SKIPPABLE_VALUES) - 1
+    assert values[2] == 1
+    assert values[-1] == {u"k%d" % i: i for i in range(0x100)}
+    assert list(values) == SKIPPABLE_VALUES[:-1]
+
+
+def test_packed_list_unpacks_into_columns():
+    columns = [Column("int64"), Column("float64"), Column("bool"), Column("int64"), Column("object")]
+    values = [-0x10, 1.5, True, None, [u"x"]]
+    for i in [1, -1, 0x7F, -0x80, 0x7FFF, -0x8000, 0x7FFFFFFF, -0x80000000, 2 ** 62]:
+        values[0] = i
+        PackedList(bytearray(packed(values))).unpack_into(columns, lambda index, value: (index, value))
+    assert columns[0].values.tolist() == [1, -1, 0x7F, -0x80, 0x7FFF, -0x8000, 0x7FFFFFFF, -0x80000000, 2 ** 62]
+    assert columns[1].values.tolist() == [1.5] * 9
+    assert columns[2].values.tolist() == [True] * 9
+    assert columns[3].mask.tolist() == [1] * 9
+    assert columns[4].values == [(4, [u"x"])] * 9
+
+
+def test_packed_list_unpacks_into_columns_with_widening():
+    columns = [Column("int64"), Column("bool"), Column("float64")]
+    PackedList(bytearray(packed([2.5, 1, False]))).unpack_into(columns)
+    assert columns[0].kind == "float64"
+    assert columns[1].kind == "object"
+    assert columns[2].kind == "object"
+    assert [column.values[0] for column in columns] == [2.5, 1, False]
+
+
+def test_packed_list_requires_list():
+    with raises(ValueError):
+        len(PackedList(packed({})))
+
+
+@mark.parametrize("value,expected", [
+    (None, b"\xC0"),
+    (True, b"\xC3"),
+    (False, b"\xC2"),
+    (-16, b"\xF0"),
+    (-17, b"\xC8\xEF"),
+    (0x80, b"\xC9\x00\x80"),
+    (0x8000, b"\xCA\x00\x00\x80\x00"),
+    (0x80000000, b"\xCB\x00\x00\x00\x00\x80\x00\x00\x00"),
+    (1.5, b"\xC1\x3F\xF8\x00\x00\x00\x00\x00\x00"),
+    (u"a", b"\x81a"),
+    (u"x" * 16, b"\xD0\x10" + b"x" * 16),
+    (bytearray(b"\x01\x02"), b"\xCC\x02\x01\x02"),
+    ([1, 2], b"\x92\x01\x02"),
+    ({u"a": 1}, b"\xA1\x81a\x01"),
+])
+def test_encoding(value, expected):
+    assert packed(value) == expected
+
+
+def test_subclass_of_supported_type():
+
+    class Name(str):
+        pass
+
+    assert packed(OrderedDict([(u"a", 1), (u"b", 2)])) == b"\xA2\x81a\x01\x81b\x02"
+    assert packed(Name(u"Alice")) == packed(u"Alice")
+
+
+def test_unsupported_type():
+    with raises(TypeError):
+        packed(object())
+
+
+def test_integer_out_of_range():
+    with raises(OverflowError):
+        packed(2 ** 64)
+
+
+def test_repeated_map_keys():
+    value = [{u"name": i, u"age": i} for i in range(10)]
+    assert unpacked(packed(value)) == value
+
+
+class Sink(object):
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, b):
+        self.data.extend(b)
+
+
+def test_message_writer_splits_large_messages_into_chunks():
+    sink = Sink()
+    writer = MessageWriter(sink)
+    writer.write_message(0x10, u"x" * 100000)
+    data = bytes(sink.data)
+    message = bytearray()
+    p = 0
+    while True:
+        size, = struct_unpack(">H", data[p:p + 2])
+        p += 2
+        if size == 0:
+            break
+        assert size <= 0x7FFF
+        message.extend(data[p:p + size])
+        p += size
+    assert p == len(data)
+    assert message[:2] == b"\xB1\x10"
+    assert unpacked(message[2:]) == u"x" * 100000
+
+
+class PacketSocket(object):
+
+    def __init__(self, packets):
+        self._packets = list(packets)
+
+    def recv(self, n):
+        if not self._packets:
+            return b""
+        packet = self._packets.pop(0)
+        if len(packet) > n:
+            self._packets.insert(0, packet[n:])
+            packet = packet[:n]
+        return packet
+
+    def recv_into(self, buffer):
+        packet = self.recv(len(buffer))
+        buffer[:len(packet)] = packet
+        return len(packet)
+
+
+def read_messages(data, count, packet_size=7):
+    packets = [data[i:i + packet_size] for i in range(0, len(data), packet_size)]
+    reader = MessageReader(Wire(PacketSocket(packets)))
+    return [reader.read_message() for _ in range(count)]
+
+
+def test_message_reader_reads_single_chunk_messages():
+    sink = Sink()
+    writer = MessageWriter(sink)
+    writer.write_message(0x71, [1, u"two", {u"three": 3.0}])
+    writer.write_message(0x70, {u"has_more": False})
+    assert read_messages(bytes(sink.data), 2) == [
+        (0x71, ([1, u"two", {u"three": 3.0}],)),
+        (0x70, ({u"has_more": False},)),
+    ]
+
+
+def test_message_reader_joins_multiple_chunks():
+    sink = Sink()
+    writer = MessageWriter(sink)
+    writer.write_message(0x71, [u"x" * 100000, list(range(20000))])
+    writer.write_message(0x70, {})
+    assert read_messages(bytes(sink.data), 2, packet_size=4096) == [
+        (0x71, ([u"x" * 100000, list(range(20000))],)),
+        (0x70, ({},)),
+    ]
+
+
+def test_message_reader_can_pack_single_records():
+    sink = Sink()
+    writer = MessageWriter(sink)
+    writer.write_message(0x71, [1, u"two"])
+    writer.write_message(0x71, [3, u"four"])
+    reader = MessageReader(Wire(PacketSocket([bytes(sink.data)])))
+    tag, (values,) = reader.read_message(pack_records=True)
+    assert isinstance(values, PackedList)
+    assert list(values) == [1, u"two"]
+    assert reader.read_message() == (0x71, ([3, u"four"],))
+
+
+def test_message_reader_skips_empty_chunks():
+    sink = Sink()
+    MessageWriter(sink).write_message(0x70, {})
+    assert read_messages(b"\x00\x00\x00\x00" + bytes(sink.data), 1) == [(0x70, ({},))]
+
+
+def test_message_reader_can_leave_records_packed():
+    sink = Sink()
+    writer = MessageWriter(sink)
+    writer.write_message(0x71, [1, u"two", {u"three": 3.0}])
+    writer.write_message(0x70, {u"has_more": False})
+    packets = [bytes(sink.data)]
+    reader = MessageReader(Wire(PacketSocket(packets)), lazy_records=True)
+    tag, (values,) = reader.read_message()
+    assert tag == 0x71
+    assert isinstance(values, PackedList)
+    assert values[1] == u"two"
+    assert list(values) == [1, u"two", {u"three": 3.0}]
+    assert reader.read_message() == (0x70, ({u"has_more": False},))
+
+class FakeGraph(object):
+
+    def __init__(self):
+        self.node_cache = ThreadLocalEntityCache()
+        self.relationship_cache = ThreadLocalEntityCache()
+
+
+def test_hydrate_node():
+    graph = FakeGraph()
+    hydrant = PackStreamHydrant(graph)
+    node_structure = unpacked(packed(Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})))
+    alice, = hydrant.hydrate([u"a"], [node_structure])
+    assert isinstance(alice, Node)
+    assert alice.graph is graph
+    assert alice.identity == 1
+    assert alice.has_label("Person")
+    assert dict(alice) == {u"name": u"Alice"}
+
+
+def test_hydrate_node_into_entity():
+    hydrant = PackStreamHydrant(FakeGraph())
+    alice = Node(u"Person", name=u"Alice")
+    value, = hydrant.hydrate([u"a"], [Structure(b"N", 1, [u"Person"], {u"name": u"Alice"})],
+                             entities={u"a": alice})
+    assert value is alice
+    assert alice.identity == 1
+
+
+def test_hydrate_nested_values():
+    hydrant = PackStreamHydrant(FakeGraph())
+    values = hydrant.hydrate([u"x"], [[{u"d": Structure(ord(b"D"), 1)}]], version=2)
+    assert values == ([{u"d": Date(1970, 1, 2)}],)
+
+
+def test_temporal_values_need_bolt_2():
+    hydrant = PackStreamHydrant(FakeGraph())
+    structure = Structure(ord(b"D"), 1)
+    assert hydrant.hydrate([u"d"], [structure], version=1) == (structure,)
+
+
+def test_unknown_structure_is_returned_as_is():
+    hydrant = PackStreamHydrant(FakeGraph())
+    structure = Structure(ord(b"?"), 1, 2)
+    assert hydrant.hydrate([u"x"], [structure], version=(4, 0)) == (structure,)
+
+
+def test_hydration_functions_are_reused_per_version():
+    hydrant = PackStreamHydrant(FakeGraph())
+    hydrant.hydrate([u"x"], [1], version=(3, 0))
+    hydrant.hydrate([u"x"], [2], version=3)
+    hydrant.hydrate([u"x"], [3], version=(4, 0))
+    assert sorted(hydrant._hydrators) == [(3, 0), (4, 0)]
+
+
+def test_dehydrate():
+    hydrant = PackStreamHydrant(FakeGraph())
+    data = hydrant.dehydrate({u"d": Date(1970, 1, 2), u"p": CartesianPoint((1.0, 2.0))}, version=2)
+    assert data[u"d"].tag == b"D"
+    assert data[u"d"].fields == (1,)
+    assert data[u"p"].tag == b"X"
+    assert data[u"p"].fields == (7203, 1.0, 2.0)
+
+
+def test_dehydrate_point_subclass_defined_after_first_use():
+    hydrant = PackStreamHydrant(FakeGraph())
+    hydrant.dehydrate({}, version=2)
+
+    class LatePoint(CartesianPoint):
+        pass
+
+    data = hydrant.dehydrate([LatePoint((1.0, 2.0))], version=2)
+    assert data[0].tag == b"X"
+    assert data[0].fields == (7203, 1.0, 2.0)
+
+
+def test_dehydrate_integer_out_of_range():
+    hydrant = PackStreamHydrant(FakeGraph())
+    with raises(ValueError):
+        hydrant.dehydrate([2 ** 64])
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Thread
+from time import sleep
+
+from pytest import fixture, raises
+
+from py2neo.connect import ConnectionPool, ConnectionProfile
+
+from test.fixtures.bolt import Script, StubBoltServer
+
+
+@fixture
+def server():
+    with StubBoltServer(Script().on("RETURN 1", ["1"], [[1]])) as server:
+        yield server
+
+
+@fixture
+def pool(server):
+    pool = ConnectionPool.open(ConnectionProfile(server.uri), max_size=2,
+                               acquire_wait_timeout=5)
+    yield pool
+    pool.close()
+
+
+def wait_for_waiters(pool, n):
+    while len(pool._waiting_list) < n:
+        sleep(0.001)
+
+
+def test_released_connection_is_reused(pool, server):
+    cx = pool.acquire()
+    pool.release(cx)
+    assert pool.acquire() is cx
+    assert pool.in_use == 1
+    assert pool.size == 1
+    assert server.connection_count == 1
+
+
+def test_pool_does_not_grow_beyond_max_size(pool):
+    connections = [pool.acquire(), pool.acquire()]
+    assert len(set(connections)) == 2
+    pool.acquire_wait_timeout = 0.05
+    with raises(RuntimeError):
+        pool.acquire()
+    assert pool.size == 2
+
+
+def test_release_of_free_connection_fails(pool):
+    cx = pool.acquire()
+    pool.release(cx)
+    with raises(ValueError):
+        pool.release(cx)
+
+
+def test_release_of_foreign_connection_fails(pool, server):
+    other = ConnectionPool.open(ConnectionProfile(server.uri))
+    try:
+        cx = other.acquire()
+        with raises(ValueError):
+            pool.release(cx)
+        other.release(cx)
+    finally:
+        other.close()
+
+
+def test_waiters_are_served_in_order(pool):
+    held = [pool.acquire(), pool.acquire()]
+    served = []
+
+    def acquire(i):
+        cx = pool.acquire()
+        served.append(i)
+        pool.release(cx)
+
+    threads = []
+    for i in range(5):
+        thread = Thread(target=acquire, args=(i,))
+        thread.start()
+        threads.append(thread)
+        wait_for_waiters(pool, i + 1)
+    # Only one connection is released, so that it is passed along
+    # the queue from each waiter to the next.
+    pool.release(held.pop())
+    for thread in threads:
+        thread.join()
+    pool.release(held.pop())
+    assert served == list(range(5))
+    assert pool.size == 2
+
+
+def test_growing_pool_wakes_waiter(pool):
+    held = [pool.acquire(), pool.acquire()]
+    acquired = []
+    thread = Thread(target=lambda: acquired.append(pool.acquire()))
+    thread.start()
+    wait_for_waiters(pool, 1)
+    pool.max_size = 3
+    thread.join()
+    assert acquired[0] not in held
+    assert pool.size == 3
+
+
+def test_closing_pool_wakes_waiters(pool):
+    pool.acquire()
+    pool.acquire()
+    acquired = []
+    thread = Thread(target=lambda: acquired.append(pool.acquire()))
+    thread.start()
+    wait_for_waiters(pool, 1)
+    pool.close()
+    thread.join()
+    assert acquired == [None]
+    assert pool.size == 0
+
+
+def test_metrics_count_acquires_releases_and_creations(pool):
+    events = []
+    pool.metrics.add_listener(lambda event, value: events.append(event))
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    pool.release(pool.acquire())
+    # The seed connection opened with the pool is also counted.
+    metrics = pool.metrics
+    assert metrics.acquires == 4
+    assert metrics.releases == 4
+    assert metrics.creations == 2
+    assert events == ["acquire", "create", "acquire", "release", "release",
+                      "acquire", "release"]
+
+
+def test_metrics_record_wait_time_and_timeouts(pool):
+    held = [pool.acquire(), pool.acquire()]
+    pool.acquire_wait_timeout = 0.05
+    with raises(RuntimeError):
+        pool.acquire()
+    assert pool.metrics.timeouts == 1
+    pool.acquire_wait_timeout = 5
+    thread = Thread(target=lambda: pool.release(pool.acquire()))
+    thread.start()
+    wait_for_waiters(pool, 1)
+    pool.release(held.pop())
+    thread.join()
+    wait_time = pool.metrics.wait_time
+    assert wait_time.count == 2
+    assert wait_time.max >= 0.05
+
+
+def test_metrics_record_expired_and_broken_connections(pool):
+    cx = pool.acquire()
+    pool.release(cx)
+    pool._max_age = 0.001
+    sleep(0.01)
+    pool.acquire()
+    assert pool.metrics.expirations == 1
+    assert cx.closed
+    pool._max_age = 3600
+    cx = pool.acquire()
+    cx.close()
+    pool.release(cx)
+    assert pool.metrics.breakages == 1
+    assert pool.metrics.lifetime.count == 2
+
+
+def test_handed_over_acquire_notifies_listeners_outside_lock(pool):
+    held = [pool.acquire(), pool.acquire()]
+    locked = []
+
+    def listener(event, value):
+        if event == "acquire":
+            locked.append(pool._lock._is_owned())
+
+    pool.metrics.add_listener(listener)
+    acquired = []
+    thread = Thread(target=lambda: acquired.append(pool.acquire()))
+    thread.start()
+    wait_for_waiters(pool, 1)
+    pool.release(held[0])
+    thread.join()
+    assert acquired == [held[0]]
+    assert locked == [False]
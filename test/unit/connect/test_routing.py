@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pytest import fixture, raises
+
+from py2neo.connect.routing import RoutingError, RoutingTable
+from py2neo.database import ClientError, Graph, GraphService
+
+from test.fixtures.bolt import Script, ScriptError, StubBoltServer
+
+
+ROUTING_4 = "CALL dbms.routing.getRoutingTable($context, $database)"
+
+ROUTING_3 = "CALL dbms.cluster.routing.getRoutingTable($context)"
+
+
+class NotALeader(ScriptError):
+
+    code = "Neo.ClientError.Cluster.NotALeader"
+
+
+def address(server):
+    return "%s:%d" % server.address
+
+
+def unused_address():
+    """ Return the address of a server that has since been stopped.
+    """
+    with StubBoltServer() as server:
+        return server.address
+
+
+class Cluster(object):
+    """ A router, two readers and two writers, each a stub server. The
+    router lists only the current leader as a writer, and only the
+    leader accepts writes.
+    """
+
+    def __init__(self, protocol_version):
+        self.ttl = 300
+        self.leader = 0
+        self.routing_calls = 0
+        routing = Script().on(ROUTING_4, ["ttl", "servers"], self.routing_table)
+        routing.on(ROUTING_3, ["ttl", "servers"], self.routing_table)
+        self.router = StubBoltServer(routing, protocol_version=protocol_version)
+        self.readers = [StubBoltServer(Script().on("RETURN 1", ["1"], [[1]]),
+                                       protocol_version=protocol_version)
+                        for _ in range(2)]
+        self.writers = [StubBoltServer(Script().on("CREATE ()", [], self.create(i)),
+                                       protocol_version=protocol_version)
+                        for i in range(2)]
+        self.servers = [self.router] + self.readers + self.writers
+        self.reader_addresses = []
+
+    def routing_table(self, parameters):
+        self.routing_calls += 1
+        return [[self.ttl, [
+            {"role": "ROUTE", "addresses": [address(self.router)]},
+            {"role": "READ", "addresses": self.reader_addresses},
+            {"role": "WRITE", "addresses": [address(self.writers[self.leader])]},
+        ]]]
+
+    def create(self, i):
+
+        def records(parameters):
+            if i != self.leader:
+                raise NotALeader("No write operations are allowed on this server")
+            return []
+
+        return records
+
+    def __enter__(self):
+        for server in self.servers:
+            server.start()
+        self.reader_addresses = list(map(address, self.readers))
+        return self
+
+    def __exit__(self, *exc_info):
+        GraphService.forget_all()
+        for server in self.servers:
+            server.stop()
+
+
+@fixture(params=[(3, 0), (4, 0)], ids=["bolt3", "bolt4"])
+def cluster(request):
+    with Cluster(request.param) as cluster:
+        yield cluster
+
+
+@fixture
+def graph(cluster):
+    return Graph("neo4j://%s" % address(cluster.router))
+
+
+def runs(server, cypher):
+    return len([fields for fields in server.requests_named("RUN") if fields[0] == cypher])
+
+
+def test_routing_table_is_fetched_with_procedure_for_server_version(cluster, graph):
+    graph.auto(readonly=True).evaluate("RETURN 1")
+    procedure = ROUTING_4 if cluster.router.protocol_version >= (4, 0) else ROUTING_3
+    assert runs(cluster.router, procedure) >= 1
+
+
+def test_reads_are_routed_to_readers(cluster, graph):
+    for _ in range(4):
+        assert graph.auto(readonly=True).evaluate("RETURN 1") == 1
+    assert [runs(reader, "RETURN 1") for reader in cluster.readers] == [2, 2]
+
+
+def test_writes_are_routed_to_leader(cluster, graph):
+    graph.run("CREATE ()")
+    with graph.begin() as tx:
+        tx.run("CREATE ()")
+    assert [runs(writer, "CREATE ()") for writer in cluster.writers] == [2, 0]
+    assert runs(cluster.router, "CREATE ()") == 0
+
+
+def test_routing_table_is_cached(cluster, graph):
+    graph.auto(readonly=True).evaluate("RETURN 1")
+    calls = cluster.routing_calls
+    for _ in range(3):
+        graph.auto(readonly=True).evaluate("RETURN 1")
+        graph.run("CREATE ()")
+    assert cluster.routing_calls == calls
+
+
+def test_expired_routing_table_is_refreshed(cluster, graph):
+    cluster.ttl = 0
+    graph.auto(readonly=True).evaluate("RETURN 1")
+    calls = cluster.routing_calls
+    graph.auto(readonly=True).evaluate("RETURN 1")
+    assert cluster.routing_calls == calls + 1
+
+
+def test_not_a_leader_error_refreshes_routing_table(cluster, graph):
+    graph.run("CREATE ()")
+    cluster.leader = 1
+    with raises(ClientError):
+        graph.run("CREATE ()")
+    graph.run("CREATE ()")
+    assert [runs(writer, "CREATE ()") for writer in cluster.writers] == [2, 1]
+
+
+def test_unreachable_reader_is_skipped(cluster):
+    dead = unused_address()
+    cluster.reader_addresses.insert(0, "%s:%d" % dead)
+    graph = Graph("neo4j://%s" % address(cluster.router))
+    for _ in range(4):
+        assert graph.auto(readonly=True).evaluate("RETURN 1") == 1
+    table = graph.service.connector.routing_table(graph.name, readonly=True)
+    assert dead not in table.readers
+
+
+def test_no_reachable_reader_raises_routing_error(cluster):
+    cluster.reader_addresses = ["%s:%d" % unused_address()]
+    with raises(RoutingError):
+        graph = Graph("neo4j://%s" % address(cluster.router))
+        graph.auto(readonly=True).evaluate("RETURN 1")
+
+
+def test_routing_table_parsing():
+    table = RoutingTable.parse(300, [
+        {"role": "ROUTE", "addresses": ["a:7687", "b:7687"]},
+        {"role": "READ", "addresses": ["b:7687"]},
+        {"role": "WRITE", "addresses": ["a:7687"]},
+    ])
+    assert table.routers == [("a", 7687), ("b", 7687)]
+    assert table.readers == [("b", 7687)]
+    assert table.writers == [("a", 7687)]
+    assert table.is_fresh(readonly=True)
+    assert table.is_fresh(readonly=False)
+    table.remove_writer(("a", 7687))
+    assert table.is_fresh(readonly=True)
+    assert not table.is_fresh(readonly=False)
+    table.remove(("b", 7687))
+    assert not table.is_fresh(readonly=True)
+
+
+def test_expired_routing_table_is_not_fresh():
+    table = RoutingTable(["a:7687"], ["a:7687"], ["a:7687"], ttl=0)
+    assert table.expired()
+    assert not table.is_fresh()
@@ -42,6 +42,11 @@ class FakeSocket(object):
         value, self._in_buffer = self._in_buffer[:n_bytes], self._in_buffer[n_bytes:]
         return value
 
+    def recv_into(self, buffer, n_bytes=0, flags=None):
+        value = self.recv(n_bytes or len(buffer))
+        buffer[:len(value)] = value
+        return len(value)
+
     def send(self, b, flags=None):
         if self._closed:
             raise OSError("Socket closed")
@@ -120,3 +125,47 @@ def test_byte_writer_close(fake_writer):
     writer.close()
     with raises(OSError):
         assert writer.send()
+
+
+def test_byte_reader_read_view(fake_reader):
+    reader = fake_reader([b"hello, ", b"world"])
+    view = reader.read_view(5)
+    assert view == b"hello"
+    del view
+    assert reader.read(7) == b", world"
+
+
+def test_byte_reader_consecutive_reads_across_packets(fake_reader):
+    reader = fake_reader([b"ab", b"cdef", b"gh"])
+    assert [reader.read(3), reader.read(3), reader.read(2)] == [b"abc", b"def", b"gh"]
+
+
+def test_byte_reader_read_larger_than_buffer():
+    data = bytes(bytearray(range(256))) * 64
+    reader = Wire(FakeSocket([data[:5000], data[5000:]]), buffer_size=1024)
+    assert reader.read(10) == data[:10]
+    assert reader.read(len(data) - 10) == data[10:]
+
+
+def test_byte_reader_compacts_buffer():
+    packets = [bytes(bytearray([i])) * 100 for i in range(20)]
+    reader = Wire(FakeSocket(packets), buffer_size=256)
+    for packet in packets:
+        assert reader.read(100) == packet
+
+
+def test_byte_writer_partial_sends():
+
+    class TrickleSocket(FakeSocket):
+
+        def send(self, b, flags=None):
+            return super(TrickleSocket, self).send(b[:3])
+
+    into = []
+    writer = Wire(TrickleSocket(out_packets=into))
+    writer.write(b"hello, world")
+    assert writer.send() == 12
+    assert b"".join(into) == b"hello, world"
+    writer.write(b"!")
+    assert writer.send() == 1
+    assert b"".join(into) == b"hello, world!"
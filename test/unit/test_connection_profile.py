@@ -231,3 +231,54 @@ class ConnectionProfileTestCase(TestCase):
             'uri': 'bolt+s://neo4j@localhost:7687',
             'user': 'neo4j',
         })
+
+    def test_readers(self):
+        profile = ConnectionProfile("bolt://host:9999", readers=["r1:9998", ("r2", 9997), "r3"])
+        self.assertEqual(profile.readers, (IPv4Address(("r1", 9998)),
+                                           IPv4Address(("r2", 9997)),
+                                           IPv4Address(("r3", 7687))))
+        self.assertNotEqual(profile, ConnectionProfile("bolt://host:9999"))
+
+    def test_readers_from_string(self):
+        profile = ConnectionProfile(readers="r1:9998, r2:9997")
+        self.assertEqual(profile.readers, (IPv4Address(("r1", 9998)),
+                                           IPv4Address(("r2", 9997))))
+
+    def test_with_address(self):
+        profile = ConnectionProfile("bolt://bob@host:9999", readers=["r1:9998"])
+        reader = profile.with_address(profile.readers[0])
+        self.assertEqual(reader.uri, "bolt://bob@r1:9998")
+        self.assertEqual(reader.readers, ())
+        self.assertEqual(profile.uri, "bolt://bob@host:9999")
+
+    def test_neo4j_uri_only(self):
+        data = ConnectionProfile("neo4j://host:9999").to_dict()
+        self.assertEqual(data, {
+            'address': IPv4Address(('host', 9999)),
+            'auth': ('neo4j', 'password'),
+            'host': 'host',
+            'password': 'password',
+            'port': 9999,
+            'port_number': 9999,
+            'scheme': 'neo4j',
+            'secure': False,
+            'verify': True,
+            'uri': 'neo4j://neo4j@host:9999',
+            'user': 'neo4j',
+        })
+
+    def test_neo4j_uri_with_ssc(self):
+        profile = ConnectionProfile("neo4j+ssc://host:9999")
+        self.assertTrue(profile.routing)
+        self.assertTrue(profile.secure)
+        self.assertFalse(profile.verify)
+        self.assertEqual(profile.protocol, "bolt")
+
+    def test_bolt_uri_is_not_routing(self):
+        self.assertFalse(ConnectionProfile("bolt://host:9999").routing)
+
+    def test_with_address_for_neo4j_uri(self):
+        profile = ConnectionProfile("neo4j+s://host:9999")
+        server = profile.with_address(IPv4Address(("server", 9998)))
+        self.assertEqual(server.uri, "bolt+s://neo4j@server:9998")
+        self.assertFalse(server.routing)
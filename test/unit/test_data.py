@@ -17,9 +17,12 @@
 
 
 from io import StringIO
+from pickle import dumps, loads
 from unittest import TestCase
 
-from py2neo.data import Record, Table, Subgraph, Walkable, Node, Relationship, PropertyDict, Path, walk
+from pytest import raises
+
+from py2neo.data import LazyRecord, Record, Table, Subgraph, Walkable, Node, Relationship, PropertyDict, Path, walk
 
 
 KNOWS = Relationship.type("KNOWS")
@@ -1108,6 +1111,66 @@ def test_record_str():
     assert str(person) == "'Alice'\t33"
 
 
+def lazy_person():
+    values = ["Alice", 33]
+    loaded = []
+
+    def load(index):
+        loaded.append(index)
+        return values[index]
+
+    return LazyRecord(["name", "age"], load), loaded
+
+
+def test_lazy_record_loads_only_accessed_values():
+    person, loaded = lazy_person()
+    assert person["age"] == 33
+    assert person.get("age") == 33
+    assert person[1] == 33
+    assert loaded == [1]
+
+
+def test_lazy_record_behaves_as_record():
+    person, loaded = lazy_person()
+    assert len(person) == 2
+    assert list(person) == ["Alice", 33]
+    assert person.keys() == ["name", "age"]
+    assert person.values() == ["Alice", 33]
+    assert person.items() == [("name", "Alice"), ("age", 33)]
+    assert person.data() == {"name": "Alice", "age": 33}
+    assert person[0:1] == Record([("name", "Alice")])
+    assert person.get("height") is None
+    assert "Alice" in person
+    assert person == Record([("name", "Alice"), ("age", 33)])
+    assert repr(person) == "Record({'name': 'Alice', 'age': 33})"
+    assert sorted(loaded) == [0, 1]
+
+
+def test_lazy_record_never_exposes_unloaded_values():
+    person, loaded = lazy_person()
+    assert isinstance(person, Record)
+    assert not isinstance(person, tuple)
+    assert "%s is %d" % tuple(person) == "Alice is 33"
+    assert "%(name)s is %(age)d" % person == "Alice is 33"
+    with raises(TypeError):
+        _ = "%s is %d" % person
+
+
+def test_lazy_record_is_pickled_as_record():
+    person, loaded = lazy_person()
+    copy = loads(dumps(person))
+    assert type(copy) is Record
+    assert copy == Record([("name", "Alice"), ("age", 33)])
+    assert copy.keys() == ["name", "age"]
+
+
+def test_record_pickling():
+    person = Record([("name", "Alice"), ("age", 33)])
+    copy = loads(dumps(person))
+    assert copy == person
+    assert tuple(copy) == ("Alice", 33)
+
+
 def test_node_repr():
     assert repr(alice) == "Node('Employee', 'Person', age=33, name='Alice')"
 
@@ -14,3 +14,298 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+
+from collections import deque
+from threading import Thread
+
+from pytest import fixture, importorskip, raises
+
+from py2neo.connect import ConnectionPool, ConnectionProfile
+from py2neo.connect.packstream import PackedList, packed
+from py2neo.data import Node, Relationship
+from py2neo.database import ClientError, Cursor, Graph, GraphService, RetryPolicy, TransientError
+
+from test.fixtures.bolt import Script, ScriptError, StubBoltServer, unwind_identities
+
+
+class FakeResult(object):
+
+    protocol_version = (4, 0)
+
+    lazy_records = False
+
+    def __init__(self, keys, records):
+        self._keys = keys
+        self._records = deque(records)
+        self._packing = False
+
+    def buffer(self):
+        self._records.clear()
+
+    def fields(self):
+        return self._keys
+
+    def pack_records(self):
+        self._packing = True
+
+    def fetch(self):
+        try:
+            values = self._records.popleft()
+        except IndexError:
+            return None
+        if self._packing:
+            return PackedList(bytearray(packed(list(values))))
+        return values
+
+
+class FakeHydrant(object):
+
+    def __init__(self):
+        self.hydrated = []
+
+    def hydrate(self, keys, values, entities=None, version=None):
+        values = tuple(values)
+        self.hydrated.append((list(keys), values))
+        return values
+
+
+def test_to_columns():
+    importorskip("numpy")
+    records = [[i, i / 2.0, u"x%d" % i, None if i % 2 else i] for i in range(5)]
+    columns = Cursor(FakeResult(["a", "b", "c", "d"], records)).to_columns(batch_size=2)
+    assert list(columns) == ["a", "b", "c", "d"]
+    assert columns["a"].dtype.name == "int64"
+    assert columns["a"].tolist() == [0, 1, 2, 3, 4]
+    assert columns["b"].dtype.name == "float64"
+    assert columns["c"].dtype.name == "object"
+    assert columns["d"].tolist() == [0, None, 2, None, 4]
+
+
+def test_to_columns_hydrates_only_values_of_other_types():
+    importorskip("numpy")
+    records = [[i, i % 2 == 0, None, u"x%d" % i] for i in range(4)]
+    hydrant = FakeHydrant()
+    columns = Cursor(FakeResult(["a", "b", "c", "d"], records), hydrant).to_columns(batch_size=1)
+    assert columns["a"].tolist() == [0, 1, 2, 3]
+    assert columns["b"].tolist() == [True, False, True, False]
+    assert columns["d"].tolist() == [u"x0", u"x1", u"x2", u"x3"]
+    assert hydrant.hydrated == [(["a", "b", "c", "d"], (0, True, None, u"x0")),
+                                (["d"], (u"x1",)), (["d"], (u"x2",)), (["d"], (u"x3",))]
+
+
+def test_to_ndarray_columnar_matches_row_based():
+    importorskip("numpy")
+    records = [[i, i * 1.5] for i in range(5)]
+    rows = Cursor(FakeResult(["a", "b"], records)).to_ndarray()
+    columns = Cursor(FakeResult(["a", "b"], records)).to_ndarray(columnar=True)
+    assert columns.dtype == rows.dtype
+    assert columns.tolist() == rows.tolist()
+
+
+class Deadlock(ScriptError):
+
+    code = "Neo.TransientError.Transaction.DeadlockDetected"
+
+
+def transient_error(code):
+    error = TransientError("Failed")
+    error.code = code
+    return error
+
+
+def test_retry_policy_delays_grow_exponentially():
+    policy = RetryPolicy(max_attempts=5, initial_delay=1.0, multiplier=2.0, jitter=0)
+    assert list(policy.delays()) == [1.0, 2.0, 4.0, 8.0]
+
+
+def test_retry_policy_delays_are_jittered():
+    policy = RetryPolicy(max_attempts=50, initial_delay=1.0, multiplier=1.0, jitter=0.5)
+    delays = list(policy.delays())
+    assert all(0.5 <= delay <= 1.5 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_policy_retryable_errors():
+    policy = RetryPolicy()
+    assert policy.is_retryable(transient_error("Neo.TransientError.Transaction.DeadlockDetected"))
+    assert not policy.is_retryable(transient_error("Neo.TransientError.Transaction.Terminated"))
+    not_a_leader = ClientError("No write operations are allowed")
+    not_a_leader.code = "Neo.ClientError.Cluster.NotALeader"
+    assert policy.is_retryable(not_a_leader)
+    assert not policy.is_retryable(ClientError("Syntax error"))
+    assert not policy.is_retryable(ValueError())
+    assert RetryPolicy(errors=[ValueError]).is_retryable(ValueError())
+
+
+@fixture
+def pool():
+    with StubBoltServer(Script()) as server:
+        pool = ConnectionPool.open(ConnectionProfile(server.uri))
+        yield pool
+        pool.close()
+
+
+def test_retry_policy_calls_until_success(pool):
+    failures = [transient_error("Neo.TransientError.General.Unavailable")] * 2
+    metrics = pool.metrics
+    events = []
+    metrics.add_listener(lambda event, value: events.append(event))
+
+    def work():
+        if failures:
+            raise failures.pop()
+        return 42
+
+    assert RetryPolicy(initial_delay=0).call(work, pool) == 42
+    assert metrics.retries == 2
+    assert metrics.retries_exhausted == 0
+    assert events == ["retry", "retry"]
+
+
+def test_retry_policy_gives_up_after_max_attempts(pool):
+    calls = []
+    metrics = pool.metrics
+
+    def work():
+        calls.append(None)
+        raise transient_error("Neo.TransientError.General.Unavailable")
+
+    with raises(TransientError):
+        RetryPolicy(max_attempts=3, initial_delay=0).call(work, pool)
+    assert len(calls) == 3
+    assert metrics.retries == 2
+    assert metrics.retries_exhausted == 1
+
+
+def test_concurrent_retries_are_all_counted(pool):
+    failures = [transient_error("Neo.TransientError.General.Unavailable")] * 4000
+    policy = RetryPolicy(max_attempts=len(failures) + 1, max_time=60, initial_delay=0)
+
+    def work():
+        try:
+            raise failures.pop()
+        except IndexError:
+            return None
+
+    threads = [Thread(target=policy.call, args=(work, pool)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.metrics.retries == 4000
+
+
+def test_retry_policy_gives_up_when_out_of_time():
+    calls = []
+
+    def work():
+        calls.append(None)
+        raise transient_error("Neo.TransientError.General.Unavailable")
+
+    with raises(TransientError):
+        RetryPolicy(max_attempts=10, max_time=0.5, initial_delay=1.0).call(work)
+    assert len(calls) == 1
+
+
+def test_retry_policy_does_not_retry_other_errors():
+    calls = []
+
+    def work():
+        calls.append(None)
+        raise ValueError()
+
+    with raises(ValueError):
+        RetryPolicy(initial_delay=0).call(work)
+    assert len(calls) == 1
+
+
+class FlakyServer(StubBoltServer):
+    """ A stub server that fails to carry out chosen statements a
+    given number of times, with a deadlock unless another error is
+    given.
+    """
+
+    def __init__(self):
+        super(FlakyServer, self).__init__(Script(default=self.reply))
+        self.failures = {}
+
+    def fail(self, fragment, times=1, error=Deadlock):
+        self.failures[fragment] = (times, error)
+
+    def reply(self, cypher, parameters):
+        for fragment, (times, error) in self.failures.items():
+            if fragment in cypher and times:
+                self.failures[fragment] = (times - 1, error)
+                raise error("Failed to run %r" % cypher)
+        return unwind_identities(cypher, parameters)
+
+    def runs(self, fragment):
+        return len([fields for fields in self.requests_named("RUN") if fragment in fields[0]])
+
+
+@fixture
+def flaky():
+    with FlakyServer() as server:
+        yield server
+        GraphService.forget_all()
+
+
+@fixture
+def graph(flaky):
+    graph = Graph(flaky.uri)
+    graph.retry_policy = RetryPolicy(initial_delay=0)
+    return graph
+
+
+def test_play_retries_transient_failure(flaky, graph):
+    flaky.fail("CREATE")
+
+    def work(tx):
+        tx.run("CREATE (a) RETURN id(a)").evaluate()
+
+    graph.play(work)
+    assert flaky.runs("CREATE") == 2
+    assert len(flaky.requests_named("COMMIT")) == 1
+    assert graph.service.connector.metrics.retries == 1
+
+
+def test_play_does_not_retry_other_failures(flaky, graph):
+    flaky.fail("CREATE", times=2, error=ScriptError)
+
+    def work(tx):
+        tx.run("CREATE (a) RETURN id(a)").evaluate()
+
+    with raises(ClientError):
+        graph.play(work)
+    assert flaky.runs("CREATE") == 1
+
+
+def test_create_restores_bindings_before_retry(flaky, graph):
+    flaky.fail("MERGE")
+    a, b = Node("Person"), Node("Person")
+    graph.create(Relationship(a, "KNOWS", b))
+    assert flaky.runs("CREATE") == 2
+    assert flaky.runs("MERGE") == 2
+    assert a.graph is graph and b.graph is graph
+    assert graph.service.connector.metrics.retries == 1
+
+
+def test_create_restores_bindings_on_failure(flaky, graph):
+    graph.retry_policy = RetryPolicy(max_attempts=2, initial_delay=0)
+    flaky.fail("MERGE", times=2)
+    a, b = Node("Person"), Node("Person")
+    with raises(TransientError):
+        graph.create(Relationship(a, "KNOWS", b))
+    assert a.graph is None and a.identity is None
+    assert b.graph is None and b.identity is None
+    assert graph.service.connector.metrics.retries_exhausted == 1
+
+
+def test_delete_restores_bindings_before_retry(flaky, graph):
+    a = Node("Person")
+    graph.create(a)
+    flaky.fail("DELETE")
+    graph.delete(a)
+    assert flaky.runs("DELETE") == 2
+    assert a.graph is None
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+# Copyright 2011-2020, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from pytest import importorskip, mark
+
+from py2neo.internal.columns import Column, infer_kind
+
+
+@mark.parametrize("values,kind", [
+    ([], "object"),
+    ([None, None], "object"),
+    ([True, None, False], "bool"),
+    ([1, None, 2], "int64"),
+    ([1, 2.5], "float64"),
+    ([1, True], "object"),
+    ([1, u"two"], "object"),
+])
+def test_infer_kind(values, kind):
+    assert infer_kind(values) == kind
+
+
+def test_typed_column_without_nulls_has_no_mask():
+    column = Column.from_values([1, 2, 3])
+    assert column.kind == "int64"
+    assert list(column.values) == [1, 2, 3]
+    assert column.mask is None
+
+
+def test_nulls_are_masked():
+    column = Column.from_values([1, 2])
+    column.extend([None, 4])
+    assert list(column.values) == [1, 2, 0, 4]
+    assert list(column.mask) == [0, 0, 1, 0]
+
+
+def test_int_column_widens_to_float():
+    column = Column.from_values([1, None])
+    column.append(2.5)
+    assert column.kind == "float64"
+    assert list(column.values) == [1.0, 0.0, 2.5]
+    assert list(column.mask) == [0, 1, 0]
+
+
+def test_typed_column_widens_to_object():
+    column = Column.from_values([True, None])
+    column.append(u"three")
+    assert column.kind == "object"
+    assert column.values == [True, None, u"three"]
+
+
+def test_int_column_widens_to_object_on_overflow():
+    column = Column.from_values([1])
+    column.append(2 ** 64)
+    assert column.kind == "object"
+    assert column.values == [1, 2 ** 64]
+
+
+def test_bool_does_not_fit_int_column():
+    column = Column.from_values([1])
+    column.append(True)
+    assert column.values == [1, True]
+
+
+def test_typed_appends():
+    column = Column("int64")
+    column.append_int(1)
+    column.append_null()
+    column.append_float(2.5)
+    assert column.kind == "float64"
+    assert list(column.values) == [1.0, 0.0, 2.5]
+    assert list(column.mask) == [0, 1, 0]
+    column.append_bool(True)
+    assert column.kind == "object"
+    assert column.values == [1.0, None, 2.5, True]
+
+
+def test_to_ndarray():
+    numpy = importorskip("numpy")
+    data = Column.from_values([1.5, 2.5]).to_ndarray()
+    assert data.dtype == numpy.float64
+    assert data.tolist() == [1.5, 2.5]
+
+
+def test_to_ndarray_with_nulls():
+    numpy = importorskip("numpy")
+    data = Column.from_values([1, None, 3]).to_ndarray()
+    assert isinstance(data, numpy.ma.MaskedArray)
+    assert data.dtype == numpy.int64
+    assert data.tolist() == [1, None, 3]
+
+
+def test_object_column_keeps_lists_as_items():
+    importorskip("numpy")
+    data = Column.from_values([[1, 2], [3, 4]]).to_ndarray()
+    assert data.shape == (2,)
+    assert data[1] == [3, 4]